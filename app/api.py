@@ -13,11 +13,13 @@ FastAPI backend for Gumgang Meeting features (BT-10)
 from __future__ import annotations
 from datetime import datetime
 
+import hashlib
 import json
 import fcntl
 import time
 import os
 import re
+import threading
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
@@ -25,7 +27,7 @@ from typing import Literal as _Lit
 
 from fastapi import Body, FastAPI, File, Form, HTTPException, UploadFile, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, HTMLResponse, PlainTextResponse, JSONResponse, Response
+from fastapi.responses import FileResponse, StreamingResponse, HTMLResponse, PlainTextResponse, Response
 import html
 import urllib.parse
 import shutil
@@ -36,12 +38,25 @@ from app.gate_utils import (
     verify_gate_token,
     make_gate_token,
     append_audit,
+    verify_audit_chain,
     compute_source_diversity,
     pii_scan_and_redact,
     sha256_text,
     ulid,
     extract_source_root,
 )
+from app.latest_index import resolve_latest, update_latest
+from app.line_index import LINE_INDEX
+from app.gate_catalog import GATE_CATALOG
+from app.dedup_index import NEAR_JACCARD_MIN, ContentHashIndex
+from app.dir_cache import DirCache, Entry as DirEntry
+from app.event_log import EventLog, EventLogs
+from app.job_queue import JobNotFound, JobQueue, QueueFull, tail_file
+from app import content_bulk, content_fts, file_serve, migrations, thread_fts
+from app.render_cache import SITEMAP_MAX_URLS, RenderCache, build_entry, response_parts
+from app.revalidate_queue import RevalidateQueue
+from app.upload_stream import UploadError, UploadSessions, iter_upload, save_stream
+from app.st_index import ST_EVIDENCE_INDEX
 
 # ---------- Paths & Env ----------
 
@@ -188,6 +203,10 @@ def _pg_conn():
     return drv.connect(url)
 
 
+def _pg_db_key() -> str:
+    return "pg:" + str(ENV.get("CONTENT_PG_URL") or ENV.get("PGURL") or "")
+
+
 class ContentItem(BaseModel):
     id: str
     slug: str
@@ -215,18 +234,6 @@ class ImportPayload(BaseModel):
 
 
 
-def write_bytes(path: Path, content: Iterable[bytes]) -> int:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    n = 0
-    with path.open("wb") as f:
-        for chunk in content:
-            if not chunk:
-                continue
-            f.write(chunk)
-            n += len(chunk)
-    return n
-
-
 # ---------- Pydantic Schemas ----------
 
 
@@ -275,8 +282,16 @@ class RecordStopRequest(BaseModel):
 
 
 class MeetingStore:
+    """events.jsonl per meeting, indexed by events.idx (app/event_log.py: O(1) append, seq reads).
+    index.json is a periodic summary snapshot, not rewritten on every event."""
+
+    SNAPSHOT_EVERY = 100  # events
+    SNAPSHOT_SEC = 5.0
+
     def __init__(self, root: Path) -> None:
         self.root = root
+        self.logs = EventLogs(self.events_path)
+        self._snap_at: Dict[str, float] = {}
 
     def events_path(self, meeting_id: str) -> Path:
         return ensure_meeting_dir(meeting_id) / "events.jsonl"
@@ -284,24 +299,42 @@ class MeetingStore:
     def index_path(self, meeting_id: str) -> Path:
         return ensure_meeting_dir(meeting_id) / "index.json"
 
-    def append_event(self, meeting_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
-        events = self.events_path(meeting_id)
-        bytes_written = append_jsonl(events, event)
-        # Light index update (non-critical)
+    def log(self, meeting_id: str) -> EventLog:
+        return self.logs.get(meeting_id)
+
+    def snapshot(self, meeting_id: str) -> Path:
         idx_path = self.index_path(meeting_id)
+        st = self.log(meeting_id).stats()
         index = {
             "meeting_id": meeting_id,
-            "last_ts": event.get("ts") or now_iso(),
+            "last_ts": st["last_ts"] or now_iso(),
             "updated_at": now_iso(),
+            "count": st["count"],
+            "bytes": st["bytes"],
+            "by_type": st["by_type"],
         }
-        try:
-            idx_path.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
-        except Exception:
-            pass
+        tmp = idx_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, idx_path)
+        self._snap_at[meeting_id] = time.monotonic()
+        return idx_path
+
+    def append_event(self, meeting_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        log = self.log(meeting_id)
+        seq, bytes_written = log.append(event)
+        idx_path = log.log_path.parent / "index.json"
+        # Summary snapshot (non-critical): first event, every SNAPSHOT_EVERY events or SNAPSHOT_SEC
+        last = self._snap_at.get(meeting_id)
+        if last is None or seq % self.SNAPSHOT_EVERY == 0 or time.monotonic() - last >= self.SNAPSHOT_SEC:
+            try:
+                self.snapshot(meeting_id)
+            except Exception:
+                pass
         return {
             "ok": True,
+            "seq": seq,
             "bytes_written": bytes_written,
-            "events_path": relpath(events),
+            "events_path": relpath(log.log_path),
             "index_path": relpath(idx_path),
         }
 
@@ -488,20 +521,29 @@ def checkpoints_tail(n: int = 50) -> Dict[str, Any]:
     status = _ckpt_chain_status(CKPT_JSONL)
     return {"ok": True, "chain_status": "OK" if status["chain_ok"] else "FAIL", "last_hash": status["last_hash"], "last_ts": status["last_ts"], "last_seq": status["last_seq"], "items": tail_items}
 
-@app.get("/api/sitegraph/latest")
-def sitegraph_latest(lens: str = "Core") -> Dict[str, Any]:
-    # Return latest SiteGraph snapshot JSON from status/evidence/sitemap/graph_runs/<date>/sitegraph.json
+def _latest_snapshot(base: Path, file_name: str) -> Tuple[Path, Path]:
+    """Resolve <base>/<date>/<file_name> for the newest date dir.
+    O(1) via the _latest.json pointer; falls back to a dir scan when it is missing."""
+    fp = resolve_latest(base)
+    if fp is not None and fp.name == file_name:
+        return fp.parent, fp
     try:
-        GRAPH_RUNS_ROOT.mkdir(parents=True, exist_ok=True)
-        dirs = [p for p in GRAPH_RUNS_ROOT.iterdir() if p.is_dir()]
+        base.mkdir(parents=True, exist_ok=True)
+        dirs = [p for p in base.iterdir() if p.is_dir()]
     except Exception:
         dirs = []
     if not dirs:
         raise HTTPException(status_code=404, detail="NO_SNAPSHOT")
     latest_dir = sorted(dirs, key=lambda p: p.name, reverse=True)[0]
-    fp = latest_dir / SITEGRAPH_FILE_NAME
+    fp = latest_dir / file_name
     if not fp.exists():
         raise HTTPException(status_code=404, detail="SNAPSHOT_MISSING")
+    return latest_dir, fp
+
+@app.get("/api/sitegraph/latest")
+def sitegraph_latest(lens: str = "Core") -> Dict[str, Any]:
+    # Return latest SiteGraph snapshot JSON from status/evidence/sitemap/graph_runs/<date>/sitegraph.json
+    latest_dir, fp = _latest_snapshot(GRAPH_RUNS_ROOT, SITEGRAPH_FILE_NAME)
     try:
         data = json.loads(fp.read_text(encoding="utf-8"))
     except Exception:
@@ -527,6 +569,8 @@ class PysparkRunReq(BaseModel):
     script: str = Field(..., description="Repo-relative path under scripts/pyspark_jobs")
     args: Optional[List[str]] = None
     run_id: Optional[str] = None
+    timeout_sec: Optional[int] = Field(None, ge=1, le=86400, description="Kill the job after this many seconds")
+    wait: bool = Field(False, description="Block until the job finishes (legacy synchronous behaviour)")
 
 
 def _resolve_pyspark_job(path_str: str) -> Path:
@@ -560,72 +604,157 @@ def pyspark_jobs_list() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"LIST_FAIL: {e}")
 
 
+PYSPARK_EVIDENCE_DIR = EVIDENCE_ROOT / "pyspark_runs"
+PYSPARK_WRAPPER = PROJECT_ROOT / "scripts" / "mcp" / "pyspark_execute.py"
+
+
+def _pyspark_evidence(row: Dict[str, Any]) -> Dict[str, Any]:
+    """JobQueue on_finish: the per-run evidence JSON + latest pointer (same shape as the
+    synchronous runner wrote, plus job fields and paths to the full logs). The returned path
+    lands in the job's meta with its terminal status."""
+    ts = now_iso()
+    script = row.get("script") or ""
+    base = prune_filename(Path(script).name, default="job.py")
+    out_path = PYSPARK_EVIDENCE_DIR / f"{ts.replace(':','').replace('-','')}_{base}.json"
+    out_p, err_p = Path(row.get("stdout_path") or ""), Path(row.get("stderr_path") or "")
+    payload = {
+        "ts": ts,
+        "run_id": (row.get("meta") or {}).get("run_id") or f"PYSPARK_RUN_{ts.replace('-', '').replace(':', '')}",
+        "job_id": row["id"],
+        "script": script,
+        "args": (row.get("meta") or {}).get("args") or [],
+        "status": row["status"],
+        "rc": row.get("rc"),
+        "error": row.get("error_msg"),
+        "duration_ms": row.get("duration_ms"),
+        "stdout": _truncate(tail_file(out_p, 16000)) if row.get("stdout_path") else "",
+        "stderr": _truncate(tail_file(err_p, 16000)) if row.get("stderr_path") else "",
+        "stdout_path": relpath(out_p) if row.get("stdout_path") else None,
+        "stderr_path": relpath(err_p) if row.get("stderr_path") else None,
+    }
+    PYSPARK_EVIDENCE_DIR.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    update_latest(PYSPARK_EVIDENCE_DIR, out_path, key=ts, meta={"rc": row.get("rc"), "script": script, "job_id": row["id"]})
+    return {"evidence": relpath(out_path)}
+
+
+PYSPARK_JOBS = JobQueue(
+    lambda: _sqlite_path(),
+    PYSPARK_EVIDENCE_DIR / "jobs",
+    workers=int(ENV.get("GG_PYSPARK_WORKERS") or 2),
+    max_queued=int(ENV.get("GG_PYSPARK_QUEUE_MAX") or 32),
+    default_timeout=int(ENV.get("GG_PYSPARK_TIMEOUT_SEC") or 1800),
+    on_finish=_pyspark_evidence,
+)
+
+
+def _pyspark_jobs() -> JobQueue:
+    """Workers start on first use, after the schema check (rows live in ops_jobs, migration 008)."""
+    _require_schema("sqlite")
+    if not PYSPARK_JOBS.running():
+        PYSPARK_JOBS.start()
+    return PYSPARK_JOBS
+
+
+def _pyspark_job_view(row: Dict[str, Any], log_bytes: int = 8000) -> Dict[str, Any]:
+    out = {k: v for k, v in row.items() if k not in ("cmd", "log_dir", "stdout_path", "stderr_path")}
+    meta = row.get("meta") or {}
+    out["args"] = meta.get("args") or []
+    out.pop("meta", None)
+    for name in ("stdout", "stderr"):
+        p = row.get(f"{name}_path")
+        out[f"{name}_path"] = relpath(Path(p)) if p else None
+        out[name] = tail_file(Path(p), log_bytes) if p and log_bytes > 0 else ""
+    out["evidence"] = meta.get("evidence")
+    return out
+
+
 @app.post("/api/mcp/pyspark/run")
 def pyspark_run(req: PysparkRunReq) -> Dict[str, Any]:
+    """Queue a run and return its job id immediately; poll GET /api/mcp/pyspark/jobs/{id}.
+    wait=true blocks until the job finishes (the old synchronous response shape)."""
     job = _resolve_pyspark_job(req.script)
-    # Build command to call wrapper
-    wrapper = PROJECT_ROOT / "scripts" / "mcp" / "pyspark_execute.py"
-    if not wrapper.exists():
+    if not PYSPARK_WRAPPER.exists():
         raise HTTPException(status_code=500, detail="WRAPPER_MISSING")
-
     import sys as _sys
 
-    cmd = [_sys.executable, str(wrapper), str(job)]
+    args = [str(a) for a in (req.args or [])]
+    cmd = [_sys.executable, str(PYSPARK_WRAPPER), str(job), *args]
+    q = _pyspark_jobs()
     try:
-        proc = subprocess.run(
+        row = q.submit(
+            "pyspark",
             cmd,
-            check=False,
-            capture_output=True,
-            text=True,
-            cwd=str(PROJECT_ROOT),
+            script=relpath(job),
+            timeout_sec=req.timeout_sec,
+            meta={"cwd": str(PROJECT_ROOT), "args": args, "run_id": req.run_id},
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"RUN_FAIL: {e}")
-
-    # Evidence write
-    ev_dir = EVIDENCE_ROOT / "pyspark_runs"
-    ev_dir.mkdir(parents=True, exist_ok=True)
-    ts = now_iso()
-    base = prune_filename(job.name, default="job.py")
-    out_path = ev_dir / f"{ts.replace(':','').replace('-','').replace('Z','Z')}_{base}.json"
-    payload = {
-        "ts": ts,
-        "run_id": req.run_id or f"PYSPARK_RUN_{ts.replace('-', '').replace(':', '')}",
-        "script": relpath(job),
-        "rc": proc.returncode,
-        "stdout": _truncate(proc.stdout or ""),
-        "stderr": _truncate(proc.stderr or ""),
+    except QueueFull:
+        raise HTTPException(status_code=429, detail="QUEUE_FULL")
+    if not req.wait:
+        return {"ok": True, "job_id": row["id"], "status": row["status"], "job": _pyspark_job_view(row, 0)}
+    row = q.wait(row["id"])
+    return {
+        "ok": row["status"] == "succeeded",
+        "rc": row.get("rc"),
+        "job_id": row["id"],
+        "status": row["status"],
+        "evidence": (row.get("meta") or {}).get("evidence"),
     }
+
+
+@app.get("/api/mcp/pyspark/jobs/{job_id}")
+def pyspark_job_status(job_id: str, log_bytes: int = 8000) -> Dict[str, Any]:
+    """Job row + the tail of its stdout/stderr logs (log_bytes=0 → row only)."""
     try:
-        out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    except Exception as e:
-        # still return result even if evidence write fails
-        return {
-            "ok": proc.returncode == 0,
-            "rc": proc.returncode,
-            "error": f"EVIDENCE_WRITE_FAIL: {e}",
-            "stdout": _truncate(proc.stdout or ""),
-            "stderr": _truncate(proc.stderr or ""),
-        }
+        row = _pyspark_jobs().get(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail="JOB_NOT_FOUND")
+    return {"ok": True, "job": _pyspark_job_view(row, max(0, min(int(log_bytes), 1 << 20)))}
+
 
+@app.post("/api/mcp/pyspark/jobs/{job_id}/cancel")
+def pyspark_job_cancel(job_id: str) -> Dict[str, Any]:
+    try:
+        row = _pyspark_jobs().cancel(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail="JOB_NOT_FOUND")
+    return {"ok": True, "job": _pyspark_job_view(row, 0)}
+
+
+@app.get("/api/mcp/pyspark/queue")
+def pyspark_queue_status(limit: int = 20) -> Dict[str, Any]:
+    q = _pyspark_jobs()
     return {
-        "ok": proc.returncode == 0,
-        "rc": proc.returncode,
-        "evidence": relpath(out_path),
+        "ok": True,
+        "queue": q.status(),
+        "recent": [_pyspark_job_view(r, 0) for r in q.list("pyspark", max(1, min(int(limit), 200)))],
     }
 
 
+@app.on_event("shutdown")
+def _stop_pyspark_jobs() -> None:
+    PYSPARK_JOBS.stop()
+
+
 @app.get("/api/mcp/pyspark/latest")
 def pyspark_latest() -> Dict[str, Any]:
-    ev_dir = EVIDENCE_ROOT / "pyspark_runs"
-    try:
-        ev_dir.mkdir(parents=True, exist_ok=True)
-        files = sorted(ev_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"SCAN_FAIL: {e}")
-    if not files:
-        raise HTTPException(status_code=404, detail="NO_RUNS")
-    fp = files[0]
+    ev_dir = PYSPARK_EVIDENCE_DIR
+    fp = resolve_latest(ev_dir)
+    if fp is None:
+        # Pointer missing (pre-pointer runs) → legacy mtime scan
+        try:
+            ev_dir.mkdir(parents=True, exist_ok=True)
+            files = sorted(
+                (p for p in ev_dir.glob("*.json") if not p.name.startswith("_")),
+                key=lambda p: p.stat().st_mtime,
+                reverse=True,
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"SCAN_FAIL: {e}")
+        if not files:
+            raise HTTPException(status_code=404, detail="NO_RUNS")
+        fp = files[0]
     try:
         data = json.loads(fp.read_text(encoding="utf-8"))
     except Exception:
@@ -664,8 +793,99 @@ def _site_base_url() -> str:
     return "https://hub.example.com"
 
 
+# ---------- Content v2 — render cache (app/render_cache.py) ----------
+# Sitemaps/JSON-LD are rendered once per (endpoint, params, content revision) and served as
+# precomputed identity/gzip/brotli bytes with ETag + Last-Modified (304 on revalidation).
+RENDER_CACHE = RenderCache(max_bytes=int(ENV.get("RENDER_CACHE_MAX_MB") or 64) << 20)
+RENDER_MAX_AGE = int(ENV.get("RENDER_CACHE_MAX_AGE") or 60)
+RENDER_REV_TTL_SEC = 1.0  # other workers see a new revision within this window
+_render_rev: Dict[str, Any] = {"rev": None, "at": 0.0}
+
+
+def _content_rev(fresh: bool = False) -> str:
+    """Content-store revision for render keys ('sqlite:12'); -1 when the store is unreadable."""
+    now = time.monotonic()
+    if not fresh and _render_rev["rev"] is not None and now - _render_rev["at"] < RENDER_REV_TTL_SEC:
+        return _render_rev["rev"]
+    kind = _content_db_kind()
+    try:
+        if kind == "sqlite":
+            con = _sqlite_conn()
+            try:
+                rev = content_fts.sqlite_content_rev(con)
+            finally:
+                con.close()
+        else:
+            with _pg_conn() as con:
+                rev = content_fts.pg_content_rev(con.cursor())
+    except Exception:
+        rev = -1
+    _render_rev.update(rev=f"{kind}:{rev}", at=now)
+    return _render_rev["rev"]
+
+
+def _render_invalidate() -> int:
+    """Drop every rendered sitemap/JSON-LD (no revalidation worker running)."""
+    _render_rev.update(rev=None, at=0.0)
+    return RENDER_CACHE.invalidate()
+
+
+def _json_bytes(obj: Any) -> bytes:
+    # same bytes JSONResponse would produce
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _rendered(
+    request: Request,
+    endpoint: str,
+    params: Dict[str, Any],
+    chunks,
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+    last_modified=None,
+    save_as: Optional[Path] = None,
+) -> Response:
+    """Serve `chunks()` (iterable of bytes) through RENDER_CACHE. `save_as` keeps the evidence
+    behaviour of ?save=true (the cached body is written, not re-rendered)."""
+    norm = []
+    for k, v in sorted(params.items()):
+        if v is None:
+            continue
+        v = str(v)
+        norm.append((k, v if len(v) <= 256 else hashlib.sha256(v.encode("utf-8")).hexdigest()))
+    key = (endpoint, tuple(norm), _content_rev())
+    entry, hit = RENDER_CACHE.get_or_render(
+        key, lambda: build_entry(chunks(), media_type, last_modified, headers)
+    )
+    status, body, hdrs = response_parts(entry, request.headers, RENDER_MAX_AGE)
+    hdrs["X-Render-Cache"] = "hit" if hit else "miss"
+    if save_as is not None:
+        try:
+            if media_type.endswith("json"):  # evidence stays pretty-printed
+                save_as.write_text(json.dumps(json.loads(entry.body), ensure_ascii=False, indent=2), encoding="utf-8")
+            else:
+                save_as.write_bytes(entry.body)
+            hdrs["X-Evidence-Path"] = relpath(save_as)
+        except Exception:
+            pass
+    if status == 304:
+        return Response(status_code=304, headers=hdrs)
+    return Response(content=body, media_type=media_type, headers=hdrs)
+
+
+def _evidence_file(root: Path, suffix: str) -> Path:
+    ts = now_iso().replace(":", "").replace("-", "")
+    return root / f"{ts}_{suffix}"
+
+
+@app.get("/api/v2/content/render/stats")
+def content_render_stats() -> Dict[str, Any]:
+    return {"ok": True, "data": {**RENDER_CACHE.stats(), "rev": _content_rev()}, "meta": {"ts": now_iso()}}
+
+
 @app.get("/api/v2/content/jsonld/breadcrumbs")
 def content_jsonld_breadcrumbs(
+    request: Request,
     region_name: Optional[str] = None,
     region_slug: Optional[str] = None,
     category_name: Optional[str] = None,
@@ -676,54 +896,51 @@ def content_jsonld_breadcrumbs(
     save: Optional[bool] = False,
 ) -> Any:
     base = (site_base or _site_base_url()).rstrip("/")
-    # Build list elements, skipping empty fields gracefully
-    items: List[Dict[str, Any]] = []
-    items.append({"@type": "ListItem", "position": 1, "name": "홈", "item": f"{base}/"})
-    if region_name and region_slug:
-        items.append(
-            {
-                "@type": "ListItem",
-                "position": len(items) + 1,
-                "name": region_name,
-                "item": f"{base}/areas/{region_slug}/",
-            }
-        )
-    if category_name and category_slug:
-        items.append(
-            {
-                "@type": "ListItem",
-                "position": len(items) + 1,
-                "name": category_name,
-                "item": f"{base}/{category_slug}/",
-            }
-        )
-    if title and canonical:
-        items.append(
-            {
-                "@type": "ListItem",
-                "position": len(items) + 1,
-                "name": title,
-                "item": canonical,
-            }
-        )
-
-    jsonld = {"@context": "https://schema.org", "@type": "BreadcrumbList", "itemListElement": items}
-
-    # Optionally save to evidence
-    saved_path: Optional[Path] = None
-    if save:
-        ts = now_iso().replace(":", "").replace("-", "")
-        fname = f"{ts}_breadcrumbs.json"
-        saved_path = CONTENT_JSONLD_DIR / fname
-        try:
-            saved_path.write_text(json.dumps(jsonld, ensure_ascii=False, indent=2), encoding="utf-8")
-        except Exception:
-            saved_path = None
 
-    # Return as application/ld+json
-    if saved_path is not None:
-        return JSONResponse(content=jsonld, media_type="application/ld+json", headers={"X-Evidence-Path": relpath(saved_path)})
-    return JSONResponse(content=jsonld, media_type="application/ld+json")
+    def render() -> List[bytes]:
+        # Build list elements, skipping empty fields gracefully
+        items: List[Dict[str, Any]] = []
+        items.append({"@type": "ListItem", "position": 1, "name": "홈", "item": f"{base}/"})
+        if region_name and region_slug:
+            items.append(
+                {
+                    "@type": "ListItem",
+                    "position": len(items) + 1,
+                    "name": region_name,
+                    "item": f"{base}/areas/{region_slug}/",
+                }
+            )
+        if category_name and category_slug:
+            items.append(
+                {
+                    "@type": "ListItem",
+                    "position": len(items) + 1,
+                    "name": category_name,
+                    "item": f"{base}/{category_slug}/",
+                }
+            )
+        if title and canonical:
+            items.append(
+                {
+                    "@type": "ListItem",
+                    "position": len(items) + 1,
+                    "name": title,
+                    "item": canonical,
+                }
+            )
+        jsonld = {"@context": "https://schema.org", "@type": "BreadcrumbList", "itemListElement": items}
+        return [_json_bytes(jsonld)]
+
+    # Return as application/ld+json (render cache); optionally save to evidence
+    return _rendered(
+        request,
+        "jsonld/breadcrumbs",
+        {"base": base, "region_name": region_name, "region_slug": region_slug, "category_name": category_name,
+         "category_slug": category_slug, "title": title, "canonical": canonical},
+        render,
+        "application/ld+json",
+        save_as=_evidence_file(CONTENT_JSONLD_DIR, "breadcrumbs.json") if save else None,
+    )
 
 
 # ---------- Content v2 — Sitemap generators ----------
@@ -734,6 +951,12 @@ try:
 except Exception:
     pass
 
+_SITEMAP_HEAD = "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+_SITEMAP_HEADERS = {"Content-Type": "application/xml; charset=utf-8"}
+SITEMAP_ITEM_PATH = ENV.get("SITEMAP_ITEM_PATH") or "items/{slug}/"  # item page, relative to site base
+SITEMAP_ITEMS_URL = ENV.get("SITEMAP_ITEMS_URL") or "sitemap-items-{part}.xml"  # public name of each part
+SITEMAP_FETCH = 2000
+
 
 def _xml_escape(text: str) -> str:
     return (
@@ -745,13 +968,28 @@ def _xml_escape(text: str) -> str:
     )
 
 
+def _sitemap_url(loc: str, lastmod: Optional[str], changefreq: Optional[str]) -> str:
+    out = f"  <url>\n    <loc>{_xml_escape(loc)}</loc>\n"
+    if lastmod:
+        out += f"    <lastmod>{_xml_escape(lastmod)}</lastmod>\n"
+    if changefreq:
+        out += f"    <changefreq>{_xml_escape(str(changefreq))}</changefreq>\n"
+    return out + "  </url>\n"
+
+
+def _sitemap_parts(n_urls: int) -> int:
+    return max(1, -(-n_urls // SITEMAP_MAX_URLS))
+
+
 @app.get("/api/v2/content/sitemap/areas")
 def content_sitemap_areas(
+    request: Request,
     paths: Optional[str] = None,
     areas: Optional[str] = None,
     site_base: Optional[str] = None,
     lastmod: Optional[str] = None,
     changefreq: Optional[str] = "daily",
+    part: int = 0,
     save: Optional[bool] = False,
 ) -> Any:
     """Generate a simple sitemap.xml for area pages.
@@ -762,6 +1000,7 @@ def content_sitemap_areas(
       - site_base: base URL (default ENV SITE_BASE_URL or https://hub.example.com)
       - lastmod: YYYY-MM-DD (default: today UTC)
       - changefreq: sitemap changefreq value (default: daily)
+      - part: 0-based file index when there are more than 50,000 URLs (X-Sitemap-Parts header)
       - save: if true, save XML under status/evidence/content/sitemaps_runs
     """
     base = (site_base or _site_base_url()).rstrip("/")
@@ -791,36 +1030,116 @@ def content_sitemap_areas(
     except Exception:
         lm = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
-    # Build XML
-    lines: List[str] = [
-        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>",
-        "<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">",
-    ]
-    for r in rels:
-        url = f"{base}/{r.lstrip('/')}"
-        lines.append("  <url>")
-        lines.append(f"    <loc>{_xml_escape(url)}</loc>")
-        lines.append(f"    <lastmod>{_xml_escape(lm)}</lastmod>")
-        if changefreq:
-            lines.append(f"    <changefreq>{_xml_escape(str(changefreq))}</changefreq>")
-        lines.append("  </url>")
-    lines.append("</urlset>")
-    xml_text = "\n".join(lines) + "\n"
-
-    saved_path: Optional[Path] = None
-    if save:
-        ts = now_iso().replace(":", "").replace("-", "")
-        fname = f"{ts}_areas.xml"
-        saved_path = CONTENT_SITEMAP_DIR / fname
+    # split at the protocol limit: one <urlset> per 50k URLs
+    n_parts = _sitemap_parts(len(rels))
+    if part < 0 or part >= n_parts:
+        raise HTTPException(status_code=404, detail="NO_SUCH_PART")
+    window = rels[part * SITEMAP_MAX_URLS : (part + 1) * SITEMAP_MAX_URLS]
+
+    def render():
+        yield (_SITEMAP_HEAD + "<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n").encode("utf-8")
+        for r in window:
+            yield _sitemap_url(f"{base}/{r.lstrip('/')}", lm, changefreq).encode("utf-8")
+        yield b"</urlset>\n"
+
+    return _rendered(
+        request,
+        "sitemap/areas",
+        {"base": base, "rels": ",".join(rels), "lastmod": lm, "changefreq": changefreq, "part": part},
+        render,
+        "application/xml",
+        headers={**_SITEMAP_HEADERS, "X-Sitemap-Parts": str(n_parts)},
+        save_as=_evidence_file(CONTENT_SITEMAP_DIR, "areas.xml") if save else None,
+    )
+
+
+def _content_item_count() -> int:
+    if _content_db_kind() == "sqlite":
+        con = _sqlite_conn()
         try:
-            saved_path.write_text(xml_text, encoding="utf-8")
-        except Exception:
-            saved_path = None
+            return int(con.execute("SELECT count(*) FROM content_items").fetchone()[0])
+        finally:
+            con.close()
+    with _pg_conn() as con:
+        cur = con.cursor()
+        cur.execute("SELECT count(*) FROM content.items")
+        return int(cur.fetchone()[0])
+
+
+def _iter_content_item_rows(offset: int, limit: int) -> Iterable[Tuple[str, Optional[float]]]:
+    """(slug, updated_at epoch seconds) ordered by slug, streamed in SITEMAP_FETCH batches
+    (PG: server-side cursor) so a full part never sits in memory as rows."""
+    if _content_db_kind() == "sqlite":
+        con = sqlite3.connect(_sqlite_path())
+        try:
+            cur = con.execute(
+                "SELECT slug, updated_at FROM content_items ORDER BY slug LIMIT ? OFFSET ?", (limit, offset)
+            )
+            while True:
+                rows = cur.fetchmany(SITEMAP_FETCH)
+                if not rows:
+                    break
+                for slug, ms in rows:
+                    yield slug, (ms / 1000.0 if ms else None)
+        finally:
+            con.close()
+        return
+    with _pg_conn() as con:
+        cur = con.cursor(name="gg_sitemap_items")
+        cur.itersize = SITEMAP_FETCH
+        cur.execute(
+            "SELECT slug, extract(epoch FROM updated_at) FROM content.items ORDER BY slug LIMIT %s OFFSET %s",
+            (limit, offset),
+        )
+        for slug, sec in cur:
+            yield slug, (float(sec) if sec is not None else None)
+        cur.close()
 
-    headers = {"Content-Type": "application/xml; charset=utf-8"}
-    if saved_path is not None:
-        headers["X-Evidence-Path"] = relpath(saved_path)
-    return Response(content=xml_text, media_type="application/xml", headers=headers)
+
+@app.get("/api/v2/content/sitemap/items")
+def content_sitemap_items(
+    request: Request,
+    part: int = 0,
+    site_base: Optional[str] = None,
+    changefreq: Optional[str] = "weekly",
+    save: Optional[bool] = False,
+) -> Any:
+    """One <urlset> of content items (≤ 50,000 URLs, ordered by slug) straight from the content
+    store. Parts are listed by /sitemap/index as SITEMAP_ITEMS_URL; lastmod = item updated_at,
+    Last-Modified = newest item in the part."""
+    kind = _content_db_kind()
+    _require_schema(kind)
+    if part < 0:
+        raise HTTPException(status_code=404, detail="NO_SUCH_PART")
+    base = (site_base or _site_base_url()).rstrip("/")
+    newest: Dict[str, float] = {"ts": 0.0}
+
+    def render():
+        newest["ts"] = 0.0  # renderers are replayed by the revalidation worker
+        yield (_SITEMAP_HEAD + "<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n").encode("utf-8")
+        n = 0
+        for slug, ts in _iter_content_item_rows(part * SITEMAP_MAX_URLS, SITEMAP_MAX_URLS):
+            n += 1
+            lm = None
+            if ts:
+                newest["ts"] = max(newest["ts"], ts)
+                lm = datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+            loc = f"{base}/{SITEMAP_ITEM_PATH.format(slug=urllib.parse.quote(slug, safe='/'))}"
+            yield _sitemap_url(loc, lm, changefreq).encode("utf-8")
+        if n == 0 and part > 0:
+            raise HTTPException(status_code=404, detail="NO_SUCH_PART")  # not cached
+        yield b"</urlset>\n"
+
+    return _rendered(
+        request,
+        "sitemap/items",
+        {"base": base, "part": part, "changefreq": changefreq},
+        render,
+        "application/xml",
+        headers=_SITEMAP_HEADERS,
+        last_modified=lambda: newest["ts"] or None,
+        save_as=_evidence_file(CONTENT_SITEMAP_DIR, f"items_{part}.xml") if save else None,
+    )
 
 
 # ---------- Content v2 — JSON‑LD: Article & LocalBusiness ----------
@@ -831,6 +1150,7 @@ CONTENT_JSONLD_BUSINESS_DIR = CONTENT_JSONLD_DIR  # reuse dir
 
 @app.get("/api/v2/content/jsonld/article")
 def content_jsonld_article(
+    request: Request,
     headline: Optional[str] = None,
     description: Optional[str] = None,
     author_name: Optional[str] = None,
@@ -843,41 +1163,41 @@ def content_jsonld_article(
 ) -> Any:
     base = _site_base_url()
     url = canonical or base
-    obj: Dict[str, Any] = {
-        "@context": "https://schema.org",
-        "@type": "Article",
-        "headline": headline or "",
-        "description": description or "",
-        "url": url,
-    }
-    if image:
-        obj["image"] = image
-    if author_name:
-        obj["author"] = {"@type": "Person", "name": author_name}
-    if date_published:
-        obj["datePublished"] = date_published
-    if date_modified:
-        obj["dateModified"] = date_modified
-    if site_name:
-        obj["publisher"] = {"@type": "Organization", "name": site_name}
-
-    saved_path: Optional[Path] = None
-    if save:
-        ts = now_iso().replace(":", "").replace("-", "")
-        fname = f"{ts}_article.json"
-        saved_path = CONTENT_JSONLD_ARTICLE_DIR / fname
-        try:
-            saved_path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
-        except Exception:
-            saved_path = None
 
-    if saved_path is not None:
-        return JSONResponse(content=obj, media_type="application/ld+json", headers={"X-Evidence-Path": relpath(saved_path)})
-    return JSONResponse(content=obj, media_type="application/ld+json")
+    def render() -> List[bytes]:
+        obj: Dict[str, Any] = {
+            "@context": "https://schema.org",
+            "@type": "Article",
+            "headline": headline or "",
+            "description": description or "",
+            "url": url,
+        }
+        if image:
+            obj["image"] = image
+        if author_name:
+            obj["author"] = {"@type": "Person", "name": author_name}
+        if date_published:
+            obj["datePublished"] = date_published
+        if date_modified:
+            obj["dateModified"] = date_modified
+        if site_name:
+            obj["publisher"] = {"@type": "Organization", "name": site_name}
+        return [_json_bytes(obj)]
+
+    return _rendered(
+        request,
+        "jsonld/article",
+        {"url": url, "headline": headline, "description": description, "author_name": author_name,
+         "date_published": date_published, "date_modified": date_modified, "image": image, "site_name": site_name},
+        render,
+        "application/ld+json",
+        save_as=_evidence_file(CONTENT_JSONLD_ARTICLE_DIR, "article.json") if save else None,
+    )
 
 
 @app.get("/api/v2/content/jsonld/localbusiness")
 def content_jsonld_local_business(
+    request: Request,
     name: Optional[str] = None,
     telephone: Optional[str] = None,
     street: Optional[str] = None,
@@ -892,58 +1212,60 @@ def content_jsonld_local_business(
     same_as: Optional[str] = None,  # comma-separated URLs
     save: Optional[bool] = False,
 ) -> Any:
-    obj: Dict[str, Any] = {
-        "@context": "https://schema.org",
-        "@type": "LocalBusiness",
-        "name": name or "",
-    }
-    if telephone:
-        obj["telephone"] = telephone
-    if url:
-        obj["url"] = url
-    addr: Dict[str, Any] = {"@type": "PostalAddress"}
-    if street:
-        addr["streetAddress"] = street
-    if locality:
-        addr["addressLocality"] = locality
-    if region:
-        addr["addressRegion"] = region
-    if postal_code:
-        addr["postalCode"] = postal_code
-    if country:
-        addr["addressCountry"] = country
-    if len(addr) > 1:
-        obj["address"] = addr
-    if lat is not None and lon is not None:
-        obj["geo"] = {"@type": "GeoCoordinates", "latitude": lat, "longitude": lon}
-    if opening_hours:
-        obj["openingHours"] = opening_hours
-    if same_as:
-        arr = [s.strip() for s in same_as.split(",") if s.strip()]
-        if arr:
-            obj["sameAs"] = arr
-
-    saved_path: Optional[Path] = None
-    if save:
-        ts = now_iso().replace(":", "").replace("-", "")
-        fname = f"{ts}_localbusiness.json"
-        saved_path = CONTENT_JSONLD_BUSINESS_DIR / fname
-        try:
-            saved_path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
-        except Exception:
-            saved_path = None
-
-    if saved_path is not None:
-        return JSONResponse(content=obj, media_type="application/ld+json", headers={"X-Evidence-Path": relpath(saved_path)})
-    return JSONResponse(content=obj, media_type="application/ld+json")
+    def render() -> List[bytes]:
+        obj: Dict[str, Any] = {
+            "@context": "https://schema.org",
+            "@type": "LocalBusiness",
+            "name": name or "",
+        }
+        if telephone:
+            obj["telephone"] = telephone
+        if url:
+            obj["url"] = url
+        addr: Dict[str, Any] = {"@type": "PostalAddress"}
+        if street:
+            addr["streetAddress"] = street
+        if locality:
+            addr["addressLocality"] = locality
+        if region:
+            addr["addressRegion"] = region
+        if postal_code:
+            addr["postalCode"] = postal_code
+        if country:
+            addr["addressCountry"] = country
+        if len(addr) > 1:
+            obj["address"] = addr
+        if lat is not None and lon is not None:
+            obj["geo"] = {"@type": "GeoCoordinates", "latitude": lat, "longitude": lon}
+        if opening_hours:
+            obj["openingHours"] = opening_hours
+        if same_as:
+            arr = [s.strip() for s in same_as.split(",") if s.strip()]
+            if arr:
+                obj["sameAs"] = arr
+        return [_json_bytes(obj)]
+
+    return _rendered(
+        request,
+        "jsonld/localbusiness",
+        {"name": name, "telephone": telephone, "street": street, "locality": locality, "region": region,
+         "postal_code": postal_code, "country": country, "lat": lat, "lon": lon, "url": url,
+         "opening_hours": opening_hours, "same_as": same_as},
+        render,
+        "application/ld+json",
+        save_as=_evidence_file(CONTENT_JSONLD_BUSINESS_DIR, "localbusiness.json") if save else None,
+    )
 
 
 @app.get("/api/v2/content/sitemap/index")
 def content_sitemap_index(
+    request: Request,
     sitemaps: Optional[str] = None,  # comma-separated absolute or relative URLs
     site_base: Optional[str] = None,
     save: Optional[bool] = False,
 ) -> Any:
+    """Sitemap index. Without `sitemaps`, lists the area/category examples plus one
+    SITEMAP_ITEMS_URL entry per 50,000 content items (count read on render, i.e. once per revision)."""
     base = (site_base or _site_base_url()).rstrip("/")
     urls: List[str] = []
     if isinstance(sitemaps, str) and sitemaps.strip():
@@ -955,38 +1277,35 @@ def content_sitemap_index(
                 urls.append(x2)
             else:
                 urls.append(f"{base}/{x2.lstrip('/')}")
-    if not urls:
-        # Fallback examples
-        urls = [
-            f"{base}/sitemap-areas.xml",
-            f"{base}/sitemap-categories.xml",
-        ]
 
-    lines: List[str] = [
-        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>",
-        "<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">",
-    ]
-    for u in urls:
-        lines.append("  <sitemap>")
-        lines.append(f"    <loc>{_xml_escape(u)}</loc>")
-        lines.append("  </sitemap>")
-    lines.append("</sitemapindex>")
-    xml_text = "\n".join(lines) + "\n"
-
-    saved_path: Optional[Path] = None
-    if save:
-        ts = now_iso().replace(":", "").replace("-", "")
-        fname = f"{ts}_sitemap_index.xml"
-        saved_path = CONTENT_SITEMAP_DIR / fname
-        try:
-            saved_path.write_text(xml_text, encoding="utf-8")
-        except Exception:
-            saved_path = None
-
-    headers = {"Content-Type": "application/xml; charset=utf-8"}
-    if saved_path is not None:
-        headers["X-Evidence-Path"] = relpath(saved_path)
-    return Response(content=xml_text, media_type="application/xml", headers=headers)
+    def render():
+        locs = urls
+        if not locs:
+            # Fallback examples + item sitemaps split at the 50k limit
+            locs = [
+                f"{base}/sitemap-areas.xml",
+                f"{base}/sitemap-categories.xml",
+            ]
+            try:
+                n_items = _content_item_count()
+            except Exception:
+                n_items = 0
+            if n_items:
+                locs += [f"{base}/{SITEMAP_ITEMS_URL.format(part=i)}" for i in range(_sitemap_parts(n_items))]
+        yield (_SITEMAP_HEAD + "<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n").encode("utf-8")
+        for u in locs:
+            yield f"  <sitemap>\n    <loc>{_xml_escape(u)}</loc>\n  </sitemap>\n".encode("utf-8")
+        yield b"</sitemapindex>\n"
+
+    return _rendered(
+        request,
+        "sitemap/index",
+        {"base": base, "urls": ",".join(urls)},
+        render,
+        "application/xml",
+        headers=_SITEMAP_HEADERS,
+        save_as=_evidence_file(CONTENT_SITEMAP_DIR, "sitemap_index.xml") if save else None,
+    )
 
 @app.get("/api/delta/latest")
 def delta_latest(
@@ -1001,17 +1320,7 @@ def delta_latest(
     Filters: lens (optional), tags (comma list), severity(info|warn|err), limit(1..100)
     """
     base = EVIDENCE_ROOT / "ops" / "delta_runs"
-    try:
-        base.mkdir(parents=True, exist_ok=True)
-        dirs = [p for p in base.iterdir() if p.is_dir()]
-    except Exception:
-        dirs = []
-    if not dirs:
-        raise HTTPException(status_code=404, detail="NO_SNAPSHOT")
-    latest_dir = sorted(dirs, key=lambda p: p.name, reverse=True)[0]
-    fp = latest_dir / "delta.json"
-    if not fp.exists():
-        raise HTTPException(status_code=404, detail="SNAPSHOT_MISSING")
+    latest_dir, fp = _latest_snapshot(base, "delta.json")
     try:
         raw = json.loads(fp.read_text(encoding="utf-8"))
     except Exception:
@@ -1069,17 +1378,7 @@ def alignment_latest(
     Filters: lens (optional), tags (comma list), limit(1..100)
     """
     base = EVIDENCE_ROOT / "ops" / "alignment_runs"
-    try:
-        base.mkdir(parents=True, exist_ok=True)
-        dirs = [p for p in base.iterdir() if p.is_dir()]
-    except Exception:
-        dirs = []
-    if not dirs:
-        raise HTTPException(status_code=404, detail="NO_SNAPSHOT")
-    latest_dir = sorted(dirs, key=lambda p: p.name, reverse=True)[0]
-    fp = latest_dir / "alignment.json"
-    if not fp.exists():
-        raise HTTPException(status_code=404, detail="SNAPSHOT_MISSING")
+    latest_dir, fp = _latest_snapshot(base, "alignment.json")
     try:
         raw = json.loads(fp.read_text(encoding="utf-8"))
     except Exception:
@@ -1167,6 +1466,66 @@ def _sqlite_conn() -> sqlite3.Connection:
     conn.row_factory = sqlite3.Row
     return conn
 
+
+# ---------- Schema migrations (db/migrations/<engine>, app/migrations.py) ----------
+_MIGRATION_STATUS: Dict[str, Any] = {}
+
+
+def _pg_schema_version() -> int:
+    with _pg_conn() as con:
+        return migrations.pg_version(con)
+
+
+def _require_schema(kind: str = "sqlite") -> None:
+    """Assert the DB is migrated (cached per process). Migrations run at startup or via the CLI,
+    never inside a request."""
+    try:
+        if kind == "sqlite":
+            migrations.require("sqlite", _sqlite_path(), lambda: migrations.sqlite_version(_sqlite_path()))
+        else:
+            migrations.require("postgres", _pg_db_key(), _pg_schema_version)
+    except migrations.SchemaOutdated as e:
+        _MIGRATION_STATUS[kind + "_outdated"] = str(e)
+        raise HTTPException(status_code=503, detail="SCHEMA_OUTDATED")
+
+
+@app.on_event("startup")
+def _migrate_on_startup() -> None:
+    """Apply pending migrations once per process (GG_MIGRATE_ON_STARTUP=0 → CLI only)."""
+    if str(ENV.get("GG_MIGRATE_ON_STARTUP") or "1").strip().lower() in {"0", "false", "no", "off"}:
+        _MIGRATION_STATUS["skipped"] = True
+        return
+    try:
+        st = migrations.migrate_sqlite(_sqlite_path())
+        _MIGRATION_STATUS.pop("sqlite_outdated", None)
+        _MIGRATION_STATUS["sqlite"] = {k: st[k] for k in ("current", "latest", "ran", "drift")}
+    except Exception as e:
+        _MIGRATION_STATUS["sqlite"] = {"error": str(e)}
+    if _content_db_kind() == "pg":
+        try:
+            with _pg_conn() as con:
+                st = migrations.migrate_pg(con, _pg_db_key())
+            _MIGRATION_STATUS["postgres"] = {k: st[k] for k in ("current", "latest", "ran", "drift")}
+        except Exception as e:
+            _MIGRATION_STATUS["postgres"] = {"error": str(e)}
+
+
+@app.get("/api/v2/db/migrations")
+def db_migrations_status() -> Dict[str, Any]:
+    """Applied/pending/drifted migrations per engine + what this process ran at startup."""
+    data: Dict[str, Any] = {"startup": _MIGRATION_STATUS}
+    try:
+        data["sqlite"] = migrations.sqlite_status(_sqlite_path())
+    except Exception as e:
+        data["sqlite"] = {"error": str(e)}
+    if _content_db_kind() == "pg":
+        try:
+            with _pg_conn() as con:
+                data["postgres"] = migrations.pg_status(con)
+        except Exception as e:
+            data["postgres"] = {"error": str(e)}
+    return {"ok": True, "data": data, "meta": {"ts": now_iso(), "db": _sqlite_path()}}
+
 THREAD_TEXT_MAX = 16 * 1024       # 16KB per input text
 THREAD_LINE_MAX = 64 * 1024       # 64KB per JSONL line
 THREAD_FILE_MAX = 50 * 1024 * 1024  # 50MB per thread file cap
@@ -1512,6 +1871,14 @@ def threads_recent_api(limit: int = 20) -> Dict[str, Any]:
 
 
 # ---------------- v2 (SQLite-backed) Thread APIs ----------------
+# Upsert (not INSERT OR REPLACE): REPLACE deletes the old row without firing the FTS delete trigger.
+_MESSAGES_UPSERT_SQL = (
+    "INSERT INTO messages(id, thread_id, role, content, meta_json, created_at) VALUES(?,?,?,?,?,?)"
+    " ON CONFLICT(id) DO UPDATE SET thread_id=excluded.thread_id, role=excluded.role,"
+    " content=excluded.content, meta_json=excluded.meta_json, created_at=excluded.created_at"
+)
+
+
 @app.get("/api/v2/threads/recent")
 def v2_threads_recent(limit: int = 50) -> Dict[str, Any]:
     try:
@@ -1542,6 +1909,24 @@ def v2_threads_recent(limit: int = 50) -> Dict[str, Any]:
         return {"ok": False, "error": str(e), "data": {"items": []}, "meta": {"ts": now_iso()}}
 
 
+@app.get("/api/v2/threads/search")
+def v2_threads_search(q: str, size: int = 20, per_thread: int = 3, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Full-text search over thread titles and messages, grouped by thread (best hit first)."""
+    q = (q or "").strip()
+    if not q:
+        raise HTTPException(status_code=422, detail="Q_REQUIRED")
+    size = max(1, min(100, int(size or 20)))
+    per_thread = max(1, min(10, int(per_thread or 3)))
+    _require_schema("sqlite")
+    try:
+        with _sqlite_conn() as con:
+            res = thread_fts.search_threads(con, _sqlite_path(), q, size=size, per_thread=per_thread, cursor=cursor)
+        mode = res.pop("mode")
+        return {"ok": True, "data": res, "meta": {"ts": now_iso(), "mode": mode, "db": _sqlite_path()}}
+    except Exception as e:
+        return {"ok": False, "error": str(e), "data": {"items": []}, "meta": {"ts": now_iso()}}
+
+
 @app.get("/api/v2/threads/read")
 def v2_threads_read(id: str) -> Dict[str, Any]:
     try:
@@ -1583,6 +1968,7 @@ def v2_threads_append(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
         raise HTTPException(status_code=422, detail="INVALID_ROLE_OR_TEXT")
     meta = body.get("meta") or {}
     now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+    _require_schema("sqlite")
     try:
         with _sqlite_conn() as con:
             con.execute(
@@ -1590,7 +1976,7 @@ def v2_threads_append(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
                 (tid, None, None, now_ms, now_ms),
             )
             con.execute(
-                "INSERT OR REPLACE INTO messages(id, thread_id, role, content, meta_json, created_at) VALUES(?,?,?,?,?,?)",
+                _MESSAGES_UPSERT_SQL,
                 (f"{tid}:{now_ms}", tid, role, text, json.dumps(meta, ensure_ascii=False), now_ms),
             )
             con.execute("UPDATE threads SET updated_at = ? WHERE id = ?", (now_ms, tid))
@@ -1606,6 +1992,7 @@ def v2_threads_import(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
     if not isinstance(threads, list) or not threads:
         raise HTTPException(status_code=422, detail="THREADS_REQUIRED")
     imported = 0
+    _require_schema("sqlite")
     try:
         with _sqlite_conn() as con:
             con.execute("PRAGMA foreign_keys=ON;")
@@ -1631,7 +2018,7 @@ def v2_threads_import(body: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
                         ts_ms = now_ms
                     meta = msg.get("meta") or {}
                     con.execute(
-                        "INSERT OR REPLACE INTO messages(id, thread_id, role, content, meta_json, created_at) VALUES(?,?,?,?,?,?)",
+                        _MESSAGES_UPSERT_SQL,
                         (f"{tid}:{ts_ms}", tid, role, text, json.dumps(meta, ensure_ascii=False), ts_ms),
                     )
                 con.execute("UPDATE threads SET updated_at = ? WHERE id = ?", (now_ms, tid))
@@ -1889,23 +2276,24 @@ def threads_import_api(body: ThreadsImportRequest = Body(...)) -> Dict[str, Any]
 
 # ---------- Routes ----------
 
+ROADMAP_MD = PROJECT_ROOT / "status" / "roadmap" / "BT11_to_BT21_Compass_ko.md"
+_ROADMAP_CACHE: Dict[str, Any] = {"sig": None, "manifest": None}
 
-@app.get("/api/roadmap/progress")
-def roadmap_progress() -> Dict[str, Any]:
-    """
-    Merge plan (BT/ST manifest in roadmap MD) with checkpoint tail into a human-friendly progress view.
-    Adds:
-    - Per-ST timestamps: start_ts (first START/시작), pass_ts (first PASS)
-    - Evidence aggregation per ST (list of latest-known evidence refs)
-    - round_map: planned ST id list per round (R1/R2/R3)
-    """
-    # 1) Load manifest JSON from roadmap MD
-    md_path = PROJECT_ROOT / "status" / "roadmap" / "BT11_to_BT21_Compass_ko.md"
+
+def _roadmap_manifest() -> Dict[str, Any]:
+    """BT/ST manifest embedded in the roadmap MD, re-parsed only when the file changes."""
     start_tag = "<!--GG_DATA:BT_ST_MANIFEST-->"
     end_tag = "<!--/GG_DATA:BT_ST_MANIFEST-->"
+    try:
+        st = ROADMAP_MD.stat()
+        sig = (st.st_mtime_ns, st.st_size)
+    except Exception:
+        sig = None
+    if sig is not None and _ROADMAP_CACHE["sig"] == sig:
+        return _ROADMAP_CACHE["manifest"]
     manifest: Dict[str, Any] = {"bts": [], "rounds": ["R1", "R2", "R3"], "version": 1}
     try:
-        text = md_path.read_text(encoding="utf-8")
+        text = ROADMAP_MD.read_text(encoding="utf-8")
         s = text.find(start_tag)
         e = text.find(end_tag)
         if s != -1 and e != -1 and e > s:
@@ -1916,6 +2304,178 @@ def roadmap_progress() -> Dict[str, Any]:
                 pass
     except Exception:
         pass
+    _ROADMAP_CACHE.update({"sig": sig, "manifest": manifest})
+    return manifest
+
+
+def _is_pass_decision(s: str) -> bool:
+    """
+    Robust PASS detector:
+    - English: 'PASS' surrounded by non-letters, or within RESTATE blobs
+    - Korean aliases: '진행완료', '완료'
+    """
+    txt = (s or "")
+    up = txt.upper()
+    if re.search(r"(?<![A-Z])PASS(?![A-Z])", up):
+        return True
+    if ("진행완료" in txt) or ("완료" in txt):
+        return True
+    return False
+
+
+def _is_start_decision(s: str) -> bool:
+    """
+    Robust START detector:
+    - English: 'START' token
+    - Korean: '시작'
+    """
+    txt = (s or "")
+    up = txt.upper()
+    if re.search(r"(?<![A-Z])START(?![A-Z])", up):
+        return True
+    if "시작" in txt:
+        return True
+    return False
+
+
+def _norm_ev_path(p: str) -> Optional[str]:
+    """
+    Normalize evidence path for Bridge /api/open:
+    - strip repo prefix 'gumgang_meeting/'
+    - drop line fragments '#Lx-y'
+    - keep only repo-relative path (e.g., 'status/evidence/...').
+    """
+    q = (p or "").strip()
+    if not q:
+        return None
+    # drop line fragment
+    if "#" in q:
+        q = q.split("#", 1)[0]
+    # strip repo root
+    if q.startswith("gumgang_meeting/"):
+        q = q[len("gumgang_meeting/") :]
+    # ensure relative (Bridge uses roots)
+    return q or None
+
+
+_ST_ID_RE = re.compile(r"ST-(\d{4})")
+
+
+class _CkptIndex:
+    """Incremental view over CKPT_72H_RUN.jsonl.
+
+    Only bytes appended since the last call are parsed; chain verification and the
+    per-ST timeline (start/pass/last ts, evidence) are extended from the previous
+    state. Truncation/rotation (size shrink or inode change) resets the view.
+    Mirrors _ckpt_read_all: a corrupt line stops ingestion for good."""
+
+    def __init__(self, fp: Path) -> None:
+        self.fp = fp
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, ino: Optional[int]) -> None:
+        self.ino = ino
+        self.offset = 0
+        self.stopped = False
+        self.items: List[Dict[str, Any]] = []
+        self.timeline: Dict[str, Dict[str, Any]] = {}
+        self.prev_hash = "0" * 64
+        self.chain_ok = True
+        self.break_idx: Optional[int] = None
+
+    def _ingest(self, it: Dict[str, Any]) -> None:
+        i = len(self.items)
+        self.items.append(it)
+        if self.chain_ok:
+            core = {k: it[k] for k in ("run_id", "scope", "decision", "next_step", "evidence") if k in it}
+            expect = sha256_text(_canonical_json_for_hash(core) + "\n" + self.prev_hash)
+            if it.get("this_hash") != expect:
+                self.chain_ok = False
+                self.break_idx = i
+            else:
+                self.prev_hash = it.get("this_hash") or ""
+        d = str(it.get("decision") or "")
+        ts = str(it.get("utc_ts") or "")
+        ev_norm = _norm_ev_path(str(it.get("evidence") or ""))
+        # all ST ids in the decision (handles RESTATE with multiple STs)
+        for num in _ST_ID_RE.findall(d):
+            ref = self.timeline.setdefault(f"ST-{num}", {
+                "decisions": [],
+                "evidence": [],
+                "start_ts": None,
+                "pass_ts": None,
+                "last_ts": None,
+                "last_decision": "",
+            })
+            ref["decisions"].append({"ts": ts, "decision": d})
+            if ev_norm and ev_norm not in ref["evidence"]:
+                ref["evidence"].append(ev_norm)
+            if ref["start_ts"] is None and _is_start_decision(d):
+                ref["start_ts"] = ts
+            if ref["pass_ts"] is None and _is_pass_decision(d):
+                ref["pass_ts"] = ts
+            if ref["last_ts"] is None or str(ref["last_ts"]) <= ts:
+                ref["last_ts"] = ts
+                ref["last_decision"] = d
+
+    def refresh(self) -> "_CkptIndex":
+        with self._lock:
+            try:
+                st = self.fp.stat()
+            except FileNotFoundError:
+                self._reset(None)
+                return self
+            if st.st_ino != self.ino or st.st_size < self.offset:
+                self._reset(st.st_ino)
+            if self.stopped or st.st_size == self.offset:
+                return self
+            with self.fp.open("rb") as f:
+                f.seek(self.offset)
+                data = f.read(st.st_size - self.offset)
+            # Consume complete lines only; a partial tail is picked up next time
+            end = data.rfind(b"\n") + 1
+            for raw in data[:end].split(b"\n"):
+                line = raw.decode("utf-8", errors="replace").rstrip("\r")
+                if not line:
+                    continue
+                try:
+                    self._ingest(json.loads(line))
+                except Exception:
+                    # stop on corrupt tail
+                    self.stopped = True
+                    break
+            self.offset += end
+            return self
+
+    def chain_status(self) -> Dict[str, Any]:
+        last = self.items[-1] if self.items else None
+        return {
+            "chain_ok": self.chain_ok,
+            "break_index": self.break_idx,
+            "last_hash": (last or {}).get("this_hash"),
+            "last_ts": (last or {}).get("utc_ts"),
+            "last_seq": (last or {}).get("seq"),
+            "count": len(self.items),
+        }
+
+
+CKPT_INDEX = _CkptIndex(CKPT_JSONL)
+
+
+@app.get("/api/roadmap/progress")
+def roadmap_progress() -> Dict[str, Any]:
+    """
+    Merge plan (BT/ST manifest in roadmap MD) with checkpoint tail into a human-friendly progress view.
+    Adds:
+    - Per-ST timestamps: start_ts (first START/시작), pass_ts (first PASS)
+    - Evidence aggregation per ST (list of latest-known evidence refs)
+    - round_map: planned ST id list per round (R1/R2/R3)
+    Served from CKPT_INDEX (incremental checkpoint view) and ST_EVIDENCE_INDEX
+    (persistent ST-ID → evidence file index); no evidence files are read here.
+    """
+    # 1) Load manifest JSON from roadmap MD
+    manifest = _roadmap_manifest()
 
     # Planned round map from manifest (order-preserving)
     round_map: Dict[str, List[str]] = {"R1": [], "R2": [], "R3": []}
@@ -1926,37 +2486,10 @@ def roadmap_progress() -> Dict[str, Any]:
             if rid in round_map and sid:
                 round_map[rid].append(sid)
 
-    # 2) Read checkpoints and basic chain status
-    items: List[Dict[str, Any]] = _ckpt_read_all(CKPT_JSONL)
-    status_meta = _ckpt_chain_status(CKPT_JSONL)
-
-    def _is_pass_decision(s: str) -> bool:
-        """
-        Robust PASS detector:
-        - English: 'PASS' surrounded by non-letters, or within RESTATE blobs
-        - Korean aliases: '진행완료', '완료'
-        """
-        txt = (s or "")
-        up = txt.upper()
-        if re.search(r"(?<![A-Z])PASS(?![A-Z])", up):
-            return True
-        if ("진행완료" in txt) or ("완료" in txt):
-            return True
-        return False
-
-    def _is_start_decision(s: str) -> bool:
-        """
-        Robust START detector:
-        - English: 'START' token
-        - Korean: '시작'
-        """
-        txt = (s or "")
-        up = txt.upper()
-        if re.search(r"(?<![A-Z])START(?![A-Z])", up):
-            return True
-        if "시작" in txt:
-            return True
-        return False
+    # 2) Checkpoints (incremental) and basic chain status
+    ckpt = CKPT_INDEX.refresh()
+    items = ckpt.items
+    status_meta = ckpt.chain_status()
 
     def _rounds_from_tail(tail: List[Dict[str, Any]]) -> Dict[str, int]:
         r = {"R1": 0, "R2": 0, "R3": 0}
@@ -1973,120 +2506,11 @@ def roadmap_progress() -> Dict[str, Any]:
 
     rounds_state = _rounds_from_tail(items)
 
-    import re
+    # 3) Evidence backfill from the ST index (file mtime approximates timestamps)
+    ev_stats = ST_EVIDENCE_INDEX.refresh()
 
-    # 3) Build per-ST timeline (start_ts/pass_ts) and evidence aggregation
-    def _norm_ev_path(p: str) -> Optional[str]:
-        """
-        Normalize evidence path for Bridge /api/open:
-        - strip repo prefix 'gumgang_meeting/'
-        - drop line fragments '#Lx-y'
-        - keep only repo-relative path (e.g., 'status/evidence/...').
-        """
-        q = (p or "").strip()
-        if not q:
-            return None
-        # drop line fragment
-        if "#" in q:
-            q = q.split("#", 1)[0]
-        # strip repo root
-        if q.startswith("gumgang_meeting/"):
-            q = q[len("gumgang_meeting/") :]
-        # ensure relative (Bridge uses roots)
-        return q or None
-
-    st_timeline: Dict[str, Dict[str, Any]] = {}
-    for it in items:
-        d = str(it.get("decision") or "")
-        ts = str(it.get("utc_ts") or "")
-        ev_raw = str(it.get("evidence") or "")
-        ev_norm = _norm_ev_path(ev_raw)
-        # find all ST ids in the decision (handles RESTATE with multiple STs)
-        sids = re.findall(r"ST-(\d{4})", d)
-        if not sids:
-            continue
-        for num in sids:
-            sid = f"ST-{num}"
-            ref = st_timeline.get(sid) or {
-                "decisions": [],
-                "evidence": [],
-                "start_ts": None,
-                "pass_ts": None,
-                "last_ts": None,
-                "last_decision": "",
-            }
-            ref["decisions"].append({"ts": ts, "decision": d})
-            if ev_norm:
-                ref["evidence"].append(ev_norm)
-            # capture first start_ts / pass_ts
-            if ref["start_ts"] is None and _is_start_decision(d):
-                ref["start_ts"] = ts
-            if ref["pass_ts"] is None and _is_pass_decision(d):
-                ref["pass_ts"] = ts
-            # last seen
-            if ref["last_ts"] is None or str(ref["last_ts"]) <= ts:
-                ref["last_ts"] = ts
-                ref["last_decision"] = d
-            st_timeline[sid] = ref
-
-    # 3-b) Evidence backfill — scan status/evidence/* for ST tokens when SSOT lacks them
-    scanned = 0
-    try:
-        ev_root = PROJECT_ROOT / "status" / "evidence"
-        # lightweight scan limits
-        MAX_FILES = 2000
-        MAX_BYTES = 200_000
-        # scanned counter initialized above
-        if ev_root.exists():
-            for p in ev_root.rglob("*"):
-                if scanned >= MAX_FILES:
-                    break
-                try:
-                    if not p.is_file():
-                        continue
-                    # limit by extension/size for safety
-                    suf = p.suffix.lower()
-                    if suf not in (".json", ".jsonl", ".md", ".log", ".txt"):
-                        continue
-                    if p.stat().st_size > MAX_BYTES:
-                        continue
-                    txt = p.read_text(encoding="utf-8", errors="ignore")
-                except Exception:
-                    continue
-                scanned += 1
-                # find all ST ids
-                for m in re.findall(r"ST-(\d{4})", txt):
-                    sid = f"ST-{m}"
-                    ref = st_timeline.get(sid)
-                    # only backfill when timeline is missing or empty
-                    if ref is None:
-                        ref = {
-                            "decisions": [],
-                            "evidence": [],
-                            "start_ts": None,
-                            "pass_ts": None,
-                            "last_ts": None,
-                            "last_decision": "",
-                        }
-                    # timestamps via file mtime (approx) if missing
-                    ts_file = None
-                    try:
-                        ts_file = p.stat().st_mtime
-                    except Exception:
-                        ts_file = None
-                    if ts_file:
-                        iso = datetime.utcfromtimestamp(ts_file).strftime("%Y-%m-%dT%H:%M:%SZ")  # type: ignore
-                        if not ref.get("start_ts"):
-                            ref["start_ts"] = iso
-                        if not ref.get("last_ts"):
-                            ref["last_ts"] = iso
-                    # evidence path (relative under status/)
-                    rel = _norm_ev_path(relpath(p)) or ""
-                    if rel.startswith("status/") and rel not in ref.get("evidence", []):
-                        ref.setdefault("evidence", []).append(rel)
-                    st_timeline[sid] = ref
-    except Exception:
-        pass
+    def _iso(ts: float) -> str:
+        return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
     # 4) Merge manifest with inferred statuses and timestamps
     out_bts: List[Dict[str, Any]] = []
@@ -2099,7 +2523,18 @@ def roadmap_progress() -> Dict[str, Any]:
             st_title = str(st.get("title") or sid)
             st_round = str(st.get("round") or "")
             done_hint = bool(st.get("done"))
-            ref = st_timeline.get(sid, {})
+            ref = ckpt.timeline.get(sid, {})
+            evidence = list(ref.get("evidence") or [])
+            start_ts = ref.get("start_ts")
+            last_ts = ref.get("last_ts")
+            file_refs = ST_EVIDENCE_INDEX.lookup(sid)
+            if file_refs:
+                start_ts = start_ts or _iso(file_refs[0][1])
+                last_ts = last_ts or _iso(file_refs[-1][1])
+                for rel, _mt in file_refs:
+                    norm = _norm_ev_path(rel)
+                    if norm and norm not in evidence:
+                        evidence.append(norm)
             dec = str(ref.get("last_decision") or "")
             # status inference
             st_status = "PLANNED"
@@ -2107,35 +2542,19 @@ def roadmap_progress() -> Dict[str, Any]:
                 st_status = "PASS"
             elif str(dec).upper().startswith("BLOCKED:"):
                 st_status = "BLOCKED"
-            elif _is_start_decision(dec) or ref.get("start_ts"):
+            elif _is_start_decision(dec) or start_ts:
                 st_status = "STARTED"
-            # Build record and apply a second-pass fallback scan if timeline missed fields
             st_rec = {
                 "id": sid,
                 "title": st_title,
                 "round": st_round,
                 "status": st_status,
-                "start_ts": ref.get("start_ts"),
+                "start_ts": start_ts,
                 "pass_ts": ref.get("pass_ts"),
-                "last_ts": ref.get("last_ts"),
-                "evidence": list(ref.get("evidence") or []),
+                "last_ts": last_ts,
+                # keep only bridge-openable evidence under status/*
+                "evidence": [p for p in evidence if p.startswith("status/")],
             }
-            if (not st_rec["start_ts"]) or (not st_rec["pass_ts"]) or (not st_rec["last_ts"]) or (len(st_rec["evidence"]) == 0):
-                for it2 in items:
-                    d2 = str(it2.get("decision") or "")
-                    if sid in d2:
-                        ts2 = str(it2.get("utc_ts") or "")
-                        ev2 = _norm_ev_path(str(it2.get("evidence") or ""))
-                        if (not st_rec["start_ts"]) and _is_start_decision(d2):
-                            st_rec["start_ts"] = ts2
-                        if (not st_rec["pass_ts"]) and _is_pass_decision(d2):
-                            st_rec["pass_ts"] = ts2
-                        if (not st_rec["last_ts"]) or (st_rec["last_ts"] <= ts2):
-                            st_rec["last_ts"] = ts2
-                        if ev2 and ev2 not in st_rec["evidence"]:
-                            st_rec["evidence"].append(ev2)
-            # keep only bridge-openable evidence under status/*
-            st_rec["evidence"] = [p for p in st_rec["evidence"] if p.startswith("status/")]
             sts_out.append(st_rec)
         out_bts.append({"id": bt_id, "title": bt_title, "sts": sts_out})
 
@@ -2164,7 +2583,7 @@ def roadmap_progress() -> Dict[str, Any]:
         "next": next_step,
         "now": now_iso(),
     }
-    debug_meta = {}
+    debug_meta = {"evidence_index": ev_stats}
     return {"ok": True, "data": data, "meta": debug_meta}
 
 @app.get("/api/health")
@@ -2200,92 +2619,156 @@ async def capture_json(body: CaptureRequest = Body(...)) -> Dict[str, Any]:
     return {"ok": True, "data": {"event": event, **res}, "meta": {"ts": now_iso()}}
 
 
+# ---------- Meeting attachments — streaming uploads (app/upload_stream.py) ----------
+MEETING_UPLOAD_MAX_BYTES = int(ENV.get("MEETING_UPLOAD_MAX_MB") or 2048) << 20
+UPLOAD_SESSIONS = UploadSessions(MEETINGS_ROOT / ".uploads", max_bytes=MEETING_UPLOAD_MAX_BYTES)
+
+
+def _attachment_path(mdir: Path, tss: str, filename: Optional[str]) -> Path:
+    safe_name = prune_filename(filename or "capture.bin")
+    # Prefix with ts for ordering
+    return mdir / "attachments" / f"{tss.replace(':', '').replace('-', '').replace('.','_')}_{safe_name}"
+
+
+def _upload_http_error(e: UploadError) -> HTTPException:
+    return HTTPException(status_code=e.status, detail=e.code)
+
+
 @app.post("/api/meetings/capture/upload")
 async def capture_upload(
+    request: Request,
     meetingId: str = Form(...),
     ts: Optional[str] = Form(None),
     note: Optional[str] = Form(None),
     mode: Optional[str] = Form(None),
     file: UploadFile = File(...),
 ) -> Dict[str, Any]:
+    """Single-request upload: chunked async reads → temp file (sha256 on the fly) → fsync → rename.
+    Over MEETING_UPLOAD_MAX_MB → 413 UPLOAD_TOO_LARGE. Large recordings: use the session API below."""
+    clen = request.headers.get("content-length")
+    if clen and clen.isdigit() and int(clen) > MEETING_UPLOAD_MAX_BYTES + (1 << 16):
+        raise HTTPException(status_code=413, detail="UPLOAD_TOO_LARGE")
     mid = safe_id(meetingId, "MEETING")
     tss = ts or now_iso()
     mdir = ensure_meeting_dir(mid)
-    safe_name = prune_filename(file.filename or "capture.bin")
-    # Prefix with ts for ordering
-    attach_path = mdir / "attachments" / f"{tss.replace(':', '').replace('-', '').replace('.','_')}_{safe_name}"
-    # Stream save
-    bytes_written = write_bytes(attach_path, _iter_upload_file(file))
-    await file.close()
+    attach_path = _attachment_path(mdir, tss, file.filename)
+    try:
+        saved = await save_stream(iter_upload(file), attach_path, MEETING_UPLOAD_MAX_BYTES)
+    except UploadError as e:
+        raise _upload_http_error(e)
+    finally:
+        await file.close()
+
+    event = {
+        "type": "capture_upload",
+        "ts": tss,
+        "meeting_id": mid,
+        "note": note,
+        "attachment": relpath(attach_path),
+        "bytes": saved["bytes"],
+        "sha256": saved["sha256"],
+        "content_type": getattr(file, "content_type", None),
+        "original_name": file.filename,
+        "mode": mode,
+    }
+    res = STORE.append_event(mid, event)
+    return {"ok": True, "data": {"event": event, **res}, "meta": {"ts": now_iso()}}
+
+
+class UploadSessionCreate(BaseModel):
+    meetingId: str
+    filename: Optional[str] = None
+    size: Optional[int] = Field(None, ge=0, description="Total bytes (enables completeness check)")
+    sha256: Optional[str] = Field(None, description="Expected hex digest, verified on complete")
+    content_type: Optional[str] = None
+    ts: Optional[str] = None
+    note: Optional[str] = None
+    mode: Optional[str] = None
+
+
+@app.post("/api/meetings/capture/upload/sessions")
+def upload_session_create(body: UploadSessionCreate = Body(...)) -> Dict[str, Any]:
+    """Start a resumable upload. Then PUT raw chunks to …/{id}?offset=N and POST …/{id}/complete."""
+    try:
+        meta = UPLOAD_SESSIONS.create(
+            size=body.size,
+            sha256=body.sha256,
+            meeting_id=safe_id(body.meetingId, "MEETING"),
+            filename=body.filename,
+            content_type=body.content_type,
+            ts=body.ts or now_iso(),
+            note=body.note,
+            mode=body.mode,
+        )
+    except UploadError as e:
+        raise _upload_http_error(e)
+    return {"ok": True, "data": meta, "meta": {"ts": now_iso(), "max_bytes": MEETING_UPLOAD_MAX_BYTES}}
+
 
+@app.get("/api/meetings/capture/upload/sessions/{sid}")
+def upload_session_status(sid: str) -> Dict[str, Any]:
+    """`received` is the offset to resume from."""
+    try:
+        return {"ok": True, "data": UPLOAD_SESSIONS.status(sid), "meta": {"ts": now_iso()}}
+    except UploadError as e:
+        raise _upload_http_error(e)
+
+
+@app.put("/api/meetings/capture/upload/sessions/{sid}")
+async def upload_session_append(sid: str, request: Request, offset: int = 0) -> Dict[str, Any]:
+    """Append the raw request body (any size, streamed) at `offset`; mismatch → 409 with the
+    expected offset in GET …/{sid}."""
+    try:
+        meta = await UPLOAD_SESSIONS.append(sid, offset, request.stream())
+    except UploadError as e:
+        raise _upload_http_error(e)
+    return {"ok": True, "data": {"id": sid, "received": meta["received"], "size": meta["size"]}, "meta": {"ts": now_iso()}}
+
+
+@app.post("/api/meetings/capture/upload/sessions/{sid}/complete")
+async def upload_session_complete(sid: str) -> Dict[str, Any]:
+    try:
+        meta = UPLOAD_SESSIONS.status(sid)
+        info = meta.get("info") or {}
+        mid = info.get("meeting_id") or "MEETING"
+        tss = info.get("ts") or now_iso()
+        attach_path = _attachment_path(ensure_meeting_dir(mid), tss, info.get("filename"))
+        saved = await UPLOAD_SESSIONS.complete(sid, attach_path)
+    except UploadError as e:
+        raise _upload_http_error(e)
     event = {
         "type": "capture_upload",
         "ts": tss,
         "meeting_id": mid,
-        "note": note,
+        "note": info.get("note"),
         "attachment": relpath(attach_path),
-        "bytes": bytes_written,
-        "content_type": getattr(file, "content_type", None),
-        "original_name": file.filename,
-        "mode": mode,
+        "bytes": saved["bytes"],
+        "sha256": saved["sha256"],
+        "content_type": info.get("content_type"),
+        "original_name": info.get("filename"),
+        "mode": info.get("mode"),
+        "upload_session": sid,
     }
     res = STORE.append_event(mid, event)
     return {"ok": True, "data": {"event": event, **res}, "meta": {"ts": now_iso()}}
 
 
-def _iter_upload_file(f: UploadFile, chunk: int = 1 << 20) -> Iterable[bytes]:
-    # UploadFile.read() is async, but we can iterate by awaiting once and returning iterable via closure.
-    async def gen():
-        while True:
-            b = await f.read(chunk)
-            if not b:
-                break
-            yield b
-
-    # Bridge async generator to sync iterator for write_bytes
-    loop = None
+@app.delete("/api/meetings/capture/upload/sessions/{sid}")
+def upload_session_abort(sid: str) -> Dict[str, Any]:
     try:
-        import asyncio
+        UPLOAD_SESSIONS.abort(sid)
+    except UploadError as e:
+        raise _upload_http_error(e)
+    return {"ok": True, "data": {"id": sid, "aborted": True}, "meta": {"ts": now_iso()}}
+
 
-        loop = asyncio.get_event_loop()
+@app.on_event("startup")
+def _sweep_upload_sessions() -> None:
+    try:
+        UPLOAD_SESSIONS.sweep()
     except Exception:
         pass
 
-    if loop and loop.is_running():
-        # In running loop, schedule reads synchronously (limited sizes)
-        from anyio import to_thread  # optional, but used by FastAPI stack; fallback below
-
-        async def collect() -> List[bytes]:
-            out: List[bytes] = []
-            async for part in gen():
-                out.append(part)
-            return out
-
-        try:
-            # Best-effort: collect in-memory; for skeleton-level sizes this is acceptable
-            data = loop.create_task(collect())  # type: ignore
-            # The caller will await file.close(), so we return a once-iterable
-            # We cannot yield async here; so return a list and iterate
-            # Note: If event loop context differs, fallback to blocking read
-            return _iter_bytes(loop.run_until_complete(data))  # type: ignore
-        except Exception:
-            pass
-
-    # Fallback: blocking reads (not ideal in async context, but acceptable for small files in skeleton)
-    def blocking_iter() -> Iterable[bytes]:
-        while True:
-            b = f.file.read(1 << 20)  # type: ignore[attr-defined]
-            if not b:
-                break
-            yield b
-
-    return blocking_iter()
-
-
-def _iter_bytes(bufs: List[bytes]) -> Iterable[bytes]:
-    for b in bufs:
-        yield b
-
 
 @app.post("/api/meetings/annotate")
 async def annotate(body: AnnotateRequest = Body(...)) -> Dict[str, Any]:
@@ -2439,53 +2922,47 @@ def record_status(meeting_id: str) -> Dict[str, Any]:
 
 
 @app.get("/api/meetings/{meeting_id}/events")
-def events_read(meeting_id: str, limit: int = 200) -> Dict[str, Any]:
+def events_read(
+    meeting_id: str,
+    limit: int = 200,
+    offset: Optional[int] = None,
+    after: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Events by sequence number (0-based, dense) via events.idx — no file scan.
+
+    - default: the last `limit` events (tail)
+    - offset=N: range [N, N+limit)
+    - after=N: events with seq > N (live polling: pass the last seq seen)
+    data.next is the seq after the last returned event; data.total the event count.
+    """
     mid = safe_id(meeting_id, "MEETING")
     path = STORE.events_path(mid)
     if not path.exists():
         raise HTTPException(status_code=404, detail="No events yet")
-    # Tail-read up to limit lines (simple implementation)
-    lines = _tail_lines(path, limit=max(1, min(2000, limit)))
-    events: List[Dict[str, Any]] = []
-    for ln in lines:
-        ln = ln.strip()
-        if not ln:
-            continue
-        try:
-            events.append(json.loads(ln))
-        except Exception:
-            continue
+    lim = max(1, min(2000, limit))
+    log = STORE.log(mid)
+    if after is not None:
+        rows = log.read(after + 1, lim)
+    elif offset is not None:
+        rows = log.read(offset, lim)
+    else:
+        rows = log.tail(lim)
+    events = [{**ev, "seq": seq} for seq, ev in rows if isinstance(ev, dict)]
+    total = log.count
     return {
         "ok": True,
-        "data": {"events": events, "count": len(events), "path": relpath(path)},
+        "data": {
+            "events": events,
+            "count": len(events),
+            "total": total,
+            "start": rows[0][0] if rows else None,
+            "next": rows[-1][0] + 1 if rows else (after + 1 if after is not None else (offset or total)),
+            "path": relpath(path),
+        },
         "meta": {"ts": now_iso()},
     }
 
 
-def _tail_lines(path: Path, limit: int) -> List[str]:
-    # Simple but efficient tail for small-to-medium files
-    try:
-        with path.open("rb") as f:
-            f.seek(0, os.SEEK_END)
-            size = f.tell()
-            block = 4096
-            data = bytearray()
-            nl = 0
-            pos = size
-            while pos > 0 and nl <= limit:
-                step = block if pos >= block else pos
-                pos -= step
-                f.seek(pos)
-                chunk = f.read(step)
-                data[:0] = chunk  # prepend
-                nl = data.count(b"\n")
-            text = data.decode("utf-8", errors="ignore")
-            out = text.splitlines()[-limit:]
-            return out
-    except Exception:
-        return path.read_text(encoding="utf-8", errors="ignore").splitlines()[-limit:]
-
-
 # ---------- Memory (5-tier) — store/search/recall ----------
 
 # Roots
@@ -2579,6 +3056,8 @@ def memory_store(body: MemoryStoreRequest = Body(...)) -> Dict[str, Any]:
     if redacted_text is not None and redacted_text != body.text:
         rec["redacted_text"] = redacted_text
     bytes_written = append_jsonl(out_path, rec)
+    if tier == "ultra_long":
+        GATE_DEDUP.add("l5", out_path, approved_sha256, item_id=rec["id"], gate_id=approved_id, text=body.text or "")
     return {
         "ok": True,
         "data": {
@@ -3134,10 +3613,74 @@ def _safe_abs_path(rel: str) -> Path:
     return abs_p
 
 
+FILES_VIEW_WINDOW = 400  # lines per server-rendered window
+FILES_VIEW_CONTEXT = 100  # lines shown above an #L anchor
+
+_FILES_VIEW_HEAD = (
+    "<style>body{background:#0b1222;color:#e5e7eb;font:14px/1.5 system-ui,monospace;margin:0;padding:14px;} "
+    ".ln{display:inline-block;width:64px;color:#94a3b8;opacity:.8;padding-right:8px;text-align:right;user-select:none} "
+    "pre{margin:0;white-space:pre-wrap} .hl{background:rgba(180, 83, 9, .25);} a{color:#93c5fd;text-decoration:none} "
+    ".head{font:12px system-ui;color:#94a3b8;margin-bottom:8px} .more{font:12px system-ui;color:#94a3b8;padding:6px 0} </style>"
+)
+
+# Lazy windows: sentinels above/below the rendered rows fetch ?fragment=1&start=…&count=… when
+# they scroll into view; the anchor scroll from ?path=…#Lx-y is unchanged.
+_FILES_VIEW_SCRIPT = """<script>
+try{
+const s=new URLSearchParams(location.search);
+const p=s.get('path')||'';
+const m=p.match(/#L(\\d+)(?:-(\\d+))?$/);
+if(m){const el=document.getElementById('L'+Number(m[1]||'0')); if(el){el.scrollIntoView({block:'center'});}}
+const rows=document.getElementById('rows');
+const cfg=rows.dataset, count=Number(cfg.count), total=Number(cfg.total);
+let first=Number(cfg.first), last=Number(cfg.last), busy=false;
+const top=document.getElementById('more-top'), bottom=document.getElementById('more-bottom');
+async function load(dir){
+  if(busy) return; busy=true;
+  try{
+    const start=dir<0?Math.max(1,first-count):last+1;
+    const n=dir<0?first-start:count;
+    if(n<=0||start>total) return;
+    const u=new URL(location.href);
+    u.searchParams.set('start',String(start)); u.searchParams.set('count',String(n)); u.searchParams.set('fragment','1');
+    const r=await fetch(u); if(!r.ok) return;
+    const html=await r.text();
+    const end=Number(r.headers.get('X-Window-End')||start+n-1);
+    if(dir<0){const h=document.documentElement.scrollHeight; rows.insertAdjacentHTML('afterbegin',html);
+      window.scrollBy(0,document.documentElement.scrollHeight-h); first=start;}
+    else{rows.insertAdjacentHTML('beforeend',html); last=end;}
+  } finally {
+    top.style.display=first>1?'':'none'; bottom.style.display=last<total?'':'none'; busy=false;
+  }
+}
+const io=new IntersectionObserver(es=>es.forEach(e=>{if(e.isIntersecting) load(e.target===top?-1:1);}),{rootMargin:'800px 0px'});
+io.observe(top); io.observe(bottom);
+}catch(e){}
+</script>"""
+
+
+def _files_view_rows(lines: List[str], first: int, hl_start: int, hl_end: int) -> Iterable[str]:
+    esc = html.escape
+    for i, ln in enumerate(lines, start=first):
+        cls = "hl" if (hl_start and i >= hl_start and (hl_end == 0 or i <= hl_end)) else ""
+        yield f"<div id='L{i}' class='{cls}'><span class='ln'>L{i}</span><pre>{esc(ln)}</pre></div>"
+
+
 @app.get("/api/files/view")
-def files_view(path: str, max_bytes: int = 200_000) -> HTMLResponse:
-    """Render a simple read‑only viewer for small UTF‑8 text files under project root.
+def files_view(
+    path: str,
+    max_bytes: int = 200_000,
+    start: Optional[int] = None,
+    count: int = FILES_VIEW_WINDOW,
+    fragment: bool = False,
+) -> Response:
+    """Render a simple read‑only viewer for UTF‑8 text files under project root.
     Accepts optional anchor in path like "status/foo.md#L10-20" to highlight lines.
+
+    Only one window of lines is rendered (around the anchor, or from `start`), located through
+    a per-(path, mtime) line-offset index (app/line_index.py), so the page cost does not depend
+    on the file size; further windows load lazily (fragment=1 returns just the rows).
+    max_bytes caps the bytes read per window.
     """
     raw = urllib.parse.unquote(path or "")
     # Split anchor
@@ -3155,60 +3698,48 @@ def files_view(path: str, max_bytes: int = 200_000) -> HTMLResponse:
             anchor_start = anchor_end = None
 
     fp = _safe_abs_path(base_path)
+    count = max(1, min(int(count), 5000))
     try:
-        text = fp.read_text(encoding="utf-8", errors="replace")
+        idx = LINE_INDEX.get(fp)
+        if start is None:
+            start = max(1, int(anchor_start or 1) - (FILES_VIEW_CONTEXT if anchor_start else 0))
+            if anchor_start and anchor_end and anchor_end - start + 1 > count:
+                count = min(5000, anchor_end - start + 1)
+        lines, cut = idx.read_lines(int(start), count, max(1, int(max_bytes)))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"READ_ERROR: {e}")
+    first = max(1, int(start))
+    last = first + len(lines) - 1
+    hl_start = int(anchor_start or 0)
+    hl_end = int(anchor_end or anchor_start or 0)
+    win = {"X-Lines-Total": str(idx.lines), "X-Window-Start": str(first), "X-Window-End": str(last)}
 
-    # Enforce byte limit (rough cut); show notice if truncated
-    b = text.encode("utf-8")
-    truncated = False
-    if len(b) > int(max_bytes):
-        truncated = True
-        # Cut at safe boundary by lines
-        lines = text.splitlines()
-        approx = 0
-        kept: list[str] = []
-        for ln in lines:
-            bs = len((ln + "\n").encode("utf-8"))
-            if approx + bs > int(max_bytes):
-                break
-            kept.append(ln)
-            approx += bs
-        text = "\n".join(kept)
+    if fragment:
+        return HTMLResponse("".join(_files_view_rows(lines, first, hl_start, hl_end)), headers=win)
 
     esc = html.escape
-    lines = text.splitlines()
-    # Build HTML with line anchors
-    out = [
-        "<!doctype html>",
-        "<html><head><meta charset='utf-8'>",
-        f"<title>{esc(relpath(fp))}</title>",
-        "<style>body{background:#0b1222;color:#e5e7eb;font:14px/1.5 system-ui,monospace;margin:0;padding:14px;} .ln{display:inline-block;width:64px;color:#94a3b8;opacity:.8;padding-right:8px;text-align:right;user-select:none} pre{margin:0;white-space:pre-wrap} .hl{background:rgba(180, 83, 9, .25);} a{color:#93c5fd;text-decoration:none} .head{font:12px system-ui;color:#94a3b8;margin-bottom:8px} </style>",
-        "</head><body>",
-        f"<div class='head'>Path: {esc(relpath(fp))}{' &middot; <em>truncated</em>' if truncated else ''}</div>",
-        "<div>",
-    ]
-    start = int(anchor_start or 0)
-    end = int(anchor_end or anchor_start or 0)
-    for i, ln in enumerate(lines, start=1):
-        cls = "hl" if (start and i >= start and (end == 0 or i <= end)) else ""
-        out.append(
-            f"<div id='L{i}' class='{cls}'><span class='ln'>L{i}</span><pre>{esc(ln)}</pre></div>"
+    rp = relpath(fp)
+
+    def page() -> Iterable[str]:
+        hide = " style='display:none'"
+        note = f" &middot; lines {first}–{last} of {idx.lines}" if (first > 1 or last < idx.lines) else ""
+        if cut:
+            note += " &middot; <em>truncated</em>"
+        yield (
+            "<!doctype html><html><head><meta charset='utf-8'>"
+            f"<title>{esc(rp)}</title>{_FILES_VIEW_HEAD}</head><body>"
+            f"<div class='head'>Path: {esc(rp)}{note}</div>"
+            f"<div class='more' id='more-top'{'' if first > 1 else hide}>… lines 1–{first - 1}</div>"
+            f"<div id='rows' data-first='{first}' data-last='{last}' data-total='{idx.lines}' data-count='{count}'>"
         )
-    out += [
-        "</div>",
-        "<script>\n",
-        "try{\n",
-        "const s=new URLSearchParams(location.search);\n",
-        "const p=s.get('path')||'';\n",
-        "const m=p.match(/#L(\\d+)(?:-(\\d+))?$/);\n",
-        "if(m){const el=document.getElementById('L'+Number(m[1]||'0')); if(el){el.scrollIntoView({block:'center'});}}\n",
-        "}catch(e){}\n",
-        "</script>",
-        "</body></html>",
-    ]
-    return HTMLResponse("".join(out))
+        yield "".join(_files_view_rows(lines, first, hl_start, hl_end))
+        yield (
+            "</div>"
+            f"<div class='more' id='more-bottom'{'' if last < idx.lines else hide}>"
+            f"… lines {last + 1}–{idx.lines}</div>{_FILES_VIEW_SCRIPT}</body></html>"
+        )
+
+    return StreamingResponse(page(), media_type="text/html; charset=utf-8", headers=win)
 
 @app.get("/api/files/exists")
 def files_exists(path: str) -> Dict[str, Any]:
@@ -3270,36 +3801,79 @@ def files_open(req: FileOpenReq) -> Dict[str, Any]:
 
 
 @app.get("/api/files/read")
-def files_read(path: str, max_bytes: int = 2_000_000) -> Dict[str, Any]:
+def files_read(request: Request, path: str, max_bytes: int = 2_000_000, raw: bool = False) -> Any:
     """Return UTF‑8 text content of a file under the project root as JSON.
-    Intended for editor consumption (read‑only)."""
-    raw = urllib.parse.unquote(path or "")
-    fp = _safe_abs_path(raw)
+    Intended for editor consumption (read‑only).
+
+    raw=true streams the file itself instead (no size cap): sniffed Content-Type, ETag /
+    Last-Modified with 304 on If-None-Match / If-Modified-Since, and Range / If-Range (206)."""
+    fp = _safe_abs_path(urllib.parse.unquote(path or ""))
     try:
-        data = fp.read_bytes()
+        st = fp.stat()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"READ_ERROR: {e}")
-    truncated = False
-    if len(data) > int(max_bytes):
-        data = data[: int(max_bytes)]
-        truncated = True
+    if raw:
+        headers = {**file_serve.validators(st), "Cache-Control": "no-cache", "X-Content-Type-Options": "nosniff"}
+        if file_serve.not_modified(request.headers, headers["ETag"], st.st_mtime):
+            return Response(status_code=304, headers=headers)
+        return FileResponse(fp, media_type=file_serve.sniff(fp, st), headers=headers, stat_result=st)
+    limit = max(0, int(max_bytes))
     try:
-        text = data.decode("utf-8", errors="replace")
-    except Exception:
-        text = data.decode("utf-8", errors="replace")
+        with fp.open("rb") as fh:  # read only what is returned
+            data = fh.read(limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"READ_ERROR: {e}")
+    truncated = st.st_size > limit
+    text = data.decode("utf-8", errors="replace")
     return {
         "ok": True,
-        "data": {"path": relpath(fp), "text": text, "truncated": truncated},
+        "data": {"path": relpath(fp), "text": text, "truncated": truncated, "size": st.st_size},
         "meta": {"ts": now_iso()},
     }
 
 
+FILES_LIST = DirCache(
+    ttl=float(ENV.get("FILES_LIST_TTL_SEC") or 2),
+    stat_ttl=float(ENV.get("FILES_LIST_STAT_TTL_SEC") or 30),
+)
+FILES_LIST_MAX_DEPTH = 32
+FILES_LIST_MAX_LIMIT = 5000
+
+
+def _rel_join(base: str, name: str) -> str:
+    return name if base in ("", ".") else f"{base}/{name}"
+
+
 @app.get("/api/files/list")
-def files_list(path: Optional[str] = None, depth: int = 1) -> Dict[str, Any]:
+def files_list(
+    path: Optional[str] = None,
+    depth: int = 1,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    sort: _Lit["name", "size", "mtime"] = "name",
+    order: _Lit["asc", "desc"] = "asc",
+    ext: Optional[str] = None,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    mtime_from: Optional[int] = None,
+    mtime_to: Optional[int] = None,
+    type: Optional[_Lit["file", "dir"]] = None,
+    flat: bool = False,
+    rollup: bool = False,
+    refresh: bool = False,
+) -> Dict[str, Any]:
     """List directories/files under project root (read‑only, safe).
 
     - path: repo‑relative directory (default '.')
-    - depth: 1 (flat) or 2 (include one level of children for directories)
+    - depth: levels to include (1 = flat, 2 = one level of children, … up to 32)
+    - limit/cursor: page over the top-level items (flat=true: over the whole preorder listing);
+      next_cursor is null on the last page
+    - sort name|size|mtime, order asc|desc (directories first, per level)
+    - ext (".json,.md"), min_size/max_size (bytes), mtime_from/mtime_to (epoch s) filter files;
+      type=file|dir restricts entries (flat mode)
+    - rollup=true: {size, files, dirs} of each directory's subtree (and of `path` itself)
+    Listings come from the directory metadata cache (app/dir_cache.py), revalidated by directory
+    mtime; refresh=true rescans `path`.
     Excludes heavy/unsafe folders: .git, node_modules, dist, build, .venv, venv, .obsidian
     """
     base = PROJECT_ROOT.resolve()
@@ -3309,51 +3883,115 @@ def files_list(path: Optional[str] = None, depth: int = 1) -> Dict[str, Any]:
         raise HTTPException(status_code=403, detail="OUT_OF_ROOT")
     if not target.exists() or not target.is_dir():
         raise HTTPException(status_code=404, detail="NOT_DIR")
-
-    deny = {".git", "node_modules", "dist", "build", ".venv", "venv", ".obsidian"}
-
-    def allowed(p: Path) -> bool:
-        n = p.name
-        if n in deny:
+    depth = max(1, min(int(depth), FILES_LIST_MAX_DEPTH))
+    try:
+        offset = max(0, int(cursor or 0))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="BAD_CURSOR")
+    if limit is not None:
+        limit = max(1, min(int(limit), FILES_LIST_MAX_LIMIT))
+    exts = {e.strip().lower() if e.strip().startswith(".") else "." + e.strip().lower()
+            for e in (ext or "").split(",") if e.strip()}
+    desc = order == "desc"
+
+    def keep_file(e: DirEntry) -> bool:
+        if exts and os.path.splitext(e.name)[1].lower() not in exts:
+            return False
+        if min_size is not None and (e.size or 0) < min_size:
             return False
-        if n.endswith(".egg-info"):
+        if max_size is not None and (e.size or 0) > max_size:
+            return False
+        if mtime_from is not None and (e.mtime or 0) < mtime_from:
+            return False
+        if mtime_to is not None and (e.mtime or 0) > mtime_to:
             return False
         return True
 
-    def entry(p: Path) -> Dict[str, Any]:
-        try:
-            st = p.stat()
-            size = int(st.st_size)
-            mtime = int(st.st_mtime)
-        except Exception:
-            size = None
-            mtime = None
-        return {
-            "name": p.name,
-            "path": relpath(p),
-            "type": "dir" if p.is_dir() else "file",
-            "size": size,
-            "mtime": mtime,
-        }
-
-    items: List[Dict[str, Any]] = []
+    def entry(e: DirEntry, abs_dir: str, rel: str) -> Dict[str, Any]:
+        d = {"name": e.name, "path": rel, "type": "dir" if e.is_dir else "file", "size": e.size, "mtime": e.mtime}
+        if rollup and e.is_dir and not e.symlink:
+            try:
+                d["rollup"] = FILES_LIST.rollup(os.path.join(abs_dir, e.name))
+            except OSError:
+                d["rollup"] = None
+        return d
+
+    def level(abs_dir: str, rel_dir: str) -> List[DirEntry]:
+        es = [e for e in FILES_LIST.listdir(abs_dir).entries if e.is_dir or keep_file(e)]
+        if sort == "size":
+            def k(e: DirEntry):
+                if e.is_dir and rollup and not e.symlink:
+                    try:
+                        return (FILES_LIST.rollup(os.path.join(abs_dir, e.name))["size"], e.name.lower())
+                    except OSError:
+                        pass
+                return (e.size or 0, e.name.lower())
+        elif sort == "mtime":
+            k = lambda e: (e.mtime or 0, e.name.lower())  # noqa: E731
+        else:
+            k = lambda e: e.name.lower()  # noqa: E731
+        dirs = sorted((e for e in es if e.is_dir), key=k, reverse=desc)
+        files = sorted((e for e in es if not e.is_dir), key=k, reverse=desc)
+        return dirs + files
+
+    def node(e: DirEntry, abs_dir: str, rel_dir: str, lvl: int) -> Dict[str, Any]:
+        rel = _rel_join(rel_dir, e.name)
+        d = entry(e, abs_dir, rel)
+        if e.is_dir and lvl < depth:
+            sub_abs = os.path.join(abs_dir, e.name)
+            try:
+                d["children"] = [] if e.symlink else [node(c, sub_abs, rel, lvl + 1) for c in level(sub_abs, rel)]
+            except OSError:
+                d["children"] = []
+        return d
+
+    cwd = relpath(target)
+    abs_t = str(target)
+    out: Dict[str, Any] = {"ok": True, "cwd": cwd}
     try:
-        for child in sorted(target.iterdir(), key=lambda x: (0 if x.is_dir() else 1, x.name.lower())):
-            if not allowed(child):
-                continue
-            d = entry(child)
-            if depth > 1 and child.is_dir():
-                subs: List[Dict[str, Any]] = []
-                for g in sorted(child.iterdir(), key=lambda x: (0 if x.is_dir() else 1, x.name.lower())):
-                    if not allowed(g):
-                        continue
-                    subs.append(entry(g))
-                d["children"] = subs
-            items.append(d)
-    except Exception as e:
+        if refresh:
+            FILES_LIST.listdir(abs_t, refresh=True)
+        if flat:
+            items: List[Dict[str, Any]] = []
+            skipped = 0
+            more = False
+            rels = {abs_t: cwd}
+            for lvl, parent, e in FILES_LIST.walk(abs_t, depth, sort=sort, desc=desc):
+                rel = _rel_join(rels[parent], e.name)
+                if e.is_dir:
+                    rels[os.path.join(parent, e.name)] = rel
+                if (type == "file" and e.is_dir) or (type == "dir" and not e.is_dir):
+                    continue
+                if not e.is_dir and not keep_file(e):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                if limit is not None and len(items) >= limit:
+                    more = True
+                    break
+                d = entry(e, parent, rel)
+                d["depth"] = lvl
+                items.append(d)
+            out["items"] = items
+            out["next_cursor"] = str(offset + len(items)) if more else None
+        else:
+            top = level(abs_t, cwd)
+            page = top[offset:] if limit is None else top[offset: offset + limit]
+            out["items"] = [node(e, abs_t, cwd, 1) for e in page]
+            out["total"] = len(top)
+            end = offset + len(page)
+            out["next_cursor"] = str(end) if end < len(top) else None
+        if rollup:
+            out["rollup"] = FILES_LIST.rollup(abs_t)
+    except OSError as e:
         raise HTTPException(status_code=500, detail=f"LIST_FAIL: {e}")
+    return out
 
-    return {"ok": True, "cwd": relpath(target), "items": items}
+
+@app.get("/api/files/list/stats")
+def files_list_stats() -> Dict[str, Any]:
+    return {"ok": True, "data": FILES_LIST.stats(), "meta": {"ts": now_iso()}}
 
 
 @app.get("/api/v2/threads/view")
@@ -3485,177 +4123,34 @@ class ImportPayload(BaseModel):
 
 @app.post("/api/v2/content/import")
 def content_import(body: ImportPayload = Body(...)) -> Dict[str, Any]:
-    """Import payload → SQLite v2 upsert + append-only evidence snapshot.
-    Tables are created on first use (idempotent)."""
+    """Import payload → bulk v2 upsert (app/content_bulk.py) + append-only evidence snapshot.
+    Tables come from migrations (002 content v2, 006 FTS); a stale DB answers 503 SCHEMA_OUTDATED.
+    meta.rows_per_sec reports DB ingest throughput."""
     run_id = body.run_id or f"run_{int(time.time()*1000)}"
     now = now_iso()
     items = body.items or []
     cols = body.collections or []
-    upserted = {"items": 0, "collections": 0, "tags": 0}
-
     db_kind = _content_db_kind()
+    err = "SQLITE_IMPORT_FAILED" if db_kind == "sqlite" else "PG_IMPORT_FAILED"
 
-    # 1) Upsert into DB (content v2 schema)
-    def _ensure_schema(con):
-        con.execute(
-            """
-            CREATE TABLE IF NOT EXISTS content_items (
-              id            TEXT PRIMARY KEY,
-              slug          TEXT UNIQUE NOT NULL,
-              title         TEXT NOT NULL,
-              summary       TEXT,
-              body_mdx_path TEXT,
-              thumbnail_url TEXT,
-              price_plan    TEXT,
-              features_json TEXT DEFAULT '[]',
-              links_json    TEXT DEFAULT '{}',
-              updated_at    INTEGER
-            );
-            """
-        )
-        con.execute(
-            """
-            CREATE TABLE IF NOT EXISTS content_tags (
-              id   TEXT PRIMARY KEY,
-              slug TEXT UNIQUE NOT NULL,
-              name TEXT NOT NULL
-            );
-            """
-        )
-        con.execute(
-            """
-            CREATE TABLE IF NOT EXISTS content_item_tags (
-              item_id TEXT NOT NULL,
-              tag_id  TEXT NOT NULL,
-              PRIMARY KEY (item_id, tag_id)
-            );
-            """
-        )
-        con.execute(
-            """
-            CREATE TABLE IF NOT EXISTS content_collections (
-              id   TEXT PRIMARY KEY,
-              slug TEXT UNIQUE NOT NULL,
-              name TEXT NOT NULL
-            );
-            """
-        )
-        con.execute(
-            """
-            CREATE TABLE IF NOT EXISTS content_collection_items (
-              collection_id TEXT NOT NULL,
-              item_id       TEXT NOT NULL,
-              ord           INTEGER DEFAULT 0,
-              PRIMARY KEY (collection_id, item_id)
-            );
-            """
-        )
-        # simple view (tags omitted for speed)
-        con.execute(
-            """
-            CREATE VIEW IF NOT EXISTS content_search_view AS
-            SELECT id, slug, title, summary, thumbnail_url, updated_at, links_json
-            FROM content_items;
-            """
-        )
-
-    if db_kind == "sqlite":
-        with _sqlite_conn() as con:
-            _ensure_schema(con)
-            # items
-            for it in items:
-                js = json.dumps((it.features_json or []), ensure_ascii=False)
-                lj = json.dumps((it.links_json or {}), ensure_ascii=False)
-                updated_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
-                con.execute(
-                    """
-                INSERT INTO content_items(id, slug, title, summary, body_mdx_path, thumbnail_url, price_plan, features_json, links_json, updated_at)
-                VALUES(?,?,?,?,?,?,?,?,?,?)
-                ON CONFLICT(id) DO UPDATE SET
-                  slug=excluded.slug, title=excluded.title, summary=excluded.summary,
-                  body_mdx_path=excluded.body_mdx_path, thumbnail_url=excluded.thumbnail_url,
-                  price_plan=excluded.price_plan, features_json=excluded.features_json,
-                  links_json=excluded.links_json, updated_at=excluded.updated_at
-                """,
-                (
-                    it.id, it.slug, it.title, it.summary, it.body_mdx_path, it.thumbnail_url,
-                    it.price_plan, js, lj, updated_ms,
-                ),
-            )
-                upserted["items"] += 1
-                # tags (optional by slug=name)
-                for tg in (it.features_json or []):
-                    # treat features_json strings as tags if they look like slugs
-                    if not isinstance(tg, str) or not tg:
-                        continue
-                    tag_id = tg
-                    con.execute(
-                        "INSERT OR IGNORE INTO content_tags(id, slug, name) VALUES(?,?,?)",
-                        (tag_id, tag_id, tag_id),
-                    )
-                    try:
-                        con.execute(
-                            "INSERT OR IGNORE INTO content_item_tags(item_id, tag_id) VALUES(?,?)",
-                            (it.id, tag_id),
-                        )
-                    except Exception:
-                        pass
-            # collections
-            for c in cols:
-                con.execute(
-                    "INSERT OR REPLACE INTO content_collections(id, slug, name) VALUES(?,?,?)",
-                    (c.id, c.slug, c.name),
-                )
-                upserted["collections"] += 1
-                for iid in (c.items or []):
-                    con.execute(
-                        "INSERT OR IGNORE INTO content_collection_items(collection_id, item_id, ord) VALUES(?,?,?)",
-                        (c.id, iid, 0),
-                    )
-            con.commit()
-    else:
-        # Postgres path (best-effort; requires psycopg2 and CONTENT_PG_URL)
-        try:
+    # 1) Bulk upsert into DB (content v2 schema): SQLite chunked executemany, PG COPY → staging → merge
+    try:
+        if db_kind == "sqlite":
+            _require_schema("sqlite")
+            chunk = int(ENV.get("CONTENT_IMPORT_CHUNK") or content_bulk.SQLITE_CHUNK)
+            with _sqlite_conn() as con:
+                stats = content_bulk.upsert_sqlite(con, items, cols, chunk=chunk)
+        else:
+            _require_schema("pg")
             with _pg_conn() as con:
-                con.autocommit = True
-                cur = con.cursor()
-                # ensure schema (idempotent)
-                cur.execute(open("db/schema/postgres/content_v2.sql","r",encoding="utf-8").read())
-                # items
-                for it in items:
-                    js = json.dumps((it.features_json or []), ensure_ascii=False)
-                    lj = json.dumps((it.links_json or {}), ensure_ascii=False)
-                    cur.execute(
-                        """
-                        INSERT INTO content.items(id, slug, title, summary, body_mdx_path, thumbnail_url, price_plan, features_json, links_json)
-                        VALUES(%s,%s,%s,%s,%s,%s,%s,%s::jsonb,%s::jsonb)
-                        ON CONFLICT(id) DO UPDATE SET
-                          slug=excluded.slug, title=excluded.title, summary=excluded.summary,
-                          body_mdx_path=excluded.body_mdx_path, thumbnail_url=excluded.thumbnail_url,
-                          price_plan=excluded.price_plan, features_json=excluded.features_json,
-                          links_json=excluded.links_json, updated_at=now()
-                        """,
-                        (it.id, it.slug, it.title, it.summary, it.body_mdx_path, it.thumbnail_url, it.price_plan, js, lj),
-                    )
-                    upserted["items"] += 1
-                    for tg in (it.features_json or []):
-                        if not isinstance(tg, str) or not tg:
-                            continue
-                        cur.execute("INSERT INTO content.tags(id, slug, name) VALUES(%s,%s,%s) ON CONFLICT(id) DO NOTHING", (tg, tg, tg))
-                        cur.execute("INSERT INTO content.item_tags(item_id, tag_id) VALUES(%s,%s) ON CONFLICT DO NOTHING", (it.id, tg))
-                for c in cols:
-                    cur.execute(
-                        "INSERT INTO content.collections(id, slug, name) VALUES(%s,%s,%s) ON CONFLICT(id) DO UPDATE SET slug=excluded.slug, name=excluded.name",
-                        (c.id, c.slug, c.name),
-                    )
-                    upserted["collections"] += 1
-                    for iid in (c.items or []):
-                        cur.execute(
-                            "INSERT INTO content.collection_items(collection_id, item_id, ord) VALUES(%s,%s,%s) ON CONFLICT DO NOTHING",
-                            (c.id, iid, 0),
-                        )
-        except Exception as e:
-            return {"ok": False, "error": f"PG_IMPORT_FAILED: {e}", "meta": {"ts": now_iso()}}
+                stats = content_bulk.upsert_pg(con, items, cols)
+    except content_bulk.BulkImportError as e:
+        return {"ok": False, "error": f"{err}: {e}", "data": {"committed": e.committed}, "meta": {"ts": now_iso()}}
+    except HTTPException:
+        raise
+    except Exception as e:
+        return {"ok": False, "error": f"{err}: {e}", "meta": {"ts": now_iso()}}
+    upserted = {k: stats[k] for k in ("items", "collections", "tags")}
 
     day = datetime.now(timezone.utc).strftime("%Y%m%d")
     out_dir = CONTENT_IMPORT_DIR / day
@@ -3668,71 +4163,60 @@ def content_import(body: ImportPayload = Body(...)) -> Dict[str, Any]:
         "collections": [c.model_dump() for c in cols],
         "ts": now,
     }
-    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    # serialize once: the run snapshot and latest.json carry the same bytes
+    snapshot = json.dumps(payload, ensure_ascii=False, indent=2)
+    out_path.write_text(snapshot, encoding="utf-8")
+    try:
+        update_latest(CONTENT_IMPORT_DIR, out_path, key=now, meta={"run_id": run_id})
+    except Exception:
+        pass
 
     # keep a latest snapshot for search stub
     latest = CONTENT_EVIDENCE_ROOT / "latest.json"
-    latest.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    latest.write_text(snapshot, encoding="utf-8")
+    # the upsert bumped content_rev: re-render what crawlers fetch before they ask again
+    if REVALIDATE_QUEUE.running:
+        for k, prio in REVALIDATE_KEYS.items():
+            REVALIDATE_QUEUE.enqueue(k, prio, f"import:{run_id}")
+    else:
+        _render_invalidate()
 
-    return {"ok": True, "upserted": upserted, "meta": {"ts": now, "evidence": relpath(out_path)}}
+    return {
+        "ok": True,
+        "upserted": upserted,
+        "meta": {
+            "ts": now,
+            "evidence": relpath(out_path),
+            "db": db_kind,
+            "elapsed_ms": stats["elapsed_ms"],
+            "rows_per_sec": stats["rows_per_sec"],
+        },
+    }
 
 
 @app.get("/api/v2/content/search")
-def content_search(q: Optional[str] = None, page: int = 1, size: int = 20) -> Dict[str, Any]:
-    """Search via content_search_view (title/summary LIKE filter). Uses SQLite by default; PG if GG_CONTENT_DB=pg."""
+def content_search(q: Optional[str] = None, page: int = 1, size: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Search content items. SQLite: FTS5 (bm25 + snippet); PG (GG_CONTENT_DB=pg): tsvector/GIN + pg_trgm.
+    Pagination: pass data.next_cursor back as `cursor` (keyset); `page` is kept for old callers.
+    `total` is an exact count cached per content revision."""
     page = max(1, int(page or 1))
-    size = max(1, int(size or 20))
-    like = f"%{(q or '').strip()}%"
-    items: List[Dict[str, Any]] = []
-    total = 0
+    size = max(1, min(100, int(size or 20)))
+    offset = 0 if cursor else (page - 1) * size
     if _content_db_kind() == "sqlite":
+        _require_schema("sqlite")
         with _sqlite_conn() as con:
-            # ensure view exists
-            try:
-                con.execute("select 1 from content_search_view limit 1")
-            except Exception:
-                con.execute(
-                    "CREATE VIEW IF NOT EXISTS content_search_view AS SELECT id, slug, title, summary, thumbnail_url, updated_at, links_json FROM content_items"
-                )
-            if (q or "").strip():
-                cur = con.execute(
-                    "SELECT id, slug, title, summary, thumbnail_url, updated_at, links_json FROM content_search_view WHERE title LIKE ? OR summary LIKE ? ORDER BY updated_at DESC LIMIT ? OFFSET ?",
-                    (like, like, size, (page - 1) * size),
-                )
-                items = [dict(row) for row in cur.fetchall()]
-                total = len(items)  # simple approx for stub
-            else:
-                cur = con.execute(
-                    "SELECT id, slug, title, summary, thumbnail_url, updated_at, links_json FROM content_search_view ORDER BY updated_at DESC LIMIT ? OFFSET ?",
-                    (size, (page - 1) * size),
-                )
-                items = [dict(row) for row in cur.fetchall()]
-                total = len(items)
+            res = content_fts.search_sqlite(con, _sqlite_path(), q, size, cursor=cursor, offset=offset)
     else:
         # Postgres path
         try:
+            _require_schema("pg")
             with _pg_conn() as con:
-                cur = con.cursor()
-                if (q or "").strip():
-                    cur.execute(
-                        "SELECT id, slug, title, summary, thumbnail_url, updated_at, links_json::text FROM content_search_view WHERE title ILIKE %s OR summary ILIKE %s ORDER BY updated_at DESC LIMIT %s OFFSET %s",
-                        (like, like, size, (page - 1) * size),
-                    )
-                else:
-                    cur.execute(
-                        "SELECT id, slug, title, summary, thumbnail_url, updated_at, links_json::text FROM content_search_view ORDER BY updated_at DESC LIMIT %s OFFSET %s",
-                        (size, (page - 1) * size),
-                    )
-                rows = cur.fetchall()
-                for r in rows:
-                    items.append({
-                        "id": r[0], "slug": r[1], "title": r[2], "summary": r[3], "thumbnail_url": r[4],
-                        "updated_at": r[5].isoformat().replace("+00:00","Z") if hasattr(r[5], 'isoformat') else str(r[5]),
-                        "links_json": r[6],
-                    })
-                total = len(items)
+                res = content_fts.search_pg(con, _pg_db_key(), q, size, cursor=cursor, offset=offset)
+        except HTTPException:
+            raise
         except Exception as e:
             return {"ok": False, "error": f"PG_SEARCH_FAILED: {e}", "data": {"items": [], "total": 0}, "meta": {"ts": now_iso()}}
+    items = res["items"]
     # normalize
     for it in items:
         it["links_json"] = json.loads(it.get("links_json") or "{}") if isinstance(it.get("links_json"), str) else (it.get("links_json") or {})
@@ -3742,23 +4226,112 @@ def content_search(q: Optional[str] = None, page: int = 1, size: int = 20) -> Di
             it["updated_at"] = datetime.fromtimestamp(ms/1000, tz=timezone.utc).isoformat().replace("+00:00","Z")
         except Exception:
             pass
-    return {"ok": True, "data": {"items": items, "total": total}, "meta": {"ts": now_iso()}}
+    return {
+        "ok": True,
+        "data": {"items": items, "total": res["total"], "next_cursor": res["next_cursor"]},
+        "meta": {"ts": now_iso(), "mode": res["mode"]},
+    }
 
 
 class RevalidateReq(BaseModel):
     paths: List[str]
     reason: Optional[str] = None
+    priority: Optional[int] = Field(None, ge=0, le=9, description="0 = urgent … 9 = background (기본: 키별)")
+
+
+# ---------- Content v2 — revalidation queue (app/revalidate_queue.py) ----------
+# Derived artifacts, their default priority (lower runs first) and what a path invalidates.
+REVALIDATE_KEYS: Dict[str, int] = {
+    "sitemap/index": 1,
+    "sitemap/items": 1,
+    "sitemap/areas": 2,
+    "search": 3,
+    "jsonld/breadcrumbs": 5,
+    "jsonld/article": 5,
+    "jsonld/localbusiness": 5,
+}
+
+
+def _revalidate_keys(path: str) -> List[str]:
+    """Site path → artifact keys. '*' or '/' = everything; unknown pages = their JSON-LD."""
+    p = (path or "").strip().lstrip("/")
+    if p in {"", "*"}:
+        return list(REVALIDATE_KEYS)
+    if p.startswith("sitemap") or p.endswith(".xml"):
+        return ["sitemap/index", "sitemap/items", "sitemap/areas"]
+    if p.startswith("areas/"):
+        return ["sitemap/areas", "jsonld/breadcrumbs"]
+    if p.startswith(SITEMAP_ITEM_PATH.split("{", 1)[0].lstrip("/") or "items/"):
+        return ["sitemap/items", "search", "jsonld/article", "jsonld/breadcrumbs"]
+    if p.startswith("search"):
+        return ["search"]
+    return ["jsonld/breadcrumbs", "jsonld/article", "jsonld/localbusiness"]
+
+
+def _revalidate_rebuild(key: str) -> Dict[str, Any]:
+    """Worker handler: re-render the cached variants of one artifact at the current revision."""
+    if key == "search":
+        return {"dropped": content_fts.COUNT_CACHE.clear()}
+    return RENDER_CACHE.rebuild(key, _content_rev(fresh=True))
+
+
+REVALIDATE_QUEUE = RevalidateQueue(
+    _revalidate_rebuild,
+    debounce_ms=int(ENV.get("REVALIDATE_DEBOUNCE_MS") or 250),
+    max_delay_ms=int(ENV.get("REVALIDATE_MAX_DELAY_MS") or 5000),
+)
+
+
+@app.on_event("startup")
+def _start_revalidate_worker() -> None:
+    """GG_REVALIDATE_WORKER=0 → no worker; /revalidate then rebuilds inline."""
+    if str(ENV.get("GG_REVALIDATE_WORKER") or "1").strip().lower() not in {"0", "false", "no", "off"}:
+        REVALIDATE_QUEUE.start()
+
+
+@app.on_event("shutdown")
+def _stop_revalidate_worker() -> None:
+    REVALIDATE_QUEUE.stop()
 
 
 @app.post("/api/v2/content/revalidate")
 def content_revalidate(req: RevalidateReq) -> Dict[str, Any]:
+    """Queue rebuilds for the artifacts behind `paths` (dedup per key, bursts coalesced).
+    Evidence of the request is written as before; progress: GET /api/v2/content/revalidate/status."""
     day = datetime.now(timezone.utc).strftime("%Y%m%d")
     out_dir = CONTENT_REVALIDATE_DIR / day
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / f"revalidate_{int(time.time()*1000)}.json"
     payload = {"paths": req.paths, "reason": req.reason, "ts": now_iso()}
     out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    return {"ok": True, "revalidated": req.paths, "meta": {"ts": now_iso(), "evidence": relpath(out_path)}}
+    try:
+        update_latest(CONTENT_REVALIDATE_DIR, out_path, key=payload["ts"])
+    except Exception:
+        pass
+    keys: List[str] = []
+    for p in req.paths:
+        keys += [k for k in _revalidate_keys(p) if k not in keys]
+    if REVALIDATE_QUEUE.running:
+        jobs = [
+            REVALIDATE_QUEUE.enqueue(k, REVALIDATE_KEYS[k] if req.priority is None else req.priority, req.reason)
+            for k in keys
+        ]
+    else:
+        jobs = [{"key": k, "state": "done", "result": _revalidate_rebuild(k)} for k in keys]
+    return {
+        "ok": True,
+        "revalidated": req.paths,
+        "data": {"jobs": jobs},
+        "meta": {"ts": now_iso(), "evidence": relpath(out_path), "queue_depth": REVALIDATE_QUEUE.status()["depth"]},
+    }
+
+
+@app.get("/api/v2/content/revalidate/status")
+def content_revalidate_status() -> Dict[str, Any]:
+    """Queue depth, in-flight key, wait/run latency and the last rebuild per artifact key."""
+    data = REVALIDATE_QUEUE.status()
+    data["render_cache"] = RENDER_CACHE.stats()
+    return {"ok": True, "data": data, "meta": {"ts": now_iso()}}
 
 
 @app.get("/api/memory/recall")
@@ -3811,6 +4384,29 @@ def memory_recall(scope: Optional[str] = None, per_tier: int = 3) -> Dict[str, A
     return {"ok": True, "data": {"cards": out, "path": relpath(card_path)}, "meta": {"ts": now_iso()}}
 
 # ST-1204 — Gate API skeleton (propose/approve/reject/list/item/stats)
+# Record lookups/listing/stats go through the SQLite catalog (app/gate_catalog.GATE_CATALOG,
+# the one process-wide instance: a single connection and sync throttle)
+GATE_STATES = ("pending", "approved", "rejected")
+GATE_DEDUP = ContentHashIndex(
+    approved_root=EVIDENCE_ROOT / "memory" / "gate" / "approved",
+    l5_root=EVIDENCE_ROOT / "memory" / "tiers" / "ultra_long",
+)
+
+
+def _gate_near_dup_mode() -> str:
+    """GATE_NEAR_DUP: off | warn (default, flag only) | block (409 NEAR_DUPLICATE on approve)."""
+    m = (os.environ.get("GATE_NEAR_DUP") or "warn").strip().lower()
+    return m if m in ("off", "warn", "block") else "warn"
+
+
+def _gate_near_dup_jaccard() -> float:
+    """GATE_NEAR_DUP_JACCARD: minimum estimated Jaccard (char 3-grams) to flag, default 0.5."""
+    try:
+        return max(0.3, min(1.0, float(os.environ.get("GATE_NEAR_DUP_JACCARD", str(NEAR_JACCARD_MIN)))))
+    except Exception:
+        return NEAR_JACCARD_MIN
+
+
 class GateProposeRequest(BaseModel):
     text: str
     refs: List[str]
@@ -3855,6 +4451,13 @@ def gate_propose(body: GateProposeRequest = Body(...)) -> Dict[str, Any]:
     # Diversity (house-only relax heuristic: single repo → need 4 refs & distinct subroots)
     div = compute_source_diversity(refs, house_only_relax=False)
 
+    # Duplicate / near-duplicate pre-check against approved + L5 (index lookups only)
+    dup_hits = GATE_DEDUP.lookup(h)
+    near_mode = _gate_near_dup_mode()
+    near = GATE_DEDUP.near(final_text, min_jaccard=_gate_near_dup_jaccard()) if near_mode != "off" else []
+    dup_ids = sorted({str(x.get("gate_id") or x.get("item_id")) for x in dup_hits} | {str(n.get("gate_id") or n.get("item_id")) for n in near})
+    top_sim = max([1.0] if dup_hits else [n["similarity"] for n in near] or [0.0])
+
     # Compose proposal
     gid = ulid()
     now = now_iso()
@@ -3872,17 +4475,17 @@ def gate_propose(body: GateProposeRequest = Body(...)) -> Dict[str, Any]:
         "sha256": h,
         "source_roots": [extract_source_root(r.split("#", 1)[0]) for r in refs],
         "source_diversity_ok": bool(div.get("source_diversity_ok")),
-        "dup_candidates": [],
+        "dup_candidates": dup_ids,
         "pii_flags": pii.get("flags") or [],
         "auto_checks": {
             "ref_count_ok": bool(div.get("ref_count_ok")),
             "source_diversity_ok": bool(div.get("source_diversity_ok")),
             "pii_detected": bool(pii.get("flags")),
             "redaction_suggested": bool(pii.get("redaction_suggested")),
-            "duplicate_sha256": False,
-            "similarity_warning": False,
-            "similarity_block": False,
-            "top_similarity": 0.0,
+            "duplicate_sha256": bool(dup_hits),
+            "similarity_warning": bool(near) and not dup_hits,
+            "similarity_block": bool(near) and not dup_hits and near_mode == "block",
+            "top_similarity": top_sim,
             "notes": [],
         },
         "embedding_version": os.environ.get("EMBEDDING_VERSION", None),
@@ -3894,6 +4497,7 @@ def gate_propose(body: GateProposeRequest = Body(...)) -> Dict[str, Any]:
     base_dir.mkdir(parents=True, exist_ok=True)
     ppath = base_dir / f"{gid}.json"
     ppath.write_text(json.dumps(proposal, ensure_ascii=False, indent=2), encoding="utf-8")
+    GATE_CATALOG.record(ppath, proposal)
 
     # Audit
     audit = append_audit(actor=proposer, action="PROPOSE", gate_id=gid, meta={
@@ -3921,14 +4525,7 @@ def gate_patch_proposal(id: str, payload: Dict[str, Any] = Body(...)) -> Dict[st
     if not id:
         raise HTTPException(status_code=400, detail="id required")
     # Locate pending
-    gate_dir = EVIDENCE_ROOT / "memory" / "gate" / "pending"
-    target = None
-    if gate_dir.exists():
-        for d in sorted(gate_dir.iterdir(), reverse=True):
-            f = d / f"{id}.json"
-            if f.exists():
-                target = f
-                break
+    target = GATE_CATALOG.find(id, "pending")
     if not target:
         raise HTTPException(status_code=404, detail="Proposal not found")
     obj = json.loads(target.read_text(encoding="utf-8"))
@@ -3942,6 +4539,7 @@ def gate_patch_proposal(id: str, payload: Dict[str, Any] = Body(...)) -> Dict[st
     # Optional typo_fixes ignored/minimized for now
 
     target.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    GATE_CATALOG.record(target, obj)
     au = append_audit(actor=str(obj.get("proposer") or "unknown"), action="PATCH", gate_id=id, meta={
         "fields": ["redacted_text"],
         "path": relpath(target),
@@ -3960,14 +4558,7 @@ def gate_withdraw(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
     actor = (payload or {}).get("actor") or "unknown"
     if not pid:
         raise HTTPException(status_code=400, detail="id required")
-    gate_dir = EVIDENCE_ROOT / "memory" / "gate" / "pending"
-    target = None
-    if gate_dir.exists():
-        for d in sorted(gate_dir.iterdir(), reverse=True):
-            f = d / f"{pid}.json"
-            if f.exists():
-                target = f
-                break
+    target = GATE_CATALOG.find(pid, "pending")
     if not target:
         raise HTTPException(status_code=404, detail="Proposal not found")
     obj = json.loads(target.read_text(encoding="utf-8"))
@@ -3975,6 +4566,7 @@ def gate_withdraw(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
         raise HTTPException(status_code=409, detail="Not allowed")
     obj["state"] = "withdrawn"
     target.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    GATE_CATALOG.record(target, obj)
     audit = append_audit(actor=actor, action="WITHDRAW", gate_id=pid, meta={"state": "withdrawn", "path": relpath(target)})
     return {
         "ok": True,
@@ -3994,13 +4586,7 @@ def gate_approve(body: GateApproveRequest = Body(...)) -> Dict[str, Any]:
         raise HTTPException(status_code=400, detail="id required")
 
     # Find pending
-    gate_dir = EVIDENCE_ROOT / "memory" / "gate" / "pending"
-    pfile = None
-    for d in sorted(gate_dir.iterdir(), reverse=True) if gate_dir.exists() else []:
-        f = d / f"{gid}.json"
-        if f.exists():
-            pfile = f
-            break
+    pfile = GATE_CATALOG.find(gid, "pending")
     if not pfile:
         raise HTTPException(status_code=404, detail="Proposal not found")
 
@@ -4021,34 +4607,15 @@ def gate_approve(body: GateApproveRequest = Body(...)) -> Dict[str, Any]:
 
     approved_sha = sha256_text(final_text)
 
-    # Duplicate check (approved set + L5 ultra_long) with rglob and debug evidence
+    # Duplicate check (approved set + L5 ultra_long) via the content-hash index, with debug evidence
     appr_dir_root = EVIDENCE_ROOT / "memory" / "gate" / "approved"
-    found_approved: List[str] = []
-    if appr_dir_root.exists():
-        for jf in appr_dir_root.rglob("*.json"):
-            try:
-                jo = json.loads(jf.read_text(encoding="utf-8"))
-                if jo.get("approved_sha256") == approved_sha:
-                    found_approved.append(relpath(jf))
-            except Exception:
-                continue
-    l5_dir = MEM_TIER_DIR / "ultra_long"
-    found_l5: List[str] = []
-    if l5_dir.exists():
-        for jl in l5_dir.rglob("*.jsonl"):
-            try:
-                with jl.open("r", encoding="utf-8") as f:
-                    for line in f:
-                        try:
-                            obj = json.loads(line)
-                        except Exception:
-                            continue
-                        txt = str(obj.get("text") or "")
-                        if sha256_text(txt) == approved_sha:
-                            found_l5.append(relpath(jl))
-                            break
-            except Exception:
-                continue
+    hits = GATE_DEDUP.lookup(approved_sha)
+    found_approved: List[str] = sorted({relpath(h["path"]) for h in hits if h["source"] == "approved"})
+    found_l5: List[str] = sorted({relpath(h["path"]) for h in hits if h["source"] == "l5"})
+    near_mode = _gate_near_dup_mode()
+    near: List[Dict[str, Any]] = []
+    if near_mode != "off" and not hits:
+        near = [n for n in GATE_DEDUP.near(final_text, min_jaccard=_gate_near_dup_jaccard()) if n["gate_id"] != gid]
     # Write de-dup debug evidence
     try:
         dbg_dir = EVIDENCE_ROOT / "memory" / "gate" / "audit"
@@ -4060,12 +4627,16 @@ def gate_approve(body: GateApproveRequest = Body(...)) -> Dict[str, Any]:
                 "id": gid,
                 "approved_sha256": approved_sha,
                 "found_approved": found_approved,
-                "found_l5": found_l5
+                "found_l5": found_l5,
+                "near": [{"gate_id": n["gate_id"], "similarity": n["similarity"], "path": relpath(n["path"])} for n in near],
+                "near_mode": near_mode,
             }, ensure_ascii=False) + "\n")
     except Exception:
         pass
     if found_approved or found_l5:
         raise HTTPException(status_code=409, detail="DUPLICATE")
+    if near and near_mode == "block":
+        raise HTTPException(status_code=409, detail="NEAR_DUPLICATE")
 
     # Issue gate token
     token = make_gate_token(gid, approved_sha, secret=os.environ.get("GATE_HMAC_SECRET", ""))
@@ -4107,6 +4678,8 @@ def gate_approve(body: GateApproveRequest = Body(...)) -> Dict[str, Any]:
     }
     afile = appr_dir / f"{gid}.json"
     afile.write_text(json.dumps(arec, ensure_ascii=False, indent=2), encoding="utf-8")
+    GATE_CATALOG.record(afile, arec)
+    GATE_DEDUP.add("approved", afile, approved_sha, item_id=gid, gate_id=gid)
 
     # Gate upsert log (summary)
     up_dir = STATUS_ROOT / "resources" / "vector_index"
@@ -4133,7 +4706,7 @@ def gate_approve(body: GateApproveRequest = Body(...)) -> Dict[str, Any]:
     return {
         "ok": True,
         "data": {"state": "approved", "approved": arec, "audit_appended": True, "audit_path": au.get("path")},
-        "meta": {"ts": now_iso()},
+        "meta": {"ts": now_iso(), "near_duplicates": [n["gate_id"] for n in near]},
     }
 
 @app.post("/api/memory/gate/reject")
@@ -4142,13 +4715,7 @@ def gate_reject(body: GateRejectRequest = Body(...)) -> Dict[str, Any]:
     if not gid:
         raise HTTPException(status_code=400, detail="id required")
     # Locate pending
-    gate_dir = EVIDENCE_ROOT / "memory" / "gate" / "pending"
-    pfile = None
-    for d in sorted(gate_dir.iterdir(), reverse=True) if gate_dir.exists() else []:
-        f = d / f"{gid}.json"
-        if f.exists():
-            pfile = f
-            break
+    pfile = GATE_CATALOG.find(gid, "pending")
     if not pfile:
         raise HTTPException(status_code=404, detail="Proposal not found")
 
@@ -4169,6 +4736,7 @@ def gate_reject(body: GateRejectRequest = Body(...)) -> Dict[str, Any]:
     }
     rpath = rej_dir / f"{gid}.json"
     rpath.write_text(json.dumps(rec, ensure_ascii=False, indent=2), encoding="utf-8")
+    GATE_CATALOG.record(rpath, rec)
 
     au = append_audit(actor=body.approver, action="REJECT", gate_id=gid, meta={
         "state": "rejected",
@@ -4184,78 +4752,55 @@ def gate_reject(body: GateRejectRequest = Body(...)) -> Dict[str, Any]:
     }
 
 @app.get("/api/memory/gate/list")
-def gate_list(state: Optional[str] = None, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-    roots = {
-        "pending": EVIDENCE_ROOT / "memory" / "gate" / "pending",
-        "approved": EVIDENCE_ROOT / "memory" / "gate" / "approved",
-        "rejected": EVIDENCE_ROOT / "memory" / "gate" / "rejected",
+def gate_list(
+    state: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    proposer: Optional[str] = None,
+    approver: Optional[str] = None,
+    scope_id: Optional[str] = None,
+    diversity_ok: Optional[bool] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Dict[str, Any]:
+    lim = max(1, min(200, int(limit or 50)))
+    off = max(0, int(offset or 0))
+    items, total = GATE_CATALOG.list(
+        state=state if state in GATE_STATES else None,
+        proposer=proposer,
+        approver=approver,
+        scope_id=scope_id,
+        source_diversity_ok=diversity_ok,
+        since=since,
+        until=until,
+        limit=lim,
+        offset=off,
+    )
+    for it in items:
+        it["path"] = relpath(it["path"])
+    next_offset = off + len(items) if off + len(items) < total else None
+    return {
+        "ok": True,
+        "data": {"items": items, "count": total, "state": state, "limit": lim, "offset": off, "next_offset": next_offset},
+        "meta": {"ts": now_iso()},
     }
-    items: List[Dict[str, Any]] = []
-    states = [state] if state in roots else ["pending", "approved", "rejected"]
-    for st in states:
-        base = roots[st]
-        if not base.exists():
-            continue
-        for d in sorted(base.iterdir(), reverse=True):
-            for jf in sorted(d.glob("*.json")):
-                try:
-                    o = json.loads(jf.read_text(encoding="utf-8"))
-                    excerpt = (o.get("text") or o.get("redacted_text") or o.get("proposal_excerpt") or "")[:120]
-                    items.append({
-                        "id": o.get("id"),
-                        "state": st,
-                        "created_at": o.get("created_at") or o.get("approved_at") or o.get("rejected_at"),
-                        "proposer": o.get("proposer"),
-                        "approver": o.get("approver"),
-                        "excerpt": excerpt,
-                        "refs_count": len(o.get("refs") or []),
-                        "source_roots": o.get("source_roots") or [],
-                        "path": relpath(jf),
-                    })
-                except Exception:
-                    continue
-    sliced = items[offset: offset + max(1, min(200, int(limit or 50)))]
-    return {"ok": True, "data": {"items": sliced, "count": len(items), "state": state}, "meta": {"ts": now_iso()}}
 
 @app.get("/api/memory/gate/item/{id}")
 def gate_item(id: str) -> Dict[str, Any]:
-    def find_in(root: Path) -> Optional[Tuple[str, Dict[str, Any]]]:
-        if not root.exists():
-            return None
-        for d in sorted(root.iterdir(), reverse=True):
-            f = d / f"{id}.json"
-            if f.exists():
-                try:
-                    return (relpath(f), json.loads(f.read_text(encoding="utf-8")))
-                except Exception:
-                    return (relpath(f), {})
-        return None
-    roots = {
-        "pending": EVIDENCE_ROOT / "memory" / "gate" / "pending",
-        "approved": EVIDENCE_ROOT / "memory" / "gate" / "approved",
-        "rejected": EVIDENCE_ROOT / "memory" / "gate" / "rejected",
-    }
-    for st, rp in roots.items():
-        found = find_in(rp)
-        if found:
-            p, obj = found
-            return {"ok": True, "data": {"state": st, "path": p, **({"proposal": obj} if st == "pending" else ({st: obj}))}, "meta": {"ts": now_iso()}}
-    raise HTTPException(status_code=404, detail="Not found")
+    found = GATE_CATALOG.find_any(id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Not found")
+    st, fp = found
+    try:
+        obj = json.loads(fp.read_text(encoding="utf-8"))
+    except Exception:
+        obj = {}
+    return {"ok": True, "data": {"state": st, "path": relpath(fp), **({"proposal": obj} if st == "pending" else ({st: obj}))}, "meta": {"ts": now_iso()}}
 
 @app.get("/api/memory/gate/stats")
 def gate_stats() -> Dict[str, Any]:
-    def count(dirp: Path) -> int:
-        if not dirp.exists():
-            return 0
-        n = 0
-        for d in dirp.iterdir():
-            if d.is_dir():
-                n += sum(1 for _ in d.glob("*.json"))
-        return n
-    pending = EVIDENCE_ROOT / "memory" / "gate" / "pending"
-    approved = EVIDENCE_ROOT / "memory" / "gate" / "approved"
-    rejected = EVIDENCE_ROOT / "memory" / "gate" / "rejected"
-    pc, ac, rc = count(pending), count(approved), count(rejected)
+    counts = GATE_CATALOG.counts()
+    pc, ac, rc = counts["pending"], counts["approved"], counts["rejected"]
     rate = (ac / max(1, (pc + ac + rc))) if (pc + ac + rc) else 0.0
     # Optional snapshot
     snapdir = EVIDENCE_ROOT / "memory" / "gate" / "audit"
@@ -4265,7 +4810,28 @@ def gate_stats() -> Dict[str, Any]:
         snap_rel = relpath(snap)
     except Exception:
         snap_rel = None
-    return {"ok": True, "data": {"pending_count": pc, "approved_count": ac, "rejected_count": rc, "approval_rate": rate}, "meta": {"ts": now_iso(), "snapshot_path": snap_rel}}
+    return {"ok": True, "data": {"pending_count": pc, "approved_count": ac, "rejected_count": rc, "approval_rate": rate}, "meta": {"ts": now_iso(), "snapshot_path": snap_rel, "catalog": GATE_CATALOG.stats}}
+
+@app.get("/api/memory/gate/audit/verify")
+def gate_audit_verify(day: Optional[str] = None, full: int = 0) -> Dict[str, Any]:
+    """Verify a day's gate audit chain (YYYYMMDD, default today); reports the first break."""
+    if day and not re.fullmatch(r"\d{8}", day):
+        raise HTTPException(status_code=422, detail="INVALID_DAY")
+    res = verify_audit_chain(day=day, incremental=not bool(full))
+    res["path"] = relpath(Path(res["path"]))
+    return {"ok": True, "data": res, "meta": {"ts": now_iso()}}
+
+@app.get("/api/memory/gate/dedup/verify")
+def gate_dedup_verify() -> Dict[str, Any]:
+    """Diff the content-hash index (approved + L5) against disk."""
+    sync = GATE_DEDUP.sync(force=True)
+    return {"ok": True, "data": GATE_DEDUP.verify(), "meta": {"ts": now_iso(), "sync": sync}}
+
+@app.post("/api/memory/gate/dedup/rebuild")
+def gate_dedup_rebuild() -> Dict[str, Any]:
+    """Drop and rebuild the content-hash index from disk."""
+    stats = GATE_DEDUP.rebuild()
+    return {"ok": True, "data": {"rebuild": stats, "verify": GATE_DEDUP.verify()}, "meta": {"ts": now_iso()}}
 
 # ST-1203 — Uncontrolled speech anchoring v1 (recent ST/BT cards + top memory evidence)
 
@@ -4326,19 +4892,15 @@ def _meeting_snapshot(session_id: str, limit: int = 10) -> Dict[str, Any]:
     events_path = STORE.events_path(mid)
     events: List[Dict[str, Any]] = []
     if events_path.exists():
-        for ln in _tail_lines(events_path, limit=max(1, min(100, limit))):
-            try:
-                obj = json.loads((ln or "").strip())
-                if isinstance(obj, dict):
-                    # keep only minimal keys
-                    events.append({
-                        "ts": obj.get("ts"),
-                        "type": obj.get("type"),
-                        "note": obj.get("note") or obj.get("text"),
-                        "attachment": obj.get("attachment"),
-                    })
-            except Exception:
-                continue
+        for _seq, obj in STORE.log(mid).tail(max(1, min(100, limit))):
+            if isinstance(obj, dict):
+                # keep only minimal keys
+                events.append({
+                    "ts": obj.get("ts"),
+                    "type": obj.get("type"),
+                    "note": obj.get("note") or obj.get("text"),
+                    "attachment": obj.get("attachment"),
+                })
 
     start_marker = mdir / "recording.started.json"
     stop_marker = mdir / "recording.stopped.json"
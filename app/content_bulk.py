@@ -0,0 +1,271 @@
+"""
+content_bulk.py — Bulk upsert for /api/v2/content/import (SQLite executemany / Postgres COPY)
+
+Features:
+- Rows are flattened once (items, tags from features_json strings, collections, memberships)
+- SQLite: executemany INSERT … ON CONFLICT DO UPDATE in chunked transactions (one commit per chunk);
+  for large payloads the per-row FTS triggers are swapped for one set-based index update per chunk
+- Postgres: COPY into temp staging tables, then one set-based merge per table in a single
+  transaction (duplicate ids within a payload: last one wins, like the row-by-row loop did)
+- Returns rows/sec so callers can log import throughput
+
+Notes:
+- Semantics match the old per-row loop: items upsert (updated_at = now), tags/memberships
+  insert-if-missing, collections replace
+- SQLite chunks commit independently: a failure reports how many rows were already committed
+- Deferred FTS: inside each chunk transaction the content_items_fts insert/update triggers are
+  dropped, the chunk's old rows are 'delete'd from the index, rows are upserted, the new rows are
+  indexed with one INSERT … SELECT, content_rev is bumped once and the triggers are recreated from
+  their stored SQL. DDL is transactional in SQLite, so other connections never see the triggers
+  missing. Per-row trigger maintenance was ~5× slower than the set-based insert (trigram index)
+
+CLI (dev):
+  python scripts/tests/content_import_bench.py --items 100000
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+SQLITE_CHUNK = 5000
+SQLITE_DEFER_FTS_MIN = 500  # smaller imports keep the per-row triggers
+_FTS_TRIGGERS = ("content_items_fts_ai", "content_items_fts_au")
+
+_SQLITE_ITEM_UPSERT = """
+INSERT INTO content_items(id, slug, title, summary, body_mdx_path, thumbnail_url, price_plan, features_json, links_json, updated_at)
+VALUES(?,?,?,?,?,?,?,?,?,?)
+ON CONFLICT(id) DO UPDATE SET
+  slug=excluded.slug, title=excluded.title, summary=excluded.summary,
+  body_mdx_path=excluded.body_mdx_path, thumbnail_url=excluded.thumbnail_url,
+  price_plan=excluded.price_plan, features_json=excluded.features_json,
+  links_json=excluded.links_json, updated_at=excluded.updated_at
+"""
+
+
+class BulkImportError(RuntimeError):
+    def __init__(self, msg: str, committed: int) -> None:
+        super().__init__(msg)
+        self.committed = committed
+
+
+def _get(obj: Any, key: str) -> Any:
+    return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+
+def flatten(items: Iterable[Any], collections: Iterable[Any] = ()) -> Dict[str, List[Any]]:
+    """ContentItem/ContentCollection models (or dicts) → row tuples per table.
+    items: (id, slug, title, summary, body_mdx_path, thumbnail_url, price_plan, features_json, links_json)
+    links_end[i]: end offset into item_tags for items[i] (so item chunks slice their links in O(1))"""
+    rows: Dict[str, List[Any]] = {
+        "items": [], "tags": [], "item_tags": [], "links_end": [], "collections": [], "collection_items": [],
+    }
+    tags_seen: set = set()
+    for it in items:
+        feats = _get(it, "features_json") or []
+        rows["items"].append((
+            _get(it, "id"), _get(it, "slug"), _get(it, "title"), _get(it, "summary"),
+            _get(it, "body_mdx_path"), _get(it, "thumbnail_url"), _get(it, "price_plan"),
+            json.dumps(feats, ensure_ascii=False), json.dumps(_get(it, "links_json") or {}, ensure_ascii=False),
+        ))
+        for tg in feats:
+            # features_json strings double as tag slugs
+            if not isinstance(tg, str) or not tg:
+                continue
+            if tg not in tags_seen:
+                tags_seen.add(tg)
+                rows["tags"].append((tg, tg, tg))
+            rows["item_tags"].append((_get(it, "id"), tg))
+        rows["links_end"].append(len(rows["item_tags"]))
+    for c in collections:
+        rows["collections"].append((_get(c, "id"), _get(c, "slug"), _get(c, "name")))
+        for iid in (_get(c, "items") or []):
+            rows["collection_items"].append((_get(c, "id"), iid, 0))
+    return rows
+
+
+def _result(counts: Dict[str, int], t0: float, **extra: Any) -> Dict[str, Any]:
+    sec = time.perf_counter() - t0
+    out = {
+        "items": counts.get("items", 0),
+        "collections": counts.get("collections", 0),
+        "tags": counts.get("tags", 0),
+        "elapsed_ms": int(sec * 1000),
+        "rows_per_sec": round(counts.get("items", 0) / sec) if sec > 0 else None,
+    }
+    out.update(extra)
+    return out
+
+
+# ---------- SQLite ----------
+
+def _fts_trigger_sql(con) -> List[str]:
+    """Stored CREATE TRIGGER statements for the content FTS insert/update triggers ([] if absent)."""
+    marks = ",".join("?" * len(_FTS_TRIGGERS))
+    rows = con.execute(
+        f"SELECT sql FROM sqlite_master WHERE type='trigger' AND name IN ({marks}) ORDER BY name", _FTS_TRIGGERS
+    ).fetchall()
+    return [r[0] for r in rows] if len(rows) == len(_FTS_TRIGGERS) else []
+
+
+def _upsert_chunk_deferred_fts(con, part: List[Tuple[Any, ...]], trigger_sql: List[str]) -> None:
+    """Upsert one chunk with set-based FTS maintenance (caller holds the transaction)."""
+    con.execute("CREATE TEMP TABLE IF NOT EXISTS bulk_ids (id TEXT PRIMARY KEY)")
+    con.execute("DELETE FROM bulk_ids")
+    con.executemany("INSERT OR IGNORE INTO bulk_ids(id) VALUES(?)", [(r[0],) for r in part])
+    con.execute(
+        "INSERT INTO content_items_fts(content_items_fts, rowid, title, summary)"
+        " SELECT 'delete', c.rowid, c.title, c.summary FROM content_items c JOIN bulk_ids b ON b.id = c.id"
+    )
+    for name in _FTS_TRIGGERS:
+        con.execute(f"DROP TRIGGER {name}")
+    con.executemany(_SQLITE_ITEM_UPSERT, part)
+    for sql in trigger_sql:
+        con.execute(sql)
+    con.execute(
+        "INSERT INTO content_items_fts(rowid, title, summary)"
+        " SELECT c.rowid, c.title, c.summary FROM content_items c JOIN bulk_ids b ON b.id = c.id"
+    )
+    con.execute("UPDATE content_rev SET rev = rev + 1 WHERE id = 1")
+
+
+def upsert_sqlite(con, items: Iterable[Any], collections: Iterable[Any] = (), chunk: int = SQLITE_CHUNK) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    rows = flatten(items, collections)
+    chunk = max(1, int(chunk or SQLITE_CHUNK))
+    updated_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+    con.commit()  # start from a clean transaction boundary
+    committed = 0
+    nchunks = 0
+    items, ends = rows["items"], rows["links_end"]
+    trigger_sql = _fts_trigger_sql(con) if len(items) >= SQLITE_DEFER_FTS_MIN else []
+    try:
+        for lo in range(0, len(items), chunk):
+            hi = min(lo + chunk, len(items))
+            con.execute("BEGIN")
+            if lo == 0 and rows["tags"]:
+                con.executemany("INSERT OR IGNORE INTO content_tags(id, slug, name) VALUES(?,?,?)", rows["tags"])
+            part = [(*r, updated_ms) for r in items[lo:hi]]
+            if trigger_sql:
+                _upsert_chunk_deferred_fts(con, part, trigger_sql)
+            else:
+                con.executemany(_SQLITE_ITEM_UPSERT, part)
+            links = rows["item_tags"][(ends[lo - 1] if lo else 0) : ends[hi - 1]]
+            if links:
+                con.executemany("INSERT OR IGNORE INTO content_item_tags(item_id, tag_id) VALUES(?,?)", links)
+            con.commit()
+            committed = hi
+            nchunks += 1
+        if rows["collections"]:
+            con.execute("BEGIN")
+            con.executemany("INSERT OR REPLACE INTO content_collections(id, slug, name) VALUES(?,?,?)", rows["collections"])
+            con.executemany(
+                "INSERT OR IGNORE INTO content_collection_items(collection_id, item_id, ord) VALUES(?,?,?)",
+                rows["collection_items"],
+            )
+            con.commit()
+    except Exception as e:
+        con.rollback()
+        raise BulkImportError(f"{type(e).__name__}: {e}", committed) from e
+    return _result(
+        {"items": committed, "collections": len(rows["collections"]), "tags": len(rows["tags"])},
+        t0, chunks=nchunks, chunk_size=chunk, deferred_fts=bool(trigger_sql),
+    )
+
+
+# ---------- Postgres ----------
+
+def _csv_field(v: Any) -> str:
+    # COPY … (FORMAT csv): unquoted empty = NULL, quoted = literal text
+    if v is None:
+        return ""
+    return '"' + str(v).replace('"', '""') + '"'
+
+
+def _copy(cur, table: str, cols: Sequence[str], rows: Iterable[Tuple[Any, ...]]) -> None:
+    buf = io.StringIO()
+    for r in rows:
+        buf.write(",".join(_csv_field(v) for v in r))
+        buf.write("\n")
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(cols)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def upsert_pg(con, items: Iterable[Any], collections: Iterable[Any] = ()) -> Dict[str, Any]:
+    """COPY → temp staging → INSERT … SELECT … ON CONFLICT, all in one transaction (psycopg2)."""
+    t0 = time.perf_counter()
+    rows = flatten(items, collections)
+    con.autocommit = False
+    cur = con.cursor()
+    try:
+        cur.execute(
+            """
+            CREATE TEMP TABLE stage_items (
+              ord bigserial, id text, slug text, title text, summary text, body_mdx_path text,
+              thumbnail_url text, price_plan text, features_json text, links_json text
+            ) ON COMMIT DROP;
+            CREATE TEMP TABLE stage_item_tags (item_id text, tag_id text) ON COMMIT DROP;
+            CREATE TEMP TABLE stage_collections (ord bigserial, id text, slug text, name text) ON COMMIT DROP;
+            CREATE TEMP TABLE stage_collection_items (collection_id text, item_id text, ord int) ON COMMIT DROP;
+            """
+        )
+        _copy(cur, "stage_items",
+              ("id", "slug", "title", "summary", "body_mdx_path", "thumbnail_url", "price_plan", "features_json", "links_json"),
+              rows["items"])
+        _copy(cur, "stage_item_tags", ("item_id", "tag_id"), rows["item_tags"])
+        _copy(cur, "stage_collections", ("id", "slug", "name"), rows["collections"])
+        _copy(cur, "stage_collection_items", ("collection_id", "item_id", "ord"), rows["collection_items"])
+        cur.execute(
+            """
+            INSERT INTO content.items(id, slug, title, summary, body_mdx_path, thumbnail_url, price_plan, features_json, links_json)
+            SELECT DISTINCT ON (id) id, slug, title, summary, body_mdx_path, thumbnail_url, price_plan,
+                   features_json::jsonb, links_json::jsonb
+              FROM stage_items ORDER BY id, ord DESC
+            ON CONFLICT(id) DO UPDATE SET
+              slug=excluded.slug, title=excluded.title, summary=excluded.summary,
+              body_mdx_path=excluded.body_mdx_path, thumbnail_url=excluded.thumbnail_url,
+              price_plan=excluded.price_plan, features_json=excluded.features_json,
+              links_json=excluded.links_json, updated_at=now()
+            """
+        )
+        cur.execute(
+            "INSERT INTO content.tags(id, slug, name) SELECT DISTINCT tag_id, tag_id, tag_id FROM stage_item_tags"
+            " ON CONFLICT DO NOTHING"
+        )
+        cur.execute(
+            "INSERT INTO content.item_tags(item_id, tag_id) SELECT DISTINCT item_id, tag_id FROM stage_item_tags"
+            " ON CONFLICT DO NOTHING"
+        )
+        cur.execute(
+            """
+            INSERT INTO content.collections(id, slug, name)
+            SELECT DISTINCT ON (id) id, slug, name FROM stage_collections ORDER BY id, ord DESC
+            ON CONFLICT(id) DO UPDATE SET slug=excluded.slug, name=excluded.name
+            """
+        )
+        cur.execute(
+            "INSERT INTO content.collection_items(collection_id, item_id, ord)"
+            " SELECT DISTINCT ON (collection_id, item_id) collection_id, item_id, ord FROM stage_collection_items"
+            " ON CONFLICT DO NOTHING"
+        )
+        con.commit()
+    except Exception as e:
+        con.rollback()
+        raise BulkImportError(f"{type(e).__name__}: {e}", 0) from e
+    return _result(
+        {"items": len(rows["items"]), "collections": len(rows["collections"]), "tags": len(rows["tags"])},
+        t0, staged=True,
+    )
+
+
+__all__ = [
+    "SQLITE_CHUNK",
+    "SQLITE_DEFER_FTS_MIN",
+    "BulkImportError",
+    "flatten",
+    "upsert_sqlite",
+    "upsert_pg",
+]
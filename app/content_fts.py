@@ -0,0 +1,299 @@
+"""
+content_fts.py — Full-text search for /api/v2/content/search (SQLite FTS5 / Postgres tsvector)
+
+Features:
+- SQLite: FTS5 external-content table content_items_fts (trigram tokenizer), kept in sync
+  by triggers (migration 006, db/schema/sqlite/content_fts_v2.sql); bm25() ranking (title
+  weighted 2×), highlight()/snippet() output
+- Postgres: generated search_tsv column + GIN (migration 006, db/schema/postgres/content_fts_v2.sql),
+  ts_rank_cd ranking, ts_headline output; substring fallback via the existing pg_trgm indexes
+- Keyset cursors (opaque base64 JSON of the last row's sort key) instead of OFFSET
+- Exact totals cached per (db, query, content revision); the revision row is bumped by the
+  same triggers, so a cached count is never stale
+
+Notes:
+- Terms shorter than 3 chars cannot use the trigram index → LIKE '%q%' (legacy behaviour)
+- Multi-word queries AND their terms (any order/column) instead of one literal substring
+- Highlight markers are applied after HTML-escaping, so title_hl/snippet are safe to render
+- Schema is owned by app/migrations.py; callers assert the version before searching
+"""
+
+from __future__ import annotations
+
+import base64
+import html
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+_HL_OPEN, _HL_CLOSE = "\x02", "\x03"
+_ITEM_COLS = ("id", "slug", "title", "summary", "thumbnail_url", "updated_at", "links_json")
+_MIN_TERM = 3  # trigram tokenizer
+
+
+# ---------- helpers ----------
+
+def fts_match_expr(q: Optional[str]) -> Optional[str]:
+    """'foo bar' → '"foo" AND "bar"'; None when empty or any term is too short for trigram."""
+    terms = (q or "").split()
+    if not terms or any(len(t) < _MIN_TERM for t in terms):
+        return None
+    return " AND ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def encode_cursor(vals: List[Any]) -> str:
+    raw = json.dumps(vals, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    if not cursor:
+        return None
+    try:
+        pad = "=" * (-len(cursor) % 4)
+        vals = json.loads(base64.urlsafe_b64decode(cursor + pad).decode("utf-8"))
+        return vals if isinstance(vals, list) and len(vals) == 2 else None
+    except Exception:
+        return None
+
+
+def mark_html(s: Optional[str]) -> str:
+    """HTML-escape, then turn the \\x02/\\x03 highlight markers into <mark> tags."""
+    return html.escape(s or "").replace(_HL_OPEN, "<mark>").replace(_HL_CLOSE, "</mark>")
+
+
+class _CountCache:
+    """Small LRU of exact totals keyed by (db, mode, query, revision)."""
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self._d: "OrderedDict[Tuple[Any, ...], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[int]:
+        with self._lock:
+            v = self._d.get(key)
+            if v is None:
+                self.misses += 1
+                return None
+            self._d.move_to_end(key)
+            self.hits += 1
+            return v
+
+    def put(self, key: Tuple[Any, ...], val: int) -> None:
+        with self._lock:
+            self._d[key] = val
+            self._d.move_to_end(key)
+            while len(self._d) > self.maxsize:
+                self._d.popitem(last=False)
+
+    def clear(self) -> int:
+        with self._lock:
+            n = len(self._d)
+            self._d.clear()
+            return n
+
+
+COUNT_CACHE = _CountCache()
+
+
+# ---------- SQLite ----------
+
+def sqlite_content_rev(con) -> int:
+    try:
+        row = con.execute("SELECT rev FROM content_rev WHERE id=1").fetchone()
+        return int(row[0]) if row else 0
+    except Exception:
+        return -1
+
+
+def _sqlite_count(con, db_key: str, mode: str, sql: str, args: Tuple[Any, ...]) -> int:
+    key = (db_key, mode, args, sqlite_content_rev(con))
+    hit = COUNT_CACHE.get(key) if key[-1] >= 0 else None
+    if hit is not None:
+        return hit
+    n = int(con.execute(sql, args).fetchone()[0])
+    if key[-1] >= 0:
+        COUNT_CACHE.put(key, n)
+    return n
+
+
+def search_sqlite(
+    con,
+    db_key: str,
+    q: Optional[str],
+    size: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    """→ {items, total, next_cursor, mode}. `con` rows must be sqlite3.Row."""
+    q = (q or "").strip()
+    cur_vals = decode_cursor(cursor)
+    if cur_vals is not None:
+        offset = 0
+    match = fts_match_expr(q)
+    cols = ", ".join(f"c.{c}" for c in _ITEM_COLS)
+
+    if match:
+        bm = "bm25(content_items_fts, 2.0, 1.0)"
+        where = "content_items_fts MATCH ?"
+        args: List[Any] = [match]
+        if cur_vals is not None:
+            where += f" AND ({bm} > ? OR ({bm} = ? AND f.rowid > ?))"
+            args += [float(cur_vals[0]), float(cur_vals[0]), int(cur_vals[1])]
+        rows = con.execute(
+            f"SELECT {cols}, {bm} AS score, f.rowid AS rid,"
+            f" highlight(content_items_fts, 0, '{_HL_OPEN}', '{_HL_CLOSE}') AS title_hl,"
+            f" snippet(content_items_fts, 1, '{_HL_OPEN}', '{_HL_CLOSE}', '…', 64) AS snip"  # trigram: 64 tokens ≈ 64 chars (max)
+            f" FROM content_items_fts f JOIN content_items c ON c.rowid = f.rowid"
+            f" WHERE {where} ORDER BY score, rid LIMIT ? OFFSET ?",
+            (*args, size, offset),
+        ).fetchall()
+        items = []
+        for r in rows:
+            it = {k: r[k] for k in _ITEM_COLS}
+            it["score"] = round(-float(r["score"]), 6)  # bm25 is lower-is-better; expose higher-is-better
+            it["title_hl"] = mark_html(r["title_hl"])
+            it["snippet"] = mark_html(r["snip"])
+            items.append(it)
+        total = _sqlite_count(con, db_key, "fts", "SELECT count(*) FROM content_items_fts WHERE content_items_fts MATCH ?", (match,))
+        nxt = encode_cursor([float(rows[-1]["score"]), int(rows[-1]["rid"])]) if len(rows) == size else None
+        return {"items": items, "total": total, "next_cursor": nxt, "mode": "fts"}
+
+    # listing / short-term LIKE fallback: newest first, keyset on (ifnull(updated_at,0), id)
+    where_parts: List[str] = []
+    args = []
+    if q:
+        like = f"%{q}%"
+        where_parts.append("(c.title LIKE ? OR c.summary LIKE ?)")
+        args += [like, like]
+    count_sql = "SELECT count(*) FROM content_items c" + (" WHERE " + where_parts[0] if where_parts else "")
+    count_args = tuple(args)
+    if cur_vals is not None:
+        where_parts.append("(ifnull(c.updated_at, 0) < ? OR (ifnull(c.updated_at, 0) = ? AND c.id < ?))")
+        args += [int(cur_vals[0]), int(cur_vals[0]), str(cur_vals[1])]
+    where = (" WHERE " + " AND ".join(where_parts)) if where_parts else ""
+    rows = con.execute(
+        f"SELECT {cols}, ifnull(c.updated_at, 0) AS sk FROM content_items c{where}"
+        f" ORDER BY ifnull(c.updated_at, 0) DESC, c.id DESC LIMIT ? OFFSET ?",
+        (*args, size, offset),
+    ).fetchall()
+    items = [{k: r[k] for k in _ITEM_COLS} for r in rows]
+    total = _sqlite_count(con, db_key, "like" if q else "all", count_sql, count_args)
+    nxt = encode_cursor([int(rows[-1]["sk"]), str(rows[-1]["id"])]) if len(rows) == size else None
+    return {"items": items, "total": total, "next_cursor": nxt, "mode": "like" if q else "list"}
+
+
+# ---------- Postgres ----------
+
+def pg_content_rev(cur) -> int:
+    try:
+        cur.execute("SELECT rev FROM content.rev WHERE id = 1")
+        row = cur.fetchone()
+        return int(row[0]) if row else 0
+    except Exception:
+        return -1
+
+
+def _pg_row(r: Tuple[Any, ...]) -> Dict[str, Any]:
+    it = dict(zip(_ITEM_COLS, r[: len(_ITEM_COLS)]))
+    ua = it.get("updated_at")
+    it["updated_at"] = ua.isoformat().replace("+00:00", "Z") if hasattr(ua, "isoformat") else ua
+    return it
+
+
+def search_pg(
+    con,
+    db_key: str,
+    q: Optional[str],
+    size: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    q = (q or "").strip()
+    cur_vals = decode_cursor(cursor)
+    if cur_vals is not None:
+        offset = 0
+    cur = con.cursor()
+    rev = pg_content_rev(cur)
+    cols = ", ".join(f"i.{c}" for c in _ITEM_COLS[:-1]) + ", i.links_json::text"
+
+    if q:
+        like = f"%{q}%"
+        rank = "ts_rank_cd(i.search_tsv, s.tsq)::float8"
+        src = "FROM content.items i, (SELECT websearch_to_tsquery('simple', %s) AS tsq) s"
+        cond = "(i.search_tsv @@ s.tsq OR i.title ILIKE %s OR i.summary ILIKE %s)"
+        base_args: List[Any] = [q, like, like]
+        where, args = cond, list(base_args)
+        if cur_vals is not None:
+            where += f" AND ({rank} < %s OR ({rank} = %s AND i.id > %s))"
+            args += [float(cur_vals[0]), float(cur_vals[0]), str(cur_vals[1])]
+        hl_title = f"StartSel={_HL_OPEN},StopSel={_HL_CLOSE},HighlightAll=true"
+        hl_sum = f"StartSel={_HL_OPEN},StopSel={_HL_CLOSE},MaxWords=30,MinWords=10"
+        cur.execute(
+            f"SELECT {cols}, {rank} AS score,"
+            f" ts_headline('simple', i.title, s.tsq, %s), ts_headline('simple', coalesce(i.summary, ''), s.tsq, %s)"
+            f" {src} WHERE {where} ORDER BY score DESC, i.id ASC LIMIT %s OFFSET %s",
+            (hl_title, hl_sum, *args, size, offset),
+        )
+        rows = cur.fetchall()
+        items = []
+        for r in rows:
+            it = _pg_row(r)
+            it["score"] = round(float(r[7]), 6)
+            it["title_hl"] = mark_html(r[8])
+            it["snippet"] = mark_html(r[9])
+            items.append(it)
+        key = (db_key, "fts", q, rev)
+        total = COUNT_CACHE.get(key) if rev >= 0 else None
+        if total is None:
+            cur.execute(f"SELECT count(*) {src} WHERE {cond}", tuple(base_args))
+            total = int(cur.fetchone()[0])
+            if rev >= 0:
+                COUNT_CACHE.put(key, total)
+        nxt = encode_cursor([float(rows[-1][7]), str(rows[-1][0])]) if len(rows) == size else None
+        return {"items": items, "total": total, "next_cursor": nxt, "mode": "fts"}
+
+    where_parts: List[str] = []
+    args = []
+    if q:
+        like = f"%{q}%"
+        where_parts.append("(i.title ILIKE %s OR i.summary ILIKE %s)")
+        args += [like, like]
+    count_sql = "SELECT count(*) FROM content.items i" + (" WHERE " + where_parts[0] if where_parts else "")
+    count_args = tuple(args)
+    if cur_vals is not None:
+        where_parts.append("(i.updated_at, i.id) < (%s::timestamptz, %s)")
+        args += [str(cur_vals[0]), str(cur_vals[1])]
+    where = (" WHERE " + " AND ".join(where_parts)) if where_parts else ""
+    cur.execute(
+        f"SELECT {cols} FROM content.items i{where} ORDER BY i.updated_at DESC, i.id DESC LIMIT %s OFFSET %s",
+        (*args, size, offset),
+    )
+    raw = cur.fetchall()
+    items = [_pg_row(r) for r in raw]
+    key = (db_key, "like" if q else "all", q, rev)
+    total = COUNT_CACHE.get(key) if rev >= 0 else None
+    if total is None:
+        cur.execute(count_sql, count_args)
+        total = int(cur.fetchone()[0])
+        if rev >= 0:
+            COUNT_CACHE.put(key, total)
+    nxt = encode_cursor([items[-1]["updated_at"], str(items[-1]["id"])]) if len(raw) == size else None
+    return {"items": items, "total": total, "next_cursor": nxt, "mode": "like" if q else "list"}
+
+
+__all__ = [
+    "fts_match_expr",
+    "encode_cursor",
+    "decode_cursor",
+    "mark_html",
+    "sqlite_content_rev",
+    "pg_content_rev",
+    "search_sqlite",
+    "search_pg",
+    "COUNT_CACHE",
+]
@@ -0,0 +1,458 @@
+"""
+dedup_index.py — Exact sha256 / MinHash-LSH index for Memory Gate duplicate checks (ST-1204)
+
+Features:
+- sha256(text) → item rows for approved gate records (approved_sha256) and L5 ultra_long
+  JSONL lines (sha256 of "text"); gate_approve's duplicate check becomes one lookup
+- Near-duplicate mode: MinHash (60 permutations) over character 3-gram shingles, LSH with
+  20 bands × 3 rows. Candidates come from indexed band lookups (no scan) and are kept when
+  the estimated Jaccard ≥ threshold (recall ≈ 0.93 at J=0.5, ≈ 0.99 at J=0.6).
+  Character shingles survive Korean particle/ending changes that defeat word tokens
+- Writers call add() on every approval / L5 append; sync() picks up anything written
+  behind the API's back (approved day dirs by dir mtime, L5 JSONL files by size; grown
+  files are read from the previous offset). Throttled by GATE_DEDUP_REFRESH_SEC (default 5s)
+- verify() recomputes the index from disk and diffs it; rebuild() drops and rescans
+
+Notes:
+- Rebuildable cache: status/resources/gate_dedup/dedup.sqlite3
+- Approved records only keep a 160-char excerpt, so signatures are taken from L5 lines
+  (every approval writes one); approved rows carry the exact hash only
+- No external deps
+
+CLI (dev)
+    python -m app.dedup_index --verify
+    python -m app.dedup_index --rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+THIS_FILE = Path(__file__).resolve()
+PROJECT_ROOT = THIS_FILE.parent.parent  # gumgang_meeting/
+APPROVED_ROOT = PROJECT_ROOT / "status" / "evidence" / "memory" / "gate" / "approved"
+L5_ROOT = PROJECT_ROOT / "status" / "evidence" / "memory" / "tiers" / "ultra_long"
+DEDUP_DB_PATH = PROJECT_ROOT / "status" / "resources" / "gate_dedup" / "dedup.sqlite3"
+
+MINHASH_PERMS = 60
+LSH_BANDS, LSH_ROWS = 20, 3
+NEAR_JACCARD_MIN = 0.5
+_SHINGLE = 3
+_MERSENNE = (1 << 61) - 1
+_rnd = random.Random(1204)
+_PERMS = [(_rnd.randrange(1, _MERSENNE), _rnd.randrange(0, _MERSENNE)) for _ in range(MINHASH_PERMS)]
+_NON_WORD_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_hashes (
+  sha256 TEXT NOT NULL,
+  source TEXT NOT NULL,
+  item_id TEXT,
+  gate_id TEXT,
+  path TEXT NOT NULL,
+  minhash BLOB,
+  UNIQUE(source, path, item_id)
+);
+CREATE INDEX IF NOT EXISTS ix_ch_sha ON content_hashes(sha256);
+CREATE INDEX IF NOT EXISTS ix_ch_path ON content_hashes(source, path);
+CREATE TABLE IF NOT EXISTS lsh_bands (
+  band_key INTEGER NOT NULL,
+  row_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_lsh_key ON lsh_bands(band_key);
+CREATE INDEX IF NOT EXISTS ix_lsh_row ON lsh_bands(row_id);
+CREATE TABLE IF NOT EXISTS hash_sources (
+  key TEXT PRIMARY KEY,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL
+);
+"""
+
+
+def _refresh_interval() -> float:
+    try:
+        return float(os.environ.get("GATE_DEDUP_REFRESH_SEC", "5"))
+    except Exception:
+        return 5.0
+
+
+def sha256_hex(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+# ---------- MinHash / LSH ----------
+
+def shingles(text: str) -> Set[str]:
+    """Character 3-grams of the lower-cased text with punctuation/whitespace collapsed."""
+    norm = _NON_WORD_RE.sub(" ", (text or "").lower()).strip()
+    if not norm:
+        return set()
+    if len(norm) <= _SHINGLE:
+        return {norm}
+    return {norm[i:i + _SHINGLE] for i in range(len(norm) - _SHINGLE + 1)}
+
+
+def minhash(text: str) -> Optional[List[int]]:
+    sh = shingles(text)
+    if not sh:
+        return None
+    xs = [int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big") for g in sh]
+    return [min(((a * x + b) % _MERSENNE) & 0xFFFFFFFF for x in xs) for a, b in _PERMS]
+
+
+def jaccard_estimate(a: List[int], b: List[int]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / float(len(a) or 1)
+
+
+def _band_keys(sig: List[int]) -> List[int]:
+    keys = []
+    for i in range(LSH_BANDS):
+        chunk = struct.pack(f">I{LSH_ROWS}I", i, *sig[i * LSH_ROWS:(i + 1) * LSH_ROWS])
+        keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "big", signed=True))
+    return keys
+
+
+def _pack(sig: List[int]) -> bytes:
+    return struct.pack(f">{len(sig)}I", *sig)
+
+
+def _unpack(blob: bytes) -> List[int]:
+    return list(struct.unpack(f">{len(blob) // 4}I", blob))
+
+
+# ---------- Index ----------
+
+class ContentHashIndex:
+    def __init__(
+        self,
+        approved_root: Path = APPROVED_ROOT,
+        l5_root: Path = L5_ROOT,
+        db_path: Path = DEDUP_DB_PATH,
+    ) -> None:
+        self.roots = {"approved": approved_root, "l5": l5_root}
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._synced_at = 0.0
+        self.stats: Dict[str, Any] = {}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+            conn.row_factory = sqlite3.Row
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.DatabaseError:
+                pass
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+            self._synced_at = 0.0
+        return self._conn
+
+    def _rel(self, source: str, path: Path) -> str:
+        try:
+            return path.resolve().relative_to(self.roots[source].resolve()).as_posix()
+        except Exception:
+            return str(path)
+
+    def path_of(self, source: str, rel: str) -> Path:
+        return self.roots[source] / rel
+
+    @staticmethod
+    def _row(sha: str, source: str, item_id: Optional[str], gate_id: Optional[str], rel: str,
+             text: Optional[str]) -> Tuple[Any, ...]:
+        sig = minhash(text) if text else None
+        return (sha, source, item_id, gate_id, rel, _pack(sig) if sig else None)
+
+    def _insert(self, db: sqlite3.Connection, rows: Iterable[Tuple[Any, ...]]) -> None:
+        for row in rows:
+            cur = db.execute(
+                "INSERT OR IGNORE INTO content_hashes(sha256, source, item_id, gate_id, path, minhash)"
+                " VALUES(?,?,?,?,?,?)",
+                row,
+            )
+            if cur.rowcount and row[5]:
+                db.executemany(
+                    "INSERT INTO lsh_bands(band_key, row_id) VALUES(?, ?)",
+                    [(k, cur.lastrowid) for k in _band_keys(_unpack(row[5]))],
+                )
+
+    def _delete(self, db: sqlite3.Connection, where: str, args: Tuple[Any, ...]) -> None:
+        db.execute(f"DELETE FROM lsh_bands WHERE row_id IN (SELECT rowid FROM content_hashes WHERE {where})", args)
+        db.execute(f"DELETE FROM content_hashes WHERE {where}", args)
+
+    # ---- writes ----
+
+    def add(
+        self,
+        source: str,
+        path: Path,
+        sha256: str,
+        item_id: Optional[str] = None,
+        gate_id: Optional[str] = None,
+        text: Optional[str] = None,
+    ) -> None:
+        """Record one item right after it was written (source: 'approved' | 'l5').
+        Rows are unique per (source, path, item_id), so a later sync() of the same
+        line is a no-op."""
+        with self._lock:
+            db = self._db()
+            self._insert(db, [self._row(sha256, source, item_id, gate_id, self._rel(source, path), text)])
+            db.commit()
+
+    # ---- disk readers (shared by sync/verify) ----
+
+    @staticmethod
+    def _read_approved(fp: Path) -> Optional[Tuple[str, Optional[str]]]:
+        try:
+            obj = json.loads(fp.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        sha = obj.get("approved_sha256") if isinstance(obj, dict) else None
+        return (str(sha), str(obj.get("id") or fp.stem)) if sha else None
+
+    @staticmethod
+    def _read_l5(fp: Path, start: int = 0) -> Tuple[List[Tuple[str, Optional[str], Optional[str], str]], int]:
+        """Complete lines from `start` → ([(sha, item_id, gate_id, text)], new offset).
+        Lines without an id are keyed by byte offset ("@<pos>")."""
+        out = []
+        with fp.open("rb") as f:
+            f.seek(start)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # ignore a trailing partial line
+        pos = 0
+        while pos < end:
+            nl = data.index(b"\n", pos)
+            raw, at = data[pos:nl], start + pos
+            pos = nl + 1
+            try:
+                obj = json.loads(raw)
+            except Exception:
+                continue
+            if not isinstance(obj, dict):
+                continue
+            txt = str(obj.get("text") or "")
+            gid = (obj.get("weight") or {}).get("approved_id") if isinstance(obj.get("weight"), dict) else None
+            out.append((sha256_hex(txt), str(obj.get("id") or f"@{at}"), gid, txt))
+        return out, start + end
+
+    def _l5_files(self) -> Dict[str, os.stat_result]:
+        root = self.roots["l5"]
+        out: Dict[str, os.stat_result] = {}
+        if not root.exists():
+            return out
+        for dirpath, _dirs, files in os.walk(root):
+            for name in files:
+                if name.endswith(".jsonl"):
+                    fp = Path(dirpath) / name
+                    try:
+                        out[fp.relative_to(root).as_posix()] = fp.stat()
+                    except OSError:
+                        continue
+        return out
+
+    # ---- reconcile ----
+
+    def sync(self, force: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            db = self._db()
+            now = time.monotonic()
+            if not force and self._synced_at and (now - self._synced_at) < _refresh_interval():
+                return self.stats
+            t0 = time.perf_counter()
+            known = {r["key"]: (r["mtime_ns"], r["size"]) for r in db.execute("SELECT key, mtime_ns, size FROM hash_sources")}
+            seen: Set[str] = set()
+            read = 0
+
+            # approved/<day>/<id>.json — re-list a day dir only when its mtime moved
+            aroot = self.roots["approved"]
+            for d in (sorted(aroot.iterdir()) if aroot.exists() else []):
+                if not d.is_dir():
+                    continue
+                key = f"approved:{d.name}"
+                seen.add(key)
+                mt = d.stat().st_mtime_ns
+                if known.get(key, (None,))[0] == mt:
+                    continue
+                have = {r["path"] for r in db.execute(
+                    "SELECT path FROM content_hashes WHERE source='approved' AND path LIKE ?", (f"{d.name}/%",))}
+                present = set()
+                rows = []
+                for jf in d.glob("*.json"):
+                    rel = f"{d.name}/{jf.name}"
+                    present.add(rel)
+                    if rel in have:
+                        continue  # approved records are write-once
+                    got = self._read_approved(jf)
+                    read += 1
+                    if got:
+                        rows.append(self._row(got[0], "approved", got[1], got[1], rel, None))
+                self._insert(db, rows)
+                for gone in have - present:
+                    self._delete(db, "source='approved' AND path=?", (gone,))
+                db.execute("INSERT OR REPLACE INTO hash_sources(key, mtime_ns, size) VALUES(?,?,0)", (key, mt))
+
+            # ultra_long/**/*.jsonl — append-only; read only the grown tail
+            for rel, st in self._l5_files().items():
+                key = f"l5:{rel}"
+                seen.add(key)
+                prev = known.get(key)
+                if prev and prev[0] == st.st_mtime_ns:
+                    continue
+                fp = self.roots["l5"] / rel
+                start = prev[1] if prev and st.st_size >= prev[1] else 0
+                if start == 0:
+                    self._delete(db, "source='l5' AND path=?", (rel,))
+                try:
+                    items, offset = self._read_l5(fp, start)
+                except OSError:
+                    continue
+                read += len(items)
+                self._insert(db, [self._row(sha, "l5", iid, gid, rel, txt) for sha, iid, gid, txt in items])
+                db.execute("INSERT OR REPLACE INTO hash_sources(key, mtime_ns, size) VALUES(?,?,?)",
+                           (key, st.st_mtime_ns, offset))
+
+            for key in set(known) - seen:
+                kind, rel = key.split(":", 1)
+                if kind == "approved":
+                    self._delete(db, "source='approved' AND path LIKE ?", (f"{rel}/%",))
+                else:
+                    self._delete(db, "source='l5' AND path=?", (rel,))
+                db.execute("DELETE FROM hash_sources WHERE key=?", (key,))
+            db.commit()
+            self._synced_at = now
+            self.stats = {
+                "sources": len(seen),
+                "read": read,
+                "sync_ms": round((time.perf_counter() - t0) * 1000, 2),
+            }
+            return self.stats
+
+    def rebuild(self) -> Dict[str, Any]:
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM lsh_bands")
+            db.execute("DELETE FROM content_hashes")
+            db.execute("DELETE FROM hash_sources")
+            db.commit()
+            return self.sync(force=True)
+
+    def verify(self) -> Dict[str, Any]:
+        """Recompute (source, path, sha256) from disk and diff against the index."""
+        disk: Dict[Tuple[str, str, str], int] = {}
+        aroot = self.roots["approved"]
+        for jf in (aroot.glob("*/*.json") if aroot.exists() else []):
+            got = self._read_approved(jf)
+            if got:
+                k = ("approved", jf.relative_to(aroot).as_posix(), got[0])
+                disk[k] = disk.get(k, 0) + 1
+        for rel in self._l5_files():
+            try:
+                items, _ = self._read_l5(self.roots["l5"] / rel)
+            except OSError:
+                continue
+            for sha, _iid, _gid, _txt in items:
+                k = ("l5", rel, sha)
+                disk[k] = disk.get(k, 0) + 1
+        with self._lock:
+            idx: Dict[Tuple[str, str, str], int] = {}
+            for r in self._db().execute("SELECT source, path, sha256 FROM content_hashes"):
+                k = (r["source"], r["path"], r["sha256"])
+                idx[k] = idx.get(k, 0) + 1
+        missing = sorted(f"{k[0]}:{k[1]}:{k[2][:12]}" for k in disk if idx.get(k, 0) < disk[k])
+        stale = sorted(f"{k[0]}:{k[1]}:{k[2][:12]}" for k in idx if disk.get(k, 0) < idx[k])
+        return {
+            "ok": not missing and not stale,
+            "on_disk": sum(disk.values()),
+            "indexed": sum(idx.values()),
+            "missing": missing[:50],
+            "stale": stale[:50],
+        }
+
+    # ---- queries ----
+
+    def lookup(self, sha256: str) -> List[Dict[str, Any]]:
+        """Exact duplicates: [{source, item_id, gate_id, path(abs Path)}]."""
+        self.sync()
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT source, item_id, gate_id, path FROM content_hashes WHERE sha256=?", (sha256,)
+            ).fetchall()
+        return [{"source": r["source"], "item_id": r["item_id"], "gate_id": r["gate_id"],
+                 "path": self.path_of(r["source"], r["path"])} for r in rows]
+
+    def near(self, text: str, min_jaccard: float = NEAR_JACCARD_MIN, limit: int = 10) -> List[Dict[str, Any]]:
+        """Near duplicates via LSH band candidates, most similar first (exact hits included)."""
+        sig = minhash(text)
+        if not sig:
+            return []
+        self.sync()
+        keys = _band_keys(sig)
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT c.sha256, c.source, c.item_id, c.gate_id, c.path, c.minhash FROM content_hashes c"
+                f" WHERE c.rowid IN (SELECT row_id FROM lsh_bands WHERE band_key IN ({','.join('?' * len(keys))}))",
+                keys,
+            ).fetchall()
+        best: Dict[str, Dict[str, Any]] = {}
+        for r in rows:
+            j = jaccard_estimate(sig, _unpack(r["minhash"]))
+            if j < min_jaccard:
+                continue
+            key = r["gate_id"] or r["item_id"] or r["path"]
+            if key in best and best[key]["similarity"] >= j:
+                continue
+            best[key] = {
+                "source": r["source"],
+                "item_id": r["item_id"],
+                "gate_id": r["gate_id"],
+                "path": self.path_of(r["source"], r["path"]),
+                "sha256": r["sha256"],
+                "similarity": round(j, 4),
+            }
+        return sorted(best.values(), key=lambda x: (-x["similarity"], str(x["gate_id"] or "")))[: max(1, int(limit))]
+
+
+DEDUP_INDEX = ContentHashIndex()
+
+__all__ = [
+    "NEAR_JACCARD_MIN",
+    "shingles",
+    "minhash",
+    "jaccard_estimate",
+    "ContentHashIndex",
+    "DEDUP_INDEX",
+]
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Verify/rebuild the gate content-hash index")
+    ap.add_argument("--verify", action="store_true", help="diff the index against disk")
+    ap.add_argument("--rebuild", action="store_true", help="drop all rows and rescan")
+    args = ap.parse_args(argv)
+    idx = DEDUP_INDEX
+    out: Dict[str, Any] = {"index": str(idx.db_path)}
+    out["sync"] = idx.rebuild() if args.rebuild else idx.sync(force=True)
+    if args.verify:
+        out["verify"] = idx.verify()
+    print(json.dumps(out, ensure_ascii=False))
+    return 0 if (not args.verify or out["verify"]["ok"]) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
@@ -0,0 +1,211 @@
+"""
+dir_cache.py — Directory metadata cache + subtree rollups for /api/files/list
+
+Features:
+- listdir(dir): one os.scandir per directory, cached and reused while the directory's mtime_ns
+  is unchanged (entries added/removed/renamed bump it); file sizes/mtimes inside an unchanged
+  directory (appends do not bump it) are re-read at most once per `stat_ttl`
+- walk(dir, depth): preorder (dirs first, then files; name / size / mtime sort per level) over
+  cached listings, to any depth; callers paginate the result
+- rollup(dir): {size, files, dirs} of the whole subtree, memoized per directory; a listing
+  change clears the memo of that directory and its cached ancestors, so a refresh re-lists only
+  changed directories and re-sums the rest in memory
+- Deny names (.git, node_modules, dist, build, .venv, venv, .obsidian, *.egg-info) are dropped
+  at scan time
+
+Notes:
+- Symlinked directories are listed but never descended into (no cycles, no escaping the root)
+- LRU-bounded by number of cached directories (DIR_CACHE_MAX, default 20000)
+- Rollups older than `ttl` re-validate their subtree (one stat per directory, not per file)
+
+CLI (dev):
+  python app/dir_cache.py [dir] [--depth 3]   # cold vs warm rollup timings
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DENY_NAMES = frozenset({".git", "node_modules", "dist", "build", ".venv", "venv", ".obsidian"})
+TTL_SEC = 2.0  # rollup memo
+STAT_TTL_SEC = 30.0  # file metadata inside an unchanged directory
+MAX_DIRS = 20000
+
+
+def allowed(name: str) -> bool:
+    return name not in DENY_NAMES and not name.endswith(".egg-info")
+
+
+@dataclass
+class Entry:
+    name: str
+    is_dir: bool
+    size: Optional[int]
+    mtime: Optional[int]
+    symlink: bool = False
+
+
+@dataclass
+class Listing:
+    mtime_ns: int
+    checked: float  # monotonic time of the scan
+    entries: List[Entry]
+    rollup: Optional[Dict[str, int]] = None
+    rollup_at: float = 0.0
+    sig: Tuple[Any, ...] = field(default_factory=tuple)
+
+
+def _sort_key(sort: str):
+    if sort == "size":
+        return lambda e: (e.size or 0, e.name.lower())
+    if sort == "mtime":
+        return lambda e: (e.mtime or 0, e.name.lower())
+    return lambda e: e.name.lower()
+
+
+class DirCache:
+    def __init__(self, ttl: float = TTL_SEC, stat_ttl: float = STAT_TTL_SEC, max_dirs: int = MAX_DIRS) -> None:
+        self.ttl = ttl
+        self.stat_ttl = stat_ttl
+        self.max_dirs = max_dirs
+        self._d: "OrderedDict[str, Listing]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "scans": 0, "changed": 0, "rollup_hits": 0, "rollup_sums": 0}
+
+    # ---------- listings ----------
+
+    def _scan(self, path: str, mtime_ns: int) -> Listing:
+        out: List[Entry] = []
+        with os.scandir(path) as it:
+            for de in it:
+                if not allowed(de.name):
+                    continue
+                try:
+                    link = de.is_symlink()
+                    is_dir = de.is_dir()  # follows symlinks, like Path.is_dir
+                    st = de.stat()
+                    out.append(Entry(de.name, is_dir, int(st.st_size), int(st.st_mtime), link))
+                except OSError:
+                    out.append(Entry(de.name, False, None, None, False))
+        out.sort(key=lambda e: (0 if e.is_dir else 1, e.name.lower()))
+        sig = tuple((e.name, e.is_dir, e.size, e.mtime) for e in out)
+        return Listing(mtime_ns, time.monotonic(), out, sig=sig)
+
+    def listdir(self, path: str, refresh: bool = False) -> Listing:
+        st = os.stat(path)
+        with self._lock:
+            cur = self._d.get(path)
+            if cur is not None:
+                self._d.move_to_end(path)
+        if (not refresh and cur is not None and cur.mtime_ns == st.st_mtime_ns
+                and time.monotonic() - cur.checked < self.stat_ttl):
+            self.counters["hits"] += 1
+            return cur
+        new = self._scan(path, st.st_mtime_ns)
+        self.counters["scans"] += 1
+        if cur is not None and cur.sig == new.sig:
+            cur.checked = new.checked
+            cur.mtime_ns = new.mtime_ns
+            return cur
+        if cur is not None:
+            self.counters["changed"] += 1
+        with self._lock:
+            self._d[path] = new
+            self._d.move_to_end(path)
+            self._invalidate_up(os.path.dirname(path))
+            while len(self._d) > self.max_dirs:
+                self._d.popitem(last=False)
+        return new
+
+    def _invalidate_up(self, path: str) -> None:
+        """Clear memoized rollups of cached ancestors (caller holds the lock)."""
+        while True:
+            lst = self._d.get(path)
+            if lst is not None:
+                lst.rollup = None
+            parent = os.path.dirname(path)
+            if parent == path:
+                return
+            path = parent
+
+    # ---------- walk / rollup ----------
+
+    def walk(self, path: str, depth: int, sort: str = "name", desc: bool = False) -> Iterator[Tuple[int, str, Entry]]:
+        """Preorder (level, parent dir, entry) down to `depth` levels (1 = direct children)."""
+        key = _sort_key(sort)
+        lst = self.listdir(path)
+        dirs = sorted((e for e in lst.entries if e.is_dir), key=key, reverse=desc)
+        files = sorted((e for e in lst.entries if not e.is_dir), key=key, reverse=desc)
+        for e in dirs + files:
+            yield 1, path, e
+            if e.is_dir and not e.symlink and depth > 1:
+                try:
+                    for lvl, parent, sub in self.walk(os.path.join(path, e.name), depth - 1, sort, desc):
+                        yield lvl + 1, parent, sub
+                except OSError:
+                    continue
+
+    def rollup(self, path: str) -> Dict[str, int]:
+        lst = self.listdir(path)
+        if lst.rollup is not None and time.monotonic() - lst.rollup_at < self.ttl:
+            self.counters["rollup_hits"] += 1
+            return lst.rollup
+        total = {"size": 0, "files": 0, "dirs": 0}
+        for e in lst.entries:
+            if not e.is_dir:
+                total["size"] += e.size or 0
+                total["files"] += 1
+                continue
+            total["dirs"] += 1
+            if e.symlink:
+                continue
+            try:
+                sub = self.rollup(os.path.join(path, e.name))
+            except OSError:
+                continue
+            for k in total:
+                total[k] += sub[k]
+        self.counters["rollup_sums"] += 1
+        lst.rollup, lst.rollup_at = total, time.monotonic()
+        return total
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"dirs": len(self._d), "ttl_sec": self.ttl, "stat_ttl_sec": self.stat_ttl, **self.counters}
+
+
+__all__ = [
+    "DENY_NAMES",
+    "Entry",
+    "Listing",
+    "DirCache",
+    "allowed",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("dir", nargs="?", default=".")
+    ap.add_argument("--depth", type=int, default=3)
+    a = ap.parse_args()
+    root = str(Path(a.dir).resolve())
+    dc = DirCache()
+    t0 = time.perf_counter()
+    cold = dc.rollup(root)
+    t1 = time.perf_counter()
+    dc.ttl = 0  # expire rollup memos: re-validation is one stat per directory, no rescans
+    warm = dc.rollup(root)
+    t2 = time.perf_counter()
+    n = sum(1 for _ in dc.walk(root, a.depth))
+    print(json.dumps({"rollup": cold, "same": cold == warm, "cold_ms": round((t1 - t0) * 1000, 1),
+                      "revalidate_ms": round((t2 - t1) * 1000, 1), f"entries_depth_{a.depth}": n,
+                      **dc.stats()}, indent=2))
@@ -0,0 +1,279 @@
+"""
+event_log.py — Append-only meeting event log with a fixed-layout binary offset index
+
+Features:
+- events.jsonl stays the source of truth (same line format as before); events.idx next to it holds
+  a 128-byte header (magic, version, count, committed log bytes, last append time, per-type
+  counters, last ts) followed by one 16-byte record per event (byte offset, length, type)
+- append(): O(1) — write the line, pwrite its record, pwrite the header; nothing is rewritten
+- Range reads by sequence number (two preads: records, then one contiguous slice of the log),
+  tail reads and `after=<seq>` polling without scanning the file
+- Crash/foreign-writer recovery: on open (and under the lock before each append) any log bytes
+  past the header's committed size are replayed into the index; an unreadable index is rebuilt
+
+Notes:
+- fcntl.flock on the index serializes writers across processes; readers only pread
+- No fsync per event (as before): a crash can lose the tail of the page cache, and the
+  index is repaired from whatever reached the log
+- Type counters: capture, capture_upload, annotate, record_start, record_stop, other
+
+CLI (dev):
+  python app/event_log.py status/evidence/meetings/<id>/events.jsonl [--tail 5]
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MAGIC = b"GGEV"
+VERSION = 1
+HEADER_SIZE = 128
+_HDR = struct.Struct("<4sHHQQd8I32s")  # 96 bytes, rest of the 128 reserved
+_REC = struct.Struct("<QIHH")  # offset, length, type, reserved → 16 bytes
+TYPES = ("capture", "capture_upload", "annotate", "record_start", "record_stop")
+OTHER = 7
+
+
+def _type_code(t: Any) -> int:
+    try:
+        return TYPES.index(str(t))
+    except ValueError:
+        return OTHER
+
+
+class EventLog:
+    """One meeting's events.jsonl + events.idx. Thread-safe; keep one instance per path."""
+
+    def __init__(self, log_path: Path, idx_path: Optional[Path] = None) -> None:
+        self.log_path = Path(log_path)
+        self.idx_path = Path(idx_path) if idx_path else self.log_path.with_suffix(".idx")
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._log_fd = os.open(str(self.log_path), os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._idx_fd = os.open(str(self.idx_path), os.O_RDWR | os.O_CREAT, 0o644)
+        self.count = 0
+        self.log_bytes = 0
+        self.last_append = 0.0
+        self.counters = [0] * 8
+        self.last_ts = ""
+        with self._lock, self._flock():
+            self._load()
+
+    # ---------- header ----------
+
+    @contextmanager
+    def _flock(self):
+        fcntl.flock(self._idx_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._idx_fd, fcntl.LOCK_UN)
+
+    def _read_header(self) -> bool:
+        raw = os.pread(self._idx_fd, _HDR.size, 0)
+        if len(raw) < _HDR.size:
+            return False
+        magic, ver, rec, count, log_bytes, last, *rest = _HDR.unpack(raw)
+        if magic != MAGIC or ver != VERSION or rec != _REC.size:
+            return False
+        self.count, self.log_bytes, self.last_append = count, log_bytes, last
+        self.counters = list(rest[:8])
+        self.last_ts = rest[8].rstrip(b"\0").decode("utf-8", "ignore")
+        return True
+
+    def _write_header(self) -> None:
+        raw = _HDR.pack(
+            MAGIC, VERSION, _REC.size, self.count, self.log_bytes, self.last_append,
+            *self.counters, self.last_ts.encode("utf-8")[:32],
+        )
+        os.pwrite(self._idx_fd, raw.ljust(HEADER_SIZE, b"\0"), 0)
+
+    def _load(self) -> None:
+        """Validate the header and catch up with log bytes it has not seen (replay)."""
+        log_size = os.fstat(self._log_fd).st_size
+        if not self._read_header() or self.log_bytes > log_size:
+            self._reset()
+        n_recs = max(0, (os.fstat(self._idx_fd).st_size - HEADER_SIZE) // _REC.size)
+        if n_recs < self.count:
+            self._reset()
+        elif n_recs > self.count:  # records written, header not: drop them, replay re-adds
+            os.ftruncate(self._idx_fd, HEADER_SIZE + self.count * _REC.size)
+        if log_size > self.log_bytes:
+            self._replay(log_size)
+
+    def _reset(self) -> None:
+        os.ftruncate(self._idx_fd, 0)
+        self.count, self.log_bytes, self.last_append = 0, 0, 0.0
+        self.counters = [0] * 8
+        self.last_ts = ""
+        self._write_header()
+
+    def _replay(self, upto: int) -> int:
+        """Index complete lines in [log_bytes, upto). A trailing partial line is left for later."""
+        pos = self.log_bytes
+        added = 0
+        recs = bytearray()
+        buf = b""
+        while pos + len(buf) < upto:
+            chunk = os.pread(self._log_fd, min(1 << 20, upto - pos - len(buf)), pos + len(buf))
+            if not chunk:
+                break
+            buf += chunk
+            start = 0
+            while True:
+                nl = buf.find(b"\n", start)
+                if nl < 0:
+                    break
+                line = buf[start : nl + 1]
+                t, ts = None, None
+                try:
+                    obj = json.loads(line)
+                    t, ts = obj.get("type"), obj.get("ts")
+                except Exception:
+                    pass
+                code = _type_code(t)
+                recs += _REC.pack(pos + start, len(line), code, 0)
+                self.counters[code] += 1
+                if ts:
+                    self.last_ts = str(ts)
+                self.count += 1
+                added += 1
+                start = nl + 1
+            pos += start
+            buf = buf[start:]
+        if recs:
+            os.pwrite(self._idx_fd, bytes(recs), HEADER_SIZE + (self.count - added) * _REC.size)
+        self.log_bytes = pos
+        self.last_append = time.time()
+        self._write_header()
+        return added
+
+    # ---------- write ----------
+
+    def append(self, event: Dict[str, Any]) -> Tuple[int, int]:
+        """→ (seq, bytes written). seq is 0-based and dense."""
+        data = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        code = _type_code(event.get("type"))
+        with self._lock, self._flock():
+            self._read_header()  # another process may have appended
+            size = os.fstat(self._log_fd).st_size
+            if size != self.log_bytes:
+                self._load()
+                size = os.fstat(self._log_fd).st_size
+                if size != self.log_bytes:  # torn line from a crashed writer: terminate it
+                    os.write(self._log_fd, b"\n")
+                    self._replay(size + 1)
+                size = self.log_bytes
+            os.write(self._log_fd, data)  # O_APPEND
+            seq = self.count
+            os.pwrite(self._idx_fd, _REC.pack(size, len(data), code, 0), HEADER_SIZE + seq * _REC.size)
+            self.count += 1
+            self.log_bytes = size + len(data)
+            self.last_append = time.time()
+            self.counters[code] += 1
+            if event.get("ts"):
+                self.last_ts = str(event["ts"])
+            self._write_header()
+            return seq, len(data)
+
+    # ---------- read ----------
+
+    def refresh(self) -> int:
+        with self._lock:
+            self._read_header()
+            return self.count
+
+    def read(self, start: int, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Events [start, start+limit) as (seq, event); undecodable lines are skipped."""
+        count = self.refresh()
+        start = max(0, start)
+        end = min(count, start + max(0, limit))
+        if start >= end:
+            return []
+        raw = os.pread(self._idx_fd, (end - start) * _REC.size, HEADER_SIZE + start * _REC.size)
+        recs = [_REC.unpack_from(raw, i * _REC.size) for i in range(len(raw) // _REC.size)]
+        if not recs:
+            return []
+        base = recs[0][0]
+        blob = os.pread(self._log_fd, recs[-1][0] + recs[-1][1] - base, base)
+        out: List[Tuple[int, Dict[str, Any]]] = []
+        for i, (off, ln, _t, _r) in enumerate(recs):
+            try:
+                out.append((start + i, json.loads(blob[off - base : off - base + ln])))
+            except Exception:
+                continue
+        return out
+
+    def tail(self, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        count = self.refresh()
+        return self.read(count - limit, limit)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._read_header()
+            return {
+                "count": self.count,
+                "bytes": self.log_bytes,
+                "last_ts": self.last_ts or None,
+                "last_append": self.last_append,
+                "by_type": {**{t: self.counters[i] for i, t in enumerate(TYPES)}, "other": self.counters[OTHER]},
+            }
+
+    def close(self) -> None:
+        for fd in (self._log_fd, self._idx_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._log_fd = self._idx_fd = -1
+
+    def __del__(self) -> None:
+        if getattr(self, "_idx_fd", -1) >= 0:
+            self.close()
+
+
+class EventLogs:
+    """Per-meeting EventLog instances (open fds cached, LRU-closed)."""
+
+    def __init__(self, path_for: Callable[[str], Path], max_open: int = 64) -> None:
+        self.path_for = path_for
+        self.max_open = max_open
+        self._d: "OrderedDict[str, EventLog]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, meeting_id: str) -> EventLog:
+        with self._lock:
+            log = self._d.get(meeting_id)
+            if log is None:
+                log = self._d[meeting_id] = EventLog(self.path_for(meeting_id))
+            self._d.move_to_end(meeting_id)
+            while len(self._d) > self.max_open:
+                self._d.popitem(last=False)  # fds close when the last user drops it (__del__)
+            return log
+
+
+__all__ = [
+    "TYPES",
+    "EventLog",
+    "EventLogs",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("log")
+    ap.add_argument("--tail", type=int, default=5)
+    a = ap.parse_args()
+    lg = EventLog(Path(a.log))
+    print(json.dumps({"stats": lg.stats(), "tail": lg.tail(a.tail)}, ensure_ascii=False, indent=2))
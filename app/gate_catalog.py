@@ -0,0 +1,360 @@
+"""
+gate_catalog.py — SQLite catalog of Memory Gate records (ST-1204)
+
+Features:
+- One row per record file under status/evidence/memory/gate/{pending,approved,rejected}/<day>/<id>.json
+  (id, state dir, day, created_at, proposer/approver, excerpt, refs, source diversity, sha256, path)
+- Gate handlers call record() after every write, so lookups/list/stats are indexed queries
+  instead of day-directory scans and full JSON loads
+- Reconcile: sync() stats only the day directories; a directory whose mtime changed is
+  re-listed and only files with a new (mtime_ns) are re-read. Throttled by
+  GATE_CATALOG_REFRESH_SEC (default 5s); writes through record() are visible immediately
+
+Notes:
+- The catalog is a rebuildable cache: status/resources/gate_catalog/catalog.sqlite3
+- `state` is the directory the record lives in (same as the legacy scans); approve/reject
+  keep the pending file, so an id can have one row per state
+- No external deps
+
+CLI (dev)
+    python -m app.gate_catalog --rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+THIS_FILE = Path(__file__).resolve()
+PROJECT_ROOT = THIS_FILE.parent.parent  # gumgang_meeting/
+GATE_ROOT = PROJECT_ROOT / "status" / "evidence" / "memory" / "gate"
+CATALOG_PATH = PROJECT_ROOT / "status" / "resources" / "gate_catalog" / "catalog.sqlite3"
+
+STATES = ("pending", "approved", "rejected")
+_STATE_RANK = {s: i for i, s in enumerate(STATES)}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS gate_records (
+  path TEXT PRIMARY KEY,
+  id TEXT NOT NULL,
+  state TEXT NOT NULL,
+  state_rank INTEGER NOT NULL,
+  day TEXT NOT NULL,
+  dir TEXT NOT NULL,
+  created_at TEXT,
+  proposer TEXT,
+  approver TEXT,
+  scope_id TEXT,
+  excerpt TEXT,
+  refs_count INTEGER NOT NULL DEFAULT 0,
+  source_roots TEXT,
+  source_diversity_ok INTEGER,
+  sha256 TEXT,
+  mtime_ns INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_gate_records_id ON gate_records(id, state_rank, day DESC);
+CREATE INDEX IF NOT EXISTS ix_gate_records_list ON gate_records(state_rank, day DESC, id);
+CREATE INDEX IF NOT EXISTS ix_gate_records_dir ON gate_records(dir);
+CREATE INDEX IF NOT EXISTS ix_gate_records_sha ON gate_records(sha256);
+CREATE TABLE IF NOT EXISTS gate_dirs (
+  dir TEXT PRIMARY KEY,
+  mtime_ns INTEGER NOT NULL
+);
+"""
+
+_COLS = (
+    "path", "id", "state", "state_rank", "day", "dir", "created_at", "proposer", "approver",
+    "scope_id", "excerpt", "refs_count", "source_roots", "source_diversity_ok", "sha256", "mtime_ns",
+)
+
+
+def _refresh_interval() -> float:
+    try:
+        return float(os.environ.get("GATE_CATALOG_REFRESH_SEC", "5"))
+    except Exception:
+        return 5.0
+
+
+def _row_from(rel: str, state: str, obj: Dict[str, Any], mtime_ns: int) -> Tuple[Any, ...]:
+    parts = rel.split("/")
+    day = parts[1] if len(parts) >= 3 else ""
+    excerpt = (obj.get("text") or obj.get("redacted_text") or obj.get("proposal_excerpt") or "")[:120]
+    div = obj.get("source_diversity_ok")
+    return (
+        rel,
+        str(obj.get("id") or Path(rel).stem),
+        state,
+        _STATE_RANK.get(state, len(STATES)),
+        day,
+        f"{state}/{day}",
+        obj.get("created_at") or obj.get("approved_at") or obj.get("rejected_at"),
+        obj.get("proposer"),
+        obj.get("approver"),
+        obj.get("scope_id"),
+        excerpt,
+        len(obj.get("refs") or []),
+        json.dumps(obj.get("source_roots") or [], ensure_ascii=False),
+        None if div is None else int(bool(div)),
+        obj.get("approved_sha256") or obj.get("sha256"),
+        int(mtime_ns),
+    )
+
+
+class GateCatalog:
+    def __init__(self, root: Path = GATE_ROOT, db_path: Path = CATALOG_PATH) -> None:
+        self.root = root
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._synced_at = 0.0
+        self.stats: Dict[str, Any] = {}
+
+    # ---- connection ----
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+            conn.row_factory = sqlite3.Row
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.DatabaseError:
+                pass
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+            self._synced_at = 0.0
+        return self._conn
+
+    def _rel(self, path: Path) -> Optional[str]:
+        try:
+            return path.resolve().relative_to(self.root.resolve()).as_posix()
+        except Exception:
+            return None
+
+    # ---- writes ----
+
+    def record(self, path: Path, obj: Optional[Dict[str, Any]] = None) -> None:
+        """Upsert one record file (call right after writing it)."""
+        rel = self._rel(path)
+        if not rel or rel.split("/", 1)[0] not in STATES:
+            return
+        try:
+            if obj is None:
+                obj = json.loads(path.read_text(encoding="utf-8"))
+            mt = path.stat().st_mtime_ns
+        except Exception:
+            return
+        with self._lock:
+            db = self._db()
+            db.execute(
+                f"INSERT OR REPLACE INTO gate_records({','.join(_COLS)}) VALUES({','.join('?' * len(_COLS))})",
+                _row_from(rel, rel.split("/", 1)[0], obj or {}, mt),
+            )
+            db.commit()
+
+    # ---- reconcile ----
+
+    def _day_dirs(self) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for st in STATES:
+            base = self.root / st
+            try:
+                entries = list(os.scandir(base))
+            except OSError:
+                continue
+            for e in entries:
+                try:
+                    if e.is_dir():
+                        out[f"{st}/{e.name}"] = e.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return out
+
+    def sync(self, force: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            db = self._db()
+            now = time.monotonic()
+            if not force and self._synced_at and (now - self._synced_at) < _refresh_interval():
+                return self.stats
+            t0 = time.perf_counter()
+            dirs = self._day_dirs()
+            known = {r["dir"]: r["mtime_ns"] for r in db.execute("SELECT dir, mtime_ns FROM gate_dirs")}
+            read = rescanned = 0
+            for d, mt in dirs.items():
+                if not force and known.get(d) == mt:
+                    continue
+                rescanned += 1
+                have = {r["path"]: r["mtime_ns"] for r in db.execute("SELECT path, mtime_ns FROM gate_records WHERE dir=?", (d,))}
+                seen = set()
+                state = d.split("/", 1)[0]
+                for e in os.scandir(self.root / d):
+                    if not e.name.endswith(".json") or not e.is_file():
+                        continue
+                    rel = f"{d}/{e.name}"
+                    seen.add(rel)
+                    try:
+                        fmt = e.stat().st_mtime_ns
+                        if have.get(rel) == fmt:
+                            continue
+                        obj = json.loads(Path(e.path).read_text(encoding="utf-8"))
+                    except Exception:
+                        continue  # legacy scans skipped unreadable records too
+                    read += 1
+                    db.execute(
+                        f"INSERT OR REPLACE INTO gate_records({','.join(_COLS)}) VALUES({','.join('?' * len(_COLS))})",
+                        _row_from(rel, state, obj if isinstance(obj, dict) else {}, fmt),
+                    )
+                gone = [p for p in have if p not in seen]
+                db.executemany("DELETE FROM gate_records WHERE path=?", [(p,) for p in gone])
+                db.execute("INSERT OR REPLACE INTO gate_dirs(dir, mtime_ns) VALUES(?, ?)", (d, mt))
+            stale = [d for d in known if d not in dirs]
+            for d in stale:
+                db.execute("DELETE FROM gate_records WHERE dir=?", (d,))
+                db.execute("DELETE FROM gate_dirs WHERE dir=?", (d,))
+            db.commit()
+            self._synced_at = now
+            self.stats = {
+                "dirs": len(dirs),
+                "rescanned": rescanned,
+                "read": read,
+                "removed_dirs": len(stale),
+                "sync_ms": round((time.perf_counter() - t0) * 1000, 2),
+            }
+            return self.stats
+
+    def rebuild(self) -> Dict[str, Any]:
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM gate_records")
+            db.execute("DELETE FROM gate_dirs")
+            db.commit()
+            return self.sync(force=True)
+
+    # ---- queries ----
+
+    def find(self, gid: str, state: str) -> Optional[Path]:
+        """Newest-day record file for (id, state dir), or None."""
+        self.sync()
+        with self._lock:
+            row = self._db().execute(
+                "SELECT path FROM gate_records WHERE id=? AND state=? ORDER BY day DESC LIMIT 1",
+                (gid, state),
+            ).fetchone()
+        if not row:
+            return None
+        fp = self.root / row["path"]
+        if fp.exists():
+            return fp
+        self.sync(force=True)  # removed behind our back; requery once
+        with self._lock:
+            row = self._db().execute(
+                "SELECT path FROM gate_records WHERE id=? AND state=? ORDER BY day DESC LIMIT 1",
+                (gid, state),
+            ).fetchone()
+        return (self.root / row["path"]) if row else None
+
+    def find_any(self, gid: str) -> Optional[Tuple[str, Path]]:
+        """(state, path) of the first match in pending → approved → rejected order."""
+        for st in STATES:
+            fp = self.find(gid, st)
+            if fp is not None:
+                return st, fp
+        return None
+
+    def list(
+        self,
+        state: Optional[str] = None,
+        proposer: Optional[str] = None,
+        approver: Optional[str] = None,
+        scope_id: Optional[str] = None,
+        source_diversity_ok: Optional[bool] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Legacy order (state, day desc, id asc); returns (page, total matching).
+        Item "path" is an absolute Path."""
+        self.sync()
+        where: List[str] = []
+        args: List[Any] = []
+        for col, val in (("state", state), ("proposer", proposer), ("approver", approver), ("scope_id", scope_id)):
+            if val:
+                where.append(f"{col}=?")
+                args.append(val)
+        if source_diversity_ok is not None:
+            where.append("source_diversity_ok=?")
+            args.append(int(bool(source_diversity_ok)))
+        if since:
+            where.append("created_at>=?")
+            args.append(since)
+        if until:
+            where.append("created_at<?")
+            args.append(until)
+        cond = (" WHERE " + " AND ".join(where)) if where else ""
+        with self._lock:
+            db = self._db()
+            total = int(db.execute(f"SELECT COUNT(*) FROM gate_records{cond}", args).fetchone()[0])
+            rows = db.execute(
+                f"SELECT * FROM gate_records{cond} ORDER BY state_rank, day DESC, id LIMIT ? OFFSET ?",
+                args + [int(limit), max(0, int(offset))],
+            ).fetchall()
+        items = []
+        for r in rows:
+            try:
+                roots = json.loads(r["source_roots"] or "[]")
+            except Exception:
+                roots = []
+            items.append({
+                "id": r["id"],
+                "state": r["state"],
+                "created_at": r["created_at"],
+                "proposer": r["proposer"],
+                "approver": r["approver"],
+                "excerpt": r["excerpt"] or "",
+                "refs_count": r["refs_count"],
+                "source_roots": roots,
+                "path": self.root / r["path"],
+            })
+        return items, total
+
+    def counts(self) -> Dict[str, int]:
+        self.sync()
+        with self._lock:
+            rows = self._db().execute("SELECT state, COUNT(*) AS n FROM gate_records GROUP BY state").fetchall()
+        out = {st: 0 for st in STATES}
+        out.update({r["state"]: int(r["n"]) for r in rows})
+        return out
+
+
+GATE_CATALOG = GateCatalog()
+
+__all__ = [
+    "GATE_ROOT",
+    "CATALOG_PATH",
+    "GateCatalog",
+    "GATE_CATALOG",
+]
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Build/refresh the Memory Gate record catalog")
+    ap.add_argument("--rebuild", action="store_true", help="drop all rows and rescan")
+    args = ap.parse_args(argv)
+    stats = GATE_CATALOG.rebuild() if args.rebuild else GATE_CATALOG.sync(force=True)
+    print(json.dumps({**stats, "counts": GATE_CATALOG.counts(), "catalog": str(GATE_CATALOG.db_path)}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
+
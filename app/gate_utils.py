@@ -4,9 +4,11 @@ gate_utils.py — Gate utilities for ST-1204 (ultra_long Memory Gate)
 Features:
 - ULID generator (sortable, Crockford Base32)
 - SHA-256 helpers and HMAC-SHA256 gate_token (make/verify)
-- PII scan + redaction (patterns from status/resources/memory/pii/patterns_v1.json)
+- PII scan + redaction (patterns from status/resources/memory/pii/patterns_v1.json;
+  compiled once per file mtime, merged single-pass redaction, redact_many batch API)
 - Source root extraction and diversity check for refs[] (path#Lx-y)
-- Audit chain logger (append-only JSONL with prev_hash → this_hash)
+- Audit chain logger (append-only JSONL with prev_hash → this_hash; flock-serialized,
+  cached head, group-commit fsync) + incremental chain verifier
 - Misc helpers: utc_now_iso, cosine similarity, JSONL append, safe mkdirs
 
 Notes:
@@ -16,13 +18,17 @@ Notes:
 
 from __future__ import annotations
 
+import atexit
 import base64
+import fcntl
 import hashlib
 import hmac
 import json
 import os
 import random
 import re
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -270,6 +276,126 @@ def apply_strategy(strategy: str, m: re.Match) -> str:
     return _mask_full(m)
 
 
+class PiiMatcher:
+    """Compiled PII pattern set with a single redaction pass.
+
+    Every pattern is matched against the original text (no re-scan of already
+    redacted output) and every hit is flagged. Overlapping hits are merged into their
+    union span: if one hit covers the whole span, the earliest such pattern's strategy
+    applies (order = patterns list, i.e. `testing.ordering` when loaded from the
+    patterns file), otherwise the span is masked in full, so no part of any hit
+    survives. The output is assembled once. Strategies get the pattern's own match
+    object, so group numbers stay valid.
+
+    Note: one big `a|b|c` alternation was measured slower on CPython's 're' than
+    per-pattern scans (the per-pattern first-char skip is lost), hence the merge.
+    """
+
+    def __init__(self, patterns: Iterable[PiiPattern]) -> None:
+        self.compiled: List[Tuple[PiiPattern, "re.Pattern[str]"]] = []
+        for p in patterns:
+            try:
+                self.compiled.append((p, re.compile(p.regex, _compile_flags(p.flags))))
+            except Exception:
+                continue
+
+    def scan(self, text: str) -> Dict[str, Any]:
+        if not text:
+            return {"flags": [], "redaction_suggested": False, "redacted_text": text}
+        hits: List[Tuple[int, int, re.Match, PiiPattern]] = []
+        for rank, (p, comp) in enumerate(self.compiled):
+            for m in comp.finditer(text):
+                if m.end() > m.start():
+                    hits.append((m.start(), rank, m, p))
+        if not hits:
+            return {"flags": [], "redaction_suggested": False, "redacted_text": text}
+        hits.sort(key=lambda h: (h[0], h[1]))
+
+        flags: List[Dict[str, Any]] = [
+            {"kind": p.kind, "id": p.id, "match": m.group(0)[:120], "start": start, "end": m.end()}
+            for start, _rank, m, p in hits
+        ]
+        # Group overlapping hits: [(span_start, span_end, [hits])]
+        groups: List[Tuple[int, int, List[Tuple[int, int, re.Match, PiiPattern]]]] = []
+        for h in hits:
+            if groups and h[0] < groups[-1][1]:
+                gs, ge, members = groups[-1]
+                members.append(h)
+                groups[-1] = (gs, max(ge, h[2].end()), members)
+            else:
+                groups.append((h[0], h[2].end(), [h]))
+
+        pieces: List[str] = []
+        pos = 0
+        for gs, ge, members in groups:
+            pieces.append(text[pos:gs])
+            cover = [h for h in members if h[0] == gs and h[2].end() == ge]
+            if cover:
+                _start, _rank, m, p = min(cover, key=lambda h: h[1])
+                try:
+                    pieces.append(apply_strategy(p.strategy, m))
+                except Exception:
+                    pieces.append(_mask_full(m))
+            else:
+                pieces.append("[REDACTED]")
+            pos = ge
+        pieces.append(text[pos:])
+        return {"flags": flags, "redaction_suggested": True, "redacted_text": "".join(pieces)}
+
+
+# Compiled matcher cache: file-backed sets are keyed by (path, mtime_ns, size) so an
+# edited patterns file is picked up on the next call; explicit lists by their content.
+_PII_LOCK = threading.Lock()
+_PII_FILE_CACHE: Dict[str, Tuple[Tuple[int, int], PiiMatcher]] = {}
+_PII_LIST_CACHE: Dict[Tuple[Tuple[str, ...], ...], PiiMatcher] = {}
+_PII_LIST_CACHE_MAX = 32
+
+
+def _pii_ordering(path: Path) -> List[str]:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        order = (raw.get("testing") or {}).get("ordering") or []
+        return [str(x) for x in order]
+    except Exception:
+        return []
+
+
+def get_pii_matcher(
+    patterns: Optional[List[PiiPattern]] = None,
+    path: Path = PII_PATTERNS_PATH,
+) -> PiiMatcher:
+    """Return a cached PiiMatcher for `patterns`, or for the patterns file at `path`."""
+    if patterns:
+        key = tuple((p.id, p.kind, p.regex, p.flags, p.strategy) for p in patterns)
+        with _PII_LOCK:
+            hit = _PII_LIST_CACHE.get(key)
+            if hit is not None:
+                return hit
+        matcher = PiiMatcher(patterns)
+        with _PII_LOCK:
+            if len(_PII_LIST_CACHE) >= _PII_LIST_CACHE_MAX:
+                _PII_LIST_CACHE.pop(next(iter(_PII_LIST_CACHE)))
+            _PII_LIST_CACHE[key] = matcher
+        return matcher
+
+    try:
+        st = path.stat()
+        sig = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        sig = (0, 0)
+    ck = str(path)
+    with _PII_LOCK:
+        hit = _PII_FILE_CACHE.get(ck)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+        pats = load_pii_patterns(path)
+        rank = {pid: i for i, pid in enumerate(_pii_ordering(path))}
+        pats.sort(key=lambda p: rank.get(p.id, len(rank)))  # stable: unlisted keep file order
+        matcher = PiiMatcher(pats)
+        _PII_FILE_CACHE[ck] = (sig, matcher)
+        return matcher
+
+
 def pii_scan_and_redact(text: str, patterns: Optional[List[PiiPattern]] = None) -> Dict[str, Any]:
     """
     Returns:
@@ -278,49 +404,17 @@ def pii_scan_and_redact(text: str, patterns: Optional[List[PiiPattern]] = None)
         "redaction_suggested": bool,
         "redacted_text": str
       }
+    start/end are offsets into the original text.
     """
     if not text:
         return {"flags": [], "redaction_suggested": False, "redacted_text": text}
+    return get_pii_matcher(patterns).scan(text)
 
-    pats = patterns or load_pii_patterns()
-    flags: List[Dict[str, Any]] = []
-    out = text
-
-    # Apply each pattern sequentially, capturing matches for flagging.
-    for p in pats:
-        try:
-            comp = re.compile(p.regex, _compile_flags(p.flags))
-        except Exception:
-            continue
-
-        # Gather matches on current output (to avoid index skew complexity, we flag using original text positions where possible)
-        matches = list(comp.finditer(out))
-        if not matches:
-            continue
 
-        for m in matches:
-            try:
-                flags.append({
-                    "kind": p.kind,
-                    "id": p.id,
-                    "match": m.group(0)[:120],
-                    "start": m.start(),
-                    "end": m.end(),
-                })
-            except Exception:
-                pass
-
-        # Redact on 'out' string
-        try:
-            out = comp.sub(lambda m: apply_strategy(p.strategy, m), out)
-        except Exception:
-            pass
-
-    return {
-        "flags": flags,
-        "redaction_suggested": bool(flags),
-        "redacted_text": out if flags else text,
-    }
+def redact_many(texts: Iterable[str], patterns: Optional[List[PiiPattern]] = None) -> List[Dict[str, Any]]:
+    """Batch form of pii_scan_and_redact: resolves the matcher once for all texts."""
+    matcher = get_pii_matcher(patterns)
+    return [matcher.scan(t) for t in texts]
 
 
 # ---------- Source roots & diversity ----------
@@ -368,17 +462,17 @@ def compute_source_diversity(refs: List[str], house_only_relax: bool = False) ->
 
 # ---------- Audit chain (append-only JSONL) ----------
 
-def _audit_day_dir(ts_iso: Optional[str] = None) -> Path:
+def _audit_day_dir(ts_iso: Optional[str] = None, root: Optional[Path] = None) -> Path:
     try:
         d = datetime.fromisoformat((ts_iso or utc_now_iso()).replace("Z", "+00:00"))
     except Exception:
         d = datetime.now(timezone.utc)
     day = f"{d.year:04d}{d.month:02d}{d.day:02d}"
-    return GATE_AUDIT_DIR / day
+    return (root or GATE_AUDIT_DIR) / day
 
 
-def _audit_file(ts_iso: Optional[str] = None) -> Path:
-    return _audit_day_dir(ts_iso) / "audit.jsonl"
+def _audit_file(ts_iso: Optional[str] = None, root: Optional[Path] = None) -> Path:
+    return _audit_day_dir(ts_iso, root) / "audit.jsonl"
 
 
 def _audit_last_hash(path: Path) -> str:
@@ -406,35 +500,222 @@ def _audit_last_hash(path: Path) -> str:
         return "0" * 64
 
 
+def _audit_hash(prev_hash: str, meta: Dict[str, Any]) -> str:
+    # this_hash = sha256(prev_hash + sha256(minified_meta))
+    try:
+        meta_min = json.dumps(meta or {}, separators=(",", ":"), sort_keys=True)
+    except Exception:
+        meta_min = "{}"
+    return sha256_hex(prev_hash + sha256_hex(meta_min))
+
+
+class AuditWriter:
+    """
+    Serialized audit chain writer.
+
+    - Appends happen under an exclusive flock on the day's audit.jsonl, so
+      concurrent processes can never read the same prev_hash (no forks)
+    - The chain head is cached per file together with (inode, size) after our own
+      write; it is reused as long as nobody else appended, otherwise the tail is
+      re-read under the lock
+    - fsync policy (GATE_AUDIT_FSYNC): "always" | "batch" (group commit: one fsync
+      per GATE_AUDIT_FSYNC_MS window or GATE_AUDIT_FSYNC_MAX appends; an idle timer
+      commits the last window when no further append comes) | "off"
+    """
+
+    def __init__(self, root: Optional[Path] = None, fsync: Optional[str] = None,
+                 fsync_ms: Optional[int] = None, fsync_max: Optional[int] = None) -> None:
+        self.root = root
+        self.fsync = (fsync or ENV.get("GATE_AUDIT_FSYNC") or "batch").lower()
+        self.fsync_ms = int(fsync_ms if fsync_ms is not None else ENV.get("GATE_AUDIT_FSYNC_MS", "50"))
+        self.fsync_max = int(fsync_max if fsync_max is not None else ENV.get("GATE_AUDIT_FSYNC_MAX", "32"))
+        self._lock = threading.Lock()
+        self._fh: Dict[Path, Any] = {}
+        self._head: Dict[Path, Tuple[int, int, str]] = {}  # path → (inode, size, this_hash)
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+        self._pid = os.getpid()
+
+    def _handle(self, path: Path):
+        if self._pid != os.getpid():
+            # Forked child: an inherited fd shares the parent's flock, so reopen
+            # (the parent's idle timer thread does not exist here)
+            self._fh, self._head, self._pid = {}, {}, os.getpid()
+            self._pending, self._timer = 0, None
+        fh = self._fh.get(path)
+        if fh is None or fh.closed:
+            _ensure_dir(path.parent)
+            # Day rolled over: release handles of older days
+            for old in list(self._fh):
+                if old != path:
+                    self._close(old)
+            fh = path.open("ab")
+            self._fh[path] = fh
+        return fh
+
+    def _close(self, path: Path) -> None:
+        fh = self._fh.pop(path, None)
+        self._head.pop(path, None)
+        if fh is not None and not fh.closed:
+            try:
+                os.fsync(fh.fileno())
+            except Exception:
+                pass
+            fh.close()
+
+    def _maybe_sync(self, fh) -> bool:
+        if self.fsync == "off":
+            return False
+        self._pending += 1
+        now = time.monotonic()
+        if (
+            self.fsync == "always"
+            or self._pending >= self.fsync_max
+            or (now - self._last_sync) * 1000.0 >= self.fsync_ms
+        ):
+            os.fsync(fh.fileno())
+            self._pending = 0
+            self._last_sync = now
+            return True
+        if self._timer is None:
+            self._timer = threading.Timer(self.fsync_ms / 1000.0, self._idle_sync)
+            self._timer.daemon = True
+            self._timer.start()
+        return False
+
+    def _idle_sync(self) -> None:
+        """Timer: commit a window that no later append closed."""
+        with self._lock:
+            self._timer = None
+            if not self._pending or self._pid != os.getpid():
+                return
+            for fh in self._fh.values():
+                if not fh.closed:
+                    try:
+                        os.fsync(fh.fileno())
+                    except Exception:
+                        pass
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def append(self, actor: str, action: str, gate_id: str, meta: Dict[str, Any], ts_iso: Optional[str] = None) -> Dict[str, Any]:
+        ts = ts_iso or utc_now_iso()
+        af = _audit_file(ts, self.root)
+        with self._lock:
+            fh = self._handle(af)
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                st = os.fstat(fh.fileno())
+                cached = self._head.get(af)
+                if cached and cached[0] == st.st_ino and cached[1] == st.st_size:
+                    prev_hash = cached[2]
+                else:
+                    prev_hash = _audit_last_hash(af)
+                body = {
+                    "ts": ts,
+                    "actor": actor,
+                    "action": action,
+                    "id": gate_id,
+                    "prev_hash": prev_hash,
+                    "meta": meta or {},
+                }
+                this_hash = _audit_hash(prev_hash, body["meta"])
+                body["this_hash"] = this_hash
+                data = (json.dumps(body, ensure_ascii=False) + "\n").encode("utf-8")
+                fh.write(data)
+                fh.flush()
+                synced = self._maybe_sync(fh)
+                self._head[af] = (st.st_ino, st.st_size + len(data), this_hash)
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+        try:
+            rel = str(af.relative_to(PROJECT_ROOT))
+        except ValueError:
+            rel = str(af)
+        return {"ok": True, "path": rel, "prev_hash": prev_hash, "this_hash": this_hash, "ts": ts, "synced": synced}
+
+    def flush(self) -> None:
+        """Force the pending group commit (fsync) of every open day file."""
+        with self._lock:
+            for fh in self._fh.values():
+                if not fh.closed:
+                    fh.flush()
+                    os.fsync(fh.fileno())
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            for p in list(self._fh):
+                self._close(p)
+
+
+AUDIT_WRITER = AuditWriter()
+atexit.register(AUDIT_WRITER.close)
+
+
 def append_audit(actor: str, action: str, gate_id: str, meta: Dict[str, Any], ts_iso: Optional[str] = None) -> Dict[str, Any]:
     """
     Appends an audit line:
       {"ts","actor","action","id","prev_hash","this_hash","meta":{...}}
     Returns dict with path and hashes.
     """
-    ts = ts_iso or utc_now_iso()
-    af = _audit_file(ts)
-    _ensure_dir(af.parent)
-    prev_hash = _audit_last_hash(af)
-
-    body = {
-        "ts": ts,
-        "actor": actor,
-        "action": action,
-        "id": gate_id,
-        "prev_hash": prev_hash,
-        "meta": meta or {},
-    }
-    # compute this_hash = sha256(prev_hash + sha256(minified_meta))
-    try:
-        meta_min = json.dumps(body["meta"], separators=(",", ":"), sort_keys=True)
-    except Exception:
-        meta_min = "{}"
-    this_hash = sha256_hex(prev_hash + sha256_hex(meta_min))
-    body["this_hash"] = this_hash
+    return AUDIT_WRITER.append(actor, action, gate_id, meta, ts_iso=ts_iso)
+
+
+# Incremental verifier state: path → (inode, offset, line_no, last_hash)
+_AUDIT_VERIFIED: Dict[Path, Tuple[int, int, int, str]] = {}
+
 
-    _append_jsonl(af, body)
-    return {"ok": True, "path": str(af.relative_to(PROJECT_ROOT)), "prev_hash": prev_hash, "this_hash": this_hash, "ts": ts}
+def verify_audit_chain(day: Optional[str] = None, path: Optional[Path] = None, incremental: bool = True) -> Dict[str, Any]:
+    """
+    Verify a day's audit chain (day=YYYYMMDD, default today, or an explicit path).
+    Each line must carry prev_hash == previous this_hash and
+    this_hash == sha256(prev_hash + sha256(minified_meta)).
+    With incremental=True only lines appended since the last clean verification are
+    checked (breaks are never cached). Returns the first break, if any.
+    """
+    af = path or ((GATE_AUDIT_DIR / day / "audit.jsonl") if day else _audit_file())
+    out: Dict[str, Any] = {"path": str(af), "ok": True, "count": 0, "checked": 0, "first_break": None, "last_hash": "0" * 64}
+    if not af.exists():
+        return out
+    st = af.stat()
+    ino, offset, line_no, prev = st.st_ino, 0, 0, "0" * 64
+    cached = _AUDIT_VERIFIED.get(af) if incremental else None
+    if cached and cached[0] == st.st_ino and cached[1] <= st.st_size:
+        _, offset, line_no, prev = cached
+    checked = 0
+    with af.open("rb") as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # partial tail (writer in progress)
+            line_no += 1
+            brk: Optional[Dict[str, Any]] = None
+            try:
+                obj = json.loads(raw.decode("utf-8"))
+                got_prev = str(obj.get("prev_hash") or "")
+                if got_prev != prev:
+                    brk = {"line": line_no, "reason": "PREV_HASH_MISMATCH", "expected_prev": prev, "got_prev": got_prev}
+                else:
+                    want = _audit_hash(prev, obj.get("meta") or {})
+                    if str(obj.get("this_hash") or "") != want:
+                        brk = {"line": line_no, "reason": "THIS_HASH_MISMATCH", "expected": want, "got": obj.get("this_hash")}
+            except Exception as e:
+                brk = {"line": line_no, "reason": "PARSE_ERROR", "error": str(e)}
+            if brk:
+                out.update({"ok": False, "first_break": brk, "count": line_no, "checked": checked + 1, "last_hash": prev})
+                return out
+            checked += 1
+            prev = str(obj.get("this_hash"))
+            offset += len(raw)
+    _AUDIT_VERIFIED[af] = (ino, offset, line_no, prev)
+    out.update({"count": line_no, "checked": checked, "last_hash": prev})
+    return out
 
 
 # ---------- Similarity ----------
@@ -472,11 +753,12 @@ __all__ = [
     # tokens
     "make_gate_token", "verify_gate_token",
     # pii
-    "PiiPattern", "load_pii_patterns", "pii_scan_and_redact",
+    "PiiPattern", "PiiMatcher", "load_pii_patterns", "get_pii_matcher",
+    "pii_scan_and_redact", "redact_many",
     # refs/diversity
     "extract_source_root", "compute_source_diversity",
     # audit
-    "append_audit",
+    "AuditWriter", "AUDIT_WRITER", "append_audit", "verify_audit_chain",
     # similarity
     "cosine_sim",
     # text hash
@@ -0,0 +1,426 @@
+"""
+job_queue.py — Local subprocess job queue backed by SQLite job records (ops_jobs)
+
+Features:
+- submit(): insert a `queued` row and hand the id to a bounded in-process queue → returns
+  immediately; a full queue raises QueueFull instead of piling up work
+- Fixed worker pool (N threads): each job runs as its own process group with stdout/stderr
+  written straight to <logs_root>/<id>/stdout.log|stderr.log (pollable while it runs)
+- Per-job timeout and cancel(): SIGTERM to the process group, SIGKILL after a grace period
+- Status: queued → running → succeeded | failed | timeout | cancelled (| interrupted when the
+  server died under a running job); rc, pid, timestamps (epoch ms) and error_msg on the row
+- on_finish(row) hook on every terminal transition, called with the final row before it is
+  published; the dict it returns is merged into meta_json by the same UPDATE that sets the
+  terminal status (api.py writes the run evidence JSON and records its path there)
+
+Notes:
+- Rows outlive the process: start() marks rows left `running` as interrupted and re-queues
+  rows still `queued` (up to capacity; the rest are marked interrupted)
+- Table: db/schema/sqlite/ops_jobs_v2.sql (migration 008); one short connection per operation,
+  WAL + synchronous=NORMAL so status polls and submits do not wait on worker commits
+- Cancelling a queued job only flips its row; the worker skips it when dequeued
+
+CLI (dev):
+  python app/job_queue.py [db_path]   # runs three shell jobs (ok / fail / timeout) on a temp DB
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import signal
+import sqlite3
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+WORKERS = 2
+MAX_QUEUED = 32
+TIMEOUT_SEC = 1800
+KILL_GRACE_SEC = 5.0
+POLL_SEC = 0.2
+TERMINAL = ("succeeded", "failed", "timeout", "cancelled", "interrupted")
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+class JobNotFound(KeyError):
+    pass
+
+
+def _ms() -> int:
+    return int(time.time() * 1000)
+
+
+def tail_file(path: Path, max_bytes: int = 8000) -> str:
+    """Last max_bytes of a (possibly growing) log file; '' when it does not exist yet."""
+    try:
+        with path.open("rb") as fh:
+            fh.seek(0, os.SEEK_END)
+            size = fh.tell()
+            fh.seek(max(0, size - max_bytes))
+            data = fh.read(max_bytes)
+    except FileNotFoundError:
+        return ""
+    text = data.decode("utf-8", "replace")
+    return ("...<truncated>...\n" + text) if size > max_bytes else text
+
+
+class JobQueue:
+    def __init__(
+        self,
+        db_path: Callable[[], str],
+        logs_root: Path,
+        workers: int = WORKERS,
+        max_queued: int = MAX_QUEUED,
+        default_timeout: int = TIMEOUT_SEC,
+        on_finish: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+    ) -> None:
+        self.db_path = db_path
+        self.logs_root = Path(logs_root)
+        self.workers = max(1, int(workers))
+        self.max_queued = max(1, int(max_queued))
+        self.default_timeout = int(default_timeout)
+        self.on_finish = on_finish
+        self._q: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=self.max_queued)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()  # serializes writes from this process
+        self._cancel: set = set()
+        self._procs: Dict[str, subprocess.Popen] = {}
+        self._started = False
+        self._wal = False
+        self.counters = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0,
+                         "timeout": 0, "cancelled": 0, "interrupted": 0}
+
+    # ---------- rows ----------
+
+    def _conn(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self.db_path(), timeout=10)
+        con.row_factory = sqlite3.Row
+        if not self._wal:
+            con.execute("PRAGMA journal_mode=WAL")  # persistent; pollers never block the writers
+            self._wal = True
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    def _update(self, job_id: str, **cols: Any) -> None:
+        cols["updated_at"] = _ms()
+        sets = ", ".join(f"{k} = ?" for k in cols)
+        with self._lock:
+            con = self._conn()
+            try:
+                with con:
+                    con.execute(f"UPDATE ops_jobs SET {sets} WHERE id = ?", (*cols.values(), job_id))
+            finally:
+                con.close()
+
+    def _row(self, r: sqlite3.Row) -> Dict[str, Any]:
+        d = dict(r)
+        d["cmd"] = json.loads(d.pop("cmd_json") or "[]")
+        d["meta"] = json.loads(d.pop("meta_json") or "{}")
+        if d.get("log_dir"):
+            d["stdout_path"] = str(Path(d["log_dir"]) / "stdout.log")
+            d["stderr_path"] = str(Path(d["log_dir"]) / "stderr.log")
+        end = d.get("finished_at") or (_ms() if d.get("started_at") else None)
+        d["duration_ms"] = end - d["started_at"] if d.get("started_at") and end else None
+        return d
+
+    def _claim(self, job_id: str) -> bool:
+        """queued → running, atomically (a concurrent cancel wins if it got there first)."""
+        with self._lock:
+            con = self._conn()
+            try:
+                with con:
+                    cur = con.execute(
+                        "UPDATE ops_jobs SET status = 'running', started_at = ?, updated_at = ? "
+                        "WHERE id = ? AND status = 'queued'",
+                        (_ms(), _ms(), job_id),
+                    )
+                    return cur.rowcount == 1
+            finally:
+                con.close()
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        con = self._conn()
+        try:
+            r = con.execute("SELECT * FROM ops_jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            con.close()
+        if r is None:
+            raise JobNotFound(job_id)
+        return self._row(r)
+
+    def list(self, kind: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        q = "SELECT * FROM ops_jobs" + (" WHERE kind = ?" if kind else "") + " ORDER BY created_at DESC LIMIT ?"
+        con = self._conn()
+        try:
+            rows = con.execute(q, ((kind,) if kind else ()) + (int(limit),)).fetchall()
+        finally:
+            con.close()
+        return [self._row(r) for r in rows]
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self._recover()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f"job-queue-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop accepting work; running jobs are cancelled, queued rows stay queued for next start."""
+        if not self._started:
+            return
+        with self._lock:
+            self._cancel.update(self._procs)
+        while True:
+            try:
+                self._q.get_nowait()
+            except queue.Empty:
+                break
+        for _ in self._threads:
+            self._q.put(None)
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+        self._started = False
+
+    def _recover(self) -> None:
+        con = self._conn()
+        try:
+            with con:
+                con.execute(
+                    "UPDATE ops_jobs SET status = 'interrupted', error_msg = 'server restarted while running', "
+                    "finished_at = ?, updated_at = ? WHERE status = 'running'",
+                    (_ms(), _ms()),
+                )
+            queued = [r["id"] for r in con.execute(
+                "SELECT id FROM ops_jobs WHERE status = 'queued' ORDER BY created_at")]
+        finally:
+            con.close()
+        for jid in queued:
+            try:
+                self._q.put_nowait(jid)
+            except queue.Full:
+                self._update(jid, status="interrupted", error_msg="queue full on restart", finished_at=_ms())
+
+    # ---------- submit / cancel ----------
+
+    def submit(
+        self,
+        kind: str,
+        cmd: Sequence[str],
+        script: Optional[str] = None,
+        timeout_sec: Optional[int] = None,
+        meta: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        if self._q.full():
+            self.counters["rejected"] += 1
+            raise QueueFull(f"{self.max_queued} jobs already queued")
+        jid = job_id or f"JOB_{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}_{uuid.uuid4().hex[:8]}"
+        now = _ms()
+        row = (jid, kind, script, json.dumps(list(cmd), ensure_ascii=False),
+               json.dumps(meta or {}, ensure_ascii=False), "queued",
+               int(timeout_sec or self.default_timeout), str(self.logs_root / jid), now, now)
+        with self._lock:
+            con = self._conn()
+            try:
+                with con:
+                    con.execute(
+                        "INSERT INTO ops_jobs(id, kind, script, cmd_json, meta_json, status, timeout_sec, log_dir, "
+                        "created_at, updated_at) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                        row,
+                    )
+            finally:
+                con.close()
+        try:
+            self._q.put_nowait(jid)
+        except queue.Full:  # lost a race for the last slot
+            self._update(jid, status="cancelled", error_msg="queue full", finished_at=_ms())
+            self.counters["rejected"] += 1
+            raise QueueFull(f"{self.max_queued} jobs already queued")
+        self.counters["submitted"] += 1
+        return self.get(jid)
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        row = self.get(job_id)
+        if row["status"] == "queued":
+            if self._terminal(job_id, "cancelled", only_if="queued", error_msg="cancelled before start"):
+                self.counters["cancelled"] += 1
+                return self.get(job_id)
+            row = self.get(job_id)  # a worker claimed it meanwhile → cancel the process
+        if row["status"] == "running":
+            with self._lock:
+                self._cancel.add(job_id)
+        return self.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            row = self.get(job_id)
+            if row["status"] in TERMINAL or (deadline is not None and time.monotonic() >= deadline):
+                return row
+            time.sleep(POLL_SEC)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            running = list(self._procs)
+        return {
+            "workers": self.workers,
+            "alive": self.running(),
+            "queued": self._q.qsize(),
+            "max_queued": self.max_queued,
+            "running": running,
+            "default_timeout_sec": self.default_timeout,
+            "counters": dict(self.counters),
+        }
+
+    # ---------- worker ----------
+
+    def _worker(self) -> None:
+        while True:
+            jid = self._q.get()
+            if jid is None:
+                return
+            try:
+                self._run(jid)
+            except Exception as e:  # keep the worker alive; the row carries the error
+                try:
+                    self._terminal(jid, "failed", error_msg=f"RUNNER_ERROR: {e}")
+                except Exception:
+                    pass
+
+    def _kill(self, proc: subprocess.Popen) -> None:
+        for sig, grace in ((signal.SIGTERM, KILL_GRACE_SEC), (signal.SIGKILL, None)):
+            try:
+                os.killpg(proc.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                return
+            try:
+                proc.wait(timeout=grace)
+                return
+            except subprocess.TimeoutExpired:
+                continue
+        proc.wait()
+
+    def _run(self, jid: str) -> None:
+        if not self._claim(jid):  # cancelled while waiting
+            return
+        row = self.get(jid)
+        log_dir = Path(row["log_dir"])
+        log_dir.mkdir(parents=True, exist_ok=True)
+        meta = row["meta"]
+        with (log_dir / "stdout.log").open("wb") as out, (log_dir / "stderr.log").open("wb") as err:
+            try:
+                proc = subprocess.Popen(
+                    row["cmd"], stdout=out, stderr=err, stdin=subprocess.DEVNULL,
+                    cwd=meta.get("cwd") or None, start_new_session=True,
+                )
+            except OSError as e:
+                self._terminal(jid, "failed", error_msg=f"SPAWN_FAIL: {e}")
+                self.counters["failed"] += 1
+                return
+            with self._lock:
+                self._procs[jid] = proc
+            self._update(jid, pid=proc.pid)
+            deadline = time.monotonic() + int(row["timeout_sec"] or self.default_timeout)
+            outcome = None
+            while True:
+                try:
+                    proc.wait(timeout=POLL_SEC)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+                if jid in self._cancel:
+                    outcome = "cancelled"
+                elif time.monotonic() >= deadline:
+                    outcome = "timeout"
+                if outcome:
+                    self._kill(proc)
+                    break
+        with self._lock:
+            self._procs.pop(jid, None)
+            self._cancel.discard(jid)
+        rc = proc.returncode
+        status = outcome or ("succeeded" if rc == 0 else "failed")
+        err_msg = {"timeout": f"timed out after {row['timeout_sec']}s", "cancelled": "cancelled"}.get(status)
+        if status == "failed":
+            err_msg = f"exit code {rc}"
+        self._terminal(jid, status, rc=rc, error_msg=err_msg)
+        self.counters[status] += 1
+
+    def _terminal(self, job_id: str, status: str, only_if: Optional[str] = None, **cols: Any) -> bool:
+        """
+        Terminal transition in one UPDATE: on_finish runs first on the final row and whatever it
+        returns is merged into meta_json alongside the status, so anyone who sees the terminal
+        status (wait(), GET) also sees what the hook recorded. only_if: apply only while the row
+        still has that status (False otherwise; the hook is not called).
+        """
+        with self._lock:  # _claim() takes it too: the row cannot change under the hook
+            row = self.get(job_id)
+            if only_if is not None and row["status"] != only_if:
+                return False
+            now = _ms()
+            cols.update(status=status, finished_at=now)
+            final = {**row, **cols}
+            final["duration_ms"] = now - row["started_at"] if row.get("started_at") else None
+            extra = None
+            if self.on_finish is not None:
+                try:
+                    extra = self.on_finish(final)
+                except Exception:
+                    pass
+            if extra:
+                cols["meta_json"] = json.dumps({**row["meta"], **extra}, ensure_ascii=False)
+            cols["updated_at"] = now
+            sets = ", ".join(f"{k} = ?" for k in cols)
+            con = self._conn()
+            try:
+                with con:
+                    con.execute(f"UPDATE ops_jobs SET {sets} WHERE id = ?", (*cols.values(), job_id))
+            finally:
+                con.close()
+        return True
+
+
+__all__ = [
+    "TERMINAL",
+    "QueueFull",
+    "JobNotFound",
+    "JobQueue",
+    "tail_file",
+]
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    td = Path(tempfile.mkdtemp())
+    db = sys.argv[1] if len(sys.argv) > 1 else str(td / "jobs.db")
+    schema = Path(__file__).resolve().parents[1] / "db" / "schema" / "sqlite" / "ops_jobs_v2.sql"
+    with sqlite3.connect(db) as c:
+        c.executescript(schema.read_text(encoding="utf-8"))
+    jq = JobQueue(lambda: db, td / "logs", workers=2, default_timeout=2)
+    jq.start()
+    ids = [jq.submit("demo", ["sh", "-c", c])["id"] for c in ("echo ok", "echo bad >&2; exit 3", "sleep 30")]
+    for j in ids:
+        r = jq.wait(j, timeout=15)
+        print(json.dumps({k: r[k] for k in ("id", "status", "rc", "error_msg", "duration_ms")}))
+        print("  stdout:", tail_file(Path(r["stdout_path"])).strip(), "| stderr:", tail_file(Path(r["stderr_path"])).strip())
+    jq.stop()
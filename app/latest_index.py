@@ -0,0 +1,124 @@
+"""
+latest_index.py — "latest artifact" pointers for evidence run directories
+
+Features:
+- Writers call update_latest(root, artifact, key) after producing an artifact
+  (pyspark run JSON, sitegraph/delta/alignment snapshot, content import run ...)
+- A single pointer file `<root>/_latest.json` holds the head plus a bounded,
+  key-ordered manifest of recent artifacts
+- Readers call resolve_latest(root) → O(1); None means "pointer missing/dangling",
+  in which case the caller falls back to its legacy directory scan
+
+Pointer shape:
+  {"version": 1, "key": "...", "path": "<rel to root>", "ts": "...",
+   "recent": [{"key": "...", "path": "...", "ts": "...", "meta": {...}}, ...]}
+
+Notes:
+- Updates are serialized with flock on `<root>/.latest.lock` and published via
+  tmp file + os.replace, so readers never observe a torn pointer
+- `key` must sort like the legacy scan order (date dir name, ISO ts ...); an older
+  key never replaces a newer head, it only lands in the manifest
+- No external deps
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+POINTER_NAME = "_latest.json"
+LOCK_NAME = ".latest.lock"
+RECENT_MAX = 50
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _rel_to(root: Path, p: Path) -> str:
+    try:
+        return str(p.resolve().relative_to(root.resolve()))
+    except Exception:
+        return str(p)
+
+
+def read_pointer(root: Path) -> Optional[Dict[str, Any]]:
+    fp = root / POINTER_NAME
+    try:
+        obj = json.loads(fp.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) and obj.get("path") else None
+
+
+def update_latest(
+    root: Path,
+    artifact: Path,
+    key: Optional[str] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    recent_max: int = RECENT_MAX,
+) -> Dict[str, Any]:
+    """Record `artifact` (a file under `root`) in the pointer + recent manifest.
+    Returns the pointer object as written."""
+    root.mkdir(parents=True, exist_ok=True)
+    ts = _now_iso()
+    entry: Dict[str, Any] = {"key": str(key or ts), "path": _rel_to(root, artifact), "ts": ts}
+    if meta:
+        entry["meta"] = meta
+
+    with (root / LOCK_NAME).open("a") as lk:
+        fcntl.flock(lk.fileno(), fcntl.LOCK_EX)
+        try:
+            cur = read_pointer(root) or {}
+            recent: List[Dict[str, Any]] = [
+                r for r in (cur.get("recent") or [])
+                if isinstance(r, dict) and r.get("path") != entry["path"]
+            ]
+            recent.append(entry)
+            recent.sort(key=lambda r: str(r.get("key") or ""), reverse=True)
+            recent = recent[: max(1, int(recent_max))]
+            head = recent[0]
+            pointer = {
+                "version": 1,
+                "key": head["key"],
+                "path": head["path"],
+                "ts": head["ts"],
+                "updated_at": ts,
+                "recent": recent,
+            }
+            tmp = root / f".{POINTER_NAME}.{os.getpid()}.tmp"
+            with tmp.open("w", encoding="utf-8") as f:
+                f.write(json.dumps(pointer, ensure_ascii=False, indent=2))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, root / POINTER_NAME)
+        finally:
+            fcntl.flock(lk.fileno(), fcntl.LOCK_UN)
+    return pointer
+
+
+def resolve_latest(root: Path) -> Optional[Path]:
+    """Return the newest artifact path, or None when the pointer is missing or dangling."""
+    ptr = read_pointer(root)
+    if not ptr:
+        return None
+    fp = root / str(ptr["path"])
+    return fp if fp.exists() else None
+
+
+def recent_artifacts(root: Path, limit: int = RECENT_MAX) -> List[Dict[str, Any]]:
+    ptr = read_pointer(root) or {}
+    return list(ptr.get("recent") or [])[: max(0, int(limit))]
+
+
+__all__ = [
+    "POINTER_NAME",
+    "read_pointer",
+    "update_latest",
+    "resolve_latest",
+    "recent_artifacts",
+]
@@ -0,0 +1,270 @@
+"""
+line_index.py — Line-offset index for windowed reads of large text files (/api/files/view)
+
+Features:
+- One scan per (path, mtime_ns, size): newline counts per 64 KiB block (array of uint64), so
+  line N → byte offset is a bisect plus one block read, for any file size
+- Sidecar persisted under status/resources/line_index/<sha1(path)>.lidx and reused across
+  restarts while (mtime_ns, size) match
+- Append-only logs (.jsonl/.log) that grew are extended from the last indexed block instead of
+  rescanned, guarded by a checksum of the indexed tail (a rewrite falls back to a full scan)
+- read_lines(start, count, max_bytes): decoded lines of one window, never the whole file
+
+Notes:
+- Lines are 1-based and split on "\\n" (a trailing "\\r" is stripped), like str.splitlines for
+  the text files this viewer serves
+- The sidecar is a rebuildable cache (gitignored); an unreadable one is rebuilt silently
+- In-process LRU of LineIndex objects (LINE_INDEX_MAX, default 128); a published LineIndex is
+  never modified — update() returns a new one that replaces it — so readers need no lock
+
+CLI (dev):
+  python app/line_index.py <file> [start] [count]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+THIS_FILE = Path(__file__).resolve()
+PROJECT_ROOT = THIS_FILE.parent.parent  # gumgang_meeting/
+INDEX_ROOT = PROJECT_ROOT / "status" / "resources" / "line_index"
+
+MAGIC = b"GGLI"
+VERSION = 1
+BLOCK = 1 << 16
+TAIL_CHECK = 64
+APPEND_SUFFIXES = (".jsonl", ".log")
+_HDR = struct.Struct("<4sHIQqQQI")  # magic, version, block, size, mtime_ns, newlines, blocks, tail crc
+
+
+def _tail_crc(fh, size: int) -> int:
+    fh.seek(max(0, size - TAIL_CHECK))
+    return zlib.crc32(fh.read(min(size, TAIL_CHECK)))
+
+
+class LineIndex:
+    """newlines_before[b] = number of "\\n" in bytes [0, b * BLOCK)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.size = 0
+        self.mtime_ns = 0
+        self.newlines = 0
+        self.last_byte_nl = True
+        self.newlines_before = array("Q")
+        self.tail_crc = 0
+
+    @property
+    def lines(self) -> int:
+        if self.size == 0:
+            return 0
+        return self.newlines + (0 if self.last_byte_nl else 1)
+
+    # ---------- build ----------
+
+    def _scan(self, fh, start_block: int, size: int) -> None:
+        """(Re)count blocks [start_block, end) — the last, partial block is always recounted."""
+        del self.newlines_before[start_block:]
+        n = self.newlines_before[start_block - 1] if start_block else 0
+        if start_block:
+            fh.seek((start_block - 1) * BLOCK)
+            n += fh.read(BLOCK).count(b"\n")
+        fh.seek(start_block * BLOCK)
+        b = start_block
+        while b * BLOCK < size:
+            self.newlines_before.append(n)
+            n += fh.read(min(BLOCK, size - b * BLOCK)).count(b"\n")
+            b += 1
+        self.newlines = n
+        if size:
+            fh.seek(size - 1)
+            self.last_byte_nl = fh.read(1) == b"\n"
+        self.size = size
+        self.tail_crc = _tail_crc(fh, size)
+
+    def _copy(self) -> "LineIndex":
+        ix = LineIndex(self.path)
+        ix.size, ix.mtime_ns, ix.newlines = self.size, self.mtime_ns, self.newlines
+        ix.last_byte_nl, ix.tail_crc = self.last_byte_nl, self.tail_crc
+        ix.newlines_before = array("Q", self.newlines_before)
+        return ix
+
+    def update(self, st: os.stat_result) -> Tuple["LineIndex", str]:
+        """Index matching `st`: self when fresh, else a new LineIndex (this one is left untouched
+        for readers still using it). → (index, "fresh" | "extended" | "rebuilt")"""
+        if st.st_mtime_ns == self.mtime_ns and st.st_size == self.size:
+            return self, "fresh"
+        with self.path.open("rb") as fh:
+            grew = (
+                self.size > 0
+                and st.st_size > self.size
+                and self.path.suffix.lower() in APPEND_SUFFIXES
+                and _tail_crc(fh, self.size) == self.tail_crc
+            )
+            if grew:
+                ix = self._copy()  # 8 bytes per 64 KiB block
+                ix._scan(fh, max(0, len(ix.newlines_before) - 1), st.st_size)
+                how = "extended"
+            else:
+                ix = LineIndex(self.path)
+                ix._scan(fh, 0, st.st_size)
+                how = "rebuilt"
+        ix.mtime_ns = st.st_mtime_ns
+        return ix, how
+
+    # ---------- sidecar ----------
+
+    def dump(self, fp: Path) -> None:
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        tmp = fp.with_suffix(".tmp")
+        with tmp.open("wb") as fh:
+            fh.write(_HDR.pack(MAGIC, VERSION, BLOCK, self.size, self.mtime_ns, self.newlines,
+                               len(self.newlines_before), self.tail_crc))
+            fh.write(b"\n" if self.last_byte_nl else b"\0")
+            self.newlines_before.tofile(fh)
+        os.replace(tmp, fp)
+
+    def load(self, fp: Path) -> bool:
+        try:
+            with fp.open("rb") as fh:
+                magic, ver, block, size, mtime_ns, newlines, blocks, crc = _HDR.unpack(fh.read(_HDR.size))
+                if magic != MAGIC or ver != VERSION or block != BLOCK:
+                    return False
+                last = fh.read(1)
+                arr = array("Q")
+                arr.fromfile(fh, blocks)
+        except (OSError, struct.error, EOFError, ValueError):
+            return False
+        self.size, self.mtime_ns, self.newlines, self.tail_crc = size, mtime_ns, newlines, crc
+        self.last_byte_nl = last == b"\n"
+        self.newlines_before = arr
+        return True
+
+    # ---------- read ----------
+
+    def offset_of(self, line: int) -> int:
+        """Byte offset where 1-based `line` starts (size when past the end)."""
+        k = line - 1  # newlines to skip
+        if k <= 0:
+            return 0
+        if k > self.newlines:
+            return self.size
+        b = bisect_left(self.newlines_before, k) - 1  # block holding the k-th newline
+        with self.path.open("rb") as fh:
+            fh.seek(b * BLOCK)
+            data = fh.read(BLOCK)
+        pos = -1
+        for _ in range(k - self.newlines_before[b]):
+            pos = data.index(b"\n", pos + 1)
+        return b * BLOCK + pos + 1
+
+    def read_lines(self, start: int, count: int, max_bytes: int = 200_000) -> Tuple[List[str], bool]:
+        """Lines [start, start+count) decoded as UTF-8 (errors replaced). → (lines, cut_by_max_bytes)."""
+        start = max(1, start)
+        count = max(0, min(count, self.lines - start + 1))
+        if count == 0:
+            return [], False
+        off = self.offset_of(start)
+        out: List[str] = []
+        buf = b""
+        cut = False
+        with self.path.open("rb") as fh:
+            fh.seek(off)
+            while len(out) < count:
+                chunk = fh.read(min(BLOCK, max(1, max_bytes - (fh.tell() - off) + 1)))
+                if not chunk:
+                    if buf:
+                        out.append(buf.decode("utf-8", "replace").rstrip("\r"))
+                    break
+                buf += chunk
+                parts = buf.split(b"\n")
+                buf = parts.pop()
+                for p in parts[: count - len(out)]:
+                    out.append(p.decode("utf-8", "replace").rstrip("\r"))
+                if fh.tell() - off > max_bytes and len(out) < count:
+                    cut = True
+                    if not out and buf:  # one huge line: show its head
+                        out.append(buf[:max_bytes].decode("utf-8", "ignore"))
+                    break
+        return out, cut
+
+
+class LineIndexCache:
+    """Per-path LineIndex objects (LRU) backed by sidecar files under `root`."""
+
+    def __init__(self, root: Path = INDEX_ROOT, max_entries: Optional[int] = None) -> None:
+        self.root = root
+        self.max_entries = max_entries or int(os.environ.get("LINE_INDEX_MAX") or 128)
+        self._d: "OrderedDict[str, LineIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self.counters = {"fresh": 0, "extended": 0, "rebuilt": 0, "loaded": 0}
+
+    def _sidecar(self, path: Path) -> Path:
+        return self.root / (hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:24] + ".lidx")
+
+    def get(self, path: Path, st: Optional[os.stat_result] = None) -> LineIndex:
+        st = st or path.stat()
+        key = str(path)
+        with self._lock:
+            lk = self._path_locks.setdefault(key, threading.Lock())
+        with lk:  # one build per path at a time
+            with self._lock:
+                idx = self._d.get(key)
+            if idx is None:
+                idx = LineIndex(path)
+                if idx.load(self._sidecar(path)):
+                    self.counters["loaded"] += 1
+            idx, how = idx.update(st)
+            self.counters[how] += 1
+            if how != "fresh":
+                try:
+                    idx.dump(self._sidecar(path))
+                except OSError:
+                    pass
+            with self._lock:  # swap in: readers of the previous object keep a consistent view
+                self._d[key] = idx
+                self._d.move_to_end(key)
+                while len(self._d) > self.max_entries:
+                    old, _ = self._d.popitem(last=False)
+                    self._path_locks.pop(old, None)
+        return idx
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._d), **self.counters}
+
+
+LINE_INDEX = LineIndexCache()
+
+__all__ = [
+    "BLOCK",
+    "LineIndex",
+    "LineIndexCache",
+    "LINE_INDEX",
+]
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+    import time
+
+    p = Path(sys.argv[1]).resolve()
+    t0 = time.perf_counter()
+    ix = LINE_INDEX.get(p)
+    t1 = time.perf_counter()
+    s = int(sys.argv[2]) if len(sys.argv) > 2 else max(1, ix.lines // 2)
+    rows, cut = ix.read_lines(s, int(sys.argv[3]) if len(sys.argv) > 3 else 3)
+    print(json.dumps({"lines": ix.lines, "size": ix.size, "index_ms": round((t1 - t0) * 1000, 1),
+                      "read_ms": round((time.perf_counter() - t1) * 1000, 2), "start": s, "rows": rows,
+                      "cut": cut, **LINE_INDEX.stats()}, ensure_ascii=False, indent=2))
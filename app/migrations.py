@@ -0,0 +1,335 @@
+"""
+migrations.py — Versioned schema migrations for SQLite / Postgres (db/migrations/<engine>/NNN_*.sql)
+
+Features:
+- Discovers NNN_name.sql files per engine; version = NNN. Include lines are expanded in place
+  (SQLite `.read path`, psql `\\i path`, relative to the project root) so the same files keep
+  working with scripts/db/migrate_*.sh
+- schema_migrations(version, name, checksum, applied_at, duration_ms) per database;
+  checksum = sha256 of the expanded SQL, so edits to an applied migration show up as drift
+- One runner per database at a time (flock next to the SQLite file, pg_advisory_xact_lock on PG)
+- Per-process version cache: handlers call require() which is a dict lookup once the DB is current
+
+Notes:
+- Migrations must be idempotent (IF NOT EXISTS / DROP … IF EXISTS): SQLite executescript()
+  cannot wrap PRAGMA journal_mode in a transaction, so a crash mid-file is retried as a whole
+- Drift is reported (status/verify), not auto-repaired; never edit an applied migration, add a new one
+- Postgres starts at 002: schema_v1 needs pgvector and is applied by scripts/db/init_postgres.sh
+
+CLI (dev):
+  python app/migrations.py status  --db db/gumgang.db
+  python app/migrations.py up      --db db/gumgang.db [--target 6]
+  python app/migrations.py verify  --pg-url postgres://…   (exit 1 on drift/pending)
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+THIS_FILE = Path(__file__).resolve()
+PROJECT_ROOT = THIS_FILE.parent.parent  # gumgang_meeting/
+MIGRATIONS_ROOT = PROJECT_ROOT / "db" / "migrations"
+
+ENGINES = ("sqlite", "postgres")
+_INCLUDE = {"sqlite": re.compile(r"^\.read\s+(\S+)\s*$"), "postgres": re.compile(r"^\\i\s+(\S+)\s*$")}
+_FILE_RE = re.compile(r"^(\d{3})_([A-Za-z0-9_]+)\.sql$")
+PG_LOCK_KEY = 0x6767_5F6D  # 'gg_m'
+
+_SQLITE_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version     INTEGER PRIMARY KEY,
+  name        TEXT NOT NULL,
+  checksum    TEXT NOT NULL,
+  applied_at  TEXT NOT NULL,
+  duration_ms INTEGER
+);
+"""
+_PG_TABLE = """
+CREATE TABLE IF NOT EXISTS public.schema_migrations (
+  version     INTEGER PRIMARY KEY,
+  name        TEXT NOT NULL,
+  checksum    TEXT NOT NULL,
+  applied_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  duration_ms INTEGER
+);
+"""
+
+
+class SchemaOutdated(RuntimeError):
+    def __init__(self, db_key: str, current: int, latest: int) -> None:
+        super().__init__(f"schema at v{current}, v{latest} required ({db_key}); run: python app/migrations.py up")
+        self.db_key, self.current, self.latest = db_key, current, latest
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+    sql: str
+    checksum: str
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _expand(engine: str, text: str, seen: Optional[set] = None) -> str:
+    seen = seen or set()
+    out: List[str] = []
+    for line in text.splitlines():
+        m = _INCLUDE[engine].match(line.strip())
+        if not m:
+            out.append(line)
+            continue
+        inc = (PROJECT_ROOT / m.group(1)).resolve()
+        if inc in seen:
+            raise ValueError(f"include cycle: {inc}")
+        out.append(_expand(engine, inc.read_text(encoding="utf-8"), seen | {inc}))
+    return "\n".join(out) + "\n"
+
+
+def discover(engine: str, root: Path = MIGRATIONS_ROOT) -> List[Migration]:
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine: {engine}")
+    out: List[Migration] = []
+    for p in sorted((root / engine).glob("*.sql")):
+        m = _FILE_RE.match(p.name)
+        if not m:
+            continue
+        sql = _expand(engine, p.read_text(encoding="utf-8"))
+        out.append(Migration(int(m.group(1)), m.group(2), p, sql, hashlib.sha256(sql.encode("utf-8")).hexdigest()))
+    versions = [m.version for m in out]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"duplicate migration versions in {root / engine}")
+    return out
+
+
+@lru_cache(maxsize=None)
+def latest_version(engine: str) -> int:
+    """Highest version on disk (cached: files only change with a deploy/restart)."""
+    ms = discover(engine)
+    return ms[-1].version if ms else 0
+
+
+def _status(engine: str, applied: Dict[int, Dict[str, Any]], target: Optional[int] = None) -> Dict[str, Any]:
+    ms = discover(engine)
+    want = ms if target is None else [m for m in ms if m.version <= target]
+    drift = [
+        {"version": m.version, "name": m.name, "applied": applied[m.version]["checksum"], "file": m.checksum}
+        for m in ms if m.version in applied and applied[m.version]["checksum"] != m.checksum
+    ]
+    return {
+        "engine": engine,
+        "current": max(applied) if applied else 0,
+        "latest": ms[-1].version if ms else 0,
+        "applied": [{"version": v, **applied[v]} for v in sorted(applied)],
+        "pending": [{"version": m.version, "name": m.name} for m in want if m.version not in applied],
+        "drift": drift,
+    }
+
+
+# ---------- SQLite ----------
+
+def _sqlite_applied(con) -> Dict[int, Dict[str, Any]]:
+    con.executescript(_SQLITE_TABLE)
+    rows = con.execute("SELECT version, name, checksum, applied_at, duration_ms FROM schema_migrations").fetchall()
+    return {int(r[0]): {"name": r[1], "checksum": r[2], "applied_at": r[3], "duration_ms": r[4]} for r in rows}
+
+
+def sqlite_status(db_path: str) -> Dict[str, Any]:
+    if not Path(db_path).exists():
+        return _status("sqlite", {})
+    con = sqlite3.connect(db_path)
+    try:
+        return _status("sqlite", _sqlite_applied(con))
+    finally:
+        con.close()
+
+
+def sqlite_version(db_path: str) -> int:
+    """Current version without creating anything (0 when the table or file is missing)."""
+    if not Path(db_path).exists():
+        return 0
+    con = sqlite3.connect(db_path)
+    try:
+        row = con.execute("SELECT max(version) FROM schema_migrations").fetchone()
+        return int(row[0] or 0)
+    except sqlite3.Error:
+        return 0
+    finally:
+        con.close()
+
+
+def migrate_sqlite(db_path: str, target: Optional[int] = None) -> Dict[str, Any]:
+    """Apply pending migrations (≤ target) in order. Returns status + applied list."""
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    lock_path = Path(str(db_path) + ".migrate.lock")
+    with open(lock_path, "a") as lk:
+        fcntl.flock(lk.fileno(), fcntl.LOCK_EX)
+        try:
+            con = sqlite3.connect(db_path)
+            try:
+                done = _sqlite_applied(con)
+                ran: List[Dict[str, Any]] = []
+                for m in discover("sqlite"):
+                    if m.version in done or (target is not None and m.version > target):
+                        continue
+                    t0 = time.perf_counter()
+                    con.executescript(m.sql)
+                    ms = int((time.perf_counter() - t0) * 1000)
+                    con.execute(
+                        "INSERT INTO schema_migrations(version, name, checksum, applied_at, duration_ms) VALUES(?,?,?,?,?)",
+                        (m.version, m.name, m.checksum, _now(), ms),
+                    )
+                    con.commit()
+                    done[m.version] = {"name": m.name, "checksum": m.checksum}
+                    ran.append({"version": m.version, "name": m.name, "duration_ms": ms})
+                st = _status("sqlite", _sqlite_applied(con), target)
+            finally:
+                con.close()
+        finally:
+            fcntl.flock(lk.fileno(), fcntl.LOCK_UN)
+    st["ran"] = ran
+    _remember(str(db_path), st["current"])
+    return st
+
+
+# ---------- Postgres ----------
+
+def _pg_applied(cur) -> Dict[int, Dict[str, Any]]:
+    cur.execute(_PG_TABLE)
+    cur.execute("SELECT version, name, checksum, applied_at, duration_ms FROM public.schema_migrations")
+    return {
+        int(r[0]): {"name": r[1], "checksum": r[2], "applied_at": str(r[3]), "duration_ms": r[4]}
+        for r in cur.fetchall()
+    }
+
+
+def pg_status(con) -> Dict[str, Any]:
+    cur = con.cursor()
+    st = _status("postgres", _pg_applied(cur))
+    con.commit()
+    return st
+
+
+def pg_version(con) -> int:
+    cur = con.cursor()
+    try:
+        cur.execute("SELECT max(version) FROM public.schema_migrations")
+        row = cur.fetchone()
+        return int(row[0] or 0)
+    except Exception:
+        con.rollback()
+        return 0
+
+
+def migrate_pg(con, db_key: str, target: Optional[int] = None) -> Dict[str, Any]:
+    """Each migration runs in its own transaction together with its schema_migrations row."""
+    con.autocommit = False
+    cur = con.cursor()
+    ran: List[Dict[str, Any]] = []
+    for m in discover("postgres"):
+        if target is not None and m.version > target:
+            break
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (PG_LOCK_KEY,))
+        if m.version in _pg_applied(cur):
+            con.commit()
+            continue
+        t0 = time.perf_counter()
+        try:
+            cur.execute(m.sql)
+            ms = int((time.perf_counter() - t0) * 1000)
+            cur.execute(
+                "INSERT INTO public.schema_migrations(version, name, checksum, duration_ms) VALUES (%s,%s,%s,%s)",
+                (m.version, m.name, m.checksum, ms),
+            )
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        ran.append({"version": m.version, "name": m.name, "duration_ms": ms})
+    st = pg_status(con)
+    st["ran"] = ran
+    _remember(db_key, st["current"])
+    return st
+
+
+# ---------- per-process version cache ----------
+
+_lock = threading.Lock()
+_VERSIONS: Dict[str, int] = {}
+
+
+def _remember(db_key: str, version: int) -> None:
+    with _lock:
+        _VERSIONS[db_key] = version
+
+
+def cached_version(db_key: str) -> Optional[int]:
+    return _VERSIONS.get(db_key)
+
+
+def require(engine: str, db_key: str, read_version: Callable[[], int], minimum: Optional[int] = None) -> int:
+    """Assert the DB is at ≥ minimum (default: latest on disk). Cheap after the first success.
+    Raises SchemaOutdated instead of migrating inside a request."""
+    need = latest_version(engine) if minimum is None else minimum
+    have = _VERSIONS.get(db_key)
+    if have is not None and have >= need:
+        return have
+    have = read_version()
+    _remember(db_key, have)
+    if have < need:
+        raise SchemaOutdated(db_key, have, need)
+    return have
+
+
+__all__ = [
+    "Migration",
+    "SchemaOutdated",
+    "discover",
+    "latest_version",
+    "sqlite_status",
+    "sqlite_version",
+    "migrate_sqlite",
+    "pg_status",
+    "pg_version",
+    "migrate_pg",
+    "cached_version",
+    "require",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("cmd", choices=["status", "up", "verify"])
+    ap.add_argument("--db", default=str(PROJECT_ROOT / "db" / "gumgang.db"), help="SQLite file")
+    ap.add_argument("--pg-url", default=None, help="Postgres URL (switches engine to postgres)")
+    ap.add_argument("--target", type=int, default=None)
+    a = ap.parse_args()
+
+    if a.pg_url:
+        import psycopg2  # type: ignore
+
+        pgc = psycopg2.connect(a.pg_url)
+        res = migrate_pg(pgc, "pg:" + a.pg_url, a.target) if a.cmd == "up" else pg_status(pgc)
+        pgc.close()
+    else:
+        res = migrate_sqlite(a.db, a.target) if a.cmd == "up" else sqlite_status(a.db)
+    print(json.dumps(res, ensure_ascii=False, indent=2))
+    if a.cmd == "verify" and (res["pending"] or res["drift"]):
+        sys.exit(1)
@@ -0,0 +1,322 @@
+"""
+render_cache.py — Precompressed render cache for crawler-facing content endpoints (sitemaps, JSON-LD)
+
+Features:
+- Entries keyed by (endpoint, normalized params, content revision); the body is rendered once
+  and stored as identity + gzip (+ brotli when the optional `brotli` package is installed)
+- Strong ETag per representation (sha256 of the identity body, suffixed per encoding) and
+  Last-Modified; If-None-Match / If-Modified-Since answer 304 without touching the body
+- Renderers are iterables of byte chunks compressed incrementally, so a 50k-URL sitemap is
+  generated straight from a DB cursor without building a list of lines first
+- Single-flight per key (concurrent misses render once), LRU bounded by total stored bytes
+- Remembers how each (endpoint, params) was rendered, so rebuild(endpoint, rev) can re-render
+  the entries crawlers actually request ahead of the next hit (revalidation worker)
+
+Notes:
+- Revisions come from the caller (content_rev / content.rev); invalidate() drops everything,
+  invalidate(endpoint) only one endpoint's entries
+- Encoded variants that are not smaller than the identity body are not stored
+- In-process only: other workers converge through the revision in the key
+
+CLI (dev):
+  python app/render_cache.py   # prints sizes/encodings for a synthetic 50k-URL sitemap
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+try:  # optional: brotli is served only when the wheel is installed
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover - depends on environment
+    brotli = None
+
+SITEMAP_MAX_URLS = 50000  # sitemaps.org protocol limit per file (also 50 MB uncompressed)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+RECIPE_MAX = 512  # remembered (endpoint, params) renderers for rebuild()
+
+
+@dataclass
+class RenderEntry:
+    media_type: str
+    body: bytes
+    etag: str
+    last_modified: float
+    encoded: Dict[str, bytes] = field(default_factory=dict)  # "br" / "gzip" → bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    rendered_ms: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(v) for v in self.encoded.values())
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        return self.etag if not encoding else self.etag[:-1] + "-" + encoding + '"'
+
+
+def build_entry(
+    chunks: Iterable[bytes],
+    media_type: str,
+    last_modified: Optional[Callable[[], Optional[float]]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> RenderEntry:
+    """Consume a chunk iterator once, compressing as it goes. `last_modified` is called after
+    the iterator is exhausted (renderers may derive it from the rows they streamed)."""
+    t0 = time.perf_counter()
+    sha = hashlib.sha256()
+    gz = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 → gzip container, mtime 0
+    br = brotli.Compressor(quality=BROTLI_QUALITY) if brotli is not None else None
+    parts, gz_parts, br_parts = [], [], []
+    for c in chunks:
+        if not c:
+            continue
+        sha.update(c)
+        parts.append(c)
+        gz_parts.append(gz.compress(c))
+        if br is not None:
+            br_parts.append(br.process(c))
+    gz_parts.append(gz.flush())
+    body = b"".join(parts)
+    encoded: Dict[str, bytes] = {}
+    if br is not None:
+        br_parts.append(br.finish())
+        b = b"".join(br_parts)
+        if len(b) < len(body):
+            encoded["br"] = b
+    g = b"".join(gz_parts)
+    if len(g) < len(body):
+        encoded["gzip"] = g
+    lm = last_modified() if last_modified else None
+    return RenderEntry(
+        media_type=media_type,
+        body=body,
+        etag='"' + sha.hexdigest()[:32] + '"',
+        last_modified=float(lm if lm is not None else time.time()),
+        encoded=encoded,
+        headers=dict(headers or {}),
+        rendered_ms=int((time.perf_counter() - t0) * 1000),
+    )
+
+
+# ---------- HTTP negotiation ----------
+
+def _accepted(accept_encoding: Optional[str]) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for tok in (accept_encoding or "").split(","):
+        name, _, params = tok.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        out[name.strip().lower()] = q
+    return out
+
+
+def pick_encoding(entry: RenderEntry, accept_encoding: Optional[str]) -> Optional[str]:
+    acc = _accepted(accept_encoding)
+    star = acc.get("*", 0.0)
+    for enc in ("br", "gzip"):
+        if enc in entry.encoded and acc.get(enc, star) > 0:
+            return enc
+    return None
+
+
+def _etag_matches(if_none_match: str, entry: RenderEntry) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    base = entry.etag.strip('"')
+    for tag in if_none_match.split(","):
+        t = tag.strip()
+        if t.startswith("W/"):
+            t = t[2:]
+        t = t.strip('"')
+        if t == base or t.startswith(base + "-"):
+            return True
+    return False
+
+
+def not_modified(entry: RenderEntry, req_headers: Mapping[str, str]) -> bool:
+    inm = req_headers.get("if-none-match")
+    if inm:
+        return _etag_matches(inm, entry)
+    ims = req_headers.get("if-modified-since")
+    if ims:
+        try:
+            return int(entry.last_modified) <= int(parsedate_to_datetime(ims).timestamp())
+        except Exception:
+            return False
+    return False
+
+
+def response_parts(
+    entry: RenderEntry,
+    req_headers: Mapping[str, str],
+    max_age: int = 60,
+) -> Tuple[int, bytes, Dict[str, str]]:
+    """→ (status, body, headers) for the request: 304 when the validators match, otherwise the
+    best precomputed encoding. Framework-neutral so api.py can wrap it in a Response."""
+    enc = pick_encoding(entry, req_headers.get("accept-encoding"))
+    headers = {
+        "ETag": entry.etag_for(enc),
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+        "Cache-Control": f"public, max-age={int(max_age)}",
+        "Vary": "Accept-Encoding",
+    }
+    if not_modified(entry, req_headers):
+        return 304, b"", headers
+    headers.update(entry.headers)
+    if enc:
+        headers["Content-Encoding"] = enc
+        return 200, entry.encoded[enc], headers
+    return 200, entry.body, headers
+
+
+# ---------- cache ----------
+
+class RenderCache:
+    """LRU of RenderEntry bounded by stored bytes, with single-flight rendering per key."""
+
+    def __init__(self, max_bytes: int = 64 << 20) -> None:
+        self.max_bytes = max_bytes
+        self._d: "OrderedDict[Tuple[Any, ...], RenderEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[Any, ...], threading.Lock] = {}
+        self._recipes: "OrderedDict[Tuple[Any, ...], Callable[[], RenderEntry]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.renders = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[RenderEntry]:
+        with self._lock:
+            e = self._d.get(key)
+            if e is not None:
+                self._d.move_to_end(key)
+            return e
+
+    def put(self, key: Tuple[Any, ...], entry: RenderEntry) -> None:
+        with self._lock:
+            old = self._d.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            if entry.size > self.max_bytes:
+                return
+            self._d[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes and self._d:
+                _, ev = self._d.popitem(last=False)
+                self._bytes -= ev.size
+
+    def get_or_render(self, key: Tuple[Any, ...], render: Callable[[], RenderEntry]) -> Tuple[RenderEntry, bool]:
+        """→ (entry, hit). key = (endpoint, params, rev); see invalidate/rebuild."""
+        with self._lock:
+            self._recipes[key[:2]] = render
+            self._recipes.move_to_end(key[:2])
+            while len(self._recipes) > RECIPE_MAX:
+                self._recipes.popitem(last=False)
+        e = self.get(key)
+        if e is not None:
+            self.hits += 1
+            return e, True
+        with self._lock:
+            lk = self._inflight.setdefault(key, threading.Lock())
+        with lk:
+            e = self.get(key)
+            if e is not None:  # rendered by the request we waited on
+                self.hits += 1
+                return e, True
+            self.misses += 1
+            try:
+                e = render()
+                self.renders += 1
+                self.put(key, e)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        return e, False
+
+    def invalidate(self, endpoint: Optional[str] = None) -> int:
+        with self._lock:
+            keys = [k for k in self._d if endpoint is None or k[0] == endpoint]
+            for k in keys:
+                self._bytes -= self._d.pop(k).size
+            self.invalidations += 1
+            return len(keys)
+
+    def rebuild(self, endpoint: str, rev: Any) -> Dict[str, int]:
+        """Drop `endpoint`'s entries and re-render every remembered params set at `rev`.
+        A recipe that fails (e.g. the part no longer exists) is forgotten."""
+        dropped = self.invalidate(endpoint)
+        with self._lock:
+            recipes = [(k, r) for k, r in self._recipes.items() if k[0] == endpoint]
+        rebuilt = failed = 0
+        for k, render in recipes:
+            try:
+                self.get_or_render((*k, rev), render)
+                rebuilt += 1
+            except Exception:
+                failed += 1
+                with self._lock:
+                    self._recipes.pop(k, None)
+        return {"dropped": dropped, "rebuilt": rebuilt, "failed": failed}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_ep: Dict[str, int] = {}
+            for k in self._d:
+                by_ep[str(k[0])] = by_ep.get(str(k[0]), 0) + 1
+            return {
+                "entries": len(self._d),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "renders": self.renders,
+                "invalidations": self.invalidations,
+                "recipes": len(self._recipes),
+                "by_endpoint": by_ep,
+                "encodings": ["br", "gzip"] if brotli is not None else ["gzip"],
+            }
+
+
+__all__ = [
+    "SITEMAP_MAX_URLS",
+    "RenderEntry",
+    "RenderCache",
+    "build_entry",
+    "pick_encoding",
+    "not_modified",
+    "response_parts",
+]
+
+
+if __name__ == "__main__":
+    import json
+
+    def _urls(n: int):
+        yield b'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        for i in range(n):
+            yield f"  <url>\n    <loc>https://hub.example.com/items/item-{i:07d}/</loc>\n  </url>\n".encode()
+        yield b"</urlset>\n"
+
+    ent = build_entry(_urls(SITEMAP_MAX_URLS), "application/xml")
+    print(json.dumps({
+        "identity": len(ent.body),
+        **{k: len(v) for k, v in ent.encoded.items()},
+        "etag": ent.etag,
+        "rendered_ms": ent.rendered_ms,
+    }, indent=2))
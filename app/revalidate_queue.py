@@ -0,0 +1,249 @@
+"""
+revalidate_queue.py — Background revalidation queue for derived content artifacts (sitemaps, JSON-LD, search)
+
+Features:
+- One pending job per key (dedup): re-enqueueing a pending key coalesces into it, keeps the
+  lowest (most urgent) priority and counts the merged requests
+- Burst coalescing: a job runs once its key has been quiet for `debounce_ms`, or at the latest
+  `max_delay_ms` after it was first queued, so a stream of revalidations cannot starve it
+- Single daemon worker calls handler(key) → dict; a key enqueued while it is being rebuilt is
+  queued again (no lost update)
+- status(): queue depth, in-flight key, wait/run latency percentiles, last rebuild per key
+
+Notes:
+- Priority: lower runs first (0 = urgent … 9 = background); ties go to the oldest job
+- In-memory only: pending jobs are lost on restart; the revalidate evidence files remain the
+  audit trail. Depth is bounded by the number of distinct keys, so selection is a linear scan
+- drain() is for CLI/bench use; request handlers never wait on the worker
+
+CLI (dev):
+  python app/revalidate_queue.py   # burst demo: 1,000 enqueues over 5 keys → 5 rebuilds
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+DEFAULT_PRIORITY = 5
+DEBOUNCE_MS = 250
+MAX_DELAY_MS = 5000
+LATENCY_WINDOW = 256
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _pct(vals: List[float], p: float) -> Optional[float]:
+    if not vals:
+        return None
+    s = sorted(vals)
+    return round(s[min(len(s) - 1, int(len(s) * p))], 2)
+
+
+@dataclass
+class Job:
+    key: str
+    priority: int
+    first_at: float  # monotonic
+    last_at: float
+    requests: int = 1
+    reasons: List[str] = field(default_factory=list)
+
+    def due_at(self, debounce: float, max_delay: float) -> float:
+        return min(self.last_at + debounce, self.first_at + max_delay)
+
+
+class RevalidateQueue:
+    def __init__(
+        self,
+        handler: Callable[[str], Optional[Dict[str, Any]]],
+        debounce_ms: int = DEBOUNCE_MS,
+        max_delay_ms: int = MAX_DELAY_MS,
+    ) -> None:
+        self.handler = handler
+        self.debounce = debounce_ms / 1000.0
+        self.max_delay = max_delay_ms / 1000.0
+        self._pending: Dict[str, Job] = {}
+        self._cv = threading.Condition()
+        self._inflight: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = False
+        self._wait_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._run_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self.enqueued = 0
+        self.coalesced = 0
+        self.processed = 0
+        self.failed = 0
+
+    # ---------- producer ----------
+
+    def enqueue(self, key: str, priority: int = DEFAULT_PRIORITY, reason: Optional[str] = None) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._cv:
+            self.enqueued += 1
+            job = self._pending.get(key)
+            if job is None:
+                job = self._pending[key] = Job(key, int(priority), now, now)
+                state = "queued"
+            else:
+                self.coalesced += 1
+                job.requests += 1
+                job.last_at = now
+                job.priority = min(job.priority, int(priority))
+                state = "coalesced"
+            if reason and len(job.reasons) < 8:
+                job.reasons.append(reason)
+            self._cv.notify()
+            return {"key": key, "state": state, "priority": job.priority, "requests": job.requests}
+
+    # ---------- worker ----------
+
+    def start(self) -> None:
+        with self._cv:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name="revalidate-worker", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._cv:
+            self._stop = True
+            self._cv.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _next_job(self) -> Optional[Job]:
+        """Block until a job is due (or stop); caller holds the condition."""
+        while not self._stop:
+            now = time.monotonic()
+            due = [j for j in self._pending.values() if j.due_at(self.debounce, self.max_delay) <= now]
+            if due:
+                job = min(due, key=lambda j: (j.priority, j.first_at))
+                del self._pending[job.key]
+                return job
+            if self._pending:
+                wake = min(j.due_at(self.debounce, self.max_delay) for j in self._pending.values())
+                self._cv.wait(max(0.0, wake - now))
+            else:
+                self._cv.wait()
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                job = self._next_job()
+                if job is None:
+                    return
+                self._inflight = job.key
+            t0 = time.monotonic()
+            res: Optional[Dict[str, Any]] = None
+            err: Optional[str] = None
+            try:
+                res = self.handler(job.key)
+            except Exception as e:
+                err = f"{type(e).__name__}: {e}"
+            run_ms = (time.monotonic() - t0) * 1000
+            with self._cv:
+                self._inflight = None
+                self._wait_ms.append((t0 - job.first_at) * 1000)
+                self._run_ms.append(run_ms)
+                self.processed += 1
+                if err:
+                    self.failed += 1
+                self._last[job.key] = {
+                    "ts": _now_iso(),
+                    "ok": err is None,
+                    "error": err,
+                    "priority": job.priority,
+                    "requests": job.requests,
+                    "reasons": job.reasons,
+                    "wait_ms": round((t0 - job.first_at) * 1000, 2),
+                    "run_ms": round(run_ms, 2),
+                    "result": res,
+                }
+                self._cv.notify_all()
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Wait until nothing is pending or running (needs a started worker)."""
+        end = time.monotonic() + timeout
+        with self._cv:
+            while self._pending or self._inflight:
+                left = end - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cv.wait(min(left, 0.05))
+        return True
+
+    # ---------- status ----------
+
+    def status(self) -> Dict[str, Any]:
+        with self._cv:
+            now = time.monotonic()
+            pending = sorted(self._pending.values(), key=lambda j: (j.priority, j.first_at))
+            return {
+                "running": self.running,
+                "depth": len(pending),
+                "inflight": self._inflight,
+                "pending": [{
+                    "key": j.key,
+                    "priority": j.priority,
+                    "requests": j.requests,
+                    "age_ms": round((now - j.first_at) * 1000, 2),
+                } for j in pending],
+                "counters": {
+                    "enqueued": self.enqueued,
+                    "coalesced": self.coalesced,
+                    "processed": self.processed,
+                    "failed": self.failed,
+                },
+                "latency_ms": {
+                    "wait_p50": _pct(list(self._wait_ms), 0.5),
+                    "wait_p95": _pct(list(self._wait_ms), 0.95),
+                    "run_p50": _pct(list(self._run_ms), 0.5),
+                    "run_p95": _pct(list(self._run_ms), 0.95),
+                },
+                "config": {"debounce_ms": int(self.debounce * 1000), "max_delay_ms": int(self.max_delay * 1000)},
+                "last": dict(self._last),
+            }
+
+
+__all__ = [
+    "DEFAULT_PRIORITY",
+    "Job",
+    "RevalidateQueue",
+]
+
+
+if __name__ == "__main__":
+    import json
+    import random
+
+    runs: Dict[str, int] = {}
+
+    def _rebuild(key: str) -> Dict[str, Any]:
+        runs[key] = runs.get(key, 0) + 1
+        time.sleep(0.01)
+        return {"rebuilt": 1}
+
+    q = RevalidateQueue(_rebuild, debounce_ms=50, max_delay_ms=1000)
+    q.start()
+    keys = [f"sitemap/items:{i}" for i in range(4)] + ["jsonld/article"]
+    for _ in range(1000):
+        q.enqueue(random.choice(keys), priority=random.randint(0, 9))
+    q.drain()
+    st = q.status()
+    q.stop()
+    print(json.dumps({"runs": runs, "counters": st["counters"], "latency_ms": st["latency_ms"]}, indent=2))
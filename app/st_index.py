@@ -0,0 +1,205 @@
+"""
+st_index.py — Persistent ST-ID → evidence index for /api/roadmap/progress
+
+Features:
+- Walks status/evidence once, remembers (mtime_ns, size, ST ids) per file and
+  persists it to status/resources/st_index/evidence_index.json
+- Incremental refresh: unchanged files are skipped by stat only; append-only logs
+  (.jsonl/.log) that grew are scanned from the previous size; others are re-read
+- Refresh is throttled (ST_INDEX_REFRESH_SEC, default 10s) so the request path
+  normally does no filesystem work at all
+- No file-count cap: the index removes reads from the request path
+
+CLI (dev)
+    python -m app.st_index --rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+THIS_FILE = Path(__file__).resolve()
+PROJECT_ROOT = THIS_FILE.parent.parent  # gumgang_meeting/
+EVIDENCE_ROOT = PROJECT_ROOT / "status" / "evidence"
+INDEX_PATH = PROJECT_ROOT / "status" / "resources" / "st_index" / "evidence_index.json"
+
+SCAN_SUFFIXES = (".json", ".jsonl", ".md", ".log", ".txt")
+APPEND_SUFFIXES = (".jsonl", ".log")
+ST_RE = re.compile(rb"ST-(\d{4})")
+_CHUNK = 1 << 20
+_OVERLAP = 6  # len("ST-dddd") - 1, so ids split across chunk edges are still seen
+
+
+def _refresh_interval() -> float:
+    try:
+        return float(os.environ.get("ST_INDEX_REFRESH_SEC", "10"))
+    except Exception:
+        return 10.0
+
+
+def _scan_ids(fp: Path, start: int = 0) -> List[str]:
+    found: set = set()
+    with fp.open("rb") as f:
+        f.seek(max(0, start))
+        tail = b""
+        while True:
+            chunk = f.read(_CHUNK)
+            if not chunk:
+                break
+            buf = tail + chunk
+            for m in ST_RE.findall(buf):
+                found.add("ST-" + m.decode("ascii"))
+            tail = buf[-_OVERLAP:]
+    return sorted(found)
+
+
+class StEvidenceIndex:
+    def __init__(self, root: Path = EVIDENCE_ROOT, index_path: Path = INDEX_PATH) -> None:
+        self.root = root
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._by_st: Optional[Dict[str, List[Tuple[str, float]]]] = None
+        self._loaded = False
+        self._refreshed_at = 0.0
+        self.stats: Dict[str, Any] = {}
+
+    # ---- persistence ----
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            raw = json.loads(self.index_path.read_text(encoding="utf-8"))
+            files = raw.get("files") if isinstance(raw, dict) else None
+            if isinstance(files, dict):
+                self._files = files
+        except Exception:
+            self._files = {}
+
+    def _save(self) -> None:
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            body = {
+                "version": 1,
+                "updated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "root": os.path.relpath(self.root, PROJECT_ROOT),
+                "files": self._files,
+            }
+            tmp.write_text(json.dumps(body, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.index_path)
+        except Exception:
+            pass
+
+    # ---- refresh ----
+
+    def _walk(self) -> Dict[str, os.stat_result]:
+        out: Dict[str, os.stat_result] = {}
+        if not self.root.exists():
+            return out
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.lower().endswith(SCAN_SUFFIXES):
+                    continue
+                fp = os.path.join(dirpath, name)
+                try:
+                    out[os.path.relpath(fp, PROJECT_ROOT)] = os.stat(fp)
+                except OSError:
+                    continue
+        return out
+
+    def refresh(self, force: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            now = time.monotonic()
+            if not force and self._by_st is not None and (now - self._refreshed_at) < _refresh_interval():
+                return self.stats
+            t0 = time.perf_counter()
+            seen = self._walk()
+            read = appended = 0
+            changed = False
+            for rel, st in seen.items():
+                prev = self._files.get(rel)
+                if prev and prev.get("m") == st.st_mtime_ns and prev.get("s") == st.st_size:
+                    continue
+                fp = PROJECT_ROOT / rel
+                try:
+                    if (
+                        prev
+                        and rel.lower().endswith(APPEND_SUFFIXES)
+                        and st.st_size > int(prev.get("s") or 0)
+                    ):
+                        ids = sorted(set(prev.get("ids") or []) | set(_scan_ids(fp, int(prev["s"]) - _OVERLAP)))
+                        appended += 1
+                    else:
+                        ids = _scan_ids(fp)
+                        read += 1
+                except OSError:
+                    continue
+                self._files[rel] = {"m": st.st_mtime_ns, "s": st.st_size, "ids": ids}
+                changed = True
+            removed = [rel for rel in self._files if rel not in seen]
+            for rel in removed:
+                del self._files[rel]
+            if changed or removed or self._by_st is None:
+                self._by_st = self._invert()
+            if changed or removed:
+                self._save()
+            self._refreshed_at = now
+            self.stats = {
+                "files": len(self._files),
+                "read": read,
+                "appended": appended,
+                "removed": len(removed),
+                "refresh_ms": round((time.perf_counter() - t0) * 1000, 2),
+            }
+            return self.stats
+
+    def _invert(self) -> Dict[str, List[Tuple[str, float]]]:
+        by_st: Dict[str, List[Tuple[str, float]]] = {}
+        for rel, ent in self._files.items():
+            mt = int(ent.get("m") or 0) / 1e9
+            for sid in ent.get("ids") or []:
+                by_st.setdefault(sid, []).append((rel, mt))
+        for refs in by_st.values():
+            refs.sort(key=lambda r: (r[1], r[0]))
+        return by_st
+
+    # ---- queries ----
+
+    def lookup(self, st_id: str) -> List[Tuple[str, float]]:
+        """[(repo-relative path, mtime epoch sec)] oldest first."""
+        self.refresh()
+        return list((self._by_st or {}).get(st_id) or [])
+
+    def all_ids(self) -> List[str]:
+        self.refresh()
+        return sorted((self._by_st or {}).keys())
+
+
+ST_EVIDENCE_INDEX = StEvidenceIndex()
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Build/refresh the ST-ID → evidence index")
+    ap.add_argument("--rebuild", action="store_true", help="drop the persisted index and rescan")
+    args = ap.parse_args(argv)
+    idx = ST_EVIDENCE_INDEX
+    if args.rebuild:
+        idx._loaded = True
+    stats = idx.refresh(force=True)
+    print(json.dumps({**stats, "st_ids": len(idx.all_ids()), "index": str(idx.index_path)}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
@@ -0,0 +1,231 @@
+"""
+thread_fts.py — Full-text search over v2 threads/messages (SQLite FTS5)
+
+Features:
+- FTS5 external-content tables threads_fts(title) / messages_fts(content) (trigram tokenizer),
+  kept in sync by triggers (migration 007, db/schema/sqlite/threads_fts_v2.sql)
+- Results grouped by thread: threads ranked by their best bm25() hit (title hits weighted),
+  each with its top-N message snippets
+- Keyset cursors over (best score, thread id); exact totals cached per (db, query, revision)
+
+Notes:
+- Terms shorter than 3 chars cannot use the trigram index → LIKE scan, newest threads first
+- Migration 007 replaces the unusable v1 declarations (content_rowid='id' on TEXT keys) and
+  backfills; callers assert the schema version (app/migrations.py) before searching
+
+CLI (dev):
+  python app/thread_fts.py --db db/gumgang.db "검색어"
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+THIS_FILE = Path(__file__).resolve()
+PROJECT_ROOT = THIS_FILE.parent.parent  # gumgang_meeting/
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.content_fts import (  # noqa: E402
+    COUNT_CACHE,
+    decode_cursor,
+    encode_cursor,
+    fts_match_expr,
+    mark_html,
+)
+
+_HL_OPEN, _HL_CLOSE = "\x02", "\x03"
+TITLE_WEIGHT = 2.0  # bm25 is negative; a title hit counts as twice as relevant
+SNIPPET_TOKENS = 64  # trigram tokens ≈ characters; 64 is the FTS5 maximum
+LIKE_SNIPPET_CHARS = 48
+
+
+# ---------- helpers ----------
+
+def threads_rev(con) -> int:
+    try:
+        row = con.execute("SELECT rev FROM threads_rev WHERE id=1").fetchone()
+        return int(row[0]) if row else 0
+    except Exception:
+        return -1
+
+
+def _cached_totals(con, db_key: str, mode: str, args: Tuple[Any, ...], sql: str) -> Tuple[int, int]:
+    key = (db_key, "threads:" + mode, args, threads_rev(con))
+    hit = COUNT_CACHE.get(key) if key[-1] >= 0 else None
+    if hit is not None:
+        return hit
+    row = con.execute(sql, args).fetchone()
+    val = (int(row[0] or 0), int(row[1] or 0))
+    if key[-1] >= 0:
+        COUNT_CACHE.put(key, val)
+    return val
+
+
+def _like_snippet(text: Optional[str], q: str, width: int = LIKE_SNIPPET_CHARS) -> str:
+    s = text or ""
+    i = s.lower().find(q.lower())
+    if i < 0:
+        return mark_html(s[: width * 2])
+    a, b = max(0, i - width), min(len(s), i + len(q) + width)
+    out = s[a:i] + _HL_OPEN + s[i : i + len(q)] + _HL_CLOSE + s[i + len(q) : b]
+    return ("…" if a > 0 else "") + mark_html(out) + ("…" if b < len(s) else "")
+
+
+# ---------- search ----------
+
+def search_threads(
+    con,
+    db_key: str,
+    q: str,
+    size: int = 20,
+    per_thread: int = 3,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """→ {items, total_threads, total_hits, next_cursor, mode}. `con` rows must be sqlite3.Row.
+
+    items: [{id, title, title_hl, updated_at, score, hits, messages: [{id, role, ts, score, snippet}]}]
+    """
+    q = (q or "").strip()
+    cur_vals = decode_cursor(cursor)
+    match = fts_match_expr(q)
+    if match:
+        return _search_fts(con, db_key, match, size, per_thread, cur_vals)
+    return _search_like(con, db_key, q, size, per_thread, cur_vals)
+
+
+def _search_fts(con, db_key, match, size, per_thread, cur_vals) -> Dict[str, Any]:
+    ranked = (
+        "WITH hits AS ("
+        " SELECT m.thread_id AS tid, bm25(messages_fts) AS s, 1 AS is_msg"
+        "   FROM messages_fts JOIN messages m ON m.rowid = messages_fts.rowid WHERE messages_fts MATCH ?"
+        " UNION ALL"
+        f" SELECT t.id, bm25(threads_fts) * {TITLE_WEIGHT}, 0"
+        "   FROM threads_fts JOIN threads t ON t.rowid = threads_fts.rowid WHERE threads_fts MATCH ?"
+        "), ranked AS (SELECT tid, min(s) AS best, sum(is_msg) AS n FROM hits GROUP BY tid)"
+    )
+    args: List[Any] = [match, match]
+    where = ""
+    if cur_vals is not None:
+        where = " WHERE r.best > ? OR (r.best = ? AND r.tid > ?)"
+        args += [float(cur_vals[0]), float(cur_vals[0]), str(cur_vals[1])]
+    rows = con.execute(
+        f"{ranked} SELECT r.tid, r.best, r.n, t.title, t.updated_at"
+        f" FROM ranked r JOIN threads t ON t.id = r.tid{where} ORDER BY r.best, r.tid LIMIT ?",
+        (*args, size),
+    ).fetchall()
+    tids = [r["tid"] for r in rows]
+    marks = ",".join("?" * len(tids))
+
+    title_hl: Dict[str, str] = {}
+    msgs: Dict[str, List[Dict[str, Any]]] = {t: [] for t in tids}
+    if tids:
+        for r in con.execute(
+            f"SELECT t.id AS tid, highlight(threads_fts, 0, '{_HL_OPEN}', '{_HL_CLOSE}') AS hl"
+            f" FROM threads_fts JOIN threads t ON t.rowid = threads_fts.rowid"
+            f" WHERE threads_fts MATCH ? AND t.id IN ({marks})",
+            (match, *tids),
+        ):
+            title_hl[r["tid"]] = r["hl"]
+        for r in con.execute(
+            "SELECT * FROM (SELECT h.*, row_number() OVER (PARTITION BY h.tid ORDER BY h.s, h.rid) AS rn FROM ("
+            "  SELECT m.thread_id AS tid, m.rowid AS rid, m.id, m.role, m.created_at, bm25(messages_fts) AS s,"
+            f"        snippet(messages_fts, 0, '{_HL_OPEN}', '{_HL_CLOSE}', '…', {SNIPPET_TOKENS}) AS snip"
+            "   FROM messages_fts JOIN messages m ON m.rowid = messages_fts.rowid"
+            f"  WHERE messages_fts MATCH ? AND m.thread_id IN ({marks})) h)"
+            " WHERE rn <= ? ORDER BY tid, rn",
+            (match, *tids, per_thread),
+        ):
+            msgs[r["tid"]].append({
+                "id": r["id"],
+                "role": r["role"],
+                "ts": r["created_at"],
+                "score": round(-float(r["s"]), 6),
+                "snippet": mark_html(r["snip"]),
+            })
+
+    items = [{
+        "id": r["tid"],
+        "title": r["title"],
+        "title_hl": mark_html(title_hl[r["tid"]]) if r["tid"] in title_hl else mark_html(r["title"]),
+        "updated_at": r["updated_at"],
+        "score": round(-float(r["best"]), 6),  # bm25 is lower-is-better; expose higher-is-better
+        "hits": int(r["n"] or 0),
+        "messages": msgs.get(r["tid"], []),
+    } for r in rows]
+    total_threads, total_hits = _cached_totals(
+        con, db_key, "fts", (match, match), f"{ranked} SELECT count(*), sum(n) FROM ranked",
+    )
+    nxt = encode_cursor([float(rows[-1]["best"]), str(rows[-1]["tid"])]) if len(rows) == size else None
+    return {"items": items, "total_threads": total_threads, "total_hits": total_hits, "next_cursor": nxt, "mode": "fts"}
+
+
+def _search_like(con, db_key, q, size, per_thread, cur_vals) -> Dict[str, Any]:
+    """Short-term fallback: threads with a matching title/message, most recently active first."""
+    like = f"%{q}%"
+    ranked = (
+        "WITH hits AS ("
+        " SELECT m.thread_id AS tid, ifnull(m.created_at, 0) AS ts, 1 AS is_msg FROM messages m WHERE m.content LIKE ?"
+        " UNION ALL SELECT t.id, ifnull(t.updated_at, 0), 0 FROM threads t WHERE t.title LIKE ?"
+        "), ranked AS (SELECT tid, max(ts) AS last, sum(is_msg) AS n FROM hits GROUP BY tid)"
+    )
+    args: List[Any] = [like, like]
+    where = ""
+    if cur_vals is not None:
+        where = " WHERE r.last < ? OR (r.last = ? AND r.tid < ?)"
+        args += [int(cur_vals[0]), int(cur_vals[0]), str(cur_vals[1])]
+    rows = con.execute(
+        f"{ranked} SELECT r.tid, r.last, r.n, t.title, t.updated_at"
+        f" FROM ranked r JOIN threads t ON t.id = r.tid{where} ORDER BY r.last DESC, r.tid DESC LIMIT ?",
+        (*args, size),
+    ).fetchall()
+    items = []
+    for r in rows:
+        ms = con.execute(
+            "SELECT id, role, content, created_at FROM messages WHERE thread_id = ? AND content LIKE ?"
+            " ORDER BY created_at DESC LIMIT ?",
+            (r["tid"], like, per_thread),
+        ).fetchall()
+        items.append({
+            "id": r["tid"],
+            "title": r["title"],
+            "title_hl": _like_snippet(r["title"], q, 1 << 16) if r["title"] else mark_html(r["title"]),
+            "updated_at": r["updated_at"],
+            "score": None,
+            "hits": int(r["n"] or 0),
+            "messages": [{
+                "id": m["id"],
+                "role": m["role"],
+                "ts": m["created_at"],
+                "score": None,
+                "snippet": _like_snippet(m["content"], q),
+            } for m in ms],
+        })
+    total_threads, total_hits = _cached_totals(
+        con, db_key, "like", (like, like), f"{ranked} SELECT count(*), sum(n) FROM ranked",
+    )
+    nxt = encode_cursor([int(rows[-1]["last"]), str(rows[-1]["tid"])]) if len(rows) == size else None
+    return {"items": items, "total_threads": total_threads, "total_hits": total_hits, "next_cursor": nxt, "mode": "like"}
+
+
+__all__ = [
+    "threads_rev",
+    "search_threads",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sqlite3
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=str(PROJECT_ROOT / "db" / "gumgang.db"))
+    ap.add_argument("--size", type=int, default=10)
+    ap.add_argument("q")
+    a = ap.parse_args()
+    c = sqlite3.connect(a.db)
+    c.row_factory = sqlite3.Row
+    print(json.dumps(search_threads(c, a.db, a.q, size=a.size), ensure_ascii=False, indent=2))
@@ -0,0 +1,289 @@
+"""
+upload_stream.py — Streaming attachment uploads for meetings (multipart + resumable sessions)
+
+Features:
+- save_stream(): async chunks → temp file next to the destination, incremental sha256,
+  size limit enforced while reading, fsync + atomic rename (no partial files under the final name)
+- UploadSessions: resumable/chunked uploads for long recordings
+  create → append(offset, chunks)… → complete (size/sha256 verified, fsync, rename)
+  state lives next to the data (<root>/<sid>.json + <sid>.part), so a restart only costs a re-hash
+- Memory stays at one chunk per upload regardless of file size
+
+Notes:
+- Multipart bodies are spooled to a temp file by Starlette before the handler runs; the
+  session PUT path reads the raw request stream and avoids that second copy
+- Appends must start exactly at the received offset (409 semantics via UploadOffsetMismatch);
+  a retry of the last chunk after a lost response is detected by the client from status()
+- Blocking fsync/rename run in a worker thread so the event loop keeps serving other requests
+
+CLI (dev):
+  python app/upload_stream.py <file>   # copies <file> through save_stream and prints size/sha256
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+CHUNK = 1 << 20
+SESSION_TTL_SEC = 24 * 3600
+
+
+class UploadError(Exception):
+    code = "UPLOAD_FAILED"
+    status = 400
+
+
+class UploadTooLarge(UploadError):
+    code = "UPLOAD_TOO_LARGE"
+    status = 413
+
+
+class UploadOffsetMismatch(UploadError):
+    code = "UPLOAD_OFFSET_MISMATCH"
+    status = 409
+
+
+class UploadIntegrityError(UploadError):
+    code = "UPLOAD_INTEGRITY"
+    status = 422
+
+
+class UploadNotFound(UploadError):
+    code = "UPLOAD_SESSION_NOT_FOUND"
+    status = 404
+
+
+def _fsync_dir(d: Path) -> None:
+    try:
+        fd = os.open(str(d), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _finalize(tmp: Path, dest: Path) -> None:
+    os.replace(tmp, dest)
+    _fsync_dir(dest.parent)
+
+
+async def iter_upload(f: Any, chunk: int = CHUNK) -> AsyncIterator[bytes]:
+    """UploadFile → async chunks (await f.read, never the whole file)."""
+    while True:
+        b = await f.read(chunk)
+        if not b:
+            break
+        yield b
+
+
+async def save_stream(chunks: AsyncIterator[bytes], dest: Path, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """Stream into dest atomically. → {bytes, sha256}. Raises UploadTooLarge (temp file removed)."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.parent / f".{dest.name}.{uuid.uuid4().hex[:8]}.part"
+    sha = hashlib.sha256()
+    n = 0
+    try:
+        with tmp.open("wb") as fh:
+            async for b in chunks:
+                if not b:
+                    continue
+                n += len(b)
+                if max_bytes is not None and n > max_bytes:
+                    raise UploadTooLarge(f"upload exceeds {max_bytes} bytes")
+                sha.update(b)
+                fh.write(b)
+            fh.flush()
+            await asyncio.to_thread(os.fsync, fh.fileno())
+        await asyncio.to_thread(_finalize, tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return {"bytes": n, "sha256": sha.hexdigest()}
+
+
+# ---------- resumable sessions ----------
+
+class UploadSessions:
+    """Chunked uploads under `root` (one <sid>.json + <sid>.part per session)."""
+
+    def __init__(self, root: Path, max_bytes: Optional[int] = None) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._hashers: Dict[str, Any] = {}  # sid → (offset, sha256 state) for the in-process fast path
+
+    def _meta_path(self, sid: str) -> Path:
+        return self.root / f"{sid}.json"
+
+    def _part_path(self, sid: str) -> Path:
+        return self.root / f"{sid}.part"
+
+    def _lock_for(self, sid: str) -> asyncio.Lock:
+        with self._lock:
+            return self._locks.setdefault(sid, asyncio.Lock())
+
+    def _read(self, sid: str) -> Dict[str, Any]:
+        if not sid or not sid.replace("_", "").isalnum():
+            raise UploadNotFound(sid)
+        try:
+            return json.loads(self._meta_path(sid).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise UploadNotFound(sid)
+
+    def _write(self, meta: Dict[str, Any]) -> None:
+        p = self._meta_path(meta["id"])
+        tmp = p.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, p)
+
+    def create(self, size: Optional[int] = None, sha256: Optional[str] = None, **info: Any) -> Dict[str, Any]:
+        if size is not None and self.max_bytes is not None and size > self.max_bytes:
+            raise UploadTooLarge(f"declared size {size} exceeds {self.max_bytes} bytes")
+        self.root.mkdir(parents=True, exist_ok=True)
+        sid = "UP_" + uuid.uuid4().hex
+        meta = {
+            "id": sid,
+            "size": size,
+            "sha256": (sha256 or "").lower() or None,
+            "received": 0,
+            "created_at": time.time(),
+            "updated_at": time.time(),
+            "info": info,
+        }
+        self._part_path(sid).touch()
+        self._write(meta)
+        self._hashers[sid] = (0, hashlib.sha256())
+        return meta
+
+    def status(self, sid: str) -> Dict[str, Any]:
+        meta = self._read(sid)
+        meta["received"] = self._part_path(sid).stat().st_size  # the file is the source of truth
+        return meta
+
+    async def append(self, sid: str, offset: int, chunks: AsyncIterator[bytes]) -> Dict[str, Any]:
+        async with self._lock_for(sid):
+            meta = self.status(sid)
+            if offset != meta["received"]:
+                raise UploadOffsetMismatch(f"expected offset {meta['received']}, got {offset}")
+            limit = meta["size"] if meta["size"] is not None else self.max_bytes
+            hs = self._hashers.get(sid)
+            sha = hs[1] if hs and hs[0] == offset else None
+            n = offset
+            with self._part_path(sid).open("ab") as fh:
+                try:
+                    async for b in chunks:
+                        if not b:
+                            continue
+                        if limit is not None and n + len(b) > limit:
+                            raise UploadTooLarge(f"upload exceeds {limit} bytes")
+                        fh.write(b)
+                        if sha is not None:
+                            sha.update(b)
+                        n += len(b)
+                finally:
+                    fh.flush()
+                    if sha is not None and fh.tell() == n:
+                        self._hashers[sid] = (n, sha)
+                    else:
+                        self._hashers.pop(sid, None)
+            meta["received"] = n
+            meta["updated_at"] = time.time()
+            self._write(meta)
+            return meta
+
+    def _hash_file(self, sid: str) -> str:
+        sha = hashlib.sha256()
+        with self._part_path(sid).open("rb") as fh:
+            for b in iter(lambda: fh.read(CHUNK), b""):
+                sha.update(b)
+        return sha.hexdigest()
+
+    async def complete(self, sid: str, dest: Path) -> Dict[str, Any]:
+        """Verify size/sha256, fsync and move the data to `dest`. → {bytes, sha256}."""
+        async with self._lock_for(sid):
+            meta = self.status(sid)
+            n = meta["received"]
+            if meta["size"] is not None and n != meta["size"]:
+                raise UploadIntegrityError(f"received {n} of {meta['size']} bytes")
+            hs = self._hashers.pop(sid, None)
+            digest = hs[1].hexdigest() if hs and hs[0] == n else await asyncio.to_thread(self._hash_file, sid)
+            if meta["sha256"] and digest != meta["sha256"]:
+                raise UploadIntegrityError("sha256 mismatch")
+            part = self._part_path(sid)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+
+            def _commit() -> None:
+                fd = os.open(str(part), os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                _finalize(part, dest)
+
+            await asyncio.to_thread(_commit)
+            self._meta_path(sid).unlink(missing_ok=True)
+        with self._lock:
+            self._locks.pop(sid, None)
+        return {"bytes": n, "sha256": digest}
+
+    def abort(self, sid: str) -> bool:
+        self._read(sid)
+        self._hashers.pop(sid, None)
+        self._part_path(sid).unlink(missing_ok=True)
+        self._meta_path(sid).unlink(missing_ok=True)
+        with self._lock:
+            self._locks.pop(sid, None)
+        return True
+
+    def sweep(self, ttl_sec: int = SESSION_TTL_SEC) -> int:
+        """Drop sessions idle for longer than ttl_sec."""
+        n = 0
+        cutoff = time.time() - ttl_sec
+        for p in self.root.glob("UP_*.json") if self.root.exists() else []:
+            try:
+                meta = json.loads(p.read_text(encoding="utf-8"))
+                if float(meta.get("updated_at") or 0) < cutoff:
+                    self.abort(meta["id"])
+                    n += 1
+            except Exception:
+                continue
+        return n
+
+
+__all__ = [
+    "CHUNK",
+    "UploadError",
+    "UploadTooLarge",
+    "UploadOffsetMismatch",
+    "UploadIntegrityError",
+    "UploadNotFound",
+    "iter_upload",
+    "save_stream",
+    "UploadSessions",
+]
+
+
+if __name__ == "__main__":
+    import sys
+
+    async def _file_chunks(p: Path) -> AsyncIterator[bytes]:
+        with p.open("rb") as fh:
+            for b in iter(lambda: fh.read(CHUNK), b""):
+                yield b
+
+    src = Path(sys.argv[1])
+    out = src.with_name(src.name + ".copy")
+    print(json.dumps(asyncio.run(save_stream(_file_chunks(src), out)), indent=2))
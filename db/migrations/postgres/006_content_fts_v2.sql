@@ -0,0 +1 @@
+\i db/schema/postgres/content_fts_v2.sql
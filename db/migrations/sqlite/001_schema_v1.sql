@@ -0,0 +1,2 @@
+-- baseline: threads/messages/flows/... (idempotent); lets a fresh file reach the latest version
+.read db/schema/sqlite/schema_v1.sql
@@ -0,0 +1,3 @@
+.read db/schema/sqlite/content_fts_v2.sql
+-- backfill rows that existed before the triggers
+INSERT INTO content_items_fts(content_items_fts) VALUES ('rebuild');
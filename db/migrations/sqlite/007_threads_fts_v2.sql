@@ -0,0 +1,8 @@
+-- v1 threads_fts/messages_fts were declared with content_rowid='id' (TEXT keys) and never
+-- populated; drop them so the v2 definitions below can be created.
+DROP TABLE IF EXISTS threads_fts;
+DROP TABLE IF EXISTS messages_fts;
+.read db/schema/sqlite/threads_fts_v2.sql
+-- backfill rows that existed before the triggers
+INSERT INTO threads_fts(threads_fts) VALUES ('rebuild');
+INSERT INTO messages_fts(messages_fts) VALUES ('rebuild');
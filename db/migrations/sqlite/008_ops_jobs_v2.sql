@@ -0,0 +1 @@
+.read db/schema/sqlite/ops_jobs_v2.sql
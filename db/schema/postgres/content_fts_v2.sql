@@ -0,0 +1,29 @@
+-- content FTS v2 (PostgreSQL) — tsvector/GIN over content.items(title, summary)
+-- 'simple' config (no stemming) because titles/summaries mix Korean and English;
+-- substring matches keep using the pg_trgm GIN indexes from content_v2.sql.
+
+ALTER TABLE content.items ADD COLUMN IF NOT EXISTS search_tsv tsvector
+  GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(summary, '')), 'B')
+  ) STORED;
+CREATE INDEX IF NOT EXISTS idx_items_search_tsv ON content.items USING GIN (search_tsv);
+CREATE INDEX IF NOT EXISTS idx_items_updated_id ON content.items (updated_at DESC, id DESC);
+
+-- Monotonic revision of content.items (cache key for search totals / rendered sitemaps)
+CREATE TABLE IF NOT EXISTS content.rev (
+  id  INT PRIMARY KEY CHECK (id = 1),
+  rev BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO content.rev(id, rev) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION content.bump_rev() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  UPDATE content.rev SET rev = rev + 1 WHERE id = 1;
+  RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_items_bump_rev ON content.items;
+CREATE TRIGGER trg_items_bump_rev
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON content.items
+  FOR EACH STATEMENT EXECUTE FUNCTION content.bump_rev();
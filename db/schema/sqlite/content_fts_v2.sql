@@ -0,0 +1,39 @@
+-- content FTS v2 (SQLite) — FTS5 index over content_items(title, summary)
+-- External-content table keyed by content_items.rowid; kept in sync by triggers.
+-- trigram tokenizer: substring semantics like the old LIKE '%q%' and works for Korean
+-- (terms shorter than 3 chars fall back to LIKE in the API).
+-- NOTE: VACUUM may renumber rowids of content_items (TEXT primary key);
+--       run  INSERT INTO content_items_fts(content_items_fts) VALUES('rebuild');  afterwards.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS content_items_fts USING fts5(
+  title, summary,
+  content='content_items', content_rowid='rowid',
+  tokenize='trigram'
+);
+
+-- Monotonic revision of content_items, bumped by the triggers below.
+-- Used as a cache key (search totals, rendered sitemaps).
+CREATE TABLE IF NOT EXISTS content_rev (
+  id  INTEGER PRIMARY KEY CHECK (id = 1),
+  rev INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO content_rev(id, rev) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS content_items_fts_ai AFTER INSERT ON content_items BEGIN
+  INSERT INTO content_items_fts(rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+  UPDATE content_rev SET rev = rev + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS content_items_fts_ad AFTER DELETE ON content_items BEGIN
+  INSERT INTO content_items_fts(content_items_fts, rowid, title, summary) VALUES ('delete', old.rowid, old.title, old.summary);
+  UPDATE content_rev SET rev = rev + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS content_items_fts_au AFTER UPDATE ON content_items BEGIN
+  INSERT INTO content_items_fts(content_items_fts, rowid, title, summary) VALUES ('delete', old.rowid, old.title, old.summary);
+  INSERT INTO content_items_fts(rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+  UPDATE content_rev SET rev = rev + 1 WHERE id = 1;
+END;
+
+-- Keyset listing (no query): ORDER BY ifnull(updated_at,0) DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_content_items_updated_id ON content_items(ifnull(updated_at, 0) DESC, id DESC);
@@ -0,0 +1,21 @@
+-- ops v2 (SQLite) — local subprocess job queue (app/job_queue.py; PySpark runner)
+CREATE TABLE IF NOT EXISTS ops_jobs (
+  id            TEXT PRIMARY KEY,
+  kind          TEXT NOT NULL,
+  script        TEXT,
+  cmd_json      TEXT NOT NULL,
+  meta_json     TEXT,
+  status        TEXT NOT NULL,            -- queued | running | succeeded | failed | timeout | cancelled | interrupted
+  rc            INTEGER,
+  error_msg     TEXT,
+  timeout_sec   INTEGER,
+  log_dir       TEXT,
+  pid           INTEGER,
+  created_at    INTEGER NOT NULL,         -- epoch ms
+  started_at    INTEGER,
+  finished_at   INTEGER,
+  updated_at    INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ops_jobs_status     ON ops_jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_ops_jobs_kind_created ON ops_jobs(kind, created_at);
@@ -97,7 +97,6 @@ CREATE TABLE IF NOT EXISTS embeddings (
 );
 
 -- FTS virtual tables
-CREATE VIRTUAL TABLE IF NOT EXISTS threads_fts USING fts5(title, content='threads', content_rowid='id');
-CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(content, content='messages', content_rowid='id');
+-- threads_fts / messages_fts: see threads_fts_v2.sql (rowid-keyed, trigger-maintained)
 CREATE VIRTUAL TABLE IF NOT EXISTS artifacts_fts USING fts5(path, kind, meta_json, content='artifacts', content_rowid='id');
 
@@ -0,0 +1,60 @@
+-- threads FTS v2 (SQLite) — FTS5 indexes over threads(title) and messages(content)
+-- Replaces the v1 declarations (content_rowid='id' on TEXT primary keys, never populated).
+-- External-content tables keyed by rowid; kept in sync by triggers.
+-- trigram tokenizer, same as content_items_fts (substring semantics, Korean-friendly;
+-- terms shorter than 3 chars fall back to LIKE in the API).
+-- Writers must upsert (INSERT … ON CONFLICT DO UPDATE) rather than INSERT OR REPLACE:
+-- REPLACE deletes the old row without firing the _ad trigger (recursive_triggers is off).
+-- NOTE: VACUUM may renumber rowids (TEXT primary keys); run the two 'rebuild' inserts afterwards.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS threads_fts USING fts5(
+  title,
+  content='threads', content_rowid='rowid',
+  tokenize='trigram'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+  content,
+  content='messages', content_rowid='rowid',
+  tokenize='trigram'
+);
+
+-- Monotonic revision of threads/messages search state (cache key for search totals).
+CREATE TABLE IF NOT EXISTS threads_rev (
+  id  INTEGER PRIMARY KEY CHECK (id = 1),
+  rev INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO threads_rev(id, rev) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS threads_fts_ai AFTER INSERT ON threads BEGIN
+  INSERT INTO threads_fts(rowid, title) VALUES (new.rowid, new.title);
+  UPDATE threads_rev SET rev = rev + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS threads_fts_ad AFTER DELETE ON threads BEGIN
+  INSERT INTO threads_fts(threads_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+  UPDATE threads_rev SET rev = rev + 1 WHERE id = 1;
+END;
+
+-- only title edits touch the index (appends bump updated_at on every message)
+CREATE TRIGGER IF NOT EXISTS threads_fts_au AFTER UPDATE OF title ON threads BEGIN
+  INSERT INTO threads_fts(threads_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+  INSERT INTO threads_fts(rowid, title) VALUES (new.rowid, new.title);
+  UPDATE threads_rev SET rev = rev + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+  INSERT INTO messages_fts(rowid, content) VALUES (new.rowid, new.content);
+  UPDATE threads_rev SET rev = rev + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+  INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+  UPDATE threads_rev SET rev = rev + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF content, thread_id ON messages BEGIN
+  INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+  INSERT INTO messages_fts(rowid, content) VALUES (new.rowid, new.content);
+  UPDATE threads_rev SET rev = rev + 1 WHERE id = 1;
+END;
@@ -14,8 +14,46 @@ FastAPI Chat Gateway Router
 - Keys are loaded from environment variables:
     OPENAI_API_KEY, ANTHROPIC_API_KEY (or ANTHROPIC_KEY), GEMINI_API_KEY
 
+- Connections:
+    - One pooled httpx.AsyncClient per provider for the app's lifetime (keep-alive, HTTP/2 when
+      the `h2` package is installed), closed on shutdown; GET /api/chat/pool shows pool metrics
+    - Env: GG_CHAT_POOL=0 (a new client per call), GG_CHAT_HTTP2=0, GG_CHAT_MAX_CONNECTIONS,
+      GG_CHAT_MAX_KEEPALIVE, GG_CHAT_KEEPALIVE_SEC; OPENAI_BASE_URL / ANTHROPIC_BASE_URL /
+      GEMINI_BASE_URL point the gateway at a proxy or a local mock
+
+- Tool loop (POST /api/chat/toolcall):
+    - Tool calls of one model step run concurrently (GG_TOOL_CONCURRENCY, default 4), each with
+      its own timeout (TOOL_TIMEOUTS, default GG_TOOL_TIMEOUT_SEC) inside a per-turn budget
+      (GG_TOOL_TURN_BUDGET_SEC, default 25) over up to GG_TOOL_MAX_STEPS (default 3) steps
+    - Results are fed back in tool_call order; data.trace has per-step model/tool ms and wall time
+    - Out of steps or budget: one closing call with tool_choice "none" on the accumulated messages
+      (data.trace.final)
+
+- Resilience (every provider call):
+    - Bounded retries with exponential backoff + jitter on transport errors and 408/429/5xx
+      (GG_CHAT_RETRY_MAX, default 2; streams only before their first chunk)
+    - Optional hedged request once a call outlives the provider's p95 (GG_CHAT_HEDGE=1)
+    - Per-provider circuit breaker (GG_CHAT_CB_FAILURES, GG_CHAT_CB_OPEN_SEC, GG_CHAT_CB_PROBE_SEC)
+    - Failover to alternates listed in GG_CHAT_FAILOVER (e.g. "anthropic,openai") with a key
+    - GET /api/chat/providers shows breaker state, latency and counters
+
+- Caches:
+    - Response cache for temperature=0 /api/chat and /api/chat/stream requests, keyed by a hash
+      of the normalized request (model, messages, tools); tool-result cache for fs.read (path +
+      mtime/size) and web.search (query). Both are byte-bounded LRUs with TTLs
+      (GG_CHAT_CACHE_* / GG_TOOL_CACHE_*), optionally persisted under GG_CHAT_CACHE_DIR
+    - Opt out per request: "X-GG-Cache: off|refresh" or Cache-Control no-store/no-cache;
+      responses carry X-Cache: HIT|MISS|BYPASS; GET /api/chat/cache shows hit rates
+
+- Stream relay (/api/chat/stream):
+    - Bounded per-stream queue (GG_SSE_QUEUE_MAX) between provider and client: a slow reader
+      pauses the upstream read, a disconnect cancels the upstream request
+    - Deltas coalesced per GG_SSE_FRAME_BYTES / GG_SSE_FRAME_MS; ": ping" every
+      GG_SSE_HEARTBEAT_SEC while idle; GET /api/chat/stream/stats
+
 - Notes:
-    - Streaming falls back to a single final chunk for providers without SSE implemented.
+    - All three providers stream natively (OpenAI / Anthropic SSE, Gemini streamGenerateContent
+      with alt=sse) through one incremental SSE parser (_sse_data).
     - Tools(MCP) in request are logged only; execution hooks are left for future extension.
 
 This module can be included in the FastAPI app as:
@@ -28,13 +66,20 @@ Author: Gumgang Team
 from __future__ import annotations
 
 
+import asyncio
+import hashlib
 import json
 import os
+import random
+import socket
 import time
-from typing import Any, AsyncGenerator, Dict, Iterable, List, Literal, Optional
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Literal, Optional
 
 import httpx
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
@@ -69,6 +114,11 @@ class ChatRequest(BaseModel):
         default=None, description="Reserved for MCP/tool calls (logged only)"
     )
 
+def _temperature(req: "ChatRequest") -> float:
+    # 0 is a valid (deterministic) setting; only a missing value falls back to the default
+    return 0.7 if req.temperature is None else req.temperature
+
+
 # ============== MCP‑Lite (Tools) — definitions & invoke ==============
 class ToolDefModel(BaseModel):
     id: str
@@ -195,7 +245,7 @@ async def _tool_run(tool: str, args: Optional[Dict[str, Any]]) -> Any:
         path = args.get("path")
         if not path or not isinstance(path, str):
             raise ValueError("fs.read requires string 'path'")
-        text = _safe_read_text(path)
+        text = await asyncio.to_thread(_safe_read_text, path)
         # Truncate overly long content defensively
         if len(text) > 60_000:
             text = text[:60_000] + "\n…(truncated)"
@@ -209,8 +259,8 @@ async def _tool_run(tool: str, args: Optional[Dict[str, Any]]) -> Any:
         url = "https://api.duckduckgo.com/"
         params = {"q": query, "format": "json", "no_html": 1, "skip_disambig": 1}
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                r = await client.get(url, params=params)
+            async with _provider_client("web") as client:
+                r = await client.get(url, params=params, timeout=10)
                 r.raise_for_status()
                 j = r.json()
                 # Extract top related topics / abstract
@@ -236,6 +286,78 @@ async def _tool_run(tool: str, args: Optional[Dict[str, Any]]) -> Any:
     raise ValueError(f"Unknown tool: {tool}")
 
 
+# Tool dispatch limits (per chat turn)
+TOOL_CONCURRENCY = int(os.getenv("GG_TOOL_CONCURRENCY") or 4)
+TOOL_TIMEOUT_SEC = float(os.getenv("GG_TOOL_TIMEOUT_SEC") or 10.0)
+TOOL_TIMEOUTS: Dict[str, float] = {"now": 1.0, "fs.read": 5.0, "fs_read": 5.0, "web.search": 10.0, "web_search": 10.0}
+TOOL_TURN_BUDGET_SEC = float(os.getenv("GG_TOOL_TURN_BUDGET_SEC") or 25.0)
+TOOL_MAX_STEPS = int(os.getenv("GG_TOOL_MAX_STEPS") or 3)
+
+
+async def _run_tool_calls(calls: List[Dict[str, Any]], deadline: float) -> List[Dict[str, Any]]:
+    """
+    Run one step's tool calls concurrently.
+    - calls: [{id, tool, args}] in the model's order; results come back in the same order
+    - at most TOOL_CONCURRENCY at a time; each bounded by its TOOL_TIMEOUTS entry (default
+      TOOL_TIMEOUT_SEC) and by what is left of the turn budget (`deadline`, monotonic)
+    → [{id, tool, ok, data | error, ms}]
+    """
+    sem = asyncio.Semaphore(max(1, TOOL_CONCURRENCY))
+
+    async def one(call: Dict[str, Any]) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"id": call.get("id") or "", "tool": call.get("tool") or ""}
+        async with sem:
+            t0 = time.monotonic()
+            limit = min(TOOL_TIMEOUTS.get(out["tool"], TOOL_TIMEOUT_SEC), deadline - t0)
+            ck = _tool_cache_key(out["tool"], call.get("args"))
+            hit = TOOL_CACHE.get(ck[0]) if ck else None
+            try:
+                if hit is not None:
+                    out["data"], out["cached"] = hit, True
+                else:
+                    if limit <= 0:
+                        raise asyncio.TimeoutError
+                    out["data"] = await asyncio.wait_for(_tool_run(out["tool"], call.get("args")), timeout=limit)
+                    # a web.search fallback (upstream failed) is an answer for now, not for WEB_SEARCH_CACHE_TTL_SEC
+                    if ck and not (isinstance(out["data"], dict) and out["data"].get("note")):
+                        TOOL_CACHE.put(ck[0], out["data"], ttl=ck[1])
+                out["ok"] = True
+            except asyncio.TimeoutError:
+                out["ok"] = False
+                out["error"] = "TURN_BUDGET_EXCEEDED" if limit <= 0 or time.monotonic() >= deadline else "TOOL_TIMEOUT"
+            except Exception as e:
+                out["ok"] = False
+                out["error"] = str(e)
+            out["ms"] = int((time.monotonic() - t0) * 1000)
+        return out
+
+    return list(await asyncio.gather(*(one(c) for c in calls)))
+
+
+def _tool_payload(res: Dict[str, Any]) -> str:
+    body = {"ok": True, "data": res.get("data")} if res.get("ok") else {"ok": False, "error": res.get("error")}
+    return json.dumps(body, ensure_ascii=False)
+
+
+def _trace_step(trace: Optional[Dict[str, Any]], model_ms: int, results: List[Dict[str, Any]], wall_ms: int) -> None:
+    if trace is None:
+        return
+    trace.setdefault("steps", []).append(
+        {
+            "model_ms": model_ms,
+            "tools": [{k: r.get(k) for k in ("id", "tool", "ok", "error", "ms", "cached") if r.get(k) is not None} for r in results],
+            "tools_wall_ms": wall_ms,
+            "tools_sum_ms": sum(r.get("ms", 0) for r in results),
+        }
+    )
+
+
+def _trace_final(trace: Optional[Dict[str, Any]], reason: str, model_ms: int) -> None:
+    """Record the closing no-tools call made when a turn runs out of steps or budget."""
+    if trace is not None:
+        trace["final"] = {"reason": reason, "tool_choice": "none", "model_ms": model_ms}
+
+
 @router.get("/tools/definitions")
 async def tool_definitions():
     """Return server-side tool definitions (MCP-Lite)."""
@@ -252,11 +374,15 @@ async def tool_invoke(req: ToolInvokeRequest) -> ToolInvokeResponse:
 
 
 # ============== OpenAI tool-call loop (MCP‑Lite integration) ==============
-async def call_openai_with_tools(req: "ChatRequest") -> str:
+async def call_openai_with_tools(req: "ChatRequest", trace: Optional[Dict[str, Any]] = None) -> str:
     """
     Tool-call loop for OpenAI Chat Completions.
     - Uses either req.tools (UI-defined) or default TOOL_DEFS.
-    - Up to 3 iterations of tool_use → tool_result → assistant follow-up.
+    - Up to TOOL_MAX_STEPS iterations of tool_calls → tool results → assistant follow-up.
+    - Tool calls of one step run concurrently (_run_tool_calls) within the turn budget;
+      per-step timings are appended to `trace` when given.
+    - Out of steps or budget: one last call on the accumulated messages with tool_choice "none",
+      so the answer still sees the tool results (trace["final"] says why).
     """
     if not OPENAI_KEY:
         raise RuntimeError("OPENAI_API_KEY missing")
@@ -270,28 +396,32 @@ async def call_openai_with_tools(req: "ChatRequest") -> str:
     tools_schema = _openai_tools_from_defs(tools_defs)
 
     msgs = [m.model_dump() for m in req.messages]
-    temp = req.temperature or 0.7
+    temp = _temperature(req)
+    deadline = time.monotonic() + TOOL_TURN_BUDGET_SEC
 
-    async def _once(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
-        url = "https://api.openai.com/v1/chat/completions"
+    async def _once(messages: List[Dict[str, Any]], tool_choice: Any = "auto") -> Dict[str, Any]:
+        url = f"{OPENAI_BASE}/chat/completions"
         headers = {"Authorization": f"Bearer {OPENAI_KEY}", "Content-Type": "application/json"}
         payload = {
             "model": req.model or "gpt-4o-mini",
             "temperature": temp,
             "messages": messages,
             "tools": tools_schema,
-            "tool_choice": "auto",
+            "tool_choice": tool_choice,
             "stream": False,
         }
-        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
+        async with _provider_client("openai") as client:
             r = await client.post(url, headers=headers, json=payload)
             r.raise_for_status()
             return r.json()
 
-    MAX_STEPS = 3
     messages = msgs
-    for _ in range(MAX_STEPS):
-        j = await _once(messages)
+    for _ in range(TOOL_MAX_STEPS):
+        if time.monotonic() >= deadline:
+            break
+        t0 = time.monotonic()
+        j = await _resilient("openai", lambda: _once(messages))
+        model_ms = int((time.monotonic() - t0) * 1000)
         choice = (j.get("choices") or [{}])[0]
         msg = choice.get("message") or {}
         tool_calls = msg.get("tool_calls") or []
@@ -306,52 +436,53 @@ async def call_openai_with_tools(req: "ChatRequest") -> str:
                     "tool_calls": tool_calls,
                 }
             )
-            # Execute each call sequentially; push tool results
+            calls: List[Dict[str, Any]] = []
             for tc in tool_calls:
                 fn = (tc.get("function") or {})
-                name = fn.get("name") or ""
                 arg_str = fn.get("arguments") or "{}"
                 try:
                     args_obj = json.loads(arg_str) if isinstance(arg_str, str) else (arg_str or {})
                 except Exception:
                     args_obj = {}
-                try:
-                    internal_name = name_map.get(name, name)
-                    result = await _tool_run(internal_name, args_obj)
-                    messages.append(
-                        {
-                            "role": "tool",
-                            "tool_call_id": tc.get("id") or "",
-                            "name": name,
-                            "content": json.dumps({"ok": True, "data": result}, ensure_ascii=False),
-                        }
-                    )
-                except Exception as e:
-                    messages.append(
-                        {
-                            "role": "tool",
-                            "tool_call_id": tc.get("id") or "",
-                            "name": name,
-                            "content": json.dumps({"ok": False, "error": str(e)}, ensure_ascii=False),
-                        }
-                    )
+                name = fn.get("name") or ""
+                calls.append({"id": tc.get("id") or "", "tool": name_map.get(name, name), "name": name, "args": args_obj})
+            # Execute concurrently; push tool results in tool_calls order
+            t1 = time.monotonic()
+            results = await _run_tool_calls(calls, deadline)
+            _trace_step(trace, model_ms, results, int((time.monotonic() - t1) * 1000))
+            for call, res in zip(calls, results):
+                messages.append(
+                    {
+                        "role": "tool",
+                        "tool_call_id": call["id"],
+                        "name": call["name"],
+                        "content": _tool_payload(res),
+                    }
+                )
             # Continue loop for follow-up answer
             continue
 
+        _trace_step(trace, model_ms, [], 0)
         # No tool calls → final assistant content
         if content:
             return content
 
-    # If loop exhausted without final content, try last completion without tools
-    return await call_openai(req)
+    # Loop exhausted without final content: answer from what the tools returned, no more tool calls
+    reason = "turn_budget" if time.monotonic() >= deadline else "max_steps"
+    t0 = time.monotonic()
+    j = await _resilient("openai", lambda: _once(messages, "none"))
+    _trace_final(trace, reason, int((time.monotonic() - t0) * 1000))
+    return ((j.get("choices") or [{}])[0].get("message") or {}).get("content") or ""
 
 
 # ============== Anthropic tool_use loop ==============
-async def call_anthropic_with_tools(req: "ChatRequest") -> str:
+async def call_anthropic_with_tools(req: "ChatRequest", trace: Optional[Dict[str, Any]] = None) -> str:
     """
     Tool-use loop for Anthropic Messages API.
     - Uses either req.tools (UI-defined) or default TOOL_DEFS.
-    - Up to 3 iterations of tool_use → tool_result → assistant follow-up.
+    - Up to TOOL_MAX_STEPS iterations of tool_use → tool_result → assistant follow-up.
+    - tool_use blocks of one step run concurrently (see call_openai_with_tools).
+    - Out of steps or budget: one last call with tool_choice none (see call_openai_with_tools).
     """
     if not ANTHROPIC_KEY:
         raise RuntimeError("ANTHROPIC_API_KEY missing")
@@ -379,8 +510,8 @@ async def call_anthropic_with_tools(req: "ChatRequest") -> str:
         # Prepend an empty user turn if the conversation would otherwise start with assistant
         messages.insert(0, {"role": "user", "content": [{"type": "text", "text": ""}]})
 
-    async def _once(msgs: List[Dict[str, Any]]) -> Dict[str, Any]:
-        url = "https://api.anthropic.com/v1/messages"
+    async def _once(msgs: List[Dict[str, Any]], tool_choice: Any = "auto") -> Dict[str, Any]:
+        url = f"{ANTHROPIC_BASE}/v1/messages"
         headers = {
             "x-api-key": ANTHROPIC_KEY,
             "anthropic-version": "2023-06-01",
@@ -390,26 +521,30 @@ async def call_anthropic_with_tools(req: "ChatRequest") -> str:
         payload = {
             "model": req.model or (ANTHROPIC_MODEL or "claude-3-5-sonnet-20241022"),
             "max_tokens": 1024,
-            "temperature": req.temperature or 0.7,
+            "temperature": _temperature(req),
             "system": system or None,
             "messages": msgs,
             "tools": tools_schema,
-            "tool_choice": "auto",
+            "tool_choice": tool_choice,
         }
-        async with httpx.AsyncClient(**HTTPX_CLIENT_KW) as client:
+        async with _provider_client("anthropic") as client:
             r = await client.post(url, headers=headers, json=payload)
             r.raise_for_status()
             return r.json()
 
-    MAX_STEPS = 3
-    for _ in range(MAX_STEPS):
+    deadline = time.monotonic() + TOOL_TURN_BUDGET_SEC
+    for _ in range(TOOL_MAX_STEPS):
+        if time.monotonic() >= deadline:
+            break
+        t0 = time.monotonic()
         try:
-            j = await _once(messages)
+            j = await _resilient("anthropic", lambda: _once(messages))
         except httpx.HTTPStatusError as e:
             # Graceful fallback: if tools are not accepted (400), run plain call
             if getattr(e, "response", None) is not None and e.response.status_code == 400:
                 return await call_anthropic(req)
             raise
+        model_ms = int((time.monotonic() - t0) * 1000)
         content = j.get("content")
         # Collect tool_use blocks and plain text
         tool_uses: List[Dict[str, Any]] = []
@@ -427,60 +562,66 @@ async def call_anthropic_with_tools(req: "ChatRequest") -> str:
         if tool_uses:
             # Append assistant tool_use blocks message
             messages.append({"role": "assistant", "content": content})
-            # Execute tools and append user tool_result blocks
-            results_blocks: List[Dict[str, Any]] = []
-            for tu in tool_uses:
-                name_safe = tu.get("name") or ""
-                internal = name_map.get(name_safe, name_safe)
-                args_obj = tu.get("input") or {}
-                try:
-                    result = await _tool_run(internal, args_obj)
-                    results_blocks.append(
-                        {
-                            "type": "tool_result",
-                            "tool_use_id": tu.get("id") or "",
-                            "content": [
-                                {"type": "text", "text": json.dumps({"ok": True, "data": result}, ensure_ascii=False)}
-                            ],
-                        }
-                    )
-                except Exception as e:
-                    results_blocks.append(
-                        {
-                            "type": "tool_result",
-                            "tool_use_id": tu.get("id") or "",
-                            "content": [
-                                {"type": "text", "text": json.dumps({"ok": False, "error": str(e)}, ensure_ascii=False)}
-                            ],
-                        }
-                    )
+            # Execute tools concurrently and append user tool_result blocks in tool_use order
+            calls = [
+                {"id": tu.get("id") or "", "tool": name_map.get(tu.get("name") or "", tu.get("name") or ""), "args": tu.get("input") or {}}
+                for tu in tool_uses
+            ]
+            t1 = time.monotonic()
+            results = await _run_tool_calls(calls, deadline)
+            _trace_step(trace, model_ms, results, int((time.monotonic() - t1) * 1000))
+            results_blocks: List[Dict[str, Any]] = [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": res["id"],
+                    "content": [{"type": "text", "text": _tool_payload(res)}],
+                }
+                for res in results
+            ]
             messages.append({"role": "user", "content": results_blocks})
             continue
 
+        _trace_step(trace, model_ms, [], 0)
         if text_accum:
             return text_accum
 
-    # Fallback if loop didn't yield final text
-    return await call_anthropic(req)
+    # Loop didn't yield final text: answer from the tool results (tools stay declared, since the
+    # history holds tool_use blocks, but may not be called)
+    reason = "turn_budget" if time.monotonic() >= deadline else "max_steps"
+    t0 = time.monotonic()
+    j = await _resilient("anthropic", lambda: _once(messages, {"type": "none"}))
+    _trace_final(trace, reason, int((time.monotonic() - t0) * 1000))
+    content = j.get("content")
+    if isinstance(content, list):
+        return "".join(blk.get("text") or "" for blk in content if blk.get("type") == "text")
+    return j.get("output_text") or ""
 
 @router.post("/chat/toolcall", response_model=ChatResponse)
-async def chat_toolcall(req: "ChatRequest") -> ChatResponse:
+async def chat_toolcall(req: "ChatRequest", request: Request) -> ChatResponse:
     """
     Tool-aware chat endpoint (OpenAI-first).
     - If model is OpenAI, use function calling (tools).
     - Otherwise, fallback to provider routing without tools.
+    - Replies are not cached (tool results change); fs.read / web.search results are (TOOL_CACHE),
+      subject to the same X-GG-Cache / Cache-Control opt-out headers as /api/chat.
     """
+    _CACHE_MODE.set(_cache_mode_from(request))
     try:
         started = time.time()
         provider = _pick_provider(req.model)
+        trace: Dict[str, Any] = {"provider": provider, "budget_ms": int(TOOL_TURN_BUDGET_SEC * 1000)}
         if provider == "openai":
-            reply = await call_openai_with_tools(req)
+            reply = await call_openai_with_tools(req, trace)
         elif provider == "anthropic":
-            reply = await call_anthropic_with_tools(req)
+            reply = await call_anthropic_with_tools(req, trace)
         else:
             reply = await route_to_provider(req)
         elapsed = int((time.time() - started) * 1000)
-        return ChatResponse(ok=True, data={"message": {"role": "assistant", "content": reply}, "elapsed_ms": elapsed})
+        trace["total_ms"] = elapsed
+        return ChatResponse(
+            ok=True,
+            data={"message": {"role": "assistant", "content": reply}, "elapsed_ms": elapsed, "trace": trace},
+        )
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
     except Exception as e:
@@ -499,6 +640,158 @@ PROJECT_ROOT = os.path.abspath(os.environ.get("GUMGANG_PROJECT_ROOT", os.getcwd(
 DEFAULT_TIMEOUT = 30.0  # seconds
 HTTPX_CLIENT_KW = dict(timeout=DEFAULT_TIMEOUT, follow_redirects=True)
 
+# Provider endpoints (override to point the gateway at a proxy or a local mock server)
+OPENAI_BASE = (os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1").rstrip("/")
+ANTHROPIC_BASE = (os.getenv("ANTHROPIC_BASE_URL") or "https://api.anthropic.com").rstrip("/")
+GEMINI_BASE = (os.getenv("GEMINI_BASE_URL") or "https://generativelanguage.googleapis.com/v1beta").rstrip("/")
+
+
+# ------------------------------------------------------------------------------
+# Shared provider clients (connection pool)
+# ------------------------------------------------------------------------------
+
+def _env_flag(name: str, default: str = "1") -> bool:
+    return str(os.getenv(name) or default).strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# GG_CHAT_POOL=0 → legacy behaviour (one client, one handshake per call)
+POOL_ENABLED = _env_flag("GG_CHAT_POOL")
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]"); HTTP/1.1 keep-alive otherwise
+HTTP2_ENABLED = _env_flag("GG_CHAT_HTTP2") and _h2_available()
+POOL_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("GG_CHAT_MAX_CONNECTIONS") or 64),
+    max_keepalive_connections=int(os.getenv("GG_CHAT_MAX_KEEPALIVE") or 16),
+    keepalive_expiry=float(os.getenv("GG_CHAT_KEEPALIVE_SEC") or 90.0),
+)
+POOL_TIMEOUT = httpx.Timeout(DEFAULT_TIMEOUT, connect=10.0, pool=10.0)
+
+
+class ProviderClients:
+    """
+    One long-lived httpx.AsyncClient per provider, created on first use and closed on app shutdown.
+    - Connections (TCP + TLS, HTTP/2 when available) are reused across turns and tool-loop steps.
+    - A client is bound to the event loop it was created on; a call from another loop (tests,
+      scripts) gets its own client instead of a cross-loop pool, and the one it replaces is
+      closed on its own loop (or, if that loop is gone, has its sockets shut down).
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, tuple[Any, httpx.AsyncClient]] = {}
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, provider: str, key: str) -> None:
+        c = self.counters.setdefault(provider, {"requests": 0, "responses": 0, "errors": 0, "clients": 0})
+        c[key] += 1
+
+    def _new(self, provider: str) -> httpx.AsyncClient:
+        async def on_request(request: httpx.Request) -> None:
+            self._count(provider, "requests")
+
+        async def on_response(response: httpx.Response) -> None:
+            self._count(provider, "responses" if response.status_code < 400 else "errors")
+
+        self._count(provider, "clients")
+        return httpx.AsyncClient(
+            timeout=POOL_TIMEOUT,
+            limits=POOL_LIMITS,
+            http2=HTTP2_ENABLED,
+            follow_redirects=True,
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        cur = self._clients.get(provider)
+        if cur is not None and cur[0] is loop and not cur[1].is_closed:
+            return cur[1]
+        if cur is not None:
+            self._retire(*cur)
+        client = self._new(provider)
+        self._clients[provider] = (loop, client)
+        return client
+
+    @staticmethod
+    def _retire(owner: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+        """Close a client bound to another event loop without awaiting it here."""
+        if client.is_closed:
+            return
+        if not owner.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), owner)
+            return
+        # Its loop is gone, so aclose() can never run: shut the pooled sockets down (the provider
+        # sees them close now; the fds go with the dead loop's transports). httpcore internals.
+        try:
+            conns = list(client._transport._pool.connections)  # type: ignore[attr-defined]
+        except Exception:
+            return
+        for conn in conns:
+            try:
+                sock = conn._connection._network_stream.get_extra_info("socket")
+                if sock is not None:
+                    sock.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        clients, self._clients = self._clients, {}
+        for owner, client in clients.values():
+            if owner is loop:
+                await client.aclose()
+            else:
+                self._retire(owner, client)
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for provider, (_, client) in self._clients.items():
+            conns: List[Any] = []
+            try:  # httpcore pool internals; best effort
+                conns = list(client._transport._pool.connections)  # type: ignore[attr-defined]
+            except Exception:
+                pass
+            out[provider] = {
+                "connections": len(conns),
+                "idle": sum(1 for c in conns if c.is_idle()),
+                "http2": sum(1 for c in conns if "HTTP/2" in c.info()),
+                "closed": client.is_closed,
+            }
+        return {
+            "pool_enabled": POOL_ENABLED,
+            "http2": HTTP2_ENABLED,
+            "limits": {
+                "max_connections": POOL_LIMITS.max_connections,
+                "max_keepalive_connections": POOL_LIMITS.max_keepalive_connections,
+                "keepalive_expiry": POOL_LIMITS.keepalive_expiry,
+            },
+            "providers": {p: {**self.counters.get(p, {}), **out.get(p, {})} for p in set(self.counters) | set(out)},
+        }
+
+
+PROVIDER_CLIENTS = ProviderClients()
+
+
+@asynccontextmanager
+async def _provider_client(provider: str) -> AsyncIterator[httpx.AsyncClient]:
+    """Shared pooled client for `provider` (or a throwaway one when GG_CHAT_POOL=0)."""
+    if not POOL_ENABLED:
+        async with httpx.AsyncClient(**HTTPX_CLIENT_KW) as client:
+            yield client
+        return
+    yield PROVIDER_CLIENTS.get(provider)
+
+
+@router.on_event("shutdown")
+async def _close_provider_clients() -> None:
+    await PROVIDER_CLIENTS.aclose()
+
 # Data models are defined earlier to avoid forward-ref issues in decorators.
 
 
@@ -524,6 +817,26 @@ def _first_system_and_rest(messages: Iterable[Msg]) -> tuple[str, List[Dict[str,
     return system, rest
 
 
+async def _sse_data(r: httpx.Response) -> AsyncGenerator[str, None]:
+    """
+    Incremental SSE framing shared by the provider streams: yields the data payload of each
+    event as soon as its terminating blank line arrives ("data:" lines joined with "\\n",
+    comments / event / id lines ignored, CRLF or LF). Reading is pull-based, so a slow consumer
+    slows the upstream read instead of buffering it.
+    """
+    buf: List[str] = []
+    async for line in r.aiter_lines():
+        if not line:
+            if buf:
+                yield "\n".join(buf)
+                buf = []
+            continue
+        if line.startswith("data:"):
+            buf.append(line[6:] if line.startswith("data: ") else line[5:])
+    if buf:
+        yield "\n".join(buf)
+
+
 # ------------------------------ OpenAI ----------------------------------------
 
 async def call_openai(req: ChatRequest) -> str:
@@ -533,18 +846,18 @@ async def call_openai(req: ChatRequest) -> str:
     if not OPENAI_KEY:
         raise RuntimeError("OPENAI_API_KEY missing")
 
-    url = "https://api.openai.com/v1/chat/completions"
+    url = f"{OPENAI_BASE}/chat/completions"
     headers = {
         "Authorization": f"Bearer {OPENAI_KEY}",
         "Content-Type": "application/json",
     }
     payload = {
         "model": (req.model or "gpt-4o-mini"),
-        "temperature": req.temperature or 0.7,
+        "temperature": _temperature(req),
         "messages": [m.model_dump() for m in req.messages],
         "stream": False,
     }
-    async with httpx.AsyncClient(**HTTPX_CLIENT_KW) as client:
+    async with _provider_client("openai") as client:
         r = await client.post(url, headers=headers, json=payload)
         r.raise_for_status()
         j = r.json()
@@ -563,39 +876,38 @@ async def call_openai_stream(req: ChatRequest) -> AsyncGenerator[str, None]:
     if not OPENAI_KEY:
         raise RuntimeError("OPENAI_API_KEY missing")
 
-    url = "https://api.openai.com/v1/chat/completions"
+    url = f"{OPENAI_BASE}/chat/completions"
     headers = {
         "Authorization": f"Bearer {OPENAI_KEY}",
         "Content-Type": "application/json",
     }
     payload = {
         "model": (req.model or "gpt-4o-mini"),
-        "temperature": req.temperature or 0.7,
+        "temperature": _temperature(req),
         "messages": [m.model_dump() for m in req.messages],
         "stream": True,
     }
-    async with httpx.AsyncClient(**HTTPX_CLIENT_KW) as client:
+    async with _provider_client("openai") as client:
         async with client.stream("POST", url, headers=headers, json=payload) as r:
             r.raise_for_status()
-            async for line in r.aiter_lines():
-                if not line:
+            async for data in _sse_data(r):
+                data = data.strip()
+                if data == "[DONE]":
+                    # Drain the (empty) rest instead of breaking: a response closed early is
+                    # not returned to the pool and the next turn pays a new handshake.
+                    continue
+                try:
+                    j = json.loads(data)
+                    # Prefer delta.content
+                    choices = j.get("choices") or []
+                    if choices:
+                        delta = choices[0].get("delta") or {}
+                        content = delta.get("content")
+                        if content:
+                            yield content
+                except Exception:
+                    # If parsing fails, ignore the chunk
                     continue
-                if line.startswith("data: "):
-                    data = line[6:].strip()
-                    if data == "[DONE]":
-                        break
-                    try:
-                        j = json.loads(data)
-                        # Prefer delta.content
-                        choices = j.get("choices") or []
-                        if choices:
-                            delta = choices[0].get("delta") or {}
-                            content = delta.get("content")
-                            if content:
-                                yield content
-                    except Exception:
-                        # If parsing fails, ignore the chunk
-                        continue
 
 
 # ---------------------------- Anthropic ---------------------------------------
@@ -607,7 +919,7 @@ async def call_anthropic(req: ChatRequest) -> str:
     if not ANTHROPIC_KEY:
         raise RuntimeError("ANTHROPIC_API_KEY missing")
 
-    url = "https://api.anthropic.com/v1/messages"
+    url = f"{ANTHROPIC_BASE}/v1/messages"
     headers = {
         "x-api-key": ANTHROPIC_KEY,
         "anthropic-version": "2023-06-01",
@@ -621,7 +933,7 @@ async def call_anthropic(req: ChatRequest) -> str:
     payload = {
         "model": req.model or (ANTHROPIC_MODEL or "claude-3-5-sonnet-20241022"),
         "max_tokens": 1024,
-        "temperature": req.temperature or 0.7,
+        "temperature": _temperature(req),
         "messages": [
             {
                 "role": "user" if m["role"] == "user" else "assistant",
@@ -633,7 +945,7 @@ async def call_anthropic(req: ChatRequest) -> str:
     if system:
         payload["system"] = system
 
-    async with httpx.AsyncClient(**HTTPX_CLIENT_KW) as client:
+    async with _provider_client("anthropic") as client:
         r = await client.post(url, headers=headers, json=payload)
         r.raise_for_status()
         j = r.json()
@@ -657,7 +969,7 @@ async def call_anthropic_stream(req: ChatRequest) -> AsyncGenerator[str, None]:
     if not ANTHROPIC_KEY:
         raise RuntimeError("ANTHROPIC_API_KEY missing")
 
-    url = "https://api.anthropic.com/v1/messages"
+    url = f"{ANTHROPIC_BASE}/v1/messages"
     headers = {
         "x-api-key": ANTHROPIC_KEY,
         "anthropic-version": "2023-06-01",
@@ -671,7 +983,7 @@ async def call_anthropic_stream(req: ChatRequest) -> AsyncGenerator[str, None]:
     payload = {
         "model": req.model or "claude-3-5-sonnet-20241022",
         "max_tokens": 1024,
-        "temperature": req.temperature or 0.7,
+        "temperature": _temperature(req),
         "messages": [
             {
                 "role": "user" if m["role"] == "user" else "assistant",
@@ -684,31 +996,63 @@ async def call_anthropic_stream(req: ChatRequest) -> AsyncGenerator[str, None]:
     if system:
         payload["system"] = system
 
-    async with httpx.AsyncClient(**HTTPX_CLIENT_KW) as client:
+    async with _provider_client("anthropic") as client:
         async with client.stream("POST", url, headers=headers, json=payload) as r:
             r.raise_for_status()
-            async for raw in r.aiter_lines():
-                if not raw:
+            # Anthropic SSE typically uses "event: <type>\n" + "data: {...}\n\n"
+            async for data in _sse_data(r):
+                data = data.strip()
+                if data in ("[DONE]", ""):
+                    continue
+                try:
+                    evt = json.loads(data)
+                    # content_block_delta contains incremental text
+                    if evt.get("type") == "content_block_delta":
+                        delta = evt.get("delta") or {}
+                        text = delta.get("text")
+                        if text:
+                            yield text
+                except Exception:
                     continue
-                # Anthropic SSE typically uses "event: <type>\n" + "data: {...}\n\n"
-                if raw.startswith("data: "):
-                    data = raw[6:].strip()
-                    if data in ("[DONE]", ""):
-                        continue
-                    try:
-                        evt = json.loads(data)
-                        # content_block_delta contains incremental text
-                        if evt.get("type") == "content_block_delta":
-                            delta = evt.get("delta") or {}
-                            text = delta.get("text")
-                            if text:
-                                yield text
-                    except Exception:
-                        continue
 
 
 # ------------------------------ Gemini ----------------------------------------
 
+def _gemini_payload(req: ChatRequest) -> Dict[str, Any]:
+    """contents with Gemini roles (assistant → model); system prompts → systemInstruction."""
+    system, rest = _first_system_and_rest(req.messages)
+    contents = [
+        {"role": "model" if m["role"] == "assistant" else "user", "parts": [{"text": m["content"]}]}
+        for m in rest
+    ]
+    payload: Dict[str, Any] = {"contents": contents, "generationConfig": {"temperature": _temperature(req)}}
+    if system:
+        payload["systemInstruction"] = {"parts": [{"text": system}]}
+    return payload
+
+
+def _gemini_text(j: Dict[str, Any]) -> str:
+    cands = j.get("candidates") or []
+    if cands:
+        segs = (cands[0].get("content") or {}).get("parts") or []
+        return "".join([p.get("text", "") for p in segs if not p.get("thought")])
+    return ""
+
+
+_GEMINI_STATUS_CODES = {
+    "INVALID_ARGUMENT": 400, "FAILED_PRECONDITION": 400, "PERMISSION_DENIED": 403, "NOT_FOUND": 404,
+    "RESOURCE_EXHAUSTED": 429, "INTERNAL": 500, "UNAVAILABLE": 503, "DEADLINE_EXCEEDED": 504,
+}
+
+
+def _gemini_error_code(err: Dict[str, Any]) -> int:
+    """HTTP status of an in-stream error object: its numeric code, else mapped from its status name."""
+    code = err.get("code")
+    if isinstance(code, int) and 100 <= code < 600:
+        return code
+    return _GEMINI_STATUS_CODES.get(str(err.get("status") or "").upper(), 500)
+
+
 async def call_gemini(req: ChatRequest) -> str:
     """
     Non-streaming call to Google Generative Language API (Gemini).
@@ -717,32 +1061,495 @@ async def call_gemini(req: ChatRequest) -> str:
         raise RuntimeError("GEMINI_API_KEY missing")
 
     model = req.model or "gemini-1.5-pro"
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={GEMINI_KEY}"
+    url = f"{GEMINI_BASE}/models/{model}:generateContent?key={GEMINI_KEY}"
 
-    # Simple mapping: include system as a separate "user" preface
-    parts: List[Dict[str, Any]] = []
-    for m in req.messages:
-        parts.append({"role": m.role, "parts": [{"text": m.content}]})
-    payload = {"contents": parts}
-
-    async with httpx.AsyncClient(**HTTPX_CLIENT_KW) as client:
-        r = await client.post(url, json=payload)
+    async with _provider_client("gemini") as client:
+        r = await client.post(url, json=_gemini_payload(req))
         r.raise_for_status()
-        j = r.json()
-        cands = j.get("candidates") or []
-        if cands:
-            segs = cands[0].get("content", {}).get("parts") or []
-            return "".join([p.get("text", "") for p in segs])
-        return ""
+        return _gemini_text(r.json())
 
 
 async def call_gemini_stream(req: ChatRequest) -> AsyncGenerator[str, None]:
     """
-    Streaming for Gemini is not implemented here; yield a single final chunk as fallback.
+    Streaming call to Gemini streamGenerateContent (alt=sse).
+    Each event is a GenerateContentResponse; its candidate parts carry the next text delta.
+    An in-stream {"error": …} event raises (after whatever text was already yielded).
     """
-    text = await call_gemini(req)
-    if text:
-        yield text
+    if not GEMINI_KEY:
+        raise RuntimeError("GEMINI_API_KEY missing")
+
+    model = req.model or "gemini-1.5-pro"
+    url = f"{GEMINI_BASE}/models/{model}:streamGenerateContent?alt=sse&key={GEMINI_KEY}"
+
+    async with _provider_client("gemini") as client:
+        async with client.stream("POST", url, json=_gemini_payload(req)) as r:
+            r.raise_for_status()
+            async for data in _sse_data(r):
+                try:
+                    evt = json.loads(data)
+                except ValueError:
+                    continue
+                if isinstance(evt, dict) and evt.get("error"):
+                    err = evt["error"]
+                    raise ProviderStreamError(
+                        "gemini",
+                        _gemini_error_code(err),
+                        f"Gemini stream error: {err.get('status') or err.get('code')} {err.get('message') or ''}".strip(),
+                    )
+                text = _gemini_text(evt) if isinstance(evt, dict) else ""
+                if text:
+                    yield text
+
+
+# ---------------------- Resilience (retry / hedge / breaker) -----------------
+
+# Retries: transport errors and these statuses, exponential backoff with full jitter
+RETRY_MAX = int(os.getenv("GG_CHAT_RETRY_MAX") or 2)
+RETRY_BASE_SEC = float(os.getenv("GG_CHAT_RETRY_BASE_SEC") or 0.25)
+RETRY_CAP_SEC = float(os.getenv("GG_CHAT_RETRY_CAP_SEC") or 4.0)
+RETRY_STATUS = {408, 429, 500, 502, 503, 504, 529}
+# Hedging (off by default): a second identical request once the first outlives the provider's p95
+HEDGE_ENABLED = _env_flag("GG_CHAT_HEDGE", "0")
+HEDGE_MIN_MS = float(os.getenv("GG_CHAT_HEDGE_MIN_MS") or 250)
+HEDGE_MIN_SAMPLES = 20
+# Circuit breaker: open after N consecutive failures, one probe after CB_OPEN_SEC
+CB_FAILURES = int(os.getenv("GG_CHAT_CB_FAILURES") or 5)
+CB_OPEN_SEC = float(os.getenv("GG_CHAT_CB_OPEN_SEC") or 30.0)
+# A half-open probe that has not reported back within this long no longer blocks the next probe
+CB_PROBE_SEC = float(os.getenv("GG_CHAT_CB_PROBE_SEC") or 2 * DEFAULT_TIMEOUT)
+# Failover: alternates tried in order (only those with a key), e.g. "anthropic,openai"; off when empty
+FAILOVER = [p.strip() for p in (os.getenv("GG_CHAT_FAILOVER") or "").split(",") if p.strip()]
+FAILOVER_MODELS = {
+    "openai": os.getenv("GG_CHAT_FAILOVER_OPENAI_MODEL") or "gpt-4o-mini",
+    "anthropic": os.getenv("GG_CHAT_FAILOVER_ANTHROPIC_MODEL") or ANTHROPIC_MODEL or "claude-3-5-sonnet-20241022",
+    "gemini": os.getenv("GG_CHAT_FAILOVER_GEMINI_MODEL") or "gemini-1.5-pro",
+}
+
+
+class ProviderUnavailable(RuntimeError):
+    """Raised without calling upstream while the provider's circuit is open."""
+
+
+class ProviderStreamError(RuntimeError):
+    """An error event inside a 200 streaming response (Gemini {"error": …}), with its HTTP status."""
+
+    def __init__(self, provider: str, status_code: int, message: str) -> None:
+        super().__init__(message)
+        self.provider = provider
+        self.status_code = status_code
+
+
+class ProviderHealth:
+    """Per-provider circuit breaker (closed → open → half_open), latency window and counters."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.state = "closed"
+        self.fails = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.probe_at = 0.0
+        self.latency: deque = deque(maxlen=200)
+        self.counters = {
+            "calls": 0, "attempts": 0, "retries": 0, "failures": 0, "short_circuits": 0,
+            "hedges": 0, "hedge_wins": 0, "failovers": 0,
+        }
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < CB_OPEN_SEC:
+                return False
+            self.state, self.probing = "half_open", False
+        if self.state == "half_open":
+            if self.probing and time.monotonic() - self.probe_at < CB_PROBE_SEC:
+                return False
+            self.probing, self.probe_at = True, time.monotonic()
+        self.counters["attempts"] += 1
+        return True
+
+    def abandon(self) -> None:
+        """The half-open probe was cancelled (hedge loser, client gone): count it as failed so the
+        breaker reopens instead of waiting forever for an outcome."""
+        if self.state == "half_open" and self.probing:
+            self.failure()
+
+    def success(self, latency: Optional[float] = None) -> None:
+        self.state, self.fails, self.probing = "closed", 0, False
+        if latency is not None:
+            self.latency.append(latency)
+
+    def failure(self) -> None:
+        self.fails += 1
+        self.counters["failures"] += 1
+        if self.state == "half_open" or self.fails >= CB_FAILURES:
+            self.state, self.opened_at = "open", time.monotonic()
+        self.probing = False
+
+    def _pct(self, p: float) -> Optional[float]:
+        if not self.latency:
+            return None
+        s = sorted(self.latency)
+        return s[min(len(s) - 1, int(len(s) * p))]
+
+    def hedge_delay(self) -> Optional[float]:
+        if len(self.latency) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(HEDGE_MIN_MS / 1000, self._pct(0.95) or 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        p50, p95 = self._pct(0.5), self._pct(0.95)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.fails,
+            "p50_ms": None if p50 is None else int(p50 * 1000),
+            "p95_ms": None if p95 is None else int(p95 * 1000),
+            **self.counters,
+        }
+
+
+PROVIDER_HEALTH: Dict[str, ProviderHealth] = {}
+
+
+def _health(provider: str) -> ProviderHealth:
+    h = PROVIDER_HEALTH.get(provider)
+    if h is None:
+        h = PROVIDER_HEALTH[provider] = ProviderHealth(provider)
+    return h
+
+
+def _retryable_status(code: int) -> bool:
+    return code in RETRY_STATUS or 500 <= code < 600
+
+
+def _retryable(e: BaseException) -> bool:
+    if isinstance(e, httpx.HTTPStatusError):
+        return _retryable_status(e.response.status_code)
+    if isinstance(e, ProviderStreamError):
+        return _retryable_status(e.status_code)
+    return isinstance(e, httpx.TransportError)
+
+
+def _backoff(attempt: int, e: BaseException) -> float:
+    if isinstance(e, httpx.HTTPStatusError):
+        ra = e.response.headers.get("retry-after")
+        if ra and ra.strip().isdigit():
+            return min(float(ra), RETRY_CAP_SEC)
+    return random.uniform(0, min(RETRY_CAP_SEC, RETRY_BASE_SEC * (2 ** attempt)))
+
+
+def _settle(h: ProviderHealth, e: BaseException) -> None:
+    """Non-retryable outcome: an HTTP error means the provider answered (breaker-wise healthy);
+    anything else (missing key, bad payload) says nothing about it."""
+    if isinstance(e, (httpx.HTTPStatusError, ProviderStreamError)):
+        h.success()
+    else:
+        h.probing = False
+
+
+async def _hedged(h: ProviderHealth, call: Callable[[], Awaitable[Any]]) -> Any:
+    delay = h.hedge_delay()
+    if delay is None:
+        return await call()
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            h.counters["hedges"] += 1
+            tasks.append(asyncio.ensure_future(call()))
+        err: Optional[BaseException] = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.exception() is None:
+                    if t is not tasks[0]:
+                        h.counters["hedge_wins"] += 1
+                    return t.result()
+                err = t.exception()
+        raise err  # type: ignore[misc]
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+async def _resilient(provider: str, call: Callable[[], Awaitable[Any]]) -> Any:
+    """One logical provider call: circuit check, optional hedge, bounded retries with backoff."""
+    h = _health(provider)
+    h.counters["calls"] += 1
+    for attempt in range(RETRY_MAX + 1):
+        if not h.allow():
+            h.counters["short_circuits"] += 1
+            raise ProviderUnavailable(f"CIRCUIT_OPEN: {provider}")
+        probe = h.state == "half_open"
+        t0 = time.monotonic()
+        try:
+            out = await (_hedged(h, call) if HEDGE_ENABLED else call())
+        except asyncio.CancelledError:
+            if probe:
+                h.abandon()
+            raise
+        except Exception as e:
+            if not _retryable(e):
+                _settle(h, e)
+                raise
+            h.failure()
+            if attempt >= RETRY_MAX:
+                raise
+            h.counters["retries"] += 1
+            await asyncio.sleep(_backoff(attempt, e))
+            continue
+        h.success(time.monotonic() - t0)
+        return out
+    raise RuntimeError("unreachable")
+
+
+async def _resilient_stream(provider: str, make: Callable[[], AsyncIterator[str]]) -> AsyncGenerator[str, None]:
+    """Streaming variant: retried only until the first chunk (later errors would duplicate text)."""
+    h = _health(provider)
+    h.counters["calls"] += 1
+    for attempt in range(RETRY_MAX + 1):
+        if not h.allow():
+            h.counters["short_circuits"] += 1
+            raise ProviderUnavailable(f"CIRCUIT_OPEN: {provider}")
+        probe = h.state == "half_open"
+        started = False
+        try:
+            async for chunk in make():
+                if not started:
+                    started = True
+                    h.success()
+                yield chunk
+            if not started:
+                h.success()
+            return
+        except (asyncio.CancelledError, GeneratorExit):
+            if probe and not started:
+                h.abandon()
+            raise
+        except Exception as e:
+            if started:
+                if _retryable(e):
+                    h.failure()
+                raise
+            if not _retryable(e):
+                _settle(h, e)
+                raise
+            h.failure()
+            if attempt >= RETRY_MAX:
+                raise
+            h.counters["retries"] += 1
+            await asyncio.sleep(_backoff(attempt, e))
+
+
+def _can_failover(e: BaseException) -> bool:
+    if isinstance(e, httpx.HTTPStatusError):
+        return _retryable_status(e.response.status_code) or e.response.status_code in (401, 403)
+    if isinstance(e, ProviderStreamError):
+        return _retryable_status(e.status_code)
+    return True  # circuit open, transport errors, missing key
+
+
+# ------------------------- Response / tool caches -----------------------------
+
+class TTLCache:
+    """
+    LRU bounded by serialized size, with per-entry TTL.
+    Optional disk tier: one JSON file per key under `disk_dir` (survives restarts; files beyond
+    `max_files` are pruned oldest-first), consulted on a memory miss.
+    """
+
+    def __init__(self, name: str, ttl: float, max_bytes: int, disk_dir: Optional[str] = None, max_files: int = 5000) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_files = max_files
+        self._d: "OrderedDict[str, tuple[float, int, Any]]" = OrderedDict()  # key → (expires, size, value)
+        self.bytes = 0
+        self._puts = 0
+        self.counters = {"hits": 0, "misses": 0, "disk_hits": 0, "puts": 0, "evictions": 0, "expired": 0, "bypass": 0}
+
+    def _drop(self, key: str) -> None:
+        _, size, _ = self._d.pop(key)
+        self.bytes -= size
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir or "", f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        ent = self._d.get(key)
+        if ent is not None and ent[0] < now:
+            self._drop(key)
+            self.counters["expired"] += 1
+            ent = None
+        if ent is not None:
+            self._d.move_to_end(key)
+            self.counters["hits"] += 1
+            return ent[2]
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                    rec = json.load(f)
+                if rec.get("exp", 0) >= now:
+                    self._remember(key, rec["v"], rec["exp"])
+                    self.counters["hits"] += 1
+                    self.counters["disk_hits"] += 1
+                    return rec["v"]
+                os.remove(self._disk_path(key))
+                self.counters["expired"] += 1
+            except (OSError, ValueError, KeyError):
+                pass
+        self.counters["misses"] += 1
+        return None
+
+    def _remember(self, key: str, value: Any, expires: float) -> int:
+        size = len(json.dumps(value, ensure_ascii=False, default=str))
+        if size > self.max_bytes:
+            return size
+        if key in self._d:
+            self._drop(key)
+        self._d[key] = (expires, size, value)
+        self.bytes += size
+        while self.bytes > self.max_bytes and self._d:
+            self._drop(next(iter(self._d)))
+            self.counters["evictions"] += 1
+        return size
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        self._remember(key, value, expires)
+        self.counters["puts"] += 1
+        if not self.disk_dir:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp = self._disk_path(key) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"exp": expires, "v": value}, f, ensure_ascii=False, default=str)
+            os.replace(tmp, self._disk_path(key))
+            self._puts += 1
+            if self._puts % 64 == 0:
+                self._prune_disk()
+        except OSError:
+            pass
+
+    def _prune_disk(self) -> None:
+        try:
+            files = [e for e in os.scandir(self.disk_dir) if e.name.endswith(".json")]
+        except OSError:
+            return
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=lambda e: e.stat().st_mtime)
+        for e in files[: len(files) - self.max_files]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        self._d.clear()
+        self.bytes = 0
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for e in os.scandir(self.disk_dir):
+                if e.name.endswith(".json"):
+                    try:
+                        os.remove(e.path)
+                    except OSError:
+                        pass
+
+    def stats(self) -> Dict[str, Any]:
+        looked = self.counters["hits"] + self.counters["misses"]
+        return {
+            "entries": len(self._d),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_sec": self.ttl,
+            "disk_dir": self.disk_dir,
+            "hit_rate": round(self.counters["hits"] / looked, 3) if looked else None,
+            **self.counters,
+        }
+
+
+_CACHE_DIR = os.getenv("GG_CHAT_CACHE_DIR") or None  # disk tier off unless set
+RESPONSE_CACHE_ENABLED = _env_flag("GG_CHAT_CACHE")
+RESPONSE_CACHE = TTLCache(
+    "response",
+    ttl=float(os.getenv("GG_CHAT_CACHE_TTL_SEC") or 3600),
+    max_bytes=int(float(os.getenv("GG_CHAT_CACHE_MAX_MB") or 32) * 1024 * 1024),
+    disk_dir=os.path.join(_CACHE_DIR, "responses") if _CACHE_DIR else None,
+)
+TOOL_CACHE_ENABLED = _env_flag("GG_TOOL_CACHE")
+TOOL_CACHE = TTLCache(
+    "tool",
+    ttl=float(os.getenv("GG_TOOL_CACHE_TTL_SEC") or 600),
+    max_bytes=int(float(os.getenv("GG_TOOL_CACHE_MAX_MB") or 16) * 1024 * 1024),
+    disk_dir=os.path.join(_CACHE_DIR, "tools") if _CACHE_DIR else None,
+)
+WEB_SEARCH_CACHE_TTL_SEC = float(os.getenv("GG_WEB_SEARCH_CACHE_TTL_SEC") or 300)
+
+# Per-request cache mode, set by the routes from headers: "use" | "refresh" (skip reads) | "off"
+_CACHE_MODE: ContextVar[str] = ContextVar("gg_chat_cache_mode", default="use")
+
+
+def _cache_mode_from(request: Request) -> str:
+    """X-GG-Cache: off|refresh, or Cache-Control: no-store (off) / no-cache (refresh)."""
+    x = (request.headers.get("x-gg-cache") or "").strip().lower()
+    if x in ("off", "0", "no", "bypass"):
+        return "off"
+    if x == "refresh":
+        return "refresh"
+    cc = (request.headers.get("cache-control") or "").lower()
+    if "no-store" in cc:
+        return "off"
+    if "no-cache" in cc:
+        return "refresh"
+    return "use"
+
+
+def _norm_text(text: str) -> str:
+    return "\n".join(ln.rstrip() for ln in (text or "").replace("\r\n", "\n").split("\n")).strip()
+
+
+def _response_cache_key(req: ChatRequest, kind: str) -> Optional[str]:
+    """sha256 of the normalized request; None unless temperature is exactly 0 (deterministic)."""
+    if not RESPONSE_CACHE_ENABLED or req.temperature != 0:
+        return None
+    body = {
+        "kind": kind,
+        "model": (req.model or "").strip(),
+        "messages": [{"role": m.role, "content": _norm_text(m.content)} for m in req.messages],
+        "tools": req.tools or None,
+    }
+    raw = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _tool_cache_key(tool: str, args: Optional[Dict[str, Any]]) -> Optional[tuple[str, float]]:
+    """(key, ttl) for idempotent tools: fs.read keyed by path + mtime/size, web.search by query."""
+    if not TOOL_CACHE_ENABLED or _CACHE_MODE.get() != "use":
+        if TOOL_CACHE_ENABLED:
+            TOOL_CACHE.counters["bypass"] += 1
+        return None
+    args = args or {}
+    if tool in ("fs.read", "fs_read"):
+        path = args.get("path")
+        if not isinstance(path, str) or not path:
+            return None
+        try:
+            st = os.stat(os.path.abspath(os.path.join(PROJECT_ROOT, path)))
+        except OSError:
+            return None
+        ident: Any = [os.path.abspath(os.path.join(PROJECT_ROOT, path)), st.st_mtime_ns, st.st_size]
+        ttl = TOOL_CACHE.ttl
+    elif tool in ("web.search", "web_search"):
+        ident = [(args.get("query") or "").strip()]
+        ttl = WEB_SEARCH_CACHE_TTL_SEC
+    else:
+        return None
+    raw = json.dumps([tool, ident, args], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest(), ttl
 
 
 # --------------------------- Provider chooser ---------------------------------
@@ -759,70 +1566,212 @@ def _pick_provider(model: Optional[str]) -> str:
     return "openai"
 
 
+def _provider_key(provider: str) -> Optional[str]:
+    return {"openai": OPENAI_KEY, "anthropic": ANTHROPIC_KEY, "gemini": GEMINI_KEY}.get(provider)
+
+
+def _provider_chain(req: ChatRequest) -> List[tuple[str, ChatRequest]]:
+    """Primary provider for req.model, then configured alternates that have a key."""
+    primary = _pick_provider(req.model)
+    chain = [(primary, req)]
+    for alt in FAILOVER:
+        if alt != primary and alt in FAILOVER_MODELS and _provider_key(alt):
+            chain.append((alt, req.model_copy(update={"model": FAILOVER_MODELS[alt]})))
+    return chain
+
+
+def _require_key(provider: str) -> None:
+    if not _provider_key(provider):
+        name = {"openai": "OPENAI_API_KEY", "anthropic": "ANTHROPIC_API_KEY", "gemini": "GEMINI_API_KEY"}[provider]
+        raise RuntimeError(f"{name} missing")
+
+
 async def route_to_provider(req: ChatRequest) -> str:
-    provider = _pick_provider(req.model)
-    if provider == "openai":
-        if not OPENAI_KEY:
-            raise RuntimeError("OPENAI_API_KEY missing")
-        return await call_openai(req)
-    if provider == "anthropic":
-        if not ANTHROPIC_KEY:
-            raise RuntimeError("ANTHROPIC_API_KEY missing")
-        return await call_anthropic(req)
-    if provider == "gemini":
-        if not GEMINI_KEY:
-            raise RuntimeError("GEMINI_API_KEY missing")
-        return await call_gemini(req)
-    # Fallback to OpenAI if available
-    if OPENAI_KEY:
-        return await call_openai(req)
+    calls = {"openai": call_openai, "anthropic": call_anthropic, "gemini": call_gemini}
+    chain = _provider_chain(req)
+    for i, (provider, r) in enumerate(chain):
+        if i:
+            _health(provider).counters["failovers"] += 1
+        try:
+            _require_key(provider)
+            return await _resilient(provider, lambda: calls[provider](r))
+        except Exception as e:
+            if i == len(chain) - 1 or not _can_failover(e):
+                raise
     raise RuntimeError("No provider key available")
 
 
-async def route_to_provider_stream(req: ChatRequest) -> AsyncGenerator[str, None]:
-    provider = _pick_provider(req.model)
-    if provider == "openai":
-        if not OPENAI_KEY:
-            raise RuntimeError("OPENAI_API_KEY missing")
-        async for chunk in call_openai_stream(req):
+async def _anthropic_stream_or_once(req: ChatRequest) -> AsyncGenerator[str, None]:
+    # Attempt SSE; if it fails before any text, fall back to one-shot
+    started = False
+    try:
+        async for chunk in call_anthropic_stream(req):
+            started = True
             yield chunk
-        return
-    if provider == "anthropic":
-        if not ANTHROPIC_KEY:
-            raise RuntimeError("ANTHROPIC_API_KEY missing")
-        # Attempt SSE; if anything fails, fallback to one-shot
+    except Exception:
+        if started:
+            raise
+        text = await call_anthropic(req)
+        if text:
+            yield text
+
+
+async def route_to_provider_stream(req: ChatRequest) -> AsyncGenerator[str, None]:
+    streams = {"openai": call_openai_stream, "anthropic": _anthropic_stream_or_once, "gemini": call_gemini_stream}
+    chain = _provider_chain(req)
+    for i, (provider, r) in enumerate(chain):
+        if i:
+            _health(provider).counters["failovers"] += 1
+        started = False
         try:
-            async for chunk in call_anthropic_stream(req):
+            _require_key(provider)
+            async for chunk in _resilient_stream(provider, lambda: streams[provider](r)):
+                started = True
                 yield chunk
             return
-        except Exception:
-            text = await call_anthropic(req)
-            if text:
-                yield text
-            return
-    if provider == "gemini":
-        if not GEMINI_KEY:
-            raise RuntimeError("GEMINI_API_KEY missing")
-        async for chunk in call_gemini_stream(req):
-            yield chunk
-        return
-    # Fallback to OpenAI or error
-    if OPENAI_KEY:
-        async for chunk in call_openai_stream(req):
-            yield chunk
-        return
+        except Exception as e:
+            if started or i == len(chain) - 1 or not _can_failover(e):
+                raise
     raise RuntimeError("No provider key available")
 
 
+# ------------------------------ SSE relay -------------------------------------
+
+SSE_QUEUE_MAX = int(os.getenv("GG_SSE_QUEUE_MAX") or 64)  # provider chunks buffered per stream
+SSE_FRAME_BYTES = int(os.getenv("GG_SSE_FRAME_BYTES") or 256)  # flush a frame at this much text…
+SSE_FRAME_MS = float(os.getenv("GG_SSE_FRAME_MS") or 25)  # …or this long after its first delta
+SSE_HEARTBEAT_SEC = float(os.getenv("GG_SSE_HEARTBEAT_SEC") or 15)
+SSE_STATS: Dict[str, int] = {
+    "streams": 0, "active": 0, "chunks": 0, "frames": 0, "heartbeats": 0,
+    "disconnects": 0, "upstream_cancelled": 0, "max_queue": 0,
+}
+_SSE_END = object()
+
+
+def _sse_frame(text: str) -> bytes:
+    text = text.replace("\r", "")
+    return ("".join(f"data: {ln}\n" for ln in text.split("\n")) + "\n").encode("utf-8")
+
+
+def _stream_error_text(e: BaseException) -> str:
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"⚠️ Upstream error: {e.response.status_code} {e}"
+    return f"⚠️ Error: {str(e)}"
+
+
+async def _sse_relay(source: AsyncIterator[str]) -> AsyncGenerator[bytes, None]:
+    """
+    Relay provider text chunks to the client as SSE frames through a bounded queue.
+    - A pump task reads `source` into a queue of SSE_QUEUE_MAX chunks; when the client reads
+      slowly the queue fills, the pump blocks and the upstream read (TCP) pauses with it, so
+      memory per stream stays bounded.
+    - Deltas are coalesced into one frame until SSE_FRAME_BYTES of text or SSE_FRAME_MS after
+      the first pending delta, whichever comes first.
+    - ": ping" comments after SSE_HEARTBEAT_SEC without output.
+    - Closing this generator (client gone) cancels the pump, which closes the upstream stream.
+    - An upstream error is flushed after the pending text as a "⚠️ …" frame.
+    """
+    q: asyncio.Queue = asyncio.Queue(maxsize=max(1, SSE_QUEUE_MAX))
+
+    async def pump() -> None:
+        try:
+            async for chunk in source:
+                if chunk:
+                    SSE_STATS["chunks"] += 1
+                    await q.put(chunk)
+                    SSE_STATS["max_queue"] = max(SSE_STATS["max_queue"], q.qsize())
+            await q.put(_SSE_END)
+        except Exception as e:
+            await q.put(e)
+        finally:
+            # cancelled while blocked on a full queue: `async for` does not close the source,
+            # so close it here to release the provider connection now rather than at GC
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    SSE_STATS["streams"] += 1
+    SSE_STATS["active"] += 1
+    task = asyncio.ensure_future(pump())
+    pending: List[str] = []
+    size = 0
+    first_at = 0.0
+    last_out = time.monotonic()
+    finished = False
+    try:
+        while True:
+            now = time.monotonic()
+            try:
+                item = q.get_nowait()
+            except asyncio.QueueEmpty:
+                wait = (first_at + SSE_FRAME_MS / 1000 - now) if pending else (last_out + SSE_HEARTBEAT_SEC - now)
+                try:
+                    if wait <= 0:
+                        raise asyncio.TimeoutError
+                    item = await asyncio.wait_for(q.get(), timeout=wait)
+                except asyncio.TimeoutError:
+                    if pending:
+                        frame, pending, size = "".join(pending), [], 0
+                        SSE_STATS["frames"] += 1
+                        yield _sse_frame(frame)
+                    else:
+                        SSE_STATS["heartbeats"] += 1
+                        yield b": ping\n\n"
+                    last_out = time.monotonic()
+                    continue
+            if item is _SSE_END or isinstance(item, BaseException):
+                if pending:
+                    SSE_STATS["frames"] += 1
+                    yield _sse_frame("".join(pending))
+                if isinstance(item, BaseException):
+                    SSE_STATS["frames"] += 1
+                    yield _sse_frame(_stream_error_text(item))
+                finished = True
+                return
+            if not pending:
+                first_at = now
+            pending.append(item)
+            size += len(item)
+            if size >= SSE_FRAME_BYTES:
+                frame, pending, size = "".join(pending), [], 0
+                SSE_STATS["frames"] += 1
+                yield _sse_frame(frame)
+                last_out = time.monotonic()
+    finally:
+        SSE_STATS["active"] -= 1
+        if not finished:
+            SSE_STATS["disconnects"] += 1
+        if not task.done():
+            task.cancel()
+            SSE_STATS["upstream_cancelled"] += 1
+        # wait() rather than gather(): if this wait is itself cancelled (pre-2.4 servers cancel the
+        # whole response scope), gather would cancel the pump again mid-way through closing upstream
+        await asyncio.wait({task})
+
+
+class _RelayResponse(StreamingResponse):
+    """StreamingResponse that always closes its body iterator, also when the send fails
+    (ASGI 2.4 servers report a gone client as OSError from send, leaving the generator open)."""
+
+    async def stream_response(self, send: Any) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
 # ------------------------------------------------------------------------------
 # Routes
 # ------------------------------------------------------------------------------
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(req: ChatRequest) -> ChatResponse:
+async def chat(req: ChatRequest, request: Request, response: Response) -> ChatResponse:
     """
     Single-response chat endpoint.
-    Returns: { ok, data: { message: {role, content}, elapsed_ms }, error }
+    Returns: { ok, data: { message: {role, content}, elapsed_ms, cached? }, error }
+    temperature=0 requests are served from the response cache (X-Cache: HIT|MISS|BYPASS).
     """
     # MCP/Tools: log shape only for now
     if req.tools:
@@ -835,8 +1784,28 @@ async def chat(req: ChatRequest) -> ChatResponse:
             pass
 
     started = time.time()
+    mode = _cache_mode_from(request)
+    _CACHE_MODE.set(mode)
+    key = _response_cache_key(req, "chat")
     try:
+        if key and mode == "use":
+            hit = RESPONSE_CACHE.get(key)
+            if hit is not None:
+                response.headers["X-Cache"] = "HIT"
+                return ChatResponse(
+                    ok=True,
+                    data={
+                        "message": {"role": "assistant", "content": hit},
+                        "elapsed_ms": int((time.time() - started) * 1000),
+                        "cached": True,
+                    },
+                )
+        elif key:
+            RESPONSE_CACHE.counters["bypass"] += 1
         reply = await route_to_provider(req)
+        if key and mode != "off" and reply:
+            RESPONSE_CACHE.put(key, reply)
+        response.headers["X-Cache"] = "MISS" if key and mode == "use" else "BYPASS"
         elapsed = int((time.time() - started) * 1000)
         return ChatResponse(
             ok=True,
@@ -852,31 +1821,99 @@ async def chat(req: ChatRequest) -> ChatResponse:
         return ChatResponse(ok=False, error=str(e))
 
 
+@router.get("/chat/pool")
+async def chat_pool() -> Dict[str, Any]:
+    """Provider connection pool metrics: per provider requests/responses/errors, clients created,
+    open/idle/HTTP/2 connections, plus the configured limits."""
+    return {"ok": True, "data": PROVIDER_CLIENTS.stats()}
+
+
+@router.get("/chat/providers")
+async def chat_providers() -> Dict[str, Any]:
+    """Resilience state per provider: breaker state, latency p50/p95, attempts/retries/failures,
+    short circuits, hedges (and wins), failovers; plus the active retry/hedge/breaker settings."""
+    return {
+        "ok": True,
+        "data": {
+            "retry": {"max": RETRY_MAX, "base_sec": RETRY_BASE_SEC, "cap_sec": RETRY_CAP_SEC},
+            "hedge": {"enabled": HEDGE_ENABLED, "min_ms": HEDGE_MIN_MS},
+            "breaker": {"failures": CB_FAILURES, "open_sec": CB_OPEN_SEC, "probe_sec": CB_PROBE_SEC},
+            "failover": FAILOVER,
+            "providers": {p: h.stats() for p, h in PROVIDER_HEALTH.items()},
+        },
+    }
+
+
+@router.get("/chat/cache")
+async def chat_cache() -> Dict[str, Any]:
+    """Response / tool-result cache metrics (entries, bytes, hit rate, evictions, bypasses)."""
+    return {
+        "ok": True,
+        "data": {
+            "response": {"enabled": RESPONSE_CACHE_ENABLED, **RESPONSE_CACHE.stats()},
+            "tool": {"enabled": TOOL_CACHE_ENABLED, **TOOL_CACHE.stats()},
+        },
+    }
+
+
+@router.post("/chat/cache/clear")
+async def chat_cache_clear() -> Dict[str, Any]:
+    RESPONSE_CACHE.clear()
+    TOOL_CACHE.clear()
+    return {"ok": True}
+
+
 @router.post("/chat/stream")
-async def chat_stream(req: ChatRequest):
+async def chat_stream(req: ChatRequest, request: Request):
     """
     Streaming chat endpoint (SSE).
-    - Emits "data: <text_chunk>\\n\\n" for each chunk.
+    - Emits "data: <text>\\n\\n" frames (multi-line text → one "data:" line per line, per the
+      SSE spec); tiny provider deltas are coalesced (see _sse_relay), ": ping" comments keep an
+      idle connection alive.
     - Finalizes with an empty flush (connection close).
+    - temperature=0: a cached reply is replayed as one chunk; a completed stream is cached.
+    - A client that disconnects cancels the upstream provider request.
 
     For clients without SSE handling, consider using the non-streaming /api/chat.
     """
-    async def event_gen() -> AsyncGenerator[bytes, None]:
-        # Preamble (optional)
-        # yield b": ready\n\n"
-        try:
-            async for chunk in route_to_provider_stream(req):
-                if not chunk:
-                    continue
-                # Basic SSE message: data: <chunk>\n\n
-                data = chunk.replace("\r", "")
-                yield f"data: {data}\n\n".encode("utf-8")
-        except httpx.HTTPStatusError as e:
-            # Emit an SSE error line then end
-            yield f"data: ⚠️ Upstream error: {e.response.status_code} {e}\n\n".encode(
-                "utf-8"
-            )
-        except Exception as e:
-            yield f"data: ⚠️ Error: {str(e)}\n\n".encode("utf-8")
+    mode = _cache_mode_from(request)
+    key = _response_cache_key(req, "chat")
+    hit = RESPONSE_CACHE.get(key) if key and mode == "use" else None
+    if key and mode != "use":
+        RESPONSE_CACHE.counters["bypass"] += 1
+
+    async def upstream() -> AsyncGenerator[str, None]:
+        if hit is not None:
+            yield hit
+            return
+        _CACHE_MODE.set(mode)
+        parts: List[str] = []
+        async for chunk in route_to_provider_stream(req):
+            if chunk:
+                parts.append(chunk)
+                yield chunk
+        if key and mode != "off" and parts:
+            RESPONSE_CACHE.put(key, "".join(parts))
+
+    x_cache = "HIT" if hit is not None else ("MISS" if key and mode == "use" else "BYPASS")
+    return _RelayResponse(
+        _sse_relay(upstream()),
+        media_type="text/event-stream",
+        headers={"X-Cache": x_cache, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    return StreamingResponse(event_gen(), media_type="text/event-stream")
+
+@router.get("/chat/stream/stats")
+async def chat_stream_stats() -> Dict[str, Any]:
+    """SSE relay counters: streams (active), chunks in / frames out, heartbeats, client disconnects,
+    upstream requests cancelled by a disconnect, deepest per-stream queue seen; plus the limits."""
+    return {
+        "ok": True,
+        "data": {
+            "queue_max": SSE_QUEUE_MAX,
+            "frame_bytes": SSE_FRAME_BYTES,
+            "frame_ms": SSE_FRAME_MS,
+            "heartbeat_sec": SSE_HEARTBEAT_SEC,
+            **SSE_STATS,
+        },
+    }
@@ -97,7 +97,10 @@ def apply_ingest(db_path: str, items: List[Tuple[str, List[dict]]]) -> None:
                 else:
                     ts_ms = ts_now
                 con.execute(
-                    "INSERT OR REPLACE INTO messages(id, thread_id, role, content, meta_json, created_at) VALUES(?,?,?,?,?,?)",
+                    # upsert: INSERT OR REPLACE would skip the messages_fts delete trigger
+                    "INSERT INTO messages(id, thread_id, role, content, meta_json, created_at) VALUES(?,?,?,?,?,?)"
+                    " ON CONFLICT(id) DO UPDATE SET thread_id=excluded.thread_id, role=excluded.role,"
+                    " content=excluded.content, meta_json=excluded.meta_json, created_at=excluded.created_at",
                     (msg_id, conv_id, role, content, meta, ts_ms),
                 )
         con.commit()
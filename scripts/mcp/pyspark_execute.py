@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
-"""MCP wrapper to run a PySpark script and capture output.
+"""MCP wrapper to run a PySpark script with the bundled JDK.
+
+Output is streamed through (not captured), so callers that redirect stdout/stderr to files
+(app/job_queue.py) can follow a long job while it runs. Extra args go to the job script.
 
 Usage:
-  python scripts/mcp/pyspark_execute.py path/to/job.py
+  python scripts/mcp/pyspark_execute.py path/to/job.py [job args...]
 """
 from __future__ import annotations
 import os
@@ -16,7 +19,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 def main(argv: list[str]) -> int:
     if not argv:
-        print("Usage: pyspark_execute.py <script.py>", file=sys.stderr)
+        print("Usage: pyspark_execute.py <script.py> [args...]", file=sys.stderr)
         return 2
     job = Path(argv[0])
     if not job.exists():
@@ -27,17 +30,11 @@ def main(argv: list[str]) -> int:
     env.setdefault('JAVA_HOME', str(PROJECT_ROOT / 'tools' / 'java' / 'jdk-17.0.11+9'))
     env.setdefault('PYSPARK_PYTHON', sys.executable)
     env['PATH'] = f"{env['JAVA_HOME']}/bin:" + env.get('PATH', '')
+    env.setdefault('PYTHONUNBUFFERED', '1')  # line-by-line logs while the job runs
 
-    cmd = [sys.executable, str(job)]
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
-        sys.stdout.write(result.stdout)
-        sys.stderr.write(result.stderr)
-        return 0
-    except subprocess.CalledProcessError as exc:
-        sys.stdout.write(exc.stdout or '')
-        sys.stderr.write(exc.stderr or '')
-        return exc.returncode
+    cmd = [sys.executable, str(job), *argv[1:]]
+    sys.stdout.flush()
+    return subprocess.call(cmd, env=env)
 
 
 if __name__ == '__main__':
@@ -60,6 +60,15 @@ except Exception:  # pragma: no cover
 SCRIPT_PATH = Path(__file__).resolve()
 PROJECT_ROOT = SCRIPT_PATH.parent.parent  # gumgang_meeting/
 STATUS_ROOT = PROJECT_ROOT / "status"
+GRAPH_RUNS_ROOT = STATUS_ROOT / "evidence" / "sitemap" / "graph_runs"
+
+# Latest pointer (served by /api/sitegraph/latest); soft dependency on app/
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+try:
+    from app.latest_index import update_latest  # type: ignore
+except Exception:  # pragma: no cover
+    update_latest = None  # type: ignore
 SCHEMA_PATH = STATUS_ROOT / "design" / "schemas" / "sitegraph.schema.json"
 
 DENY_GLOBS = [
@@ -532,7 +541,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         return 2
 
     # Output path
-    out_dir = Path(args.out_dir) if args.out_dir else (PROJECT_ROOT / "status" / "evidence" / "sitemap" / "graph_runs" / args.date)
+    out_dir = Path(args.out_dir) if args.out_dir else (GRAPH_RUNS_ROOT / args.date)
     out_dir.mkdir(parents=True, exist_ok=True)
     out_file = out_dir / "sitegraph.json"
     if out_file.exists() and not args.overwrite and not args.dry_run:
@@ -590,6 +599,11 @@ def main(argv: Optional[List[str]] = None) -> int:
     out_bytes = json.dumps(snapshot, ensure_ascii=False, indent=2).encode("utf-8")
     out_file.write_bytes(out_bytes)
     print(f"[OK] Wrote snapshot: {repo_rel(out_file)} ({len(out_bytes)} bytes)", file=sys.stderr)
+    if update_latest is not None and out_dir.resolve().parent == GRAPH_RUNS_ROOT.resolve():
+        try:
+            update_latest(GRAPH_RUNS_ROOT, out_file, key=out_dir.name, meta={"snapshot_id": snapshot_id})
+        except Exception as e:
+            print(f"[WARN] Latest pointer update failed: {e}", file=sys.stderr)
     print(f"[OK] Nodes={len(snapshot['nodes'])}, Edges={len(snapshot['edges'])}", file=sys.stderr)
     return 0
 
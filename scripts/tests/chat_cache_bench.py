@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Chat gateway — response / tool-result cache harness (ST-1206)
+
+The gateway router is mounted on a bare FastAPI app (ASGI in-process) and pointed at the local
+mock provider (scripts/tests/mock_llm_server.py), answering after --upstream-ms with a numbered
+answer per upstream hit:
+1) /api/chat, temperature=0, --repeat identical prompts (whitespace/CRLF variations included)
+   → one upstream hit, HIT latency vs MISS latency
+2) temperature=0.7 → never cached
+3) opt-out: "X-GG-Cache: off" and "Cache-Control: no-cache" reach upstream; no-cache refreshes
+4) /api/chat/stream: MISS streams from upstream, the repeat is replayed from cache (same text)
+5) /api/chat/toolcall: fs.read on an unchanged file is served from the tool cache on the next
+   turn; touching the file (new mtime) misses
+   web.search: an upstream failure (the "Search fallback used" answer) is not cached, the next
+   identical query runs again and its real result is
+6) disk tier: a fresh TTLCache on the same directory serves the entry; LRU stays within max_bytes
+7) GET /api/chat/cache hit rates
+
+Usage:
+  python scripts/tests/chat_cache_bench.py [--repeat 50] [--upstream-ms 80]
+
+Exit code 0 = every check above held.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from gumgang_0_5.backend.app.api.routes import chat_gateway as gw  # noqa: E402
+from mock_llm_server import MockLLMServer  # noqa: E402
+
+
+def _pct(vals, p):
+    s = sorted(vals)
+    return round(s[min(len(s) - 1, int(len(s) * p))] * 1000, 2) if s else None
+
+
+def _body(content: str, temperature: float = 0) -> dict:
+    return {"model": "gpt-4o-mini", "temperature": temperature,
+            "messages": [{"role": "system", "content": "You are terse."}, {"role": "user", "content": content}]}
+
+
+async def main_async(args, tmp: Path) -> dict:
+    mock = await MockLLMServer(ttft=str(args.upstream_ms), token_ms="0").start()
+    mock.reply = lambda req: "streamed answer" if req.get("stream") else f"answer #{mock.stats['requests']}"
+    gw.OPENAI_BASE = mock.base_urls()["OPENAI_BASE_URL"]
+    app = FastAPI()
+    app.include_router(gw.router)
+    res: dict = {"upstream_ms": args.upstream_ms}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gw") as c:
+            # 1) exact/normalized hits
+            variants = ["What is WAL?", "What is WAL?  ", "What is WAL?\r\n", "  What is WAL?"]
+            h0, lat, tags = mock.stats["requests"], [], []
+            for i in range(args.repeat):
+                t0 = time.perf_counter()
+                r = await c.post("/api/chat", json=_body(variants[i % len(variants)]))
+                lat.append(time.perf_counter() - t0)
+                tags.append(r.headers.get("x-cache"))
+            res["repeat"] = {"requests": args.repeat, "upstream_hits": mock.stats["requests"] - h0,
+                             "miss_ms": round(lat[0] * 1000, 2), "hit_p50_ms": _pct(lat[1:], 0.5),
+                             "x_cache": {t: tags.count(t) for t in set(tags)}}
+
+            # 2) non-zero temperature
+            h0 = mock.stats["requests"]
+            for _ in range(5):
+                await c.post("/api/chat", json=_body("What is WAL?", 0.7))
+            res["temperature_0_7_upstream_hits"] = mock.stats["requests"] - h0
+
+            # 3) opt-out headers
+            h0 = mock.stats["requests"]
+            r_off = await c.post("/api/chat", json=_body("What is WAL?"), headers={"X-GG-Cache": "off"})
+            r_nc = await c.post("/api/chat", json=_body("What is WAL?"), headers={"Cache-Control": "no-cache"})
+            r_after = await c.post("/api/chat", json=_body("What is WAL?"))
+            res["opt_out"] = {"upstream_hits": mock.stats["requests"] - h0, "off": r_off.headers.get("x-cache"),
+                              "no_cache": r_nc.headers.get("x-cache"),
+                              "refreshed": r_after.json()["data"]["message"]["content"]
+                              == r_nc.json()["data"]["message"]["content"]}
+
+            # 4) stream
+            h0 = mock.stats["requests"]
+            s1 = await c.post("/api/chat/stream", json=_body("stream me"))
+            s2 = await c.post("/api/chat/stream", json=_body("stream me"))
+            text = lambda r: "".join(ln[6:] for ln in r.text.split("\n") if ln.startswith("data: "))  # noqa: E731
+            res["stream"] = {"first": s1.headers.get("x-cache"), "second": s2.headers.get("x-cache"),
+                             "same_text": text(s1) == text(s2) == "streamed answer", "upstream_hits": mock.stats["requests"] - h0}
+
+            # 5) tool cache
+            f = PROJECT_ROOT / "status" / "evidence" / "_bench_tool_cache.txt"
+            f.parent.mkdir(parents=True, exist_ok=True)
+            f.write_text("v1", encoding="utf-8")
+            gw.PROJECT_ROOT = str(PROJECT_ROOT)
+            mock.tool_plan = [("fs_read", {"path": str(f.relative_to(PROJECT_ROOT))})]
+            tb = {**_body("read it", 0.7)}
+            cached = []
+            try:
+                for step in range(3):
+                    if step == 2:
+                        time.sleep(0.01)
+                        f.write_text("v2 changed", encoding="utf-8")
+                    r = await c.post("/api/chat/toolcall", json=tb)
+                    cached.append(bool(r.json()["data"]["trace"]["steps"][0]["tools"][0].get("cached")))
+            finally:
+                f.unlink()
+            res["tool_cache"] = {"cached_per_turn": cached}
+
+            # 5b) web.search fallback (simulated DuckDuckGo failure on the first call only)
+            real, calls = gw._tool_run, []
+
+            async def flaky(tool, args):
+                calls.append(tool)
+                if len(calls) == 1:
+                    return {"query": args["query"], "results": [], "note": "Search fallback used: ConnectError"}
+                return {"query": args["query"], "results": [{"title": "Abstract", "snippet": "ok"}]}
+
+            gw._tool_run = flaky
+            try:
+                step = [{"id": "c1", "tool": "web.search", "args": {"query": "gumgang bench"}}]
+                got = [(await gw._run_tool_calls(step, time.monotonic() + 5))[0] for _ in range(3)]
+            finally:
+                gw._tool_run = real
+            res["tool_cache"]["web_search_fallback"] = {
+                "upstream_calls": len(calls), "cached": [bool(g.get("cached")) for g in got],
+                "last_has_results": bool(got[-1]["data"]["results"]),
+            }
+
+            res["metrics"] = (await c.get("/api/chat/cache")).json()["data"]
+
+        # 6) disk tier + LRU bound
+        d = tmp / "cache"
+        a = gw.TTLCache("t", ttl=60, max_bytes=2000, disk_dir=str(d))
+        for i in range(50):
+            a.put(f"k{i}", "x" * 100)
+        b = gw.TTLCache("t", ttl=60, max_bytes=2000, disk_dir=str(d))
+        res["disk_lru"] = {"bytes": a.bytes, "max_bytes": a.max_bytes, "evictions": a.counters["evictions"],
+                           "disk_roundtrip": b.get("k0") == "x" * 100 and b.counters["disk_hits"] == 1}
+    finally:
+        await gw.PROVIDER_CLIENTS.aclose()
+        await mock.stop()
+    return res
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--upstream-ms", type=float, default=80.0)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as td:
+        res = asyncio.run(main_async(args, Path(td)))
+    r = res["repeat"]
+    ok = (r["upstream_hits"] == 1 and r["hit_p50_ms"] < r["miss_ms"] / 4
+          and res["temperature_0_7_upstream_hits"] == 5
+          and res["opt_out"] == {"upstream_hits": 2, "off": "BYPASS", "no_cache": "BYPASS", "refreshed": True}
+          and res["stream"] == {"first": "MISS", "second": "HIT", "same_text": True, "upstream_hits": 1}
+          and res["tool_cache"]["cached_per_turn"] == [False, True, False]
+          and res["tool_cache"]["web_search_fallback"] == {"upstream_calls": 2, "cached": [False, False, True],
+                                                           "last_has_results": True}
+          and res["disk_lru"]["bytes"] <= res["disk_lru"]["max_bytes"] and res["disk_lru"]["evictions"] > 0
+          and res["disk_lru"]["disk_roundtrip"])
+    res["ok"] = ok
+    print(json.dumps(res, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Chat gateway — load driver: RPS, TTFT, inter-token latency, p50/p95/p99 (ST-1206)
+
+Drives /api/chat, /api/chat/stream and /api/chat/toolcall per provider (OpenAI / Anthropic /
+Gemini model names) with a closed loop of --concurrency clients against the local mock provider
+(scripts/tests/mock_llm_server.py), and prints one JSON document meant to be kept and diffed
+across commits (--out, --baseline).
+
+Targets:
+- default: the gateway router in-process on a bare FastAPI app, called over raw ASGI (body
+  messages are timestamped as the relay sends them), provider base URLs pointed at a mock
+  started in the same loop (or at --mock-url)
+- --gateway-url http://127.0.0.1:8000: a running backend over HTTP (start it with the env the
+  mock server prints; the driver then only talks to the gateway)
+
+Per scenario ("<endpoint>/<provider>"): requests, errors, rps, latency_ms, ttft_ms (first body
+byte; for the non-streaming endpoints this is the whole answer) and, for the stream, itl_ms —
+gaps between SSE data frames as the client sees them (deltas within GG_SSE_FRAME_MS /
+GG_SSE_FRAME_BYTES arrive as one frame) — each as p50/p95/p99/max/mean.
+Prompts are unique per request and sent with temperature 0.7, so the response cache stays out
+of the numbers. In-process, client, gateway and mock share one event loop and one core: compare
+runs of the same mode on the same machine.
+
+Usage:
+  python scripts/tests/chat_load_driver.py [--endpoints chat,stream,toolcall] [--providers openai,anthropic,gemini]
+                                           [--concurrency 16] [--requests 200] [--warmup 10]
+                                           [--ttft 40] [--token-ms 8] [--tokens 48] [--error-rate 0]
+                                           [--mock-url URL] [--gateway-url URL]
+                                           [--out results.json] [--baseline previous.json]
+
+Exit code 0 = every scenario ran and its error rate stayed within --max-error-rate.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+for _k in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GEMINI_API_KEY"):
+    os.environ.setdefault(_k, "bench")
+
+import httpx  # noqa: E402
+
+from mock_llm_server import MockLLMServer, mock_kwargs, add_args  # noqa: E402
+
+ENDPOINTS = {"chat": "/api/chat", "stream": "/api/chat/stream", "toolcall": "/api/chat/toolcall"}
+MODELS = {"openai": "gpt-4o-mini", "anthropic": "claude-3-5-sonnet-20241022", "gemini": "gemini-1.5-flash"}
+COMPARE = (("rps",), ("latency_ms", "p50"), ("latency_ms", "p95"), ("latency_ms", "p99"),
+           ("ttft_ms", "p50"), ("ttft_ms", "p95"), ("itl_ms", "p50"), ("itl_ms", "p95"))
+
+
+def _dist(vals: List[float]) -> Optional[Dict[str, float]]:
+    if not vals:
+        return None
+    s = sorted(vals)
+
+    def pct(p: float) -> float:
+        return round(s[min(len(s) - 1, int(len(s) * p))] * 1000, 2)
+
+    return {"p50": pct(0.5), "p95": pct(0.95), "p99": pct(0.99), "max": round(s[-1] * 1000, 2),
+            "mean": round(sum(s) / len(s) * 1000, 2)}
+
+
+def _git_rev() -> Dict[str, Any]:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True,
+                             text=True, timeout=10).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no", "--", "gumgang_0_5"],
+                                    cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=30).stdout.strip())
+        return {"commit": rev or None, "dirty": dirty}
+    except Exception:
+        return {"commit": None, "dirty": None}
+
+
+def _body(provider: str, i: int, temperature: float) -> bytes:
+    return json.dumps({"model": MODELS[provider], "temperature": temperature, "messages": [
+        {"role": "system", "content": "You are terse."},
+        {"role": "user", "content": f"Load request #{i}: summarize the gateway in one paragraph."},
+    ]}).encode()
+
+
+def _judge(endpoint: str, status: int, body: bytes) -> bool:
+    if status != 200:
+        return False
+    if endpoint == "stream":
+        return b"data: \xe2\x9a\xa0\xef\xb8\x8f" not in body  # the relay's "⚠️ …" error frame
+    try:
+        return bool(json.loads(body).get("ok"))
+    except ValueError:
+        return False
+
+
+class Sample:
+    __slots__ = ("t0", "first", "end", "frames", "ok")
+
+    def __init__(self) -> None:
+        self.t0 = time.perf_counter()
+        self.first: Optional[float] = None
+        self.end = 0.0
+        self.frames: List[float] = []
+        self.ok = False
+
+
+class _FrameClock:
+    """Timestamps SSE data frames as body bytes arrive (events end at a blank line)."""
+
+    def __init__(self, s: Sample) -> None:
+        self.s, self.buf = s, b""
+
+    def feed(self, data: bytes) -> None:
+        now = time.perf_counter()
+        if self.s.first is None:
+            self.s.first = now
+        self.buf += data
+        while b"\n\n" in self.buf:
+            ev, self.buf = self.buf.split(b"\n\n", 1)
+            if ev.startswith(b"data:") or b"\ndata:" in ev:
+                self.s.frames.append(now)
+
+
+async def _asgi_call(app, endpoint: str, raw: bytes) -> Sample:
+    path = ENDPOINTS[endpoint]
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "client": ("127.0.0.1", 50000), "server": ("gw", 80),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(raw)).encode())],
+    }
+    s, sent, status, body = Sample(), False, 0, []
+    clock = _FrameClock(s)
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": raw, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(msg):
+        nonlocal status
+        if msg["type"] == "http.response.start":
+            status = msg["status"]
+        elif msg["type"] == "http.response.body" and msg.get("body"):
+            body.append(msg["body"])
+            clock.feed(msg["body"])
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        status = status or 599
+    s.end = time.perf_counter()
+    s.ok = _judge(endpoint, status, b"".join(body))
+    return s
+
+
+async def _http_call(client: httpx.AsyncClient, endpoint: str, raw: bytes) -> Sample:
+    s = Sample()
+    clock, body, status = _FrameClock(s), [], 0
+    try:
+        async with client.stream("POST", ENDPOINTS[endpoint], content=raw,
+                                 headers={"Content-Type": "application/json"}) as r:
+            status = r.status_code
+            async for data in r.aiter_raw():
+                body.append(data)
+                clock.feed(data)
+    except httpx.HTTPError:
+        status = status or 599
+    s.end = time.perf_counter()
+    s.ok = _judge(endpoint, status, b"".join(body))
+    return s
+
+
+async def _scenario(call, endpoint: str, provider: str, args, seq: List[int]) -> Dict[str, Any]:
+    async def run(n: int) -> List[Sample]:
+        out: List[Sample] = []
+        todo = iter(range(n))
+
+        async def worker() -> None:
+            for _ in todo:
+                seq[0] += 1
+                out.append(await call(endpoint, _body(provider, seq[0], args.temperature)))
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        return out
+
+    await run(args.warmup)
+    t0 = time.perf_counter()
+    samples = await run(args.requests)
+    wall = time.perf_counter() - t0
+    good = [s for s in samples if s.ok]
+    itl = [b - a for s in good for a, b in zip(s.frames, s.frames[1:])]
+    return {
+        "requests": len(samples),
+        "errors": len(samples) - len(good),
+        "error_rate": round((len(samples) - len(good)) / max(1, len(samples)), 4),
+        "wall_s": round(wall, 3),
+        "rps": round(len(good) / wall, 2) if wall else None,
+        "latency_ms": _dist([s.end - s.t0 for s in good]),
+        "ttft_ms": _dist([s.first - s.t0 for s in good if s.first is not None]),
+        "itl_ms": _dist(itl) if endpoint == "stream" else None,
+        "frames_per_request": round(sum(len(s.frames) for s in good) / len(good), 1) if endpoint == "stream" and good else None,
+    }
+
+
+def _compare(cur: Dict[str, Any], base: Dict[str, Any]) -> Dict[str, Any]:
+    """Relative change (%) of the headline metrics for scenarios present in both runs."""
+    diff: Dict[str, Any] = {}
+    for name, r in cur.items():
+        b = base.get(name)
+        if not b:
+            continue
+        row = {}
+        for path in COMPARE:
+            x, y = r, b
+            for k in path:
+                x = (x or {}).get(k) if isinstance(x, dict) else None
+                y = (y or {}).get(k) if isinstance(y, dict) else None
+            if isinstance(x, (int, float)) and isinstance(y, (int, float)) and y:
+                row[".".join(path)] = {"base": y, "now": x, "change_pct": round((x - y) / y * 100, 1)}
+        diff[name] = row
+    return diff
+
+
+async def main_async(args) -> Dict[str, Any]:
+    endpoints = [e for e in args.endpoints.split(",") if e]
+    providers = [p for p in args.providers.split(",") if p]
+    mock: Optional[MockLLMServer] = None
+    gw = client = None
+    res: Dict[str, Any] = {
+        "meta": {
+            **_git_rev(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.gateway_url or "in-process",
+            "config": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+        },
+    }
+    try:
+        if args.gateway_url:
+            client = httpx.AsyncClient(base_url=args.gateway_url, timeout=120.0,
+                                       limits=httpx.Limits(max_connections=args.concurrency))
+
+            async def call(endpoint: str, raw: bytes) -> Sample:
+                return await _http_call(client, endpoint, raw)
+        else:
+            from fastapi import FastAPI
+
+            from gumgang_0_5.backend.app.api.routes import chat_gateway as gw
+
+            if args.mock_url:
+                base = args.mock_url.rstrip("/")
+            else:
+                mock = await MockLLMServer(**mock_kwargs(args)).start()
+                base = mock.url
+            gw.OPENAI_BASE, gw.ANTHROPIC_BASE, gw.GEMINI_BASE = f"{base}/v1", base, f"{base}/v1beta"
+            app = FastAPI()
+            app.include_router(gw.router)
+
+            async def call(endpoint: str, raw: bytes) -> Sample:
+                return await _asgi_call(app, endpoint, raw)
+
+        seq = [0]
+        results: Dict[str, Any] = {}
+        for endpoint in endpoints:
+            for provider in providers:
+                results[f"{endpoint}/{provider}"] = await _scenario(call, endpoint, provider, args, seq)
+        res["results"] = results
+        if mock is not None:
+            res["mock"] = {**mock.stats, "by_route": mock.by_route}
+        if gw is not None:
+            res["gateway"] = {"pool": gw.PROVIDER_CLIENTS.stats(), "relay": dict(gw.SSE_STATS),
+                              "providers": {p: h.stats() for p, h in gw.PROVIDER_HEALTH.items()}}
+    finally:
+        if client is not None:
+            await client.aclose()
+        if gw is not None:
+            await gw.PROVIDER_CLIENTS.aclose()
+        if mock is not None:
+            await mock.stop()
+    return res
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--endpoints", default="chat,stream,toolcall")
+    ap.add_argument("--providers", default="openai,anthropic,gemini")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    ap.add_argument("--warmup", type=int, default=10)
+    ap.add_argument("--temperature", type=float, default=0.7)
+    ap.add_argument("--mock-url", default="", help="use a running mock_llm_server instead of an in-process one")
+    ap.add_argument("--gateway-url", default="", help="drive a running backend over HTTP")
+    ap.add_argument("--max-error-rate", type=float, default=0.05)
+    ap.add_argument("--out", default="", help="also write the JSON here")
+    ap.add_argument("--baseline", default="", help="earlier --out file to compare against")
+    args = add_args(ap).parse_args(argv)
+
+    res = asyncio.run(main_async(args))
+    if args.baseline:
+        base = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        res["compare"] = {"baseline": base.get("meta", {}).get("commit"),
+                          "scenarios": _compare(res["results"], base.get("results") or {})}
+    ok = bool(res["results"]) and all(r["requests"] and r["error_rate"] <= args.max_error_rate
+                                      for r in res["results"].values())
+    res["ok"] = ok
+    out = json.dumps(res, indent=2)
+    if args.out:
+        Path(args.out).write_text(out + "\n", encoding="utf-8")
+    print(out)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
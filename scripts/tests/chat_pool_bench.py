@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Chat gateway — pooled vs per-call provider clients benchmark (ST-1206)
+
+Runs the local mock provider (scripts/tests/mock_llm_server.py) charging --connect-ms on every
+NEW connection (stand-in for TCP + TLS handshake round trips), points the gateway at it
+(OPENAI_BASE) and measures, with GG_CHAT_POOL off and on:
+1) streaming: --turns sequential call_openai_stream turns → time-to-first-token p50/p95, total
+2) throughput: --requests call_openai calls from --concurrency workers → req/s, latency p50/p95
+3) connections accepted by the mock for each mode, and /api/chat/pool-style stats after the run
+4) loop switch: a call from another thread's event loop replaces the pooled client → the old one
+   is closed on its own (still running) loop; back on this loop, the client left behind by the
+   finished thread loop has its connections shut down (the mock sees them close)
+5) shutdown: PROVIDER_CLIENTS.aclose() closes the pooled client
+
+Usage:
+  python scripts/tests/chat_pool_bench.py [--turns 50] [--requests 400] [--concurrency 16]
+                                          [--connect-ms 30] [--tokens 20] [--token-ms 2]
+
+Exit code 0 = pooled mode reused connections (fewer accepted than requests) and had a lower TTFT p50.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+from gumgang_0_5.backend.app.api.routes import chat_gateway as gw  # noqa: E402
+from mock_llm_server import MockLLMServer  # noqa: E402
+
+
+def _pct(vals, p):
+    s = sorted(vals)
+    return round(s[min(len(s) - 1, int(len(s) * p))] * 1000, 2) if s else None
+
+
+def _req() -> gw.ChatRequest:
+    return gw.ChatRequest(model="gpt-4o-mini", messages=[gw.Msg(role="user", content="hi")], temperature=0)
+
+
+async def run_mode(pooled: bool, mock: MockLLMServer, args) -> dict:
+    gw.POOL_ENABLED = pooled
+    before = mock.stats["connections"]
+
+    ttft, totals = [], []
+    for _ in range(args.turns):
+        t0 = time.perf_counter()
+        first = None
+        async for _chunk in gw.call_openai_stream(_req()):
+            if first is None:
+                first = time.perf_counter() - t0
+        ttft.append(first)
+        totals.append(time.perf_counter() - t0)
+
+    lat = []
+    todo = iter(range(args.requests))
+
+    async def worker():
+        for _ in todo:
+            t0 = time.perf_counter()
+            await gw.call_openai(_req())
+            lat.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    wall = time.perf_counter() - t0
+
+    out = {
+        "stream": {"turns": args.turns, "ttft_p50_ms": _pct(ttft, 0.5), "ttft_p95_ms": _pct(ttft, 0.95),
+                   "total_p50_ms": _pct(totals, 0.5)},
+        "throughput": {"requests": args.requests, "concurrency": args.concurrency,
+                       "rps": round(args.requests / wall, 1), "p50_ms": _pct(lat, 0.5), "p95_ms": _pct(lat, 0.95)},
+        "connections_accepted": mock.stats["connections"] - before,
+    }
+    if pooled:
+        out["pool"] = gw.PROVIDER_CLIENTS.stats()["providers"].get("openai")
+    return out
+
+
+async def loop_switch(mock: MockLLMServer) -> dict:
+    gw.POOL_ENABLED = True
+    await gw.call_openai(_req())
+    here = gw.PROVIDER_CLIENTS.get("openai")
+    t = threading.Thread(target=lambda: asyncio.run(gw.call_openai(_req())))
+    t.start()
+    while t.is_alive():  # keep this loop running: the replaced client is closed on it
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    closed0 = mock.stats["connections_closed"]
+    await gw.call_openai(_req())  # replaces the dead thread loop's client
+    for _ in range(50):
+        if mock.stats["connections_closed"] > closed0:
+            break
+        await asyncio.sleep(0.01)
+    return {"replaced_closed_on_own_loop": here.is_closed,
+            "dead_loop_connections_closed": mock.stats["connections_closed"] - closed0}
+
+
+async def main_async(args) -> dict:
+    mock = await MockLLMServer(ttft="0", token_ms=str(args.token_ms), tokens=args.tokens,
+                               connect_ms=str(args.connect_ms)).start()
+    gw.OPENAI_BASE = mock.base_urls()["OPENAI_BASE_URL"]
+    try:
+        res = {"connect_ms": args.connect_ms, "http2": gw.HTTP2_ENABLED,
+               "per_call": await run_mode(False, mock, args),
+               "pooled": await run_mode(True, mock, args),
+               "loop_switch": await loop_switch(mock)}
+        client = gw.PROVIDER_CLIENTS.get("openai")
+        await gw.PROVIDER_CLIENTS.aclose()
+        res["shutdown_closed"] = client.is_closed
+    finally:
+        await mock.stop()
+    return res
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turns", type=int, default=50)
+    ap.add_argument("--requests", type=int, default=400)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--connect-ms", type=float, default=30.0)
+    ap.add_argument("--tokens", type=int, default=20)
+    ap.add_argument("--token-ms", type=float, default=2.0)
+    args = ap.parse_args(argv)
+
+    res = asyncio.run(main_async(args))
+    a, b = res["per_call"], res["pooled"]
+    res["speedup"] = {"ttft_p50": round(a["stream"]["ttft_p50_ms"] / max(b["stream"]["ttft_p50_ms"], 1e-3), 2),
+                      "rps": round(b["throughput"]["rps"] / max(a["throughput"]["rps"], 1e-3), 2)}
+    ok = (b["connections_accepted"] < args.turns + args.requests
+          and b["stream"]["ttft_p50_ms"] < a["stream"]["ttft_p50_ms"]
+          and res["loop_switch"] == {"replaced_closed_on_own_loop": True, "dead_loop_connections_closed": 1}
+          and res["shutdown_closed"])
+    res["ok"] = ok
+    print(json.dumps(res, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
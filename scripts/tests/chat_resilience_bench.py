@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Chat gateway — retry / hedging / circuit breaker / failover harness (ST-1206)
+
+Two local mock providers (scripts/tests/mock_llm_server.py, one answering as OpenAI, one as
+Anthropic) inject errors and latency per request; the gateway is pointed at them (OPENAI_BASE /
+ANTHROPIC_BASE) and driven through route_to_provider / route_to_provider_stream:
+1) retries: --error-rate 503s → success rate with GG_CHAT_RETRY_MAX=0 vs default (breaker off)
+2) hedging: --slow-rate requests take --slow-ms → p99 with GG_CHAT_HEDGE off vs on
+3) breaker + failover: OpenAI always 500 with GG_CHAT_FAILOVER=anthropic → every call answered
+   by Anthropic, OpenAI upstream hits bounded by the breaker, later calls short-circuit
+4) recovery: OpenAI healthy again → after GG_CHAT_CB_OPEN_SEC one half-open probe closes the breaker
+5) streaming: a 503 before the first byte is retried; the text arrives exactly once
+6) cancelled probe: the half-open probe (plain and streaming) is cancelled mid-flight → the breaker
+   reopens and recovers on the next probe; a probe older than GG_CHAT_CB_PROBE_SEC is superseded
+
+Usage:
+  python scripts/tests/chat_resilience_bench.py [--calls 200] [--error-rate 0.3]
+                                                [--slow-rate 0.04] [--slow-ms 800]
+
+Exit code 0 = retries lifted the success rate, hedging cut p99, the breaker bounded upstream
+hits while failover answered every call, the breaker recovered, the stream retry was clean,
+a cancelled probe did not wedge the breaker half-open.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+
+from gumgang_0_5.backend.app.api.routes import chat_gateway as gw  # noqa: E402
+from mock_llm_server import MockLLMServer  # noqa: E402
+
+
+def _pct(vals, p):
+    s = sorted(vals)
+    return round(s[min(len(s) - 1, int(len(s) * p))] * 1000, 1) if s else None
+
+
+def _req(model: str = "gpt-4o-mini") -> gw.ChatRequest:
+    return gw.ChatRequest(model=model, messages=[gw.Msg(role="user", content="hi")], temperature=0)
+
+
+def _reset() -> None:
+    gw.PROVIDER_HEALTH.clear()
+
+
+async def _drive(n: int, concurrency: int = 8):
+    ok, lat, served = 0, [], {}
+    todo = iter(range(n))
+
+    async def worker():
+        nonlocal ok
+        for _ in todo:
+            t0 = time.perf_counter()
+            try:
+                text = await gw.route_to_provider(_req())
+                ok += 1
+                served[text] = served.get(text, 0) + 1
+            except Exception:
+                pass
+            lat.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return ok, lat, served
+
+
+async def main_async(args) -> dict:
+    oa = await MockLLMServer(ttft="5", token_ms="0", seed=7).start()
+    an = await MockLLMServer(ttft="5", token_ms="0", seed=11).start()
+    oa.reply, an.reply = (lambda req: "openai ok"), (lambda req: "anthropic ok")
+    gw.OPENAI_BASE, gw.ANTHROPIC_BASE = oa.base_urls()["OPENAI_BASE_URL"], an.base_urls()["ANTHROPIC_BASE_URL"]
+    gw.RETRY_BASE_SEC, gw.RETRY_CAP_SEC = 0.01, 0.05
+    res: dict = {}
+    try:
+        # 1) retries (breaker out of the way: random 30% errors do produce runs of 5)
+        oa.error_rate = args.error_rate
+        gw.CB_FAILURES = 10 ** 6
+        out = {}
+        for label, retries in (("no_retry", 0), ("retry", 2)):
+            _reset()
+            gw.RETRY_MAX = retries
+            ok, lat, _ = await _drive(args.calls)
+            out[label] = {"success_rate": round(ok / args.calls, 3), "p50_ms": _pct(lat, 0.5),
+                          "retries": gw.PROVIDER_HEALTH["openai"].counters["retries"]}
+        res["retries"] = out
+        oa.error_rate = 0.0
+
+        # 2) hedging (warm the latency window first so p95 is known)
+        oa.slow_rate, oa.slow_ms = args.slow_rate, args.slow_ms
+        gw.HEDGE_MIN_MS = 30
+        out = {}
+        for label, hedge in (("no_hedge", False), ("hedge", True)):
+            _reset()
+            gw.HEDGE_ENABLED = hedge
+            oa.slow_rate = 0.0
+            await _drive(gw.HEDGE_MIN_SAMPLES + 10)
+            oa.slow_rate = args.slow_rate
+            ok, lat, _ = await _drive(args.calls)
+            h = gw.PROVIDER_HEALTH["openai"].counters
+            out[label] = {"success_rate": round(ok / args.calls, 3), "p50_ms": _pct(lat, 0.5),
+                          "p99_ms": _pct(lat, 0.99), "hedges": h["hedges"], "hedge_wins": h["hedge_wins"]}
+        res["hedging"] = out
+        gw.HEDGE_ENABLED, oa.slow_rate = False, 0.0
+
+        # 3) breaker + failover
+        _reset()
+        gw.RETRY_MAX, gw.CB_FAILURES, gw.CB_OPEN_SEC = 2, 5, 0.5
+        gw.FAILOVER = ["anthropic"]
+        oa.error_rate, oa.error_status = 1.0, 500
+        hits0 = oa.stats["requests"]
+        ok, lat, served = await _drive(args.calls // 2, concurrency=1)
+        res["breaker_failover"] = {
+            "calls": args.calls // 2, "answered": ok, "served_by": served,
+            "openai_upstream_hits": oa.stats["requests"] - hits0,
+            "openai": gw.PROVIDER_HEALTH["openai"].stats(),
+            "p50_ms": _pct(lat, 0.5),
+        }
+
+        # 4) recovery via half-open probe
+        oa.error_rate = 0.0
+        await asyncio.sleep(gw.CB_OPEN_SEC + 0.05)
+        text = await gw.route_to_provider(_req())
+        res["recovery"] = {"served_by": text, "state": gw.PROVIDER_HEALTH["openai"].state}
+
+        # 5) streaming retry before first byte
+        oa.reply = lambda req: "one two three"
+        oa.script("*", 503)
+        chunks = [c async for c in gw.route_to_provider_stream(_req())]
+        res["stream_retry"] = {"text": "".join(chunks), "retries": gw.PROVIDER_HEALTH["openai"].counters["retries"]}
+
+        # 6) cancelled half-open probe
+        oa.reply = lambda req: "openai ok"
+        gw.FAILOVER, gw.RETRY_MAX = [], 0
+        out = {}
+        for label in ("call", "stream"):
+            _reset()
+            oa.error_rate = 1.0
+            for _ in range(gw.CB_FAILURES):
+                try:
+                    await gw.route_to_provider(_req())
+                except Exception:
+                    pass
+            oa.error_rate, oa.slow_rate, oa.slow_ms = 0.0, 1.0, 2000.0
+            await asyncio.sleep(gw.CB_OPEN_SEC + 0.05)
+            if label == "call":
+                task = asyncio.ensure_future(gw.route_to_provider(_req()))
+            else:
+                async def consume():
+                    return [c async for c in gw.route_to_provider_stream(_req())]
+                task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.1)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            h = gw.PROVIDER_HEALTH["openai"]
+            after_cancel = h.state
+            oa.slow_rate = 0.0
+            await asyncio.sleep(gw.CB_OPEN_SEC + 0.05)
+            out[label] = {"after_cancel": after_cancel, "recovered": await gw.route_to_provider(_req()) == "openai ok"
+                          and h.state == "closed"}
+        h = gw.ProviderHealth("expiry")
+        h.state, h.probing, h.probe_at = "half_open", True, time.monotonic() - gw.CB_PROBE_SEC - 1
+        out["stale_probe_superseded"] = h.allow()
+        res["cancelled_probe"] = out
+    finally:
+        await gw.PROVIDER_CLIENTS.aclose()
+        await oa.stop()
+        await an.stop()
+    return res
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=200)
+    ap.add_argument("--error-rate", type=float, default=0.3)
+    ap.add_argument("--slow-rate", type=float, default=0.04)
+    ap.add_argument("--slow-ms", type=float, default=800.0)
+    args = ap.parse_args(argv)
+
+    res = asyncio.run(main_async(args))
+    r, h, b = res["retries"], res["hedging"], res["breaker_failover"]
+    ok = (r["retry"]["success_rate"] > r["no_retry"]["success_rate"] and r["retry"]["success_rate"] >= 0.95
+          and h["hedge"]["p99_ms"] < h["no_hedge"]["p99_ms"] and h["hedge"]["hedges"] > 0
+          and b["answered"] == b["calls"] and b["served_by"].get("anthropic ok") == b["calls"]
+          and b["openai_upstream_hits"] < b["calls"] and b["openai"]["short_circuits"] > 0
+          and res["recovery"] == {"served_by": "openai ok", "state": "closed"}
+          and res["stream_retry"]["text"] == "one two three"
+          and res["cancelled_probe"] == {"call": {"after_cancel": "open", "recovered": True},
+                                         "stream": {"after_cancel": "open", "recovered": True},
+                                         "stale_probe_superseded": True})
+    res["ok"] = ok
+    print(json.dumps(res, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
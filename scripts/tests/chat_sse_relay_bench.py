@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Chat gateway — SSE relay harness: slow and disconnecting clients (ST-1206)
+
+The gateway router runs on a bare FastAPI app driven over raw ASGI (the test client's send()
+can be slowed down or fail, like a server's transport), against the local mock provider
+(scripts/tests/mock_llm_server.py) streaming tiny deltas and logging, per upstream request, how
+many it sent and when the gateway hung up:
+1) fast client: provider chunks vs SSE frames (coalescing), TTFT, text intact (incl. newlines)
+2) slow client: send() takes --slow-ms per frame → relay queue never exceeds GG_SSE_QUEUE_MAX,
+   and the relay reads no further ahead of the client than that queue (upstream paused)
+3) disconnect, ASGI 2.4 (send raises OSError) and pre-2.4 (receive → http.disconnect), upstream
+   emitting a delta every --token-ms → upstream connection closed within --cancel-ms, no active
+   relays left
+4) idle upstream: heartbeat comments while the provider pauses
+
+Usage:
+  python scripts/tests/chat_sse_relay_bench.py [--tokens 4000] [--slow-ms 20] [--slow-frames 50]
+                                               [--token-ms 1] [--cancel-ms 500]
+
+Exit code 0 = coalescing, bounded queue + upstream pause, both disconnect paths, heartbeats held.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+from fastapi import FastAPI  # noqa: E402
+
+from gumgang_0_5.backend.app.api.routes import chat_gateway as gw  # noqa: E402
+from mock_llm_server import Latency, MockLLMServer  # noqa: E402
+
+
+async def drive(app, model: str, slow_ms: float = 0.0, fail_after: int = 0, disconnect_after_ms: float = 0.0,
+                spec: str = "2.4") -> dict:
+    raw = json.dumps({"model": model, "messages": [{"role": "user", "content": "go"}]}).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": spec}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/api/chat/stream", "raw_path": b"/api/chat/stream",
+        "query_string": b"", "root_path": "", "client": ("127.0.0.1", 50000), "server": ("gw", 80),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(raw)).encode())],
+    }
+    out = {"frames": 0, "pings": 0, "body": b"", "ttft": None, "gone_at": None}
+    sent_request = False
+    t0 = time.perf_counter()
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": raw, "more_body": False}
+        if disconnect_after_ms:
+            await asyncio.sleep(disconnect_after_ms / 1000)
+            out["gone_at"] = time.perf_counter()
+            return {"type": "http.disconnect"}
+        await asyncio.Event().wait()
+
+    async def send(msg):
+        if msg["type"] != "http.response.body" or not msg.get("body"):
+            return
+        if fail_after and out["frames"] >= fail_after:
+            out["gone_at"] = out["gone_at"] or time.perf_counter()
+            raise OSError("client went away")
+        body = msg["body"]
+        if body.startswith(b": ping"):
+            out["pings"] += 1
+        else:
+            out["frames"] += 1
+            out["ttft"] = out["ttft"] or time.perf_counter() - t0
+        out["body"] += body
+        if slow_ms:
+            await asyncio.sleep(slow_ms / 1000)
+
+    try:
+        await app(scope, receive, send)
+    except Exception as e:  # ClientDisconnect on the 2.4 path
+        out["error"] = type(e).__name__
+    out["elapsed"] = time.perf_counter() - t0
+    return out
+
+
+def _text(body: bytes) -> str:
+    events = body.decode("utf-8").split("\n\n")
+    return "".join("\n".join(ln[6:] for ln in ev.split("\n") if ln.startswith("data: ")) for ev in events)
+
+
+def _deltas(delta: str, n: int) -> list:
+    """n upstream deltas; the second one carries a newline (must survive SSE framing)."""
+    return ["line\nbreak " if i == 1 else delta for i in range(n)]
+
+
+async def _settle(mock: MockLLMServer, since: int, timeout: float = 2.0) -> dict:
+    end = time.perf_counter() + timeout
+    while time.perf_counter() < end and (len(mock.log) <= since or mock.log[since]["aborted_at"] is None):
+        await asyncio.sleep(0.01)
+    return mock.log[since] if len(mock.log) > since else {}
+
+
+async def main_async(args) -> dict:
+    mock = await MockLLMServer(ttft="0", token_ms="0").start()
+    mock.record = True
+    gw.OPENAI_BASE = mock.base_urls()["OPENAI_BASE_URL"]
+    gw.RESPONSE_CACHE_ENABLED = False
+    app = FastAPI()
+    app.include_router(gw.router)
+    res: dict = {"queue_max": gw.SSE_QUEUE_MAX, "frame_bytes": gw.SSE_FRAME_BYTES, "frame_ms": gw.SSE_FRAME_MS}
+    try:
+        # 1) fast client (after one warm-up request: route compile, pooled upstream connection)
+        mock.reply = lambda req: _deltas("ab ", 2)
+        await drive(app, "gpt-4o-mini")
+        mock.reply = lambda req: _deltas("ab ", args.tokens)
+        c0 = dict(gw.SSE_STATS)
+        r = await drive(app, "gpt-4o-mini")
+        want = "ab " + "line\nbreak " + "ab " * (args.tokens - 2)
+        res["fast"] = {"chunks": gw.SSE_STATS["chunks"] - c0["chunks"], "frames": r["frames"],
+                       "ttft_ms": round(r["ttft"] * 1000, 2), "total_ms": round(r["elapsed"] * 1000, 1),
+                       "text_intact": _text(r["body"]) == want}
+
+        # 2) slow client: after --slow-frames frames at --slow-ms each the client hangs up; a relay
+        #    without backpressure would have read the whole upstream answer by then (the mock writes
+        #    it at loopback speed), this one reads at most queue + in-flight frames ahead
+        gw.SSE_STATS["max_queue"] = 0
+        mock.reply = lambda req: _deltas("x" * 1000 + " ", args.tokens)  # one delta ≥ frame size → one frame per delta, client-paced
+        c0 = dict(gw.SSE_STATS)
+        r = await drive(app, "gpt-4o-mini", slow_ms=args.slow_ms, fail_after=args.slow_frames)
+        res["slow"] = {"upstream_deltas": args.tokens, "client_frames": r["frames"],
+                       "deltas_read_from_upstream": gw.SSE_STATS["chunks"] - c0["chunks"],
+                       "max_queue": gw.SSE_STATS["max_queue"], "total_ms": round(r["elapsed"] * 1000, 1)}
+        mock.reply = lambda req: _deltas("ab ", args.tokens)
+
+        # 3) disconnects, against an upstream still generating (--token-ms per delta)
+        mock.token_ms = Latency(str(args.token_ms))
+        out = {}
+        for label, kw in (("asgi_2_4_send_fails", {"fail_after": 5, "slow_ms": 2}),
+                          ("asgi_2_3_http_disconnect", {"disconnect_after_ms": 50, "spec": "2.3", "slow_ms": 2})):
+            n = len(mock.log)
+            c0 = dict(gw.SSE_STATS)
+            r = await drive(app, "gpt-4o-mini", **kw)
+            rec = await _settle(mock, n)
+            await asyncio.sleep(0.05)
+            out[label] = {
+                "upstream_closed_early": rec.get("aborted_at") is not None and rec["sent"] < rec["total"],
+                "upstream_sent": rec.get("sent"), "upstream_total": rec.get("total"),
+                "cancel_ms": round((rec["aborted_at"] - r["gone_at"]) * 1000, 1) if rec.get("aborted_at") and r["gone_at"] else None,
+                "upstream_cancelled": gw.SSE_STATS["upstream_cancelled"] - c0["upstream_cancelled"],
+                "active_after": gw.SSE_STATS["active"],
+            }
+        res["disconnect"] = out
+        mock.token_ms = Latency("0")
+
+        # 4) heartbeats during an upstream pause (halfway through the stream)
+        gw.SSE_HEARTBEAT_SEC = 0.2
+        mock.reply, mock.pause_ms = (lambda req: _deltas("ab ", 20)), 1000.0
+        r = await drive(app, "gpt-4o-mini")
+        res["heartbeat"] = {"pause_sec": mock.pause_ms / 1000, "heartbeat_sec": gw.SSE_HEARTBEAT_SEC, "pings": r["pings"],
+                            "text_intact": _text(r["body"]) == "ab " + "line\nbreak " + "ab " * 18}
+        res["stats"] = dict(gw.SSE_STATS)
+    finally:
+        await gw.PROVIDER_CLIENTS.aclose()
+        await mock.stop()
+    return res
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tokens", type=int, default=4000)
+    ap.add_argument("--slow-ms", type=float, default=20.0)
+    ap.add_argument("--slow-frames", type=int, default=50)
+    ap.add_argument("--token-ms", type=float, default=1.0)
+    ap.add_argument("--cancel-ms", type=float, default=500.0)
+    args = ap.parse_args(argv)
+
+    res = asyncio.run(main_async(args))
+    f, s, d, h = res["fast"], res["slow"], res["disconnect"], res["heartbeat"]
+    ok = (f["text_intact"] and f["frames"] * 4 < f["chunks"]
+          and s["max_queue"] <= res["queue_max"] and s["deltas_read_from_upstream"] <= s["client_frames"] + res["queue_max"] + 4
+          and all(v["upstream_closed_early"] and v["upstream_cancelled"] == 1 and v["active_after"] == 0
+                  and v["cancel_ms"] is not None and v["cancel_ms"] < args.cancel_ms for v in d.values())
+          and h["pings"] >= 3 and h["text_intact"])
+    res["ok"] = ok
+    print(json.dumps(res, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Chat gateway — parallel tool dispatch benchmark (ST-1206)
+
+The local mock provider (scripts/tests/mock_llm_server.py) answers the first step of every turn
+with --calls tool_calls (fs.read / web.search / now, slowest first) and logs every request, so
+the order of the tool results the model received can be checked. Tool latency is simulated (--tool-ms, web.search never leaves the machine) by wrapping
+chat_gateway._tool_run. Measured through chat_toolcall():
+1) sequential (GG_TOOL_CONCURRENCY=1) vs concurrent (default) turn wall time and trace
+   tools_wall_ms vs tools_sum_ms
+2) ordering: tool results reach the model in tool_call order although they finish out of order
+3) per-tool timeout: a web.search slower than its timeout → TOOL_TIMEOUT, others still succeed
+4) turn budget: a budget shorter than the tools → TURN_BUDGET_EXCEEDED, turn ends within budget,
+   the closing tool_choice "none" call still sees the tool results (trace.final.reason turn_budget)
+5) steps exhausted: the model asks for tools at every step → after GG_TOOL_MAX_STEPS steps
+   one closing tool_choice "none" call on all accumulated tool results (trace.final.reason max_steps)
+
+Usage:
+  python scripts/tests/chat_tools_bench.py [--turns 10] [--calls 4] [--tool-ms 200]
+
+Exit code 0 = concurrent turns beat sequential, ordering held, timeout and budget were enforced,
+              exhausted turns answered from their tool results.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("GUMGANG_PROJECT_ROOT", str(PROJECT_ROOT))
+
+from starlette.requests import Request  # noqa: E402
+
+from gumgang_0_5.backend.app.api.routes import chat_gateway as gw  # noqa: E402
+from mock_llm_server import MockLLMServer  # noqa: E402
+
+gw.TOOL_CACHE_ENABLED = False  # every turn must run its tools (same fs.read args each turn)
+
+TOOLS = [("fs.read", {"path": "README.md"}), ("web.search", {"query": "gumgang"}), ("now", {})]
+
+
+def _tool_ids(body: dict) -> tuple:
+    """(tool_call ids the model asked for, tool_call ids of the results it got back), in message order."""
+    msgs = body.get("messages") or []
+    asked = [tc.get("id") for m in msgs if m.get("role") == "assistant" for tc in m.get("tool_calls") or []]
+    return asked, [m.get("tool_call_id") for m in msgs if m.get("role") == "tool"]
+
+
+def _final_saw_results(mock: MockLLMServer, n: int) -> bool:
+    """The last tool_choice "none" request carried all n tool results, in tool_call order."""
+    finals = [r["body"] for r in mock.log if r["body"].get("tool_choice") == "none"]
+    asked, got = _tool_ids(finals[-1]) if finals else ([], [])
+    return len(asked) == n and got == asked
+
+
+REAL_TOOL_RUN = gw._tool_run
+
+
+def install_slow_tools(tool_ms: float, web_ms: float) -> None:
+    real = REAL_TOOL_RUN
+
+    async def slow(tool, args):
+        if tool in ("web.search", "web_search"):
+            await asyncio.sleep(web_ms / 1000)
+            return {"query": (args or {}).get("query"), "results": []}
+        # slowest first: fs.read > now, so completion order differs from call order
+        await asyncio.sleep(tool_ms / 1000 * (1.5 if tool == "fs.read" else 0.5))
+        return await real(tool, args)
+
+    gw._tool_run = slow
+
+
+def _req() -> gw.ChatRequest:
+    return gw.ChatRequest(model="gpt-4o-mini", messages=[gw.Msg(role="user", content="use tools")], temperature=0)
+
+
+async def turns(n: int) -> dict:
+    walls, traces = [], []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        r = await gw.chat_toolcall(_req(), Request({"type": "http", "method": "POST", "headers": []}))
+        walls.append(time.perf_counter() - t0)
+        traces.append(r.data["trace"])
+    step = traces[-1]["steps"][0]
+    return {"turn_p50_ms": round(sorted(walls)[len(walls) // 2] * 1000, 1),
+            "tools_wall_ms": step["tools_wall_ms"], "tools_sum_ms": step["tools_sum_ms"],
+            "tools": step["tools"], "reply": r.data["message"]["content"],
+            "steps": len(traces[-1]["steps"]), "final": traces[-1].get("final")}
+
+
+async def main_async(args) -> dict:
+    mock = await MockLLMServer(ttft="0", token_ms="0").start()
+    mock.tool_plan = [(gw._safe_func_name(TOOLS[i % len(TOOLS)][0]), TOOLS[i % len(TOOLS)][1]) for i in range(args.calls)]
+    mock.reply = lambda req: "final" if req.get("tool_choice") == "none" else "done"
+    mock.record = True
+    gw.OPENAI_BASE = mock.base_urls()["OPENAI_BASE_URL"]
+    res: dict = {"calls_per_step": args.calls, "tool_ms": args.tool_ms}
+    try:
+        install_slow_tools(args.tool_ms, args.tool_ms)
+        gw.TOOL_CONCURRENCY = 1
+        res["sequential"] = await turns(args.turns)
+        gw.TOOL_CONCURRENCY = 4
+        res["concurrent"] = await turns(args.turns)
+        follow_ups = [_tool_ids(r["body"]) for r in mock.log if _tool_ids(r["body"])[1]]
+        res["ordered"] = bool(follow_ups) and all(len(a) == args.calls and g == a for a, g in follow_ups)
+
+        # per-tool timeout: web.search takes 3x its limit
+        gw.TOOL_TIMEOUTS["web.search"] = args.tool_ms / 1000
+        install_slow_tools(args.tool_ms, args.tool_ms * 3)
+        t = await turns(1)
+        res["timeout_case"] = {"turn_p50_ms": t["turn_p50_ms"], "tools": t["tools"]}
+
+        # turn budget shorter than the slowest tool
+        gw.TOOL_TURN_BUDGET_SEC = args.tool_ms / 1000
+        t = await turns(1)
+        res["budget_case"] = {"budget_ms": args.tool_ms, "turn_p50_ms": t["turn_p50_ms"], "tools": t["tools"],
+                              "final": t["final"], "final_saw_results": _final_saw_results(mock, args.calls)}
+
+        # steps exhausted: the model keeps asking for tools
+        gw.TOOL_TURN_BUDGET_SEC, gw.TOOL_TIMEOUTS["web.search"] = 25.0, 10.0
+        install_slow_tools(1, 1)
+        mock.tool_rounds = 10 ** 6
+        t = await turns(1)
+        res["steps_case"] = {"steps": t["steps"], "final": t["final"], "reply": t["reply"],
+                             "final_saw_results": _final_saw_results(mock, gw.TOOL_MAX_STEPS * args.calls)}
+    finally:
+        await gw.PROVIDER_CLIENTS.aclose()
+        await mock.stop()
+    return res
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turns", type=int, default=10)
+    ap.add_argument("--calls", type=int, default=4)
+    ap.add_argument("--tool-ms", type=float, default=200.0)
+    args = ap.parse_args(argv)
+
+    res = asyncio.run(main_async(args))
+    seq, par = res["sequential"], res["concurrent"]
+    errors = {x["tool"]: x.get("error") for x in res["timeout_case"]["tools"]}
+    budget_errors = [x.get("error") for x in res["budget_case"]["tools"]]
+    ok = (par["turn_p50_ms"] < seq["turn_p50_ms"]
+          and par["tools_wall_ms"] < par["tools_sum_ms"]
+          and res["ordered"]
+          and errors.get("web.search") == "TOOL_TIMEOUT" and errors.get("now") is None
+          and "TURN_BUDGET_EXCEEDED" in budget_errors and None in budget_errors
+          and res["budget_case"]["turn_p50_ms"] < args.tool_ms * 3
+          and (res["budget_case"]["final"] or {}).get("reason") == "turn_budget" and res["budget_case"]["final_saw_results"]
+          and res["steps_case"]["steps"] == gw.TOOL_MAX_STEPS and res["steps_case"]["final_saw_results"]
+          and (res["steps_case"]["final"] or {}).get("reason") == "max_steps" and res["steps_case"]["reply"] == "final")
+    res["ok"] = ok
+    print(json.dumps(res, indent=2, ensure_ascii=False))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
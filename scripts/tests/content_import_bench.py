@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Content import — bulk upsert benchmark (ST-1204)
+
+Synthetic catalog (N items, ~3 tags each, a few collections) imported into:
+- SQLite (throwaway file, migrated with app/migrations.py):
+  legacy  = the pre-bulk per-row loop (execute per item/tag, one commit at the end)
+  bulk    = content_bulk.upsert_sqlite (chunked executemany transactions)
+  re-run  = bulk again over the same ids (pure update path)
+- Postgres (optional, --pg-url to a THROWAWAY database; needs psycopg2):
+  legacy  = per-row INSERT … ON CONFLICT in autocommit (what the endpoint used to do)
+  bulk    = content_bulk.upsert_pg (COPY → temp staging → set-based merge)
+and checks that table counts match between legacy and bulk and that the FTS index agrees
+with a LIKE scan (plus FTS5 integrity-check) after deferred indexing.
+
+Usage:
+  python scripts/tests/content_import_bench.py [--items 100000] [--chunk 5000] [--pg-url postgres://…]
+
+Exit code 0 = counts match.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import content_bulk  # noqa: E402
+from app.migrations import migrate_pg, migrate_sqlite  # noqa: E402
+
+WORDS = "gate memory roadmap sitegraph import search 회의 요약 검색 대화 pricing plan starter pro".split()
+
+
+def make_items(n: int, seed: int) -> tuple:
+    rnd = random.Random(seed)
+    items = []
+    for i in range(n):
+        items.append({
+            "id": f"item_{i:07d}",
+            "slug": f"item-{i:07d}",
+            "title": " ".join(rnd.choices(WORDS, k=4)) + f" #{i}",
+            "summary": " ".join(rnd.choices(WORDS, k=rnd.randint(8, 24))),
+            "body_mdx_path": f"content/items/{i:07d}.mdx",
+            "thumbnail_url": None,
+            "price_plan": rnd.choice(["free", "starter", "pro"]),
+            "features_json": rnd.sample(["fast", "secure", "offline", "sync", "ai", "export"], 3),
+            "links_json": {"home": f"https://example.com/{i}"},
+        })
+    cols = [{"id": f"col_{c}", "slug": f"col-{c}", "name": f"Collection {c}",
+             "items": [items[j]["id"] for j in range(c, min(n, c + 500))]} for c in range(0, min(n, 10))]
+    return items, cols
+
+
+def legacy_sqlite(con, items, cols) -> None:
+    """Pre-bulk content_import loop, verbatim semantics."""
+    from datetime import datetime, timezone
+    for it in items:
+        js = json.dumps(it["features_json"] or [], ensure_ascii=False)
+        lj = json.dumps(it["links_json"] or {}, ensure_ascii=False)
+        updated_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+        con.execute(content_bulk._SQLITE_ITEM_UPSERT, (
+            it["id"], it["slug"], it["title"], it["summary"], it["body_mdx_path"], it["thumbnail_url"],
+            it["price_plan"], js, lj, updated_ms))
+        for tg in it["features_json"] or []:
+            con.execute("INSERT OR IGNORE INTO content_tags(id, slug, name) VALUES(?,?,?)", (tg, tg, tg))
+            con.execute("INSERT OR IGNORE INTO content_item_tags(item_id, tag_id) VALUES(?,?)", (it["id"], tg))
+    for c in cols:
+        con.execute("INSERT OR REPLACE INTO content_collections(id, slug, name) VALUES(?,?,?)", (c["id"], c["slug"], c["name"]))
+        for iid in c["items"]:
+            con.execute("INSERT OR IGNORE INTO content_collection_items(collection_id, item_id, ord) VALUES(?,?,?)", (c["id"], iid, 0))
+    con.commit()
+
+
+def _sqlite_counts(con) -> dict:
+    out = {t: con.execute(f"SELECT count(*) FROM {t}").fetchone()[0]
+           for t in ("content_items", "content_tags", "content_item_tags", "content_collection_items")}
+    # FTS must agree with a LIKE scan after bulk/deferred indexing (and survive integrity-check)
+    con.execute("INSERT INTO content_items_fts(content_items_fts) VALUES('integrity-check')")
+    out["fts_pricing"] = con.execute(
+        "SELECT count(*) FROM content_items_fts WHERE content_items_fts MATCH '\"pricing\"'").fetchone()[0]
+    out["like_pricing"] = con.execute(
+        "SELECT count(*) FROM content_items WHERE title LIKE '%pricing%' OR summary LIKE '%pricing%'").fetchone()[0]
+    return out
+
+
+def bench_sqlite(items, cols, chunk: int) -> dict:
+    out = {}
+    with tempfile.TemporaryDirectory() as td:
+        counts = {}
+        for mode in ("legacy", "bulk"):
+            db = str(Path(td) / f"{mode}.db")
+            migrate_sqlite(db)
+            con = sqlite3.connect(db)
+            t0 = time.perf_counter()
+            if mode == "legacy":
+                legacy_sqlite(con, items, cols)
+                sec = time.perf_counter() - t0
+                out[mode] = {"elapsed_ms": int(sec * 1000), "rows_per_sec": round(len(items) / sec)}
+            else:
+                out[mode] = content_bulk.upsert_sqlite(con, items, cols, chunk=chunk)
+                out["bulk_rerun"] = content_bulk.upsert_sqlite(con, items, cols, chunk=chunk)
+            counts[mode] = _sqlite_counts(con)
+            con.close()
+    out["counts"] = counts
+    out["counts_match"] = counts["legacy"] == counts["bulk"] and counts["bulk"]["fts_pricing"] == counts["bulk"]["like_pricing"]
+    out["speedup"] = round(out["bulk"]["rows_per_sec"] / out["legacy"]["rows_per_sec"], 2)
+    return out
+
+
+def bench_pg(url: str, items, cols) -> dict:
+    import psycopg2  # type: ignore
+
+    out = {}
+    counts = {}
+    con = psycopg2.connect(url)
+    migrate_pg(con, "pg:" + url)
+    cur = con.cursor()
+    for mode in ("legacy", "bulk"):
+        cur.execute("TRUNCATE content.items, content.tags, content.collections CASCADE")
+        con.commit()
+        t0 = time.perf_counter()
+        if mode == "legacy":
+            con.autocommit = True
+            for it in items:
+                cur.execute(
+                    "INSERT INTO content.items(id, slug, title, summary, body_mdx_path, thumbnail_url, price_plan, features_json, links_json)"
+                    " VALUES(%s,%s,%s,%s,%s,%s,%s,%s::jsonb,%s::jsonb) ON CONFLICT(id) DO UPDATE SET title=excluded.title, updated_at=now()",
+                    (it["id"], it["slug"], it["title"], it["summary"], it["body_mdx_path"], it["thumbnail_url"], it["price_plan"],
+                     json.dumps(it["features_json"]), json.dumps(it["links_json"])),
+                )
+                for tg in it["features_json"]:
+                    cur.execute("INSERT INTO content.tags(id, slug, name) VALUES(%s,%s,%s) ON CONFLICT(id) DO NOTHING", (tg, tg, tg))
+                    cur.execute("INSERT INTO content.item_tags(item_id, tag_id) VALUES(%s,%s) ON CONFLICT DO NOTHING", (it["id"], tg))
+            con.autocommit = False
+            sec = time.perf_counter() - t0
+            out[mode] = {"elapsed_ms": int(sec * 1000), "rows_per_sec": round(len(items) / sec)}
+        else:
+            out[mode] = content_bulk.upsert_pg(con, items, cols)
+            out["bulk_rerun"] = content_bulk.upsert_pg(con, items, cols)
+        cur.execute("SELECT (SELECT count(*) FROM content.items), (SELECT count(*) FROM content.item_tags)")
+        counts[mode] = list(cur.fetchone())
+        con.commit()
+    con.close()
+    out["counts"] = counts
+    out["counts_match"] = counts["legacy"] == counts["bulk"]
+    out["speedup"] = round(out["bulk"]["rows_per_sec"] / out["legacy"]["rows_per_sec"], 2)
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000)
+    ap.add_argument("--chunk", type=int, default=content_bulk.SQLITE_CHUNK)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--pg-url", default=None, help="throwaway Postgres (content.* tables are TRUNCATEd)")
+    args = ap.parse_args(argv)
+
+    items, cols = make_items(args.items, args.seed)
+    res = {"items": args.items, "sqlite": bench_sqlite(items, cols, args.chunk)}
+    ok = res["sqlite"]["counts_match"]
+    if args.pg_url:
+        res["postgres"] = bench_pg(args.pg_url, items, cols)
+        ok = ok and res["postgres"]["counts_match"]
+    res["ok"] = ok
+    print(json.dumps(res, ensure_ascii=False, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
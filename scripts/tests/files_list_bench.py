@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+/api/files/list — cached listings, deep pagination and incremental rollups (ST-1206)
+
+Builds a throwaway evidence-like tree under status/evidence/ (--dirs top-level run dirs, each with
+nested day/hour dirs and --files files per leaf), then through the API:
+1) depth=2 listing: the previous handler body (iterdir + stat per entry, every call) vs the
+   cached handler, both called in-process, cold and warm
+2) flat depth=8 walk paged with limit/cursor until next_cursor is null → every file seen once
+3) rollup=true on the tree root: cold, warm (memo), and after one file is added in a leaf
+   (only that directory is rescanned; totals grow by exactly one file)
+
+Usage:
+  python scripts/tests/files_list_bench.py [--dirs 40] [--files 50]
+
+Exit code 0 = paging saw every file exactly once, rollups match a fresh os.walk, and the
+post-change refresh rescanned a single directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ.setdefault("GG_MIGRATE_ON_STARTUP", "0")
+os.environ.setdefault("GG_REVALIDATE_WORKER", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import api  # noqa: E402
+
+TMP = PROJECT_ROOT / "status" / "evidence" / "_bench_files_list"
+
+
+def legacy_list(target: Path, depth: int = 2) -> int:
+    """The previous handler body (sorted iterdir, stat + is_dir per entry, one level of children)."""
+    def entry(p: Path) -> dict:
+        st = p.stat()
+        return {"name": p.name, "path": api.relpath(p), "type": "dir" if p.is_dir() else "file",
+                "size": int(st.st_size), "mtime": int(st.st_mtime)}
+    items = []
+    for child in sorted(target.iterdir(), key=lambda x: (0 if x.is_dir() else 1, x.name.lower())):
+        d = entry(child)
+        if depth > 1 and child.is_dir():
+            d["children"] = [entry(g) for g in sorted(child.iterdir(), key=lambda x: (0 if x.is_dir() else 1, x.name.lower()))]
+        items.append(d)
+    return len(items)
+
+
+def build(dirs: int, files: int) -> int:
+    n = 0
+    for r in range(dirs):
+        for day in range(3):
+            for hour in range(2):
+                leaf = TMP / f"run_{r:03d}" / f"day_{day}" / f"h{hour:02d}"
+                leaf.mkdir(parents=True, exist_ok=True)
+                for f in range(files):
+                    (leaf / f"ev_{f:03d}.json").write_bytes(b"x" * (100 + f))
+                    n += 1
+        (TMP / f"run_{r:03d}" / "summary.md").write_text("# run\n")
+        n += 1
+    return n
+
+
+def ms(t: float) -> float:
+    return round(t * 1000, 1)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dirs", type=int, default=40)
+    ap.add_argument("--files", type=int, default=50)
+    args = ap.parse_args(argv)
+    shutil.rmtree(TMP, ignore_errors=True)
+    res: dict = {}
+    try:
+        n_files = build(args.dirs, args.files)
+        rel = api.relpath(TMP)
+        res["tree"] = {"files": n_files}
+        c = TestClient(api.app)
+        get = lambda **q: c.get("/api/files/list", params={"path": rel, **q}).json()  # noqa: E731
+
+        # handler called directly on both sides (no HTTP/JSON overhead in the comparison)
+        listing = lambda: [api.files_list(path=f"{rel}/run_{r:03d}/day_0", depth=2) for r in range(args.dirs)]  # noqa: E731
+        _, t_legacy = timed(lambda: [legacy_list(TMP / f"run_{r:03d}" / "day_0") for r in range(args.dirs)])
+        _, t_cold = timed(listing)
+        _, t_warm = timed(listing)
+        res["depth2_x%d" % args.dirs] = {"legacy_ms": ms(t_legacy), "cached_cold_ms": ms(t_cold), "cached_warm_ms": ms(t_warm)}
+
+        seen, cur, pages = [], None, 0
+        t0 = time.perf_counter()
+        while True:
+            q = {"depth": 8, "flat": 1, "type": "file", "limit": 1000}
+            if cur:
+                q["cursor"] = cur
+            r = get(**q)
+            seen += [i["path"] for i in r["items"]]
+            pages += 1
+            cur = r["next_cursor"]
+            if not cur:
+                break
+        paging_ok = len(seen) == n_files == len(set(seen))
+        res["paged_walk"] = {"pages": pages, "files": len(seen), "ms": ms(time.perf_counter() - t0)}
+
+        fc = api.FILES_LIST
+        r1, t_r1 = timed(lambda: get(rollup=1)["rollup"])
+        r2, t_r2 = timed(lambda: get(rollup=1)["rollup"])
+        walk = {"size": 0, "files": 0, "dirs": 0}
+        for root, ds, fs in os.walk(TMP):
+            walk["dirs"] += len(ds)
+            walk["files"] += len(fs)
+            walk["size"] += sum(os.path.getsize(os.path.join(root, f)) for f in fs)
+        (TMP / "run_000" / "day_1" / "h01" / "late.json").write_bytes(b"y" * 10)
+        fc.ttl = 0  # let the memo expire instead of sleeping
+        scans0 = fc.counters["scans"]
+        r3, t_r3 = timed(lambda: get(rollup=1)["rollup"])
+        rescanned = fc.counters["scans"] - scans0
+        fc.ttl = 2.0
+        res["rollup"] = {"cold_ms": ms(t_r1), "warm_ms": ms(t_r2), "after_change_ms": ms(t_r3),
+                         "dirs_rescanned_after_change": rescanned, "totals": r1}
+        rollup_ok = r1 == walk and r2 == r1 and r3 == {"size": walk["size"] + 10, "files": walk["files"] + 1, "dirs": walk["dirs"]}
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
+    ok = paging_ok and rollup_ok and rescanned == 1
+    res["checks"] = {"paging_every_file_once": paging_ok, "rollup_matches_walk": rollup_ok}
+    res["ok"] = ok
+    print(json.dumps(res, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
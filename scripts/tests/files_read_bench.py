@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+/api/files/read — JSON vs streamed (raw=true) throughput + RSS benchmark (ST-1206)
+
+Writes throwaway JSONL "evidence" files of growing size under the project root, then through the ASGI
+app in-process (response bodies are counted, never kept):
+- json  GET /api/files/read?path=…&max_bytes=<size>   (whole file in memory, decoded, JSON-encoded)
+- raw   GET /api/files/read?path=…&raw=true           (FileResponse, chunked from disk)
+and samples process RSS while each request runs → MB/s and peak RSS growth per mode.
+Also checks Range (206 + Content-Range + exact bytes), If-Range with a stale validator (→ 200),
+If-None-Match (→ 304) and the sniffed Content-Type.
+
+Usage:
+  python scripts/tests/files_read_bench.py [--sizes 16,64,256]
+
+Exit code 0 = raw RSS growth under --max-growth-mb at every size and all protocol checks pass.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ.setdefault("GG_MIGRATE_ON_STARTUP", "0")
+os.environ.setdefault("GG_REVALIDATE_WORKER", "0")
+
+from app import api  # noqa: E402
+
+TMP = PROJECT_ROOT / "status" / "evidence" / "_bench_files_read"
+PAGE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE / (1 << 20)
+
+
+class Sampler:
+    def __enter__(self):
+        self.base = self.peak = rss_mb()
+        self._stop = threading.Event()
+        self._t = threading.Thread(target=self._run, daemon=True)
+        self._t.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, rss_mb())
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._t.join()
+        self.peak = max(self.peak, rss_mb())
+
+
+async def get(path: str, query: str, headers=None, keep: bool = False) -> dict:
+    state = {"status": None, "headers": {}, "bytes": 0, "body": b""}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(msg):
+        if msg["type"] == "http.response.start":
+            state["status"] = msg["status"]
+            state["headers"] = {k.decode().lower(): v.decode() for k, v in msg.get("headers", [])}
+        elif msg["type"] == "http.response.body":
+            b = msg.get("body", b"")
+            state["bytes"] += len(b)
+            if keep:
+                state["body"] += b
+
+    scope = {
+        # spec_version 2.4 (as uvicorn advertises): FileResponse skips its disconnect listener
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 8000), "root_path": "",
+    }
+    await api.app(scope, receive, send)
+    return state
+
+
+def make_file(p: Path, size: int) -> None:
+    line = (json.dumps({"type": "annotate", "ts": "2025-09-20T10:00:00.000Z", "note": "x" * 180}) + "\n").encode()
+    with p.open("wb") as fh:
+        block = line * ((1 << 20) // len(line))
+        left = size
+        while left > 0:
+            fh.write(block[:left])
+            left -= len(block[:left])
+
+
+async def measure(rel: str, size: int, raw: bool) -> dict:
+    q = f"path={rel}&" + ("raw=true" if raw else f"max_bytes={size}")
+    t0 = time.perf_counter()
+    with Sampler() as s:
+        st = await get("/api/files/read", q)
+    dt = time.perf_counter() - t0
+    return {"status": st["status"], "body_mb": round(st["bytes"] / (1 << 20), 1),
+            "mb_s": round(size / (1 << 20) / dt, 1), "rss_growth_mb": round(s.peak - s.base, 1)}
+
+
+async def protocol(rel: str, fp: Path) -> dict:
+    data = fp.read_bytes()[:1 << 20]
+    r = await get("/api/files/read", f"path={rel}&raw=true", {"range": "bytes=100-199"}, keep=True)
+    etag = r["headers"].get("etag", "")
+    rng_ok = r["status"] == 206 and r["body"] == data[100:200] and r["headers"].get("content-range", "").startswith("bytes 100-199/")
+    stale = await get("/api/files/read", f"path={rel}&raw=true", {"range": "bytes=0-9", "if-range": '"stale"'})
+    nm = await get("/api/files/read", f"path={rel}&raw=true", {"if-none-match": etag})
+    return {
+        "range_206": rng_ok,
+        "if_range_stale_200": stale["status"] == 200,
+        "if_none_match_304": nm["status"] == 304 and nm["bytes"] == 0,
+        "content_type": r["headers"].get("content-type"),
+    }
+
+
+async def main_async(sizes) -> dict:
+    res: dict = {"json": {}, "raw": {}}
+    for mb in sizes:
+        fp = TMP / f"events_{mb}mb.jsonl"
+        make_file(fp, mb << 20)
+        rel = api.relpath(fp)
+        res["raw"][f"{mb}MB"] = await measure(rel, mb << 20, True)
+        res["json"][f"{mb}MB"] = await measure(rel, mb << 20, False)
+        fp.unlink()
+    fp = TMP / "events_small.jsonl"
+    make_file(fp, 1 << 20)
+    res["checks"] = await protocol(api.relpath(fp), fp)
+    return res
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="16,64,256", help="MB, comma-separated")
+    ap.add_argument("--max-growth-mb", type=float, default=32.0)
+    args = ap.parse_args(argv)
+    TMP.mkdir(parents=True, exist_ok=True)
+    try:
+        res = asyncio.run(main_async([int(x) for x in args.sizes.split(",") if x.strip()]))
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
+    c = res["checks"]
+    ok = (all(r["status"] == 200 for r in res["raw"].values())
+          and max(r["rss_growth_mb"] for r in res["raw"].values()) <= args.max_growth_mb
+          and c["range_206"] and c["if_range_stale_200"] and c["if_none_match_304"]
+          and (c["content_type"] or "").startswith("application/x-ndjson"))
+    res["ok"] = ok
+    print(json.dumps(res, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+/api/files/view — time-to-first-byte vs file size, whole-file vs windowed rendering (ST-1206)
+
+Writes throwaway JSONL logs of growing size under status/evidence/, then for each size:
+- legacy: the previous handler's work (read_text → encode → splitlines → escape every kept line),
+  timed directly (it built the full page before sending anything)
+- windowed: GET /api/files/view?path=<file>#L<middle> through the ASGI app — TTFB (first body
+  chunk) and total, cold (first request builds the line index) and warm (index reused)
+Also checks the anchor line is rendered/highlighted, the window headers, and that fragment=1
+returns the next window's rows, and that reader threads bisecting a .jsonl log while a writer
+appends to it (index extended under them) always get the line they asked for.
+
+Usage:
+  python scripts/tests/files_view_bench.py [--sizes 1,16,128]
+
+Exit code 0 = warm TTFB at the largest size ≤ --max-ttfb-ratio × the smallest, and checks pass.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import html
+import json
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ.setdefault("GG_MIGRATE_ON_STARTUP", "0")
+os.environ.setdefault("GG_REVALIDATE_WORKER", "0")
+
+from app import api  # noqa: E402
+from app.line_index import LineIndexCache  # noqa: E402
+
+TMP = PROJECT_ROOT / "status" / "evidence" / "_bench_files_view"
+
+
+def legacy_render(fp: Path, max_bytes: int = 200_000) -> int:
+    text = fp.read_text(encoding="utf-8", errors="replace")
+    if len(text.encode("utf-8")) > max_bytes:
+        kept, approx = [], 0
+        for ln in text.splitlines():
+            bs = len((ln + "\n").encode("utf-8"))
+            if approx + bs > max_bytes:
+                break
+            kept.append(ln)
+            approx += bs
+        text = "\n".join(kept)
+    out = [f"<div id='L{i}'><span class='ln'>L{i}</span><pre>{html.escape(ln)}</pre></div>"
+           for i, ln in enumerate(text.splitlines(), start=1)]
+    return len("".join(out))
+
+
+async def get(query: str) -> dict:
+    state = {"status": None, "headers": {}, "ttfb": None, "body": b""}
+    t0 = time.perf_counter()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(msg):
+        if msg["type"] == "http.response.start":
+            state["status"] = msg["status"]
+            state["headers"] = {k.decode().lower(): v.decode() for k, v in msg.get("headers", [])}
+        elif msg["type"] == "http.response.body" and msg.get("body"):
+            if state["ttfb"] is None:
+                state["ttfb"] = time.perf_counter() - t0
+            state["body"] += msg["body"]
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/files/view", "raw_path": b"/api/files/view", "query_string": query.encode(),
+        "headers": [], "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 8000), "root_path": "",
+    }
+    await api.app(scope, receive, send)
+    state["total"] = time.perf_counter() - t0
+    return state
+
+
+def make_file(p: Path, size: int) -> int:
+    n = 0
+    with p.open("w", encoding="utf-8") as fh:
+        while fh.tell() < size:
+            fh.write(json.dumps({"i": n, "type": "annotate", "note": "메모 " + "x" * 120}, ensure_ascii=False) + "\n")
+            n += 1
+    return n
+
+
+def growing_log(seconds: float = 2.0, readers: int = 4) -> dict:
+    """Writer appends {"i": n} lines; readers read random complete lines through a shared cache."""
+    fp = TMP / "growing.jsonl"
+    cache = LineIndexCache(root=TMP / "lidx")
+    n = make_file(fp, 4 << 20)
+    stop = time.monotonic() + seconds
+    stats = {"reads": 0, "wrong": 0, "errors": 0, "extended": 0}
+
+    def writer():
+        i = n
+        with fp.open("a", encoding="utf-8") as fh:
+            while time.monotonic() < stop:
+                for _ in range(200):
+                    fh.write(json.dumps({"i": i, "note": "y" * 300}) + "\n")
+                    i += 1
+                fh.flush()
+
+    def reader(seed: int):
+        rng = random.Random(seed)
+        while time.monotonic() < stop:
+            try:
+                ix = cache.get(fp)
+                k = rng.randint(1, max(1, ix.newlines))
+                rows, _ = ix.read_lines(k, 1)
+                stats["reads"] += 1
+                if json.loads(rows[0])["i"] != k - 1:
+                    stats["wrong"] += 1
+            except Exception:
+                stats["errors"] += 1
+
+    ts = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(s,)) for s in range(readers)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    stats["extended"] = cache.counters["extended"]
+    return stats
+
+
+def ms(x: float) -> float:
+    return round(x * 1000, 2)
+
+
+async def main_async(sizes) -> dict:
+    res: dict = {}
+    checks: dict = {}
+    for mb in sizes:
+        fp = TMP / f"events_{mb}mb.jsonl"
+        n = make_file(fp, mb << 20)
+        mid = n // 2
+        t0 = time.perf_counter()
+        legacy_render(fp)
+        legacy = time.perf_counter() - t0
+        q = "path=" + api.relpath(fp) + f"%23L{mid}-{mid + 2}"
+        cold = await get(q)
+        warm = min([await get(q) for _ in range(5)], key=lambda s: s["ttfb"])
+        res[f"{mb}MB"] = {"lines": n, "legacy_full_render_ms": ms(legacy), "cold_ttfb_ms": ms(cold["ttfb"]),
+                          "warm_ttfb_ms": ms(warm["ttfb"]), "warm_total_ms": ms(warm["total"]),
+                          "page_kb": round(len(warm["body"]) / 1024, 1)}
+        body = warm["body"].decode()
+        end = int(warm["headers"]["x-window-end"])
+        frag = await get(q + f"&start={end + 1}&count=50&fragment=1")
+        checks[f"{mb}MB"] = (
+            f"<div id='L{mid}' class='hl'>" in body
+            and warm["headers"]["x-lines-total"] == str(n)
+            and frag["body"].decode().startswith(f"<div id='L{end + 1}'")
+            and frag["headers"]["x-window-end"] == str(end + 50)
+        )
+    res["growing_log"] = g = growing_log()
+    checks["growing_log_consistent"] = g["reads"] > 0 and g["extended"] > 0 and not g["wrong"] and not g["errors"]
+    res["checks"] = checks
+    return res
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1,16,128", help="MB, comma-separated")
+    ap.add_argument("--max-ttfb-ratio", type=float, default=3.0)
+    args = ap.parse_args(argv)
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    TMP.mkdir(parents=True, exist_ok=True)
+    try:
+        res = asyncio.run(main_async(sizes))
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
+    small, big = res[f"{sizes[0]}MB"]["warm_ttfb_ms"], res[f"{sizes[-1]}MB"]["warm_ttfb_ms"]
+    ok = big <= max(small, 1.0) * args.max_ttfb_ratio and all(res["checks"].values())
+    res["ok"] = ok
+    print(json.dumps(res, indent=2, ensure_ascii=False))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Gate audit chain — multi-process stress check (ST-1204)
+
+Spawns N worker processes that append to the same day's audit.jsonl through
+app.gate_utils.AuditWriter, then verifies that the chain is linear:
+- every line's prev_hash equals the previous line's this_hash (no forks)
+- line count == workers * appends
+- verify_audit_chain() reports no break
+- fsync=batch: a lone append (no later append to close its window) is still fsynced by the
+  idle timer within a few GATE_AUDIT_FSYNC_MS
+
+Usage:
+  python scripts/tests/gate_audit_stress.py [--workers 8] [--appends 200] [--fsync batch|always|off]
+
+Writes into a temp directory (never touches status/evidence). Exit code 0 = PASS.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import gate_utils  # noqa: E402
+from app.gate_utils import AuditWriter, verify_audit_chain  # noqa: E402
+
+TS = "2025-01-01T00:00:00Z"  # pin every append to one day file
+
+
+def _worker(root: str, wid: int, n: int, fsync: str) -> None:
+    w = AuditWriter(root=Path(root), fsync=fsync)
+    for i in range(n):
+        w.append(actor=f"w{wid}", action="STRESS", gate_id=f"{wid}-{i}", meta={"w": wid, "i": i}, ts_iso=TS)
+    w.close()
+
+
+def idle_sync(root: Path, fsync_ms: int = 50) -> dict:
+    """A batch-mode append inside an open window, then silence: count fsyncs (os.fsync wrapped)."""
+    synced = []
+    real = gate_utils.os.fsync
+    w = AuditWriter(root=root, fsync="batch", fsync_ms=fsync_ms, fsync_max=1000)
+    w.append(actor="idle", action="STRESS", gate_id="open", meta={}, ts_iso=TS)
+    w.flush()  # window starts now
+    gate_utils.os.fsync = lambda fd: (synced.append(time.perf_counter()), real(fd))[1]
+    try:
+        t0 = time.perf_counter()
+        r = w.append(actor="idle", action="STRESS", gate_id="lone", meta={}, ts_iso=TS)
+        time.sleep(fsync_ms * 3 / 1000)
+    finally:
+        gate_utils.os.fsync = real
+        w.close()
+    return {"synced_inline": r["synced"], "idle_fsyncs": len(synced),
+            "after_ms": round((synced[0] - t0) * 1000, 1) if synced else None}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--appends", type=int, default=200)
+    ap.add_argument("--fsync", default="batch", choices=["batch", "always", "off"])
+    args = ap.parse_args(argv)
+
+    root = Path(tempfile.mkdtemp(prefix="gate_audit_stress_"))
+    ctx = mp.get_context("spawn")
+    t0 = time.perf_counter()
+    procs = [ctx.Process(target=_worker, args=(str(root), w, args.appends, args.fsync)) for w in range(args.workers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - t0
+
+    af = root / "20250101" / "audit.jsonl"
+    lines = af.read_text(encoding="utf-8").splitlines()
+    prev = "0" * 64
+    forks = 0
+    for ln in lines:
+        obj = json.loads(ln)
+        if obj["prev_hash"] != prev:
+            forks += 1
+        prev = obj["this_hash"]
+    ver = verify_audit_chain(path=af, incremental=False)
+    expected = args.workers * args.appends
+    idle = idle_sync(root / "idle")
+    ok = forks == 0 and len(lines) == expected and ver["ok"] and not idle["synced_inline"] and idle["idle_fsyncs"] == 1
+    print(json.dumps({
+        "ok": ok,
+        "workers": args.workers,
+        "appends_per_worker": args.appends,
+        "fsync": args.fsync,
+        "lines": len(lines),
+        "expected": expected,
+        "forks": forks,
+        "verify": ver,
+        "idle_sync": idle,
+        "elapsed_sec": round(elapsed, 3),
+        "appends_per_sec": round(expected / elapsed, 1) if elapsed else None,
+        "path": str(af),
+    }, ensure_ascii=False, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
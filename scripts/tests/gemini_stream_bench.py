@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Chat gateway — Gemini streamGenerateContent replay tests + TTFT benchmark (ST-1206)
+
+The local mock provider (scripts/tests/mock_llm_server.py, Gemini routes) serves:
+- models/gemini-fixture-<name>:streamGenerateContent → scripted replay of
+  scripts/tests/fixtures/gemini_sse/<name>.sse event by event (--event-ms apart), each event
+  written in two TCP chunks split mid-line
+- models/gemini-synth:{generateContent,streamGenerateContent} → --tokens tokens at --token-ms each;
+  the non-streaming answer arrives after the full generation time, like the live API
+- models/gemini-flaky:streamGenerateContent → error_first.sse (an in-stream 503 before any text)
+  on the first request, basic.sse afterwards
+
+Checks:
+1) every fixture parses to its expected text (CRLF/LF framing, multi-line data, comments,
+   Korean split across events, safety stop); error_midstream yields its text then raises
+   an in-stream 503 before the first chunk is retried like an HTTP 503 (and counted by the breaker)
+2) request mapping: assistant → "model" role, system → systemInstruction, temperature passed
+3) TTFT: old path (generateContent, then one synthetic chunk) vs call_gemini_stream
+
+Usage:
+  python scripts/tests/gemini_stream_bench.py [--runs 10] [--tokens 40] [--token-ms 15] [--event-ms 5]
+
+Exit code 0 = all fixtures matched and streaming TTFT beat the one-shot path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault("GEMINI_API_KEY", "bench")
+
+from gumgang_0_5.backend.app.api.routes import chat_gateway as gw  # noqa: E402
+from mock_llm_server import Latency, MockLLMServer  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "gemini_sse"
+EXPECTED = {
+    "basic": "The write-ahead log records every change before it reaches the database file, "
+             "so readers never block writers.",
+    "korean_lf": "금강 회의록은 이벤트 로그에 순서대로 기록됩니다.",
+    "multiline_comments": "Alpha Beta",
+    "safety_stop": "I can help with",
+}
+
+
+def _pct(vals, p):
+    s = sorted(vals)
+    return round(s[min(len(s) - 1, int(len(s) * p))] * 1000, 2) if s else None
+
+
+def _req(model: str) -> gw.ChatRequest:
+    return gw.ChatRequest(model=model, temperature=0, messages=[
+        gw.Msg(role="system", content="Be brief."),
+        gw.Msg(role="user", content="What is WAL?"),
+        gw.Msg(role="assistant", content="A log."),
+        gw.Msg(role="user", content="More detail."),
+    ])
+
+
+async def main_async(args) -> dict:
+    mock = await MockLLMServer(ttft="0", token_ms=str(args.event_ms), tokens=args.tokens).start()
+    mock.record = True
+    gw.GEMINI_BASE = mock.base_urls()["GEMINI_BASE_URL"]
+    res: dict = {"fixtures": {}}
+    try:
+        for name, want in EXPECTED.items():
+            mock.script(f"gemini-fixture-{name}", FIXTURES / f"{name}.sse")
+            chunks = [c async for c in gw.route_to_provider_stream(_req(f"gemini-fixture-{name}"))]
+            res["fixtures"][name] = {"chunks": len(chunks), "match": "".join(chunks) == want}
+        got, err = [], None
+        mock.script("gemini-fixture-error_midstream", FIXTURES / "error_midstream.sse")
+        try:
+            async for c in gw.call_gemini_stream(_req("gemini-fixture-error_midstream")):
+                got.append(c)
+        except RuntimeError as e:
+            err = str(e)
+        res["fixtures"]["error_midstream"] = {"chunks": len(got), "match": got == ["Partial answer"] and "UNAVAILABLE" in (err or ""),
+                                              "error": err}
+        gw.PROVIDER_HEALTH.clear()
+        gw.RETRY_BASE_SEC = 0.01
+        mock.script("gemini-flaky", FIXTURES / "error_first.sse", FIXTURES / "basic.sse")
+        text = "".join([c async for c in gw.route_to_provider_stream(_req("gemini-flaky"))])
+        h = gw.PROVIDER_HEALTH["gemini"]
+        res["error_before_first_chunk"] = {"text_ok": text == EXPECTED["basic"], "upstream_requests": sum(r["model"] == "gemini-flaky" for r in mock.log),
+                                           "retries": h.counters["retries"], "failures": h.counters["failures"]}
+
+        b = mock.log[-1]["body"]
+        res["request_mapping"] = {
+            "roles": [c["role"] for c in b.get("contents", [])],
+            "system": (b.get("systemInstruction") or {}).get("parts", [{}])[0].get("text"),
+            "temperature": (b.get("generationConfig") or {}).get("temperature"),
+        }
+
+        mock.token_ms, mock.record = Latency(str(args.token_ms)), False
+        old_ttft, new_ttft, new_total = [], [], []
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            text = await gw.call_gemini(_req("gemini-synth"))  # the pre-streaming path: one final chunk
+            assert text
+            old_ttft.append(time.perf_counter() - t0)
+            t0, first = time.perf_counter(), None
+            async for _c in gw.call_gemini_stream(_req("gemini-synth")):
+                if first is None:
+                    first = time.perf_counter() - t0
+            new_ttft.append(first)
+            new_total.append(time.perf_counter() - t0)
+        res["ttft"] = {"tokens": args.tokens, "token_ms": args.token_ms,
+                       "one_shot_p50_ms": _pct(old_ttft, 0.5), "stream_p50_ms": _pct(new_ttft, 0.5),
+                       "stream_p95_ms": _pct(new_ttft, 0.95), "stream_total_p50_ms": _pct(new_total, 0.5)}
+    finally:
+        await gw.PROVIDER_CLIENTS.aclose()
+        await mock.stop()
+    return res
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--tokens", type=int, default=40)
+    ap.add_argument("--token-ms", type=float, default=15.0)
+    ap.add_argument("--event-ms", type=float, default=5.0)
+    args = ap.parse_args(argv)
+
+    res = asyncio.run(main_async(args))
+    t = res["ttft"]
+    ok = (all(f["match"] for f in res["fixtures"].values())
+          and res["error_before_first_chunk"] == {"text_ok": True, "upstream_requests": 2, "retries": 1, "failures": 1}
+          and res["request_mapping"] == {"roles": ["user", "model", "user"], "system": "Be brief.", "temperature": 0.0}
+          and t["stream_p50_ms"] < t["one_shot_p50_ms"] / 4)
+    res["ok"] = ok
+    print(json.dumps(res, indent=2, ensure_ascii=False))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Meeting event log — sustained ingest + read benchmark (ST-1206)
+
+In a throwaway directory:
+1) preload: N events into a meeting log (app/event_log.py), plus the same bytes for the legacy path
+2) sustained: ~100 events/sec for --seconds through
+     legacy = append_jsonl (open/append/close) + index.json rewrite per event
+     indexed = EventLog.append + index.json snapshot every 100 events (MeetingStore policy)
+   while a poller reads `after=<last seq>` every 100 ms (indexed only) → append p50/p99/max,
+   achieved rate, poll latency and whether the poller saw every event exactly once
+3) reads at N events: tail(200) and a mid-log range (offset N/2, 200) vs the legacy tail
+   (backwards block scan) and a line scan to the same offset
+4) recovery: append raw lines behind the index's back (pre-index writer), reopen,
+   check count/offsets
+
+Usage:
+  python scripts/tests/meeting_events_bench.py [--preload 100000] [--seconds 10] [--rate 100]
+
+Exit code 0 = poller saw every event once and recovery re-indexed the foreign lines.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.event_log import EventLog  # noqa: E402
+
+
+def _pct(vals, p):
+    s = sorted(vals)
+    return round(s[min(len(s) - 1, int(len(s) * p))] * 1000, 3) if s else None
+
+
+def _event(i: int) -> dict:
+    kinds = ("capture", "annotate", "capture_upload", "record_start", "record_stop")
+    return {"type": kinds[i % 5], "ts": f"2025-09-20T10:{(i // 60) % 60:02d}:{i % 60:02d}.000Z",
+            "meeting_id": "BENCH", "note": f"event {i} " + "x" * (i % 80), "mode": "NORMAL"}
+
+
+def legacy_append(mdir: Path, ev: dict) -> None:
+    data = (json.dumps(ev, ensure_ascii=False) + "\n").encode("utf-8")
+    with (mdir / "events.jsonl").open("ab") as f:
+        f.write(data)
+    index = {"meeting_id": "BENCH", "last_ts": ev["ts"], "updated_at": ev["ts"]}
+    (mdir / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def legacy_tail(path: Path, limit: int) -> list:
+    """The pre-index _tail_lines (backwards 4 KiB blocks, prepend)."""
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = bytearray()
+        while pos > 0 and data.count(b"\n") <= limit:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            data[:0] = f.read(step)
+    return [json.loads(x) for x in data.decode("utf-8", "ignore").splitlines()[-limit:]]
+
+
+def legacy_range(path: Path, offset: int, limit: int) -> list:
+    out = []
+    with path.open("rb") as f:
+        for i, ln in enumerate(f):
+            if i >= offset + limit:
+                break
+            if i >= offset:
+                out.append(json.loads(ln))
+    return out
+
+
+def _timed(fn, runs=20):
+    ts = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        ts.append(time.perf_counter() - t0)
+    return {"p50_ms": _pct(ts, 0.5), "max_ms": round(max(ts) * 1000, 3)}
+
+
+def sustained(mode: str, mdir: Path, start_i: int, seconds: float, rate: float) -> dict:
+    log = EventLog(mdir / "events.jsonl") if mode == "indexed" else None
+    lat = []
+    seen = []
+    stop = threading.Event()
+    poll_lat = []
+
+    def poller():
+        last = log.count - 1
+        while not stop.is_set() or log.refresh() - 1 > last:
+            t0 = time.perf_counter()
+            rows = log.read(last + 1, 2000)
+            poll_lat.append(time.perf_counter() - t0)
+            if rows:
+                seen.extend(s for s, _ in rows)
+                last = rows[-1][0]
+            stop.wait(0.1)
+
+    th = threading.Thread(target=poller) if log else None
+    first_seq = log.count if log else 0
+    if th:
+        th.start()
+    n = int(seconds * rate)
+    t_start = time.perf_counter()
+    for k in range(n):
+        due = t_start + k / rate
+        while time.perf_counter() < due:
+            time.sleep(min(0.002, max(0.0, due - time.perf_counter())))
+        ev = _event(start_i + k)
+        t0 = time.perf_counter()
+        if log is None:
+            legacy_append(mdir, ev)
+        else:
+            seq, _ = log.append(ev)
+            if seq % 100 == 0:  # MeetingStore snapshot policy
+                st = log.stats()
+                (mdir / "index.json").write_text(json.dumps(st, ensure_ascii=False, indent=2), encoding="utf-8")
+        lat.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - t_start
+    out = {"events": n, "rate": round(n / elapsed, 1), "append_p50_ms": _pct(lat, 0.5),
+           "append_p99_ms": _pct(lat, 0.99), "append_max_ms": round(max(lat) * 1000, 3)}
+    if th:
+        stop.set()
+        th.join()
+        out["poll_p50_ms"] = _pct(poll_lat, 0.5)
+        out["poller_exact"] = seen == list(range(first_seq, first_seq + n))
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--preload", type=int, default=100000)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--rate", type=float, default=100.0)
+    args = ap.parse_args(argv)
+
+    res: dict = {"preload": args.preload}
+    with tempfile.TemporaryDirectory() as td:
+        legacy_dir, idx_dir = Path(td) / "legacy", Path(td) / "indexed"
+        legacy_dir.mkdir()
+        idx_dir.mkdir()
+        lines = b"".join((json.dumps(_event(i), ensure_ascii=False) + "\n").encode() for i in range(args.preload))
+        (legacy_dir / "events.jsonl").write_bytes(lines)
+        (idx_dir / "events.jsonl").write_bytes(lines)
+        t0 = time.perf_counter()
+        log = EventLog(idx_dir / "events.jsonl")  # no index yet → replay builds it
+        res["index_build_sec"] = round(time.perf_counter() - t0, 3)
+
+        res["sustained"] = {
+            "legacy": sustained("legacy", legacy_dir, args.preload, args.seconds, args.rate),
+            "indexed": sustained("indexed", idx_dir, args.preload, args.seconds, args.rate),
+        }
+        total = log.refresh()
+        mid = total // 2
+        res["reads"] = {
+            "events": total,
+            "tail200_legacy": _timed(lambda: legacy_tail(legacy_dir / "events.jsonl", 200)),
+            "tail200_indexed": _timed(lambda: log.tail(200)),
+            "range_mid_legacy": _timed(lambda: legacy_range(legacy_dir / "events.jsonl", mid, 200), runs=5),
+            "range_mid_indexed": _timed(lambda: log.read(mid, 200)),
+        }
+        same = [e for _, e in log.read(mid, 200)] == legacy_range(idx_dir / "events.jsonl", mid, 200)
+
+        # recovery: a writer that bypasses the index (old code path) + reopen
+        with (idx_dir / "events.jsonl").open("ab") as f:
+            for i in range(3):
+                f.write((json.dumps({"type": "annotate", "ts": "foreign", "i": i}) + "\n").encode())
+        log.close()
+        log2 = EventLog(idx_dir / "events.jsonl")
+        tail = log2.tail(3)
+        recovered = log2.count == total + 3 and [e.get("i") for _, e in tail] == [0, 1, 2]
+        res["checks"] = {"range_matches_scan": same, "foreign_lines_reindexed": recovered}
+        log2.close()
+
+    ok = res["sustained"]["indexed"]["poller_exact"] and same and recovered
+    res["ok"] = ok
+    print(json.dumps(res, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Chat gateway — local mock LLM provider (OpenAI / Anthropic / Gemini wire formats) (ST-1206)
+
+One asyncio HTTP/1.1 keep-alive server that answers the three provider APIs the gateway calls,
+so the gateway can be load-tested without real keys or network:
+- OpenAI    POST /v1/chat/completions                       (stream: SSE chat.completion.chunk)
+- Anthropic POST /v1/messages                               (stream: message_start … message_stop)
+- Gemini    POST /v1beta/models/<m>:generateContent
+            POST /v1beta/models/<m>:streamGenerateContent?alt=sse
+- GET /stats (counters), GET /health
+
+Generation model: time to first token ~ --ttft, then one token (word) every ~ --token-ms, up to
+--tokens (or the request's max_tokens). Non-streaming answers arrive after the full generation
+time, like the live APIs. Latency specs: "40" (fixed ms), "uniform:20:80", "normal:40:10",
+"lognormal:40:0.5" (median ms, sigma).
+Tool calls: a request that carries tools and no tool result yet is answered with one call to
+--tool-name (or the first tool offered) with --tool-args; the follow-up turn gets text.
+Error injection (seeded): --error-rate answers --error-status with the provider's error body
+before generating; --midstream-error-rate breaks a stream halfway (OpenAI: connection dropped,
+Anthropic: "event: error", Gemini: {"error": …} event).
+Network: --connect-ms is charged once per new connection (TCP + TLS handshake stand-in);
+--slow-rate of the requests wait an extra --slow-ms before their first token (tail latency).
+
+Bench hooks (attributes, set between phases; scripts/tests/chat_*_bench.py, gemini_stream_bench.py):
+- script(model, *steps): the next requests for `model` ("*" = any) take one step each, in order —
+  an int answers that status with the provider's error body, a path replays a recorded SSE file
+  (e.g. scripts/tests/fixtures/gemini_sse/*.sse) event by event, --token-ms apart, each event
+  written in two chunks split mid-line
+- reply(req) → text or list of deltas, instead of the generated words
+- tool_plan [(name, args), …]: the calls of one tool step; tool_rounds: tool steps before text
+  (a request with tool_choice "none" always gets text)
+- pause_ms: one stall halfway through every stream (idle upstream)
+- record=True: log gets one entry per request {route, model, body, status, total, sent, aborted_at}
+
+Usage:
+  python scripts/tests/mock_llm_server.py [--port 9100] [--ttft lognormal:300:0.4] [--token-ms normal:20:5]
+                                          [--tokens 200] [--error-rate 0.01] [--error-status 503]
+                                          [--midstream-error-rate 0] [--connect-ms 0]
+                                          [--slow-rate 0] [--slow-ms 0] [--seed 7]
+  then start the backend with the printed OPENAI_BASE_URL / ANTHROPIC_BASE_URL / GEMINI_BASE_URL
+  (and any non-empty *_API_KEY values).
+
+Importable: MockLLMServer(...).start() in the driver's event loop (scripts/tests/chat_load_driver.py).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+WORDS = ("the gateway relays each token from the provider to the client while the pool keeps "
+         "connections warm and the cache answers repeated prompts").split()
+
+
+class Latency:
+    """Parsed latency spec; sample() returns seconds."""
+
+    def __init__(self, spec: str) -> None:
+        self.spec = str(spec)
+        kind, _, rest = self.spec.partition(":")
+        if not rest:
+            kind, rest = "fixed", kind
+        self.kind = kind
+        self.args = [float(x) for x in rest.split(":")]
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"unknown latency spec: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        a = self.args
+        if self.kind == "fixed":
+            ms = a[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(a[0], a[1])
+        elif self.kind == "normal":
+            ms = rng.gauss(a[0], a[1])
+        else:
+            ms = a[0] * math.exp(rng.gauss(0.0, a[1]))
+        return max(0.0, ms) / 1000
+
+
+class MockLLMServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, ttft: str = "40", token_ms: str = "8",
+                 tokens: int = 48, error_rate: float = 0.0, error_status: int = 503,
+                 midstream_error_rate: float = 0.0, tool_name: str = "now", tool_args: str = "{}",
+                 seed: int = 7, connect_ms: str = "0", slow_rate: float = 0.0, slow_ms: float = 0.0) -> None:
+        self.host, self.port = host, port
+        self.ttft, self.token_ms, self.connect_ms = Latency(ttft), Latency(token_ms), Latency(connect_ms)
+        self.tokens = tokens
+        self.error_rate, self.error_status = error_rate, error_status
+        self.midstream_error_rate = midstream_error_rate
+        self.slow_rate, self.slow_ms = slow_rate, slow_ms
+        self.tool_name, self.tool_args = tool_name, json.loads(tool_args or "{}")
+        self.tool_plan: List[Tuple[str, Dict[str, Any]]] = [(self.tool_name, self.tool_args)]
+        self.tool_rounds = 1
+        self.reply: Optional[Callable[[Dict[str, Any]], Union[str, List[str]]]] = None
+        self.pause_ms = 0.0
+        self.record = False
+        self.log: List[Dict[str, Any]] = []
+        self.scripts: Dict[str, List[Union[int, str, Path]]] = {}
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, int] = {
+            "connections": 0, "connections_closed": 0, "requests": 0, "streams": 0, "tool_calls": 0, "tokens": 0,
+            "errors_injected": 0, "midstream_errors": 0, "client_aborts": 0, "scripted": 0,
+        }
+        self.by_route: Dict[str, int] = {}
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    def script(self, model: str, *steps: Union[int, str, Path]) -> None:
+        self.scripts.setdefault(model, []).extend(steps)
+
+    # ------------------------------------------------------------------ lifecycle
+
+    async def start(self) -> "MockLLMServer":
+        self.server = await asyncio.start_server(self._conn, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def base_urls(self) -> Dict[str, str]:
+        return {"OPENAI_BASE_URL": f"{self.url}/v1", "ANTHROPIC_BASE_URL": self.url,
+                "GEMINI_BASE_URL": f"{self.url}/v1beta"}
+
+    # ------------------------------------------------------------------ HTTP
+
+    async def _conn(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats["connections"] += 1
+        await asyncio.sleep(self.connect_ms.sample(self.rng))
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, target = lines[0].split(" ")[:2]
+                n = 0
+                for ln in lines[1:]:
+                    if ln.lower().startswith("content-length:"):
+                        n = int(ln.split(":", 1)[1])
+                raw = await reader.readexactly(n) if n else b""
+                if not await self._dispatch(method, target, raw, reader, writer):
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.stats["connections_closed"] += 1
+            writer.close()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, status: int, body: Dict[str, Any]) -> None:
+        out = json.dumps(body).encode()
+        writer.write(b"HTTP/1.1 %d X\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+                     % (status, len(out), out))
+        await writer.drain()
+
+    @staticmethod
+    async def _chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+        await writer.drain()
+
+    async def _dispatch(self, method: str, target: str, raw: bytes, reader: asyncio.StreamReader,
+                        writer: asyncio.StreamWriter) -> bool:
+        path, _, query = target.partition("?")
+        if method == "GET":
+            if path == "/stats":
+                await self._send(writer, 200, {**self.stats, "by_route": self.by_route})
+            else:
+                await self._send(writer, 200 if path == "/health" else 404, {"ok": path == "/health"})
+            return True
+        try:
+            req = json.loads(raw or b"{}")
+        except ValueError:
+            await self._send(writer, 400, {"error": {"message": "invalid JSON"}})
+            return True
+        if path == "/v1/chat/completions":
+            kind, stream = "openai", bool(req.get("stream"))
+        elif path == "/v1/messages":
+            kind, stream = "anthropic", bool(req.get("stream"))
+        elif path.startswith("/v1beta/models/") and ":" in path:
+            kind, stream = "gemini", path.endswith(":streamGenerateContent")
+        else:
+            await self._send(writer, 404, {"error": {"message": f"no route {path}"}})
+            return True
+        route = f"{kind}{'.stream' if stream else ''}"
+        self.by_route[route] = self.by_route.get(route, 0) + 1
+        self.stats["requests"] += 1
+        model = req.get("model") or path.rsplit("/", 1)[-1].split(":")[0]
+        rec: Dict[str, Any] = {"route": route, "model": model, "body": req, "status": 200,
+                               "total": 0, "sent": 0, "aborted_at": None}
+        if self.record:
+            self.log.append(rec)
+
+        step = self._next_step(model)
+        if isinstance(step, int) or (step is None and self.rng.random() < self.error_rate):
+            rec["status"] = step if isinstance(step, int) else self.error_status
+            self.stats["scripted" if step is not None else "errors_injected"] += 1
+            await asyncio.sleep(self.ttft.sample(self.rng) / 4)
+            await self._send(writer, rec["status"], self._error_body(kind, rec["status"]))
+            return True
+        if step is not None:
+            self.stats["scripted"] += 1
+            return await self._replay(Path(step), rec, reader, writer)
+
+        tool = self._tool_for(kind, req)
+        toks = self._tokens_for(req)
+        n = rec["total"] = len(toks)
+        if tool is not None:
+            self.stats["tool_calls"] += len(tool)
+        first = self.ttft.sample(self.rng) + (self.slow_ms / 1000 if self.rng.random() < self.slow_rate else 0.0)
+        if not stream:
+            await asyncio.sleep(first + sum(self.token_ms.sample(self.rng) for _ in range(n - 1)))
+            self.stats["tokens"] += n
+            rec["sent"] = n
+            body = {"openai": self._openai_body, "anthropic": self._anthropic_body, "gemini": self._gemini_body}[kind]
+            await self._send(writer, 200, body(req, "".join(toks), tool))
+            return True
+
+        self.stats["streams"] += 1
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+        await writer.drain()
+        events = {"openai": self._openai_events, "anthropic": self._anthropic_events, "gemini": self._gemini_events}[kind]
+        fail_at = n // 2 if self.rng.random() < self.midstream_error_rate else -1
+        await asyncio.sleep(first)
+        i = 0
+        for ev in events(req, toks, tool):
+            if ev is None:  # token boundary
+                if i == fail_at:
+                    self.stats["midstream_errors"] += 1
+                    if kind == "openai":
+                        return False  # drop the connection mid-body
+                    await self._chunk(writer, self._midstream_error(kind))
+                    break
+                if i:
+                    await asyncio.sleep(self.token_ms.sample(self.rng))
+                if i and i == n // 2 and self.pause_ms:
+                    await asyncio.sleep(self.pause_ms / 1000)
+                i += 1
+                self.stats["tokens"] += 1
+                continue
+            if not await self._stream_chunk(rec, reader, writer, ev):
+                return False
+            rec["sent"] = i
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return True
+
+    async def _stream_chunk(self, rec: Dict[str, Any], reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter, data: bytes) -> bool:
+        """Write one chunk; False (and the abort recorded) once the client has hung up."""
+        try:
+            if reader.at_eof():
+                raise ConnectionResetError
+            await self._chunk(writer, data)
+            return True
+        except ConnectionError:
+            self.stats["client_aborts"] += 1
+            rec["aborted_at"] = time.perf_counter()
+            return False
+
+    def _next_step(self, model: str) -> Optional[Union[int, str, Path]]:
+        for key in (model, "*"):
+            if self.scripts.get(key):
+                return self.scripts[key].pop(0)
+        return None
+
+    async def _replay(self, fixture: Path, rec: Dict[str, Any], reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> bool:
+        """Stream a recorded SSE file, event by event, each split mid-line across two chunks."""
+        raw = fixture.read_bytes()
+        sep = b"\r\n\r\n" if b"\r\n\r\n" in raw else b"\n\n"
+        events = [p + sep for p in raw.split(sep) if p]
+        rec["total"] = len(events)
+        self.stats["streams"] += 1
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+        await writer.drain()
+        await asyncio.sleep(self.ttft.sample(self.rng))
+        for i, ev in enumerate(events):
+            if i:
+                await asyncio.sleep(self.token_ms.sample(self.rng))
+            cut = max(1, len(ev) // 2)
+            if not await self._stream_chunk(rec, reader, writer, ev[:cut]):
+                return False
+            await asyncio.sleep(0.001)
+            if not await self._stream_chunk(rec, reader, writer, ev[cut:]):
+                return False
+            rec["sent"] = i + 1
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return True
+
+    # ------------------------------------------------------------------ content
+
+    def _tokens_for(self, req: Dict[str, Any]) -> List[str]:
+        """The answer as stream deltas: reply(req) when set, else up to --tokens (or max_tokens) words."""
+        if self.reply is not None:
+            out = self.reply(req)
+            return (re.findall(r"\S+\s*", out) or [out]) if isinstance(out, str) else list(out)
+        cap = req.get("max_tokens") or (req.get("generationConfig") or {}).get("maxOutputTokens")
+        n = max(1, min(self.tokens, int(cap))) if cap else max(1, self.tokens)
+        return [self._text(1, i) for i in range(n)]
+
+    @staticmethod
+    def _text(n: int, start: int = 0) -> str:
+        return "".join(f"{WORDS[(start + i) % len(WORDS)]} " for i in range(n))
+
+    def _tool_for(self, kind: str, req: Dict[str, Any]) -> Optional[List[Tuple[str, Dict[str, Any]]]]:
+        """[(name, args), …] when the request offers tools, allows them and has had fewer than
+        tool_rounds tool steps."""
+        if kind == "openai":
+            names = [((t.get("function") or {}).get("name")) for t in req.get("tools") or []]
+            rounds = sum(1 for m in req.get("messages") or [] if m.get("role") == "assistant" and m.get("tool_calls"))
+            off = req.get("tool_choice") == "none"
+        elif kind == "anthropic":
+            names = [t.get("name") for t in req.get("tools") or []]
+            rounds = sum(1 for m in req.get("messages") or [] if m.get("role") == "assistant"
+                         and isinstance(m.get("content"), list) and any(b.get("type") == "tool_use" for b in m["content"]))
+            off = (req.get("tool_choice") or {}) in ("none", {"type": "none"})
+        else:
+            names = [f.get("name") for t in req.get("tools") or [] for f in t.get("functionDeclarations") or []]
+            rounds = sum(1 for c in req.get("contents") or [] if any("functionCall" in p for p in c.get("parts") or []))
+            off = ((req.get("toolConfig") or {}).get("functionCallingConfig") or {}).get("mode") == "NONE"
+        names = [x for x in names if x]
+        if not names or off or rounds >= self.tool_rounds:
+            return None
+        return [c for c in self.tool_plan if c[0] in names] or [(names[0], self.tool_args)]
+
+    @staticmethod
+    def _error_body(kind: str, status: int) -> Dict[str, Any]:
+        msg = f"injected {status}"
+        if kind == "openai":
+            return {"error": {"message": msg, "type": "server_error", "code": status}}
+        if kind == "anthropic":
+            return {"type": "error", "error": {"type": "overloaded_error", "message": msg}}
+        return {"error": {"code": status, "message": msg, "status": "UNAVAILABLE"}}
+
+    def _midstream_error(self, kind: str) -> bytes:
+        if kind == "anthropic":
+            ev = {"type": "error", "error": {"type": "overloaded_error", "message": "injected midstream"}}
+            return f"event: error\ndata: {json.dumps(ev)}\n\n".encode()
+        ev = {"error": {"code": 503, "message": "injected midstream", "status": "UNAVAILABLE"}}
+        return f"data: {json.dumps(ev)}\r\n\r\n".encode()
+
+    # OpenAI ----------------------------------------------------------------------
+
+    def _openai_body(self, req: Dict[str, Any], text: str, tool) -> Dict[str, Any]:
+        if tool is not None:
+            msg = {"role": "assistant", "content": None, "tool_calls": [{
+                "id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                "function": {"name": name, "arguments": json.dumps(args)}} for name, args in tool]}
+            finish = "tool_calls"
+        else:
+            msg, finish = {"role": "assistant", "content": text}, "stop"
+        return {"id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "object": "chat.completion", "created": int(time.time()),
+                "model": req.get("model"), "choices": [{"index": 0, "message": msg, "finish_reason": finish}],
+                "usage": {"prompt_tokens": 16, "completion_tokens": len(text.split()), "total_tokens": 16 + len(text.split())}}
+
+    def _openai_events(self, req: Dict[str, Any], toks: List[str], tool):
+        cid, created = f"chatcmpl-{uuid.uuid4().hex[:12]}", int(time.time())
+
+        def ev(delta: Dict[str, Any], finish: Optional[str] = None) -> bytes:
+            j = {"id": cid, "object": "chat.completion.chunk", "created": created, "model": req.get("model"),
+                 "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+            return f"data: {json.dumps(j)}\n\n".encode()
+
+        yield ev({"role": "assistant", "content": ""})
+        if tool is not None:
+            yield None
+            for k, (name, args) in enumerate(tool):
+                yield ev({"tool_calls": [{"index": k, "id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                                          "function": {"name": name, "arguments": ""}}]})
+                yield ev({"tool_calls": [{"index": k, "function": {"arguments": json.dumps(args)}}]})
+            yield ev({}, "tool_calls")
+        else:
+            for tok in toks:
+                yield None
+                yield ev({"content": tok})
+            yield ev({}, "stop")
+        yield b"data: [DONE]\n\n"
+
+    # Anthropic -------------------------------------------------------------------
+
+    def _anthropic_body(self, req: Dict[str, Any], text: str, tool) -> Dict[str, Any]:
+        if tool is not None:
+            content = [{"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:12]}", "name": name, "input": args}
+                       for name, args in tool]
+            stop = "tool_use"
+        else:
+            content, stop = [{"type": "text", "text": text}], "end_turn"
+        return {"id": f"msg_{uuid.uuid4().hex[:12]}", "type": "message", "role": "assistant", "model": req.get("model"),
+                "content": content, "stop_reason": stop,
+                "usage": {"input_tokens": 16, "output_tokens": len(text.split())}}
+
+    def _anthropic_events(self, req: Dict[str, Any], toks: List[str], tool):
+        def ev(j: Dict[str, Any]) -> bytes:
+            return f"event: {j['type']}\ndata: {json.dumps(j)}\n\n".encode()
+
+        msg = {"id": f"msg_{uuid.uuid4().hex[:12]}", "type": "message", "role": "assistant", "model": req.get("model"),
+               "content": [], "stop_reason": None, "usage": {"input_tokens": 16, "output_tokens": 1}}
+        yield ev({"type": "message_start", "message": msg})
+        if tool is not None:
+            yield None
+            for k, (name, args) in enumerate(tool):
+                yield ev({"type": "content_block_start", "index": k, "content_block": {
+                    "type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:12]}", "name": name, "input": {}}})
+                yield ev({"type": "content_block_delta", "index": k,
+                          "delta": {"type": "input_json_delta", "partial_json": json.dumps(args)}})
+                yield ev({"type": "content_block_stop", "index": k})
+            stop = "tool_use"
+        else:
+            yield ev({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+            for tok in toks:
+                yield None
+                yield ev({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": tok}})
+            yield ev({"type": "content_block_stop", "index": 0})
+            stop = "end_turn"
+        yield ev({"type": "message_delta", "delta": {"stop_reason": stop}, "usage": {"output_tokens": len(toks)}})
+        yield ev({"type": "message_stop"})
+
+    # Gemini ----------------------------------------------------------------------
+
+    @staticmethod
+    def _gemini_candidate(parts: List[Dict[str, Any]], finish: Optional[str] = None) -> Dict[str, Any]:
+        cand: Dict[str, Any] = {"content": {"parts": parts, "role": "model"}, "index": 0}
+        if finish:
+            cand["finishReason"] = finish
+        return {"candidates": [cand], "modelVersion": "mock"}
+
+    def _gemini_body(self, req: Dict[str, Any], text: str, tool) -> Dict[str, Any]:
+        parts = ([{"functionCall": {"name": name, "args": args}} for name, args in tool] if tool is not None
+                 else [{"text": text}])
+        j = self._gemini_candidate(parts, "STOP")
+        j["usageMetadata"] = {"promptTokenCount": 16, "candidatesTokenCount": len(text.split())}
+        return j
+
+    def _gemini_events(self, req: Dict[str, Any], toks: List[str], tool):
+        def ev(j: Dict[str, Any]) -> bytes:
+            return f"data: {json.dumps(j)}\r\n\r\n".encode()
+
+        if tool is not None:
+            yield None
+            yield ev(self._gemini_candidate([{"functionCall": {"name": name, "args": args}} for name, args in tool], "STOP"))
+            return
+        for i, tok in enumerate(toks):
+            yield None
+            yield ev(self._gemini_candidate([{"text": tok}], "STOP" if i == len(toks) - 1 else None))
+
+
+async def _serve(args) -> None:
+    srv = await MockLLMServer(args.host, args.port, **mock_kwargs(args)).start()
+    print(json.dumps({"listening": srv.url, "env": srv.base_urls()}, indent=2), flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await srv.stop()
+
+
+def mock_kwargs(args) -> Dict[str, Any]:
+    """MockLLMServer keyword arguments from an add_args() namespace."""
+    return {"ttft": args.ttft, "token_ms": args.token_ms, "tokens": args.tokens, "error_rate": args.error_rate,
+            "error_status": args.error_status, "midstream_error_rate": args.midstream_error_rate,
+            "tool_name": args.tool_name, "tool_args": args.tool_args, "seed": args.seed,
+            "connect_ms": args.connect_ms, "slow_rate": args.slow_rate, "slow_ms": args.slow_ms}
+
+
+def add_args(ap: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    ap.add_argument("--ttft", default="40", help="time to first token (ms or spec)")
+    ap.add_argument("--token-ms", default="8", help="gap between tokens (ms or spec)")
+    ap.add_argument("--tokens", type=int, default=48)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--error-status", type=int, default=503)
+    ap.add_argument("--midstream-error-rate", type=float, default=0.0)
+    ap.add_argument("--tool-name", default="now")
+    ap.add_argument("--tool-args", default="{}")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--connect-ms", default="0", help="delay charged on each new connection (ms or spec)")
+    ap.add_argument("--slow-rate", type=float, default=0.0, help="share of requests that get --slow-ms extra TTFT")
+    ap.add_argument("--slow-ms", type=float, default=0.0)
+    return ap
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9100)
+    args = add_args(ap).parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
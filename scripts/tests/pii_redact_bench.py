@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+PII redaction — throughput benchmark (ST-1204)
+
+Builds a synthetic corpus (mostly prose with sprinkled emails/phones/cards/RRNs),
+then measures MB/s for:
+- legacy: per-call pattern load + compile, finditer()+sub() per pattern on the
+  rewritten text (the pre-cache pii_scan_and_redact)
+- cached: pii_scan_and_redact (matcher cached by file mtime, one merged rewrite)
+- batch: redact_many over the whole corpus
+and checks that no planted PII value survives verbatim in the redacted output, including
+fixed cases where two patterns' hits overlap (OVERLAPS: every piece redacted, every pattern flagged).
+
+Usage:
+  python scripts/tests/pii_redact_bench.py [--docs 2000] [--doc-kb 4] [--seed 7]
+
+Exit code 0 = no leaks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.gate_utils import (  # noqa: E402
+    _compile_flags,
+    apply_strategy,
+    get_pii_matcher,
+    load_pii_patterns,
+    pii_scan_and_redact,
+    redact_many,
+)
+
+WORDS = (
+    "gate memory tier ultra long proposal evidence checkpoint meeting summary "
+    "roadmap sitegraph import revalidate approve reject audit chain hash token"
+).split()
+SAMPLES = [
+    "john.doe{n}@example.com",
+    "+82 10-{a:04d}-{b:04d}",
+    "4111 1111 1111 {a:04d}",
+    "900101-{c:07d}",
+]
+
+# (text, values that must not survive, pattern kinds that must be flagged)
+OVERLAPS = [
+    ("call 123 4567.john.doe@example.com", ["john.doe", "123 4567", "4567.john"], {"email", "phone"}),
+]
+
+
+def make_corpus(docs: int, doc_kb: int, seed: int) -> list:
+    """[(text, [planted PII values])]"""
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(docs):
+        buf = []
+        planted = []
+        size = 0
+        while size < doc_kb * 1024:
+            if rnd.random() < 0.02:
+                w = rnd.choice(SAMPLES).format(n=rnd.randint(0, 999), a=rnd.randint(0, 9999),
+                                               b=rnd.randint(0, 9999), c=rnd.randint(0, 9999999))
+                planted.append(w)
+            else:
+                w = rnd.choice(WORDS)
+            buf.append(w)
+            size += len(w) + 1
+        out.append((" ".join(buf), planted))
+    return out
+
+
+def legacy_scan(text: str) -> str:
+    out = text
+    for p in load_pii_patterns():
+        comp = re.compile(p.regex, _compile_flags(p.flags))
+        if not list(comp.finditer(out)):  # pre-cache code collected flags, then sub()
+            continue
+        out = comp.sub(lambda m, _p=p: apply_strategy(_p.strategy, m), out)
+    return out
+
+
+def _mbps(nbytes: int, sec: float) -> float:
+    return round(nbytes / (1024 * 1024) / sec, 2) if sec else 0.0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=2000)
+    ap.add_argument("--doc-kb", type=int, default=4)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    corpus = make_corpus(args.docs, args.doc_kb, args.seed)
+    texts = [t for t, _ in corpus]
+    nbytes = sum(len(t.encode("utf-8")) for t in texts)
+    matcher = get_pii_matcher()
+
+    res = {}
+    t0 = time.perf_counter()
+    for t in texts:
+        legacy_scan(t)
+    res["legacy"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    outs = [pii_scan_and_redact(t)["redacted_text"] for t in texts]
+    res["cached"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    redact_many(texts)
+    res["batch"] = time.perf_counter() - t0
+
+    leaks = sum(1 for out, (_t, planted) in zip(outs, corpus) for v in planted if v in out)
+    overlaps = []
+    for text, values, kinds in OVERLAPS:
+        r = pii_scan_and_redact(text)
+        bad = [v for v in values if v in r["redacted_text"]]
+        missing = sorted(kinds - {f["kind"] for f in r["flags"]})
+        leaks += len(bad) + len(missing)
+        overlaps.append({"text": text, "redacted": r["redacted_text"], "leaked": bad, "unflagged": missing})
+    print(json.dumps({
+        "ok": leaks == 0,
+        "docs": len(texts),
+        "bytes": nbytes,
+        "patterns": [p.id for p, _ in matcher.compiled],
+        "mb_per_sec": {k: _mbps(nbytes, v) for k, v in res.items()},
+        "elapsed_sec": {k: round(v, 3) for k, v in res.items()},
+        "speedup_vs_legacy": round(res["legacy"] / res["cached"], 2) if res["cached"] else None,
+        "leaks": leaks,
+        "overlaps": overlaps,
+    }, ensure_ascii=False, indent=2))
+    return 0 if leaks == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+PySpark runner — submission latency + job lifecycle benchmark (ST-1206)
+
+Against a throwaway SQLite DB (migrated to head) and a throwaway job directory, through the ASGI app:
+1) legacy: time a synchronous run (wait=true) per job duration → latency grows with the job
+2) queued: POST /api/mcp/pyspark/run for jobs sleeping --durations seconds → submit p50/p99 should
+   stay flat regardless of duration (the handler only inserts a row and enqueues)
+3) lifecycle: exit code ≠ 0 → failed, timeout_sec → timeout, cancel of a running job → cancelled,
+   stdout visible via GET /api/mcp/pyspark/jobs/{id} while the job is still running,
+   a full queue → 429, no job processes left behind
+4) evidence: every wait=true response carries its evidence path, and GET /jobs/{id} still shows it
+   after a restart (a fresh JobQueue on the same DB)
+
+Usage:
+  python scripts/tests/pyspark_queue_bench.py [--durations 0.1,2,5] [--submits 20]
+
+Exit code 0 = flat submit latency (p99 < --max-submit-ms) and every lifecycle check passed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+TMP = Path(tempfile.mkdtemp(prefix="gg_pyspark_bench_"))
+os.environ["GG_SQLITE_DB"] = str(TMP / "bench.db")
+os.environ.setdefault("GG_REVALIDATE_WORKER", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import api, migrations  # noqa: E402
+from app.job_queue import JobQueue  # noqa: E402
+
+JOB = """import sys, time
+print("started", flush=True)
+time.sleep(float(sys.argv[1]))
+print("finished", flush=True)
+sys.exit(int(sys.argv[2]) if len(sys.argv) > 2 else 0)
+"""
+
+
+def _pct(vals, p):
+    s = sorted(vals)
+    return round(s[min(len(s) - 1, int(len(s) * p))] * 1000, 2) if s else None
+
+
+def _wait(c, jid, timeout=30.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        j = c.get(f"/api/mcp/pyspark/jobs/{jid}").json()["job"]
+        if j["status"] not in ("queued", "running"):
+            return j
+        time.sleep(0.1)
+    return j
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--durations", default="0.1,2,5", help="job sleep seconds, comma-separated")
+    ap.add_argument("--submits", type=int, default=20, help="submissions per duration")
+    ap.add_argument("--max-submit-ms", type=float, default=100.0)
+    args = ap.parse_args(argv)
+    durations = [float(x) for x in args.durations.split(",") if x.strip()]
+
+    migrations.migrate_sqlite(os.environ["GG_SQLITE_DB"])
+    jobs_dir = TMP / "jobs"
+    jobs_dir.mkdir()
+    (jobs_dir / "sleep_job.py").write_text(JOB, encoding="utf-8")
+    api.PYSPARK_JOBS_ROOT = jobs_dir
+    api.PYSPARK_EVIDENCE_DIR = TMP / "evidence"
+    api.PYSPARK_JOBS = JobQueue(lambda: os.environ["GG_SQLITE_DB"], TMP / "evidence" / "jobs", workers=2,
+                                max_queued=args.submits * len(durations) + 8, on_finish=api._pyspark_evidence)
+    script = str(jobs_dir / "sleep_job.py")
+    res: dict = {"durations": durations, "submits": args.submits}
+
+    with TestClient(api.app) as c:
+        def run(body):
+            t0 = time.perf_counter()
+            r = c.post("/api/mcp/pyspark/run", json={"script": script, **body})
+            return r, time.perf_counter() - t0
+
+        legacy = {str(d): run({"args": [str(d)], "wait": True}) for d in durations}
+        res["legacy_wait_ms"] = {d: round(dt * 1000, 1) for d, (_, dt) in legacy.items()}
+        waited = [r.json() for r, _ in legacy.values()]
+
+        submit = {}
+        ids = []
+        for d in durations:
+            lat = []
+            for _ in range(args.submits):
+                r, dt = run({"args": [str(d)], "timeout_sec": 60})
+                lat.append(dt)
+                ids.append(r.json()["job_id"])
+            submit[str(d)] = {"p50_ms": _pct(lat, 0.5), "p99_ms": _pct(lat, 0.99)}
+        res["submit"] = submit
+        for jid in ids:  # drain before the lifecycle checks
+            c.post(f"/api/mcp/pyspark/jobs/{jid}/cancel")
+
+        checks = {}
+        r, _ = run({"args": ["0.1", "3"]})
+        checks["failed_rc3"] = (lambda j: j["status"] == "failed" and j["rc"] == 3)(_wait(c, r.json()["job_id"]))
+        r, _ = run({"args": ["30"], "timeout_sec": 1})
+        checks["timeout"] = _wait(c, r.json()["job_id"])["status"] == "timeout"
+        r, _ = run({"args": ["30"]})
+        jid = r.json()["job_id"]
+        live = ""
+        for _ in range(50):
+            live = c.get(f"/api/mcp/pyspark/jobs/{jid}").json()["job"]["stdout"]
+            if "started" in live:
+                break
+            time.sleep(0.1)
+        checks["live_stdout"] = "started" in live
+        c.post(f"/api/mcp/pyspark/jobs/{jid}/cancel")
+        checks["cancel_running"] = _wait(c, jid)["status"] == "cancelled"
+        q = api.PYSPARK_JOBS
+        q.max_queued, q._q.maxsize = 2, 2
+        codes = [run({"args": ["5"]})[0].status_code for _ in range(6)]
+        checks["queue_full_429"] = 429 in codes
+        for j in q.list("pyspark", 10):
+            if j["status"] in ("queued", "running"):
+                q.cancel(j["id"])
+        time.sleep(1.5)
+        checks["evidence_latest"] = c.get("/api/mcp/pyspark/latest").json()["data"]["job_id"] is not None
+        checks["evidence_on_wait"] = all(w["evidence"] and (PROJECT_ROOT / w["evidence"]).exists() for w in waited)
+        res["queue"] = q.status()
+        q.stop()
+        api.PYSPARK_JOBS = JobQueue(lambda: os.environ["GG_SQLITE_DB"], TMP / "evidence" / "jobs", workers=1,
+                                    on_finish=api._pyspark_evidence)
+        after = [c.get(f"/api/mcp/pyspark/jobs/{w['job_id']}", params={"log_bytes": 0}).json()["job"] for w in waited]
+        checks["evidence_after_restart"] = all(a["evidence"] == w["evidence"] for a, w in zip(after, waited))
+    left = subprocess.run(["pgrep", "-f", str(jobs_dir / "sleep_job.py")], capture_output=True, text=True).stdout.split()
+    checks["no_orphans"] = not left
+    res["checks"] = checks
+
+    flat = max(v["p99_ms"] for v in submit.values()) < args.max_submit_ms
+    ok = flat and all(checks.values())
+    res["ok"] = ok
+    print(json.dumps(res, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Thread search — FTS5 latency benchmark (ST-1204)
+
+Builds a throwaway SQLite DB from schema_v1.sql (+ migrations via app/migrations.py),
+loads synthetic threads/messages (mixed Korean/English prose, Zipf-distributed vocabulary so
+term frequencies look like chat logs rather than a 30-word bag), then measures:
+- ingest rate with the FTS triggers active (upsert path used by /api/v2/threads/append)
+- migration time for a DB that already holds rows (007 'rebuild' backfill dominates)
+- search_threads() latency p50/p95/max per query class: rare term, mid/common term (by Zipf
+  rank), multi-term AND, Korean term, short-term LIKE fallback, page-2 via cursor
+- baseline: the LIKE '%q%' scan the FTS index replaces (same terms, grouped by thread)
+and checks that an edited message is found by its new text only (trigger sync).
+
+Usage:
+  python scripts/tests/threads_fts_bench.py [--threads 5000] [--messages 120000] [--runs 20] [--seed 7]
+
+Exit code 0 = sync checks passed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.migrations import migrate_sqlite  # noqa: E402
+from app.thread_fts import search_threads  # noqa: E402
+
+SCHEMA_V1 = PROJECT_ROOT / "db" / "schema" / "sqlite" / "schema_v1.sql"
+UPSERT = (
+    "INSERT INTO messages(id, thread_id, role, content, meta_json, created_at) VALUES(?,?,?,?,?,?)"
+    " ON CONFLICT(id) DO UPDATE SET thread_id=excluded.thread_id, role=excluded.role,"
+    " content=excluded.content, meta_json=excluded.meta_json, created_at=excluded.created_at"
+)
+WORDS = (
+    "gate memory tier proposal evidence checkpoint meeting summary roadmap sitegraph "
+    "import revalidate approve reject audit chain token stream backend frontend deploy "
+    "회의 요약 메모리 증거 승인 거절 체크포인트 로드맵 배포 검색 대화 스레드"
+).split()
+RARE = "zephyrquartz"
+VOCAB_SIZE = 4000
+
+
+def make_vocab(rnd: random.Random) -> tuple:
+    """(words, cum_weights): domain words spread over Zipf ranks, filler words elsewhere."""
+    syl = "ka ri mo su ne ta lo vi pe du ra zo mi ke no ha".split()
+    filler = sorted({"".join(rnd.choices(syl, k=rnd.randint(2, 4))) for _ in range(VOCAB_SIZE * 2)})
+    rnd.shuffle(filler)
+    words = filler[:VOCAB_SIZE]
+    for i, w in enumerate(WORDS):  # ranks 5, 35, 65, …
+        words.insert(5 + i * 30, w)
+    acc, cum = 0.0, []
+    for r in range(len(words)):
+        acc += 1.0 / (r + 1)
+        cum.append(acc)
+    return words, cum
+
+
+def _pct(vals, p):
+    s = sorted(vals)
+    return round(s[min(len(s) - 1, int(len(s) * p))] * 1000, 2)
+
+
+def _timed(fn, runs):
+    out = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return {"p50_ms": _pct(out, 0.5), "p95_ms": _pct(out, 0.95), "max_ms": round(max(out) * 1000, 2)}
+
+
+def build(db: Path, threads: int, messages: int, seed: int) -> dict:
+    rnd = random.Random(seed)
+    vocab, cum = make_vocab(rnd)
+    con = sqlite3.connect(db)
+    con.executescript(SCHEMA_V1.read_text(encoding="utf-8"))
+    # half the rows go in before the FTS tables exist → exercised by the rebuild backfill
+    half = messages // 2
+    t0 = time.perf_counter()
+    tids = [f"CONV_{i:06d}" for i in range(threads)]
+    con.executemany(
+        "INSERT INTO threads(id, title, tags, created_at, updated_at) VALUES(?,?,?,?,?)",
+        [(t, " ".join(rnd.choices(vocab, cum_weights=cum, k=4)) + (f" {RARE}" if i % 997 == 0 else ""), None, i, i)
+         for i, t in enumerate(tids)],
+    )
+
+    def rows(lo, hi):
+        for i in range(lo, hi):
+            text = " ".join(rnd.choices(vocab, cum_weights=cum, k=rnd.randint(8, 40)))
+            if i % 5003 == 0:
+                text += f" {RARE}"
+            yield (f"M{i:07d}", tids[i % threads], "user" if i % 2 else "assistant", text, "{}", i)
+
+    con.executemany(UPSERT, rows(0, half))
+    con.commit()
+    pre_sec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    migrate_sqlite(str(db))  # 001…007: FTS tables/triggers + 'rebuild'
+    migrate_sec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    con.executemany(UPSERT, rows(half, messages))
+    con.commit()
+    trig_sec = time.perf_counter() - t0
+    con.close()
+    n_trig = messages - half
+    return {
+        "ingest_no_fts_rows_per_sec": round(half / pre_sec) if pre_sec else None,
+        "ingest_with_triggers_rows_per_sec": round(n_trig / trig_sec) if trig_sec else None,
+        "migrate_sec": round(migrate_sec, 3),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", type=int, default=5000)
+    ap.add_argument("--messages", type=int, default=120000)
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as td:
+        db = Path(td) / "bench.db"
+        load = build(db, args.threads, args.messages, args.seed)
+        con = sqlite3.connect(db)
+        con.row_factory = sqlite3.Row
+        key = str(db)
+
+        queries = {  # Zipf ranks: gate=5, memory=35, … (see make_vocab)
+            "rare": RARE,
+            "common": WORDS[0],
+            "mid": WORDS[8],
+            "multi_and": f"{WORDS[1]} {WORDS[8]}",
+            "korean": "체크포인트",
+            "short_like": "회의",
+        }
+        lat, hits = {}, {}
+        for name, q in queries.items():
+            lat[name] = _timed(lambda q=q: search_threads(con, key, q, size=20), args.runs)
+            r = search_threads(con, key, q, size=20)
+            hits[name] = {"q": q, "mode": r["mode"], "threads": r["total_threads"], "messages": r["total_hits"]}
+        first = search_threads(con, key, WORDS[8], size=20)
+        lat["mid_page2"] = _timed(
+            lambda: search_threads(con, key, WORDS[8], size=20, cursor=first["next_cursor"]), args.runs)
+        # checked before the edit below: bm25 depends on corpus stats, so writes shift scores
+        page2_disjoint = not ({i["id"] for i in first["items"]} & {
+            i["id"] for i in search_threads(con, key, WORDS[8], size=20, cursor=first["next_cursor"])["items"]})
+        like_sql = "SELECT thread_id, count(*) FROM messages WHERE content LIKE ? GROUP BY thread_id"
+        for name in ("rare", "mid"):
+            lat[f"baseline_like_{name}"] = _timed(
+                lambda q=queries[name]: con.execute(like_sql, (f"%{q}%",)).fetchall(), max(3, args.runs // 4))
+
+        # trigger sync: edit a message, old text must disappear, new text must be found
+        con.execute(UPSERT, ("M0000001", "CONV_000001", "user", "quokkaflux edited", "{}", 1))
+        con.commit()
+        new_hit = any(m["id"] == "M0000001" for it in search_threads(con, key, "quokkaflux")["items"] for m in it["messages"])
+        con.execute(UPSERT, ("M0000001", "CONV_000001", "user", "plain again", "{}", 1))
+        con.commit()
+        stale = search_threads(con, key, "quokkaflux")["total_hits"]
+        con.close()
+
+    ok = new_hit and stale == 0 and page2_disjoint
+    print(json.dumps({
+        "ok": ok,
+        "threads": args.threads,
+        "messages": args.messages,
+        "load": load,
+        "latency": lat,
+        "totals": hits,
+        "checks": {"edit_indexed": new_hit, "stale_hits": stale, "page2_disjoint": page2_disjoint},
+    }, ensure_ascii=False, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Meeting upload — streaming RSS benchmark (ST-1206)
+
+Drives the ASGI app in-process with a generated request body (the "client" never holds more than
+one chunk), for growing upload sizes through:
+- multipart  POST /api/meetings/capture/upload
+- session    POST …/upload/sessions → PUT …/{id}?offset=N (several parts) → POST …/{id}/complete
+and samples the process RSS (/proc/self/statm) while each upload runs. Peak RSS growth should stay
+flat (≈ chunk size + spool buffers) as the upload size grows. Also checks the stored sha256
+against the generated bytes and that the size limit answers 413 without leaving temp files.
+
+Uploads go to a throwaway meeting id; the bench deletes its attachments afterwards.
+
+Usage:
+  python scripts/tests/upload_rss_bench.py [--sizes 16,64,256] [--parts 4]
+
+Exit code 0 = digests match, 413 enforced, RSS growth under --max-growth-mb.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ.setdefault("GG_MIGRATE_ON_STARTUP", "0")
+os.environ.setdefault("GG_REVALIDATE_WORKER", "0")
+
+from app import api  # noqa: E402
+
+MID = "BENCH_UPLOAD_RSS"
+CHUNK = 1 << 20
+PAGE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE / (1 << 20)
+
+
+class Sampler:
+    def __init__(self) -> None:
+        self.peak = 0.0
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self.base = rss_mb()
+        self.peak = self.base
+        self._t = threading.Thread(target=self._run, daemon=True)
+        self._t.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, rss_mb())
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._t.join()
+        self.peak = max(self.peak, rss_mb())
+
+
+def payload(size: int, seed: int = 7):
+    """Deterministic pseudo-random bytes, one chunk at a time, plus their sha256."""
+    block = hashlib.sha256(str(seed).encode()).digest() * (CHUNK // 32)
+    sha = hashlib.sha256()
+    left = size
+    i = 0
+    while left > 0:
+        b = bytes([i & 0xFF]) + block[1 : min(CHUNK, left)]
+        sha.update(b)
+        left -= len(b)
+        i += 1
+        yield b, sha
+
+
+async def asgi(method: str, path: str, body_iter, headers=None, query: str = "") -> tuple:
+    """Minimal ASGI client: streams body chunks via receive(), collects the response."""
+    it = iter(body_iter)
+    state = {"status": None, "body": b""}
+
+    async def receive():
+        try:
+            b = next(it)
+            return {"type": "http.request", "body": b, "more_body": True}
+        except StopIteration:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(msg):
+        if msg["type"] == "http.response.start":
+            state["status"] = msg["status"]
+        elif msg["type"] == "http.response.body":
+            state["body"] += msg.get("body", b"")
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 8000), "root_path": "",
+    }
+    await api.app(scope, receive, send)
+    return state["status"], json.loads(state["body"] or b"null")
+
+
+def multipart_body(size: int, out: dict):
+    bnd = "----ggbench"
+    yield (f"--{bnd}\r\nContent-Disposition: form-data; name=\"meetingId\"\r\n\r\n{MID}\r\n"
+           f"--{bnd}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"rec.bin\"\r\n"
+           "Content-Type: application/octet-stream\r\n\r\n").encode()
+    for b, sha in payload(size):
+        out["sha"] = sha
+        yield b
+    yield f"\r\n--{bnd}--\r\n".encode()
+
+
+async def run_multipart(size: int) -> dict:
+    out: dict = {}
+    t0 = time.perf_counter()
+    with Sampler() as s:
+        st, res = await asgi("POST", "/api/meetings/capture/upload", multipart_body(size, out),
+                             {"content-type": "multipart/form-data; boundary=----ggbench"})
+    ev = (res or {}).get("data", {}).get("event", {})
+    return {"status": st, "sec": round(time.perf_counter() - t0, 2), "rss_growth_mb": round(s.peak - s.base, 1),
+            "sha_ok": ev.get("sha256") == out["sha"].hexdigest(), "bytes": ev.get("bytes")}
+
+
+async def run_session(size: int, parts: int) -> dict:
+    t0 = time.perf_counter()
+    st, res = await asgi("POST", "/api/meetings/capture/upload/sessions",
+                         [json.dumps({"meetingId": MID, "filename": "rec.bin", "size": size}).encode()],
+                         {"content-type": "application/json"})
+    sid = res["data"]["id"]
+    part = -(-size // parts)
+    gen = payload(size)
+    sha = None
+    with Sampler() as s:
+        off = 0
+        while off < size:
+            n = min(part, size - off)
+
+            def chunk_iter(n=n):
+                nonlocal sha
+                got = 0
+                while got < n:
+                    b, sha = next(gen)
+                    got += len(b)
+                    yield b
+
+            st, res = await asgi("PUT", f"/api/meetings/capture/upload/sessions/{sid}", chunk_iter(), query=f"offset={off}")
+            off = res["data"]["received"]
+        st, res = await asgi("POST", f"/api/meetings/capture/upload/sessions/{sid}/complete", [])
+    ev = (res or {}).get("data", {}).get("event", {})
+    return {"status": st, "sec": round(time.perf_counter() - t0, 2), "rss_growth_mb": round(s.peak - s.base, 1),
+            "sha_ok": ev.get("sha256") == sha.hexdigest(), "bytes": ev.get("bytes")}
+
+
+async def check_limit() -> dict:
+    limit = 2 << 20
+    old = api.MEETING_UPLOAD_MAX_BYTES
+    api.MEETING_UPLOAD_MAX_BYTES = limit
+    try:
+        st, _ = await asgi("POST", "/api/meetings/capture/upload", multipart_body(limit * 2, {}),
+                           {"content-type": "multipart/form-data; boundary=----ggbench"})
+    finally:
+        api.MEETING_UPLOAD_MAX_BYTES = old
+    leftovers = list((api.MEETINGS_ROOT / MID / "attachments").glob(".*.part"))
+    return {"status": st, "temp_files_left": len(leftovers)}
+
+
+async def main_async(sizes, parts) -> dict:
+    res = {"multipart": {}, "session": {}}
+    for mb in sizes:
+        res["multipart"][f"{mb}MB"] = await run_multipart(mb << 20)
+        res["session"][f"{mb}MB"] = await run_session(mb << 20, parts)
+    res["limit"] = await check_limit()
+    return res
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="16,64,256", help="MB, comma-separated")
+    ap.add_argument("--parts", type=int, default=4, help="PUTs per session upload")
+    ap.add_argument("--max-growth-mb", type=float, default=48.0)
+    args = ap.parse_args(argv)
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    try:
+        res = asyncio.run(main_async(sizes, args.parts))
+    finally:
+        shutil.rmtree(api.MEETINGS_ROOT / MID, ignore_errors=True)
+    runs = [r for k in ("multipart", "session") for r in res[k].values()]
+    ok = (all(r["status"] == 200 and r["sha_ok"] for r in runs)
+          and max(r["rss_growth_mb"] for r in runs) <= args.max_growth_mb
+          and res["limit"]["status"] == 413 and res["limit"]["temp_files_left"] == 0)
+    res["ok"] = ok
+    print(json.dumps(res, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -628,8 +628,12 @@ export default function A1Dev() {
             while ((sep = buf.indexOf("\n\n")) !== -1) {
               const part = buf.slice(0, sep);
               buf = buf.slice(sep + 2);
-              if (part.startsWith("data: ")) {
-                const chunk = part.slice(6);
+              // One event may carry several "data:" lines (multi-line text); ": ping" is a heartbeat
+              const lines = part.split("\n").filter((l) => l.startsWith("data:"));
+              if (lines.length) {
+                const chunk = lines
+                  .map((l) => (l.startsWith("data: ") ? l.slice(6) : l.slice(5)))
+                  .join("\n");
                 if (chunk) {
                   assembled += chunk;
                   chatStore.actions.patchMessage(t.id, placeholderId, {
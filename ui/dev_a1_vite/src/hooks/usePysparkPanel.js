@@ -9,6 +9,27 @@ import { useCallback, useEffect, useState } from "react";
  * - setShowCC: (bool) => void
  * - setCCTab: (tab: string) => void
  */
+const JOB_POLL_MS = 1000;
+const JOB_DONE = new Set(["succeeded", "failed", "timeout", "cancelled", "interrupted"]);
+
+// POST /api/mcp/pyspark/run only queues the job; poll its status until it reaches a final state.
+async function runPysparkJob(script) {
+  const r = await fetch("/api/mcp/pyspark/run", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ script }),
+  });
+  const j = await r.json().catch(() => ({}));
+  const id = j?.job_id;
+  if (!r.ok || !id) return j;
+  for (;;) {
+    await new Promise((res) => setTimeout(res, JOB_POLL_MS));
+    const s = await fetch(`/api/mcp/pyspark/jobs/${encodeURIComponent(id)}?log_bytes=0`);
+    const sj = await s.json().catch(() => ({}));
+    if (!s.ok || JOB_DONE.has(sj?.job?.status)) return sj;
+  }
+}
+
 export default function usePysparkPanel({ showCC, ccTab, setShowCC, setCCTab }) {
   const [pysparkData, setPysparkData] = useState(null);
 
@@ -53,12 +74,7 @@ export default function usePysparkPanel({ showCC, ccTab, setShowCC, setCCTab })
         ? script
         : "scripts/pyspark_jobs/sample_verify_spark.py";
       try {
-        const r = await fetch("/api/mcp/pyspark/run", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ script: js }),
-        });
-        await r.json().catch(() => ({}));
+        await runPysparkJob(js);
       } catch {}
       fetchPysparkLatest();
     },
@@ -66,16 +82,11 @@ export default function usePysparkPanel({ showCC, ccTab, setShowCC, setCCTab })
   );
 
   const onPlannerRun = useCallback(async () => {
-    try {
-      const r = await fetch("/api/mcp/pyspark/run", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ script: "scripts/pyspark_jobs/sample_verify_spark.py" }),
-      });
-      await r.json().catch(() => ({}));
-    } catch {}
     setCCTab("pyspark");
     setShowCC(true);
+    try {
+      await runPysparkJob("scripts/pyspark_jobs/sample_verify_spark.py");
+    } catch {}
     fetchPysparkLatest();
   }, [setCCTab, setShowCC, fetchPysparkLatest]);
 